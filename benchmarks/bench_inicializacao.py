@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização da interface de terminal
+
+Mede, em processos Python novos (inicialização a frio), quanto tempo o
+SWAIF-CONFA leva para desenhar o menu principal e quanto leva até o
+controller (pandas + models) estar pronto em segundo plano.
+
+Uso:
+    python benchmarks/bench_inicializacao.py
+    python benchmarks/bench_inicializacao.py --repeticoes 10 --historico bench.jsonl
+    python benchmarks/bench_inicializacao.py --limite-menu 0.1
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executado no processo filho: abre o menu, escolhe "0" e aguarda o aquecimento
+_SCRIPT_FILHO = """
+import json, os, sys, time
+inicio = time.perf_counter()
+import main
+app = main.SwaifConfaApp()
+app.view.limpar_tela = lambda: None
+saida_real, sys.stdout = sys.stdout, open(os.devnull, "w")
+app.view.exibir_cabecalho()
+app.view.exibir_menu_principal()
+menu = time.perf_counter() - inicio
+pandas_no_menu = "pandas" in sys.modules
+app.controller
+pronto = time.perf_counter() - inicio
+sys.stdout = saida_real
+print(json.dumps({"menu_s": menu, "controller_s": pronto, "pandas_no_menu": pandas_no_menu}))
+"""
+
+
+def medir_uma_vez() -> Dict:
+    """Executa uma inicialização a frio e retorna os tempos medidos"""
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, "-c", _SCRIPT_FILHO],
+        cwd=RAIZ_PROJETO,
+        input="0\n",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    medicao = json.loads(processo.stdout.strip().splitlines()[-1])
+    medicao["processo_s"] = time.perf_counter() - inicio
+    return medicao
+
+
+def medir_inicializacao(repeticoes: int = 5) -> Dict:
+    """
+    Mede a inicialização várias vezes e resume pela mediana
+
+    Returns:
+        Dict com medianas de menu_s, controller_s e processo_s (segundos)
+        e as medições individuais
+    """
+    medicoes: List[Dict] = [medir_uma_vez() for _ in range(repeticoes)]
+    return {
+        "repeticoes": repeticoes,
+        "menu_s": statistics.median(m["menu_s"] for m in medicoes),
+        "controller_s": statistics.median(m["controller_s"] for m in medicoes),
+        "processo_s": statistics.median(m["processo_s"] for m in medicoes),
+        "pandas_no_menu": any(m["pandas_no_menu"] for m in medicoes),
+        "medicoes": medicoes,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument(
+        "--historico",
+        metavar="ARQUIVO",
+        help="Acrescenta o resultado (uma linha JSON) a este arquivo",
+    )
+    parser.add_argument(
+        "--limite-menu",
+        type=float,
+        metavar="SEGUNDOS",
+        help="Falha (código 1) se a mediana até o menu passar deste limite",
+    )
+    args = parser.parse_args(argv)
+
+    resultado = medir_inicializacao(args.repeticoes)
+
+    print(f"Inicialização a frio ({resultado['repeticoes']} execuções, mediana):")
+    print(f"  até o menu:            {resultado['menu_s'] * 1000:8.1f} ms")
+    print(f"  até o controller:      {resultado['controller_s'] * 1000:8.1f} ms")
+    print(f"  processo completo:     {resultado['processo_s'] * 1000:8.1f} ms")
+    print(f"  pandas antes do menu:  {'sim' if resultado['pandas_no_menu'] else 'não'}")
+
+    if args.historico:
+        registro = {"data": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0]}
+        registro.update({k: v for k, v in resultado.items() if k != "medicoes"})
+        with open(args.historico, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro) + "\n")
+
+    if args.limite_menu is not None and resultado["menu_s"] > args.limite_menu:
+        print(f"❌ Menu levou mais que {args.limite_menu * 1000:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
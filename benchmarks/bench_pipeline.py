@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pipeline de conciliação: leitura, padronização, análise e exibição
+
+Gera meses sintéticos (tests/fixtures/gerador_sintetico.py) com cerca de 10
+mil, 100 mil ou 1 milhão de linhas por fonte e mede cada estágio
+separadamente: ler_csv e ler_wab_json, os _padronizar_* do Analisador,
+calcular_totais_*, analisar_todos_pares e a exibição pela TerminalView.
+O tempo de cada estágio é a mediana das repetições; o pico de memória vem
+de uma execução extra sob tracemalloc.
+
+O resultado é gravado em JSON. Com --baseline, cada estágio é comparado ao
+valor guardado e o benchmark falha (código 1) se algum passar da margem.
+
+Uso:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --cenarios 10k,100k,1m --saida bench.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline_pipeline.json --margem 0.3
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline_pipeline.json --atualizar-baseline
+"""
+import argparse
+import contextlib
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.controllers.conciliacao_controller import ConciliacaoController
+from src.models.analisador import Analisador
+from src.models.data_loader import DataLoader
+from src.views.terminal_view import Paginador, TerminalView
+from tests.fixtures.gerador_sintetico import ConfiguracaoGerador, gerar_mes
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MES = '072025'
+SEMENTE = 42
+
+# Cenário -> vendas sorteadas (≈ linhas por fonte) e repetições padrão
+CENARIOS: Dict[str, Tuple[int, int]] = {
+    '10k': (10_000, 5),
+    '100k': (100_000, 3),
+    '1m': (1_000_000, 1),
+}
+CENARIOS_PADRAO = '10k,100k'
+
+MARGEM_PADRAO = 0.5
+# Diferenças abaixo destes pisos são ruído e nunca contam como regressão
+PISO_TEMPO_S = 0.01
+PISO_MEMORIA_BYTES = 1 << 20
+
+SAIDA_PADRAO = os.path.join(RAIZ_PROJETO, 'benchmarks', 'resultados_pipeline.json')
+DIR_DADOS_PADRAO = os.path.join(tempfile.gettempdir(), 'swaif_bench_pipeline')
+
+_PADRONIZADORES = {
+    'faturamento_c6': '_padronizar_valores_c6_faturamento',
+    'faturamento_gds': '_padronizar_valores_gds',
+    'faturamento_wab': '_padronizar_valores_wab',
+    'pagamento_c6': '_padronizar_valores_c6_pagamento',
+    'pagamento_gds': '_padronizar_valores_gds',
+}
+
+
+def preparar_dados(cenario: str, dir_dados: str) -> str:
+    """
+    Gera (uma vez) o mês sintético do cenário e retorna o diretório base
+
+    Os arquivos ficam em ``dir_dados/<cenario>_<semente>`` e são
+    reaproveitados entre execuções; o marcador só é gravado ao final da
+    geração, então uma geração interrompida é refeita.
+    """
+    vendas, _ = CENARIOS[cenario]
+    base = os.path.join(dir_dados, f"{cenario}_{SEMENTE}")
+    marcador = os.path.join(base, 'resumo.json')
+    if not os.path.exists(marcador):
+        print(f"Gerando mês sintético {cenario} ({vendas:,} vendas) em {base}...")
+        resumo = gerar_mes(base, MES, ConfiguracaoGerador(vendas=vendas, semente=SEMENTE))
+        with open(marcador, 'w', encoding='utf-8') as f:
+            json.dump({'linhas': resumo.linhas, 'totais': resumo.totais}, f)
+    return base
+
+
+def medir(funcao: Callable[[], object], repeticoes: int, memoria: bool = True) -> Dict:
+    """
+    Mede uma função: mediana de ``repeticoes`` execuções e pico de memória
+
+    O pico vem de uma execução adicional sob tracemalloc, para não somar o
+    custo do rastreamento aos tempos.
+    """
+    tempos: List[float] = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    medicao: Dict = {'tempo_s': statistics.median(tempos), 'tempos_s': tempos}
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            funcao()
+            medicao['pico_memoria_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return medicao
+
+
+def _exibir_sem_terminal(view: TerminalView, exibir: Callable[[], None]) -> None:
+    with open(os.devnull, 'w', encoding='utf-8') as nulo, contextlib.redirect_stdout(nulo):
+        view.paginador = Paginador(saida=nulo, interativo=False)
+        exibir()
+
+
+def executar_cenario(
+    cenario: str, dir_dados: str, repeticoes: Optional[int] = None, memoria: bool = True
+) -> Dict:
+    """
+    Executa todos os estágios de um cenário
+
+    Cada estágio recebe como entrada a saída já pronta do estágio anterior,
+    de modo que só o próprio estágio é medido.
+
+    Returns:
+        Dict estágio -> {tempo_s, tempos_s, pico_memoria_bytes, linhas}
+    """
+    base = preparar_dados(cenario, dir_dados)
+    repeticoes = repeticoes or CENARIOS[cenario][1]
+    loader = DataLoader(base)
+    analisador = Analisador()
+    caminhos = loader.caminhos_fontes(MES)
+    mapeamentos = {
+        'faturamento_c6': loader.faturamento_c6_cols,
+        'faturamento_gds': loader.faturamento_gds_cols,
+        'pagamento_c6': loader.pagamento_c6_cols,
+        'pagamento_gds': loader.pagamento_gds_cols,
+    }
+    estagios: Dict[str, Dict] = {}
+
+    def registrar(nome: str, funcao: Callable[[], object], linhas: int) -> None:
+        print(f"  {cenario:>5} {nome:<36}", end='', flush=True)
+        estagios[nome] = {**medir(funcao, repeticoes, memoria), 'linhas': linhas}
+        print(f"{estagios[nome]['tempo_s'] * 1000:10.1f} ms")
+
+    dados: Dict[str, pd.DataFrame] = {}
+    for fonte, mapeamento in mapeamentos.items():
+        def ler(fonte=fonte, mapeamento=mapeamento):
+            return loader.ler_csv(caminhos[fonte], mapeamento, loader.filtros_linhas.get(fonte))
+        dados[fonte] = ler()
+        registrar(f"ler_csv.{fonte}", ler, len(dados[fonte]))
+    dados['faturamento_wab'] = loader.ler_wab_json(caminhos['faturamento_wab'])
+    registrar(
+        'ler_wab_json',
+        lambda: loader.ler_wab_json(caminhos['faturamento_wab']),
+        len(dados['faturamento_wab']),
+    )
+
+    for fonte, metodo in _PADRONIZADORES.items():
+        padronizar = getattr(analisador, metodo)
+        registrar(
+            f"padronizar.{fonte}",
+            lambda padronizar=padronizar, fonte=fonte: padronizar(dados[fonte]),
+            len(dados[fonte]),
+        )
+
+    linhas_total = sum(len(df) for df in dados.values())
+    registrar(
+        'calcular_totais_faturamento',
+        lambda: analisador.calcular_totais_faturamento(dados), linhas_total,
+    )
+    registrar(
+        'calcular_totais_pagamento',
+        lambda: analisador.calcular_totais_pagamento(dados), linhas_total,
+    )
+    resultados = analisador.analisar_todos_pares(dados)
+    registrar('analisar_todos_pares', lambda: analisador.analisar_todos_pares(dados), linhas_total)
+
+    view = TerminalView()
+    view.limpar_tela = lambda: None
+    registrar(
+        'exibir.resultados_conciliacao',
+        lambda: _exibir_sem_terminal(
+            view, lambda: view.exibir_resultados_conciliacao(resultados, MES)
+        ),
+        sum(len(r.detalhes_divergencias) for r in resultados),
+    )
+    controller = ConciliacaoController(base)
+    controller.cache_sessao.guardar(MES, controller.data_loader.fingerprint_mes(MES), dados)
+    detalhes = controller.obter_detalhes_fonte(MES, 'faturamento_c6')
+    registrar(
+        'exibir.detalhes_fonte',
+        lambda: _exibir_sem_terminal(view, lambda: view.exibir_detalhes_fonte(
+            detalhes, 'faturamento_c6', MES,
+            registros=controller.iterar_registros_fonte(MES, 'faturamento_c6'),
+        )),
+        len(dados['faturamento_c6']),
+    )
+    return estagios
+
+
+def comparar_com_baseline(
+    atual: Dict[str, Dict[str, Dict]],
+    baseline: Dict[str, Dict[str, Dict]],
+    margem: float,
+    margem_memoria: Optional[float] = None,
+) -> List[str]:
+    """
+    Lista as regressões (tempo ou pico de memória) acima da margem
+
+    Só são comparados os cenários e estágios presentes nos dois lados.
+    Diferenças absolutas abaixo de PISO_TEMPO_S / PISO_MEMORIA_BYTES são
+    ignoradas, para que estágios de poucos milissegundos não falhem por ruído.
+
+    Args:
+        atual: cenário -> estágio -> medição
+        baseline: Mesmo formato, lido do arquivo de baseline
+        margem: Aumento relativo tolerado no tempo (0.5 = 50%)
+        margem_memoria: Aumento relativo tolerado no pico (padrão: ``margem``)
+    """
+    margem_memoria = margem if margem_memoria is None else margem_memoria
+    regressoes = []
+    for cenario, estagios in atual.items():
+        for estagio, medicao in estagios.items():
+            referencia = baseline.get(cenario, {}).get(estagio)
+            if not referencia:
+                continue
+            tempo, tempo_base = medicao['tempo_s'], referencia['tempo_s']
+            if tempo > tempo_base * (1 + margem) and tempo - tempo_base > PISO_TEMPO_S:
+                regressoes.append(
+                    f"{cenario} {estagio}: {tempo * 1000:.1f} ms "
+                    f"(baseline {tempo_base * 1000:.1f} ms, +{(tempo / tempo_base - 1):.0%})"
+                )
+            pico = medicao.get('pico_memoria_bytes')
+            pico_base = referencia.get('pico_memoria_bytes')
+            if (
+                pico is not None and pico_base
+                and pico > pico_base * (1 + margem_memoria)
+                and pico - pico_base > PISO_MEMORIA_BYTES
+            ):
+                regressoes.append(
+                    f"{cenario} {estagio}: pico {pico / 2**20:.1f} MiB "
+                    f"(baseline {pico_base / 2**20:.1f} MiB, +{(pico / pico_base - 1):.0%})"
+                )
+    return regressoes
+
+
+def _ambiente() -> Dict:
+    return {
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--cenarios', default=CENARIOS_PADRAO,
+        help=f"Cenários separados por vírgula ({', '.join(CENARIOS)}; padrão: {CENARIOS_PADRAO})",
+    )
+    parser.add_argument('--repeticoes', type=int, help='Repetições por estágio (padrão: por cenário)')
+    parser.add_argument('--saida', default=SAIDA_PADRAO, metavar='ARQUIVO',
+                        help='Arquivo JSON com o resultado')
+    parser.add_argument('--dados', default=DIR_DADOS_PADRAO, metavar='DIR',
+                        help='Onde os meses sintéticos são gerados e reaproveitados')
+    parser.add_argument('--baseline', metavar='ARQUIVO',
+                        help='Compara com este resultado guardado e falha em regressão')
+    parser.add_argument('--margem', type=float, default=MARGEM_PADRAO,
+                        help='Aumento de tempo tolerado sobre a baseline (0.5 = 50%%)')
+    parser.add_argument('--margem-memoria', type=float,
+                        help='Aumento de pico de memória tolerado (padrão: --margem)')
+    parser.add_argument('--sem-memoria', action='store_true',
+                        help='Não mede o pico de memória (pula a execução sob tracemalloc)')
+    parser.add_argument('--atualizar-baseline', action='store_true',
+                        help='Grava os cenários medidos no arquivo de --baseline')
+    args = parser.parse_args(argv)
+
+    cenarios = [c.strip().lower() for c in args.cenarios.split(',') if c.strip()]
+    desconhecidos = [c for c in cenarios if c not in CENARIOS]
+    if desconhecidos:
+        parser.error(f"Cenário(s) desconhecido(s): {', '.join(desconhecidos)}")
+    if args.atualizar_baseline and not args.baseline:
+        parser.error('--atualizar-baseline requer --baseline')
+
+    # O controller configura logging INFO; o benchmark só quer os próprios tempos
+    logging.disable(logging.INFO)
+
+    medicoes = {
+        cenario: executar_cenario(cenario, args.dados, args.repeticoes, not args.sem_memoria)
+        for cenario in cenarios
+    }
+    resultado = {'ambiente': _ambiente(), 'cenarios': medicoes}
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2)
+    print(f"Resultado gravado em {args.saida}")
+
+    if not args.baseline:
+        return 0
+
+    baseline: Dict = {'cenarios': {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.atualizar_baseline:
+        baseline['ambiente'] = resultado['ambiente']
+        baseline.setdefault('cenarios', {}).update(medicoes)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline atualizada em {args.baseline}")
+        return 0
+
+    regressoes = comparar_com_baseline(
+        medicoes, baseline.get('cenarios', {}), args.margem, args.margem_memoria
+    )
+    if regressoes:
+        print(f"❌ {len(regressoes)} regressão(ões) acima da margem:")
+        for regressao in regressoes:
+            print(f"  {regressao}")
+        return 1
+    print(f"✅ Nenhum estágio acima da margem ({args.margem:.0%}) da baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
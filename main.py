@@ -4,24 +4,67 @@ Aplicação principal com arquitetura MVC
 """
 import os
 import sys
+import threading
+from typing import TYPE_CHECKING, List, Optional
 
 # Adiciona o diretório raiz ao path para imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.controllers.conciliacao_controller import ConciliacaoController
+# A view não depende de pandas; controller e models são importados em segundo plano
 from src.views.terminal_view import TerminalView
 
+if TYPE_CHECKING:
+    from src.controllers.conciliacao_controller import ConciliacaoController
+
 
 class SwaifConfaApp:
     """Aplicação principal do sistema"""
     
     def __init__(self):
         # Caminho base para os arquivos de dados
-        base_path = os.path.join(os.path.dirname(__file__), "faturamentos")
+        self.base_path = os.path.join(os.path.dirname(__file__), "faturamentos")
+        self.cache_dir = os.path.join(os.path.dirname(__file__), ".swaif_cache")
         
-        self.controller = ConciliacaoController(base_path)
-        self.view = TerminalView()
+        # SWAIF_METRICAS=1 mostra o tempo de cada etapa após a conciliação
+        self.view = TerminalView(
+            exibir_metricas=os.environ.get("SWAIF_METRICAS", "") not in ("", "0")
+        )
         self.rodando = True
+
+        # SWAIF_TABELA_TAXAS=arquivo.json troca as taxas contratadas da análise de MDR
+        self.tabela_taxas = os.environ.get("SWAIF_TABELA_TAXAS") or None
+
+        # Importar pandas e montar o controller leva mais que desenhar o menu:
+        # isso acontece em uma thread enquanto o operador escolhe a opção
+        self._controller: Optional["ConciliacaoController"] = None
+        self._erro_aquecimento: Optional[Exception] = None
+        self._aquecimento = threading.Thread(
+            target=self._aquecer_controller, name="aquecimento-controller", daemon=True
+        )
+        self._aquecimento.start()
+
+    def _aquecer_controller(self):
+        """Importa os models e cria o controller (executa na thread de aquecimento)"""
+        try:
+            from src.controllers.conciliacao_controller import ConciliacaoController
+
+            self._controller = ConciliacaoController(
+                self.base_path, cache_dir=self.cache_dir, prefetch=True,
+                tabela_taxas=self.tabela_taxas,
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            self._erro_aquecimento = e
+
+    @property
+    def controller(self) -> "ConciliacaoController":
+        """Controller da aplicação; aguarda o aquecimento se ainda não terminou"""
+        self._aquecimento.join()
+        if self._erro_aquecimento is not None:
+            raise RuntimeError(
+                f"Falha ao inicializar o sistema: {self._erro_aquecimento}"
+            ) from self._erro_aquecimento
+        assert self._controller is not None
+        return self._controller
     
     def executar(self):
         """Loop principal da aplicação"""
@@ -44,6 +87,12 @@ class SwaifConfaApp:
             self._detalhar_fonte()
         elif opcao == "4":
             self._exibir_configuracoes()
+        elif opcao == "5":
+            self._executar_conciliacao_lote()
+        elif opcao == "6":
+            self._visualizar_visao_acumulada()
+        elif opcao == "7":
+            self._analisar_taxas()
         elif opcao == "0":
             self._sair()
         else:
@@ -66,6 +115,50 @@ class SwaifConfaApp:
         except Exception as e:
             self.view.exibir_erro(f"Erro durante a conciliação: {str(e)}")
     
+    def _executar_conciliacao_lote(self):
+        """Executa conciliação de um intervalo de meses"""
+        try:
+            from src.controllers.conciliacao_controller import expandir_meses
+
+            inicio, fim = self.view.solicitar_intervalo_meses()
+            meses = expandir_meses(inicio, fim)
+
+            self.view.exibir_processando(f"Executando conciliação de {len(meses)} meses...")
+
+            lote = self.controller.executar_conciliacao_lote(meses)
+
+            self.view.exibir_resultados_lote(lote)
+
+        except Exception as e:
+            self.view.exibir_erro(f"Erro durante a conciliação em lote: {str(e)}")
+
+    def _visualizar_visao_acumulada(self):
+        """Exibe totais acumulados (ano até a data ou 12 meses) a partir dos agregados"""
+        try:
+            mes_ano = self.view.solicitar_mes_ano()
+            janela_meses = self.view.solicitar_janela_visao()
+
+            resultados, meses = self.controller.obter_visao_acumulada(mes_ano, janela_meses)
+
+            self.view.exibir_visao_acumulada(resultados, mes_ano, janela_meses, meses)
+
+        except Exception as e:
+            self.view.exibir_erro(f"Erro ao obter visão acumulada: {str(e)}")
+
+    def _analisar_taxas(self):
+        """Confere as taxas de adquirência cobradas no mês"""
+        try:
+            mes_ano = self.view.solicitar_mes_ano()
+
+            self.view.exibir_processando("Analisando taxas...")
+
+            resultado = self.controller.analisar_taxas(mes_ano)
+
+            self.view.exibir_analise_taxas(resultado, mes_ano)
+
+        except Exception as e:
+            self.view.exibir_erro(f"Erro na análise de taxas: {str(e)}")
+
     def _visualizar_resumo_dados(self):
         """Visualiza resumo dos dados carregados"""
         try:
@@ -89,8 +182,11 @@ class SwaifConfaApp:
             self.view.exibir_processando(f"Carregando detalhes de {fonte}...")
             
             detalhes = self.controller.obter_detalhes_fonte(mes_ano, fonte)
+            registros = None
+            if 'erro' not in detalhes:
+                registros = self.controller.iterar_registros_fonte(mes_ano, fonte)
             
-            self.view.exibir_detalhes_fonte(detalhes, fonte, mes_ano)
+            self.view.exibir_detalhes_fonte(detalhes, fonte, mes_ano, registros=registros)
             
         except Exception as e:
             self.view.exibir_erro(f"Erro ao obter detalhes: {str(e)}")
@@ -103,7 +199,7 @@ class SwaifConfaApp:
         print("⚙️  CONFIGURAÇÕES DO SISTEMA")
         print("=" * 60)
         print()
-        print("📂 Diretório de dados:", self.controller.data_loader.base_path)
+        print("📂 Diretório de dados:", self.base_path)
         print("📋 Pares de análise de faturamento: (GDS x C6), (GDS x WAB), (C6 x WAB)")
         print("📋 Pares de análise de pagamento: (GDS x C6)")
         print()
@@ -121,11 +217,15 @@ class SwaifConfaApp:
         print("   ✅ Conforme: diferença < 1%")
         print("   ⚠️  Pequena divergência: 1% ≤ diferença < 5%")
         print("   ❌ Grande divergência: diferença ≥ 5%")
+        print()
+        print("💳 TAXAS CONTRATADAS (MDR):", self.tabela_taxas or "tabela padrão")
         
         input("\nPressione ENTER para voltar ao menu...")
     
     def _sair(self):
         """Encerra a aplicação"""
+        if self._controller is not None:
+            self._controller.encerrar()
         self.view.limpar_tela()
         self.view.exibir_cabecalho()
         
@@ -135,11 +235,37 @@ class SwaifConfaApp:
         
         self.rodando = False
 
+def _perfil_da_sessao(argv: List[str]) -> Optional[str]:
+    """Prefixo dos arquivos de perfil se a linha de comando é só ``--perfil [PREFIXO]``"""
+    if not argv or argv[0] not in ("--perfil", "--profile") or len(argv) > 2:
+        return None
+    if len(argv) == 2 and argv[1].startswith("-"):
+        return None
+    from src.models.perfilador import PREFIXO_PADRAO
+
+    return argv[1] if len(argv) == 2 else PREFIXO_PADRAO
+
+
 def main():
     """Função principal"""
+    # --perfil sozinho perfila a sessão interativa; com outros argumentos, a CLI
+    prefixo_perfil = _perfil_da_sessao(sys.argv[1:])
+    if len(sys.argv) > 1 and prefixo_perfil is None:
+        from src.cli import main as cli_main
+
+        sys.exit(cli_main(sys.argv[1:]))
+
     try:
         app = SwaifConfaApp()
-        app.executar()
+        if prefixo_perfil is None:
+            app.executar()
+        else:
+            from src.models.perfilador import perfilar
+
+            with perfilar(prefixo_perfil) as perfil:
+                app.executar()
+            print(f"Perfil de CPU gravado em {perfil.arquivo_prof} e {perfil.arquivo_pilhas}")
+            print(perfil.funcoes_quentes())
     except KeyboardInterrupt:
         print("\n\n👋 Sistema encerrado pelo usuário.")
     except Exception as e:
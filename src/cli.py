@@ -0,0 +1,564 @@
+"""
+Interface de linha de comando - execução da conciliação sem o menu interativo
+
+Pensada para agendamentos (cron): não desenha a interface de terminal,
+escreve o resultado em JSON ou CSV e sinaliza divergências pelo código de
+saída. Com --clinicas/--raiz-clinicas, várias clínicas são conciliadas em
+paralelo em uma única execução, com relatório consolidado.
+
+Códigos de saída:
+    0 - todos os pares dentro do limite de alerta
+    1 - erro ao processar algum mês ou mês sem registros
+    2 - argumentos inválidos
+    3 - algum par com divergência acima do limite de alerta
+    4 - algum par com divergência acima do limite crítico (ou com uma das
+        fontes ausente ou zerada)
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from contextlib import contextmanager
+from typing import IO, Dict, Iterator, List, Optional
+
+from src.controllers.clinicas_controller import (
+    ClinicasController,
+    descobrir_clinicas,
+    nome_clinica,
+)
+from src.controllers.conciliacao_controller import ConciliacaoController, expandir_meses
+from src.models.analisador import (
+    FONTES_FATURAMENTO,
+    FONTES_PAGAMENTO,
+    LIMITE_ALERTA_PERCENTUAL,
+    LIMITE_CRITICO_PERCENTUAL,
+    ResultadoAnalise,
+    ResultadoClinicas,
+    ResultadoLote,
+    classificar_resultado,
+)
+from src.models.perfilador import PREFIXO_PADRAO, perfilar
+from src.views.exportadores import FORMATOS_EXPORTACAO, exportar
+from src.views.metricas_prometheus import escrever_metricas_prometheus
+from src.views.terminal_view import formatar_metricas, formatar_perfil_memoria
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_PATH_PADRAO = os.path.join(RAIZ_PROJETO, "faturamentos")
+CACHE_DIR_PADRAO = os.path.join(RAIZ_PROJETO, ".swaif_cache")
+
+SAIDA_OK = 0
+SAIDA_ERRO = 1
+SAIDA_ALERTA = 3
+SAIDA_CRITICO = 4
+
+COLUNAS_CSV = [
+    "mes_ano", "tipo_analise", "fonte_1", "fonte_2", "total_fonte_1", "total_fonte_2",
+    "registros_fonte_1", "registros_fonte_2", "diferenca", "percentual_diferenca",
+    "status", "erro",
+]
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Cria o parser de argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="SWAIF-CONFA - conciliação financeira sem interface interativa",
+        epilog=(
+            "Códigos de saída: 0 confere, 1 erro de processamento ou mês sem registros, "
+            "2 argumentos inválidos, 3 divergência acima do alerta, 4 divergência acima "
+            "do limite crítico ou fonte ausente/zerada em um par"
+        ),
+    )
+    parser.add_argument(
+        "--meses",
+        nargs="+",
+        metavar="MMAAAA",
+        help="Lista de meses a conciliar (ex: 062025 072025)",
+    )
+    parser.add_argument("--de", metavar="MMAAAA", help="Primeiro mês do intervalo")
+    parser.add_argument("--ate", metavar="MMAAAA", help="Último mês do intervalo")
+    parser.add_argument(
+        "--fontes",
+        nargs="+",
+        choices=FONTES_FATURAMENTO + FONTES_PAGAMENTO,
+        metavar="FONTE",
+        help="Carrega apenas estas fontes e concilia os pares formados por elas "
+        f"({', '.join(FONTES_FATURAMENTO + FONTES_PAGAMENTO)})",
+    )
+    parser.add_argument(
+        "--formato",
+        choices=["json", "csv"],
+        default="json",
+        help="Formato da saída (padrão: json)",
+    )
+    parser.add_argument(
+        "--saida",
+        metavar="ARQUIVO",
+        help="Grava o resultado neste arquivo em vez da saída padrão",
+    )
+    parser.add_argument(
+        "--exportar",
+        metavar="ARQUIVO",
+        help="Exporta pares, divergências por registro e erros de validação das fontes "
+        "para planilha/arquivo; "
+        "formato pela extensão (.csv, .jsonl ou .html)",
+    )
+    parser.add_argument(
+        "--limite-alerta",
+        type=float,
+        default=LIMITE_ALERTA_PERCENTUAL,
+        metavar="PCT",
+        help=f"Divergência (%%) que gera código de saída 3 (padrão: {LIMITE_ALERTA_PERCENTUAL})",
+    )
+    parser.add_argument(
+        "--limite-critico",
+        type=float,
+        default=LIMITE_CRITICO_PERCENTUAL,
+        metavar="PCT",
+        help=f"Divergência (%%) que gera código de saída 4 (padrão: {LIMITE_CRITICO_PERCENTUAL})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Número máximo de processos simultâneos (padrão: nº de CPUs; "
+        "1 para um só mês de uma só clínica)",
+    )
+    parser.add_argument(
+        "--base-path",
+        default=BASE_PATH_PADRAO,
+        help="Diretório com os arquivos de faturamento",
+    )
+    parser.add_argument(
+        "--clinicas",
+        nargs="+",
+        metavar="DIRETORIO",
+        help="Diretórios base de várias clínicas, conciliadas em paralelo "
+        "(o nome da clínica é o nome do diretório)",
+    )
+    parser.add_argument(
+        "--raiz-clinicas",
+        metavar="DIRETORIO",
+        help="Concilia cada subdiretório com arquivos de origem como uma clínica",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=CACHE_DIR_PADRAO,
+        help="Diretório dos artefatos persistentes (agregados, base de lançamentos)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["pandas", "sql"],
+        default="pandas",
+        help="pandas lê os arquivos de cada mês; sql consulta a base de lançamentos em "
+        "--cache-dir, ingerindo só os meses alterados (padrão: pandas)",
+    )
+    parser.add_argument(
+        "--sem-cache",
+        action="store_true",
+        help="Não grava agregados, índice de recebíveis nem resultados",
+    )
+    parser.add_argument(
+        "--recalcular",
+        action="store_true",
+        help="Refaz a conciliação a partir dos arquivos mesmo com resultados gravados em "
+        "--cache-dir para os mesmos arquivos e a mesma versão do analisador",
+    )
+    parser.add_argument(
+        "--metricas",
+        action="store_true",
+        help="Escreve no stderr o tempo, as linhas e os bytes lidos de cada etapa por mês",
+    )
+    parser.add_argument(
+        "--metricas-prometheus",
+        metavar="ARQUIVO",
+        help="Grava as métricas da execução (etapas, linhas, erros de validação, caches, "
+        "diferenças por par, pico de RSS) no formato do textfile collector do node-exporter (ARQUIVO.prom)",
+    )
+    parser.add_argument(
+        "--perfil-memoria",
+        metavar="ARQUIVO",
+        help="Mede a memória de cada etapa com tracemalloc (pico, retido, DataFrames e "
+        "locais de alocação) e grava o relatório em ARQUIVO; bem mais lento",
+    )
+    parser.add_argument(
+        "--perfil", "--profile",
+        nargs="?",
+        const=PREFIXO_PADRAO,
+        metavar="PREFIXO",
+        help="Executa sob o cProfile, grava PREFIXO.prof e PREFIXO.folded (pilhas "
+        f"colapsadas para flamegraph) e lista as funções mais lentas (padrão: {PREFIXO_PADRAO})",
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Exibe o log de processamento (stderr)",
+    )
+    return parser
+
+
+def resolver_meses(args: argparse.Namespace) -> List[str]:
+    """Monta a lista de meses a partir de --meses e/ou --de/--ate"""
+    meses: List[str] = list(args.meses or [])
+    if args.de or args.ate:
+        meses.extend(expandir_meses(args.de or args.ate, args.ate or args.de))
+
+    for mes_ano in meses:
+        if len(mes_ano) != 6 or not mes_ano.isdigit() or not 1 <= int(mes_ano[:2]) <= 12:
+            raise ValueError(f"Mês inválido: {mes_ano} (use MMAAAA)")
+
+    # Remove repetições preservando a ordem
+    return list(dict.fromkeys(meses))
+
+
+def resultado_para_dict(
+    resultado: ResultadoAnalise, limite_alerta: float, limite_critico: float
+) -> Dict:
+    """Converte um ResultadoAnalise em dict serializável"""
+    return {
+        "tipo_analise": resultado.tipo_analise,
+        "fonte_1": resultado.par_fontes[0],
+        "fonte_2": resultado.par_fontes[1],
+        "total_fonte_1": round(resultado.total_fonte_1, 2),
+        "total_fonte_2": round(resultado.total_fonte_2, 2),
+        "registros_fonte_1": resultado.registros_fonte_1,
+        "registros_fonte_2": resultado.registros_fonte_2,
+        "diferenca": round(resultado.diferenca, 2),
+        "percentual_diferenca": round(resultado.percentual_diferenca, 4),
+        "status": classificar_resultado(resultado, limite_alerta, limite_critico),
+    }
+
+
+def calcular_codigo_saida(
+    lote: ResultadoLote, limite_alerta: float, limite_critico: float
+) -> int:
+    """
+    Código de saída do lote: erro prevalece sobre divergência crítica e alerta
+
+    Mês sem nenhum registro em nenhuma fonte (pasta vazia ou inexistente)
+    conta como erro; fonte ausente ou zerada em um par, como crítico.
+    """
+    if lote.erros:
+        return SAIDA_ERRO
+    for resultados in lote.resultados.values():
+        if not any(r.registros_fonte_1 or r.registros_fonte_2 for r in resultados):
+            return SAIDA_ERRO
+    status = {
+        classificar_resultado(r, limite_alerta, limite_critico)
+        for resultados in lote.resultados.values()
+        for r in resultados
+    }
+    if "critico" in status:
+        return SAIDA_CRITICO
+    if "alerta" in status:
+        return SAIDA_ALERTA
+    return SAIDA_OK
+
+
+def calcular_codigo_saida_clinicas(
+    consolidado: ResultadoClinicas, limite_alerta: float, limite_critico: float
+) -> int:
+    """Pior código de saída entre as clínicas; clínica com erro conta como erro"""
+    if consolidado.erros:
+        return SAIDA_ERRO
+    codigos = {
+        calcular_codigo_saida(lote, limite_alerta, limite_critico)
+        for lote in consolidado.lotes.values()
+    }
+    for codigo in (SAIDA_ERRO, SAIDA_CRITICO, SAIDA_ALERTA):
+        if codigo in codigos:
+            return codigo
+    return SAIDA_OK
+
+
+def validacao_para_dict(resultados: List[ResultadoAnalise]) -> Dict[str, Dict[str, int]]:
+    """Erros de validação do mês por fonte e regra (fontes sem erro ficam vazias)"""
+    tabelas = {f: t for r in resultados for f, t in r.erros_validacao.items()}
+    return {fonte: tabela.contar("regra") for fonte, tabela in tabelas.items()}
+
+
+def _meses_para_dict(
+    lote: ResultadoLote, limite_alerta: float, limite_critico: float
+) -> Dict:
+    """Resultados, erros de validação e duração de cada mês do lote"""
+    return {
+        mes_ano: {
+            "duracao": round(lote.tempos.get(mes_ano, 0.0), 4),
+            "resultados": [
+                resultado_para_dict(r, limite_alerta, limite_critico) for r in resultados
+            ],
+            "validacao": validacao_para_dict(resultados),
+        }
+        for mes_ano, resultados in lote.resultados.items()
+    }
+
+
+def escrever_json(
+    lote: ResultadoLote, codigo: int, limite_alerta: float, limite_critico: float, saida: IO
+) -> None:
+    """Escreve o lote como um documento JSON"""
+    documento = {
+        "codigo_saida": codigo,
+        "limites": {"alerta": limite_alerta, "critico": limite_critico},
+        "duracao_total": round(lote.duracao_total, 4),
+        "meses": _meses_para_dict(lote, limite_alerta, limite_critico),
+        "erros": lote.erros,
+    }
+    json.dump(documento, saida, ensure_ascii=False, indent=2)
+    saida.write("\n")
+
+
+def escrever_json_clinicas(
+    consolidado: ResultadoClinicas,
+    codigo: int,
+    limite_alerta: float,
+    limite_critico: float,
+    saida: IO,
+) -> None:
+    """Escreve o relatório consolidado das clínicas como um documento JSON"""
+    documento = {
+        "codigo_saida": codigo,
+        "limites": {"alerta": limite_alerta, "critico": limite_critico},
+        "duracao_total": round(consolidado.duracao_total, 4),
+        "clinicas": {
+            nome: {
+                "codigo_saida": calcular_codigo_saida(lote, limite_alerta, limite_critico),
+                "duracao": round(consolidado.tempos.get(nome, 0.0), 4),
+                "meses": _meses_para_dict(lote, limite_alerta, limite_critico),
+                "erros": lote.erros,
+            }
+            for nome, lote in consolidado.lotes.items()
+        },
+        "erros": consolidado.erros,
+    }
+    json.dump(documento, saida, ensure_ascii=False, indent=2)
+    saida.write("\n")
+
+
+def _linhas_csv(
+    lote: ResultadoLote, limite_alerta: float, limite_critico: float
+) -> Iterator[Dict]:
+    """Uma linha por par e mês; meses com erro viram uma linha com a mensagem"""
+    for mes_ano, resultados in lote.resultados.items():
+        for resultado in resultados:
+            yield {
+                "mes_ano": mes_ano,
+                **resultado_para_dict(resultado, limite_alerta, limite_critico),
+                "erro": "",
+            }
+    for mes_ano, erro in lote.erros.items():
+        yield {"mes_ano": mes_ano, "status": "erro", "erro": erro}
+
+
+def escrever_csv(
+    lote: ResultadoLote, limite_alerta: float, limite_critico: float, saida: IO
+) -> None:
+    """Escreve uma linha por par e mês; meses com erro viram uma linha com a mensagem"""
+    writer = csv.DictWriter(saida, fieldnames=COLUNAS_CSV, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(_linhas_csv(lote, limite_alerta, limite_critico))
+
+
+def escrever_csv_clinicas(
+    consolidado: ResultadoClinicas, limite_alerta: float, limite_critico: float, saida: IO
+) -> None:
+    """Como escrever_csv, com a clínica na primeira coluna e uma linha por clínica com erro"""
+    writer = csv.DictWriter(saida, fieldnames=["clinica"] + COLUNAS_CSV, lineterminator="\n")
+    writer.writeheader()
+    for nome, lote in consolidado.lotes.items():
+        for linha in _linhas_csv(lote, limite_alerta, limite_critico):
+            writer.writerow({"clinica": nome, **linha})
+    for nome, erro in consolidado.erros.items():
+        writer.writerow({"clinica": nome, "status": "erro", "erro": erro})
+
+
+def escrever_metricas(lote: ResultadoLote, saida: IO, titulo: str = "") -> None:
+    """Tabela de etapas de cada mês do lote (meses sem métricas são omitidos)"""
+    for mes_ano, resultados in lote.resultados.items():
+        metricas = resultados[0].metricas if resultados else None
+        if metricas is None:
+            continue
+        saida.write(f"Etapas {titulo}{mes_ano[:2]}/{mes_ano[2:]}:\n")
+        saida.write("\n".join(formatar_metricas(metricas)) + "\n\n")
+
+
+def escrever_perfil_memoria(lote: ResultadoLote, saida: IO) -> None:
+    """Relatório de memória por etapa de cada mês do lote"""
+    for mes_ano, resultados in lote.resultados.items():
+        metricas = resultados[0].metricas if resultados else None
+        if metricas is None or not metricas.memoria:
+            continue
+        saida.write(f"Memória por etapa {mes_ano[:2]}/{mes_ano[2:]}:\n")
+        saida.write("\n".join(formatar_perfil_memoria(metricas)) + "\n\n")
+    for mes_ano, erro in lote.erros.items():
+        saida.write(f"{mes_ano[:2]}/{mes_ano[2:]}: erro - {erro}\n")
+
+
+def resolver_clinicas(args: argparse.Namespace) -> Dict[str, str]:
+    """Monta o dict nome -> diretório base a partir de --clinicas e --raiz-clinicas"""
+    clinicas: Dict[str, str] = {}
+    if args.raiz_clinicas:
+        if not os.path.isdir(args.raiz_clinicas):
+            raise ValueError(f"Diretório não encontrado: {args.raiz_clinicas}")
+        clinicas.update(descobrir_clinicas(args.raiz_clinicas))
+    for caminho in args.clinicas or []:
+        if not os.path.isdir(caminho):
+            raise ValueError(f"Diretório não encontrado: {caminho}")
+        nome = nome_clinica(caminho)
+        if nome in clinicas and os.path.abspath(clinicas[nome]) != os.path.abspath(caminho):
+            raise ValueError(f"Duas clínicas com o mesmo nome: {nome}")
+        clinicas[nome] = caminho
+    return clinicas
+
+
+@contextmanager
+def _abrir_saida(caminho: Optional[str]) -> Iterator[IO]:
+    """Arquivo de saída informado ou a saída padrão (que não é fechada)"""
+    if not caminho:
+        yield sys.stdout
+        return
+    with open(caminho, "w", encoding="utf-8", newline="") as saida:
+        yield saida
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando"""
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        meses = resolver_meses(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if not meses:
+        parser.error("informe --meses ou --de/--ate")
+    if args.limite_alerta > args.limite_critico:
+        parser.error("--limite-alerta deve ser menor ou igual a --limite-critico")
+    if args.fontes is not None and len(set(args.fontes)) < 2:
+        parser.error("--fontes precisa de ao menos duas fontes para formar um par")
+    if args.backend == "sql" and args.sem_cache:
+        parser.error("--backend sql precisa da base em --cache-dir (não use --sem-cache)")
+    varias_clinicas = bool(args.clinicas or args.raiz_clinicas)
+    if args.exportar:
+        extensao = os.path.splitext(args.exportar)[1].lower()
+        if extensao not in FORMATOS_EXPORTACAO:
+            parser.error(
+                f"--exportar: extensão não suportada ({', '.join(sorted(FORMATOS_EXPORTACAO))})"
+            )
+        if varias_clinicas:
+            parser.error("--exportar não está disponível com várias clínicas")
+    if args.perfil_memoria:
+        if varias_clinicas:
+            parser.error("--perfil-memoria não está disponível com várias clínicas")
+        if args.backend == "sql":
+            parser.error("--perfil-memoria não está disponível com --backend sql")
+    if args.perfil and args.workers not in (None, 1):
+        parser.error("--perfil mede só o próprio processo (use --workers 1)")
+    clinicas: Dict[str, str] = {}
+    if varias_clinicas:
+        if args.backend == "sql":
+            parser.error("--backend sql não está disponível com várias clínicas")
+        try:
+            clinicas = resolver_clinicas(args)
+        except ValueError as exc:
+            parser.error(str(exc))
+        if not clinicas:
+            parser.error("nenhuma clínica com arquivos de origem encontrada")
+
+    # Configura o log antes do controller, que só aplica seu padrão se nada foi configurado
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+
+    if not args.perfil:
+        return _executar(args, meses, clinicas)
+
+    # O cProfile só enxerga o próprio processo: sem pool de processos, e
+    # medindo a conciliação, não a leitura dos resultados gravados
+    args.workers = 1
+    args.recalcular = True
+    with perfilar(args.perfil) as perfil:
+        codigo = _executar(args, meses, clinicas)
+    sys.stderr.write(
+        f"Perfil de CPU ({perfil.duracao:.2f}s) gravado em {perfil.arquivo_prof} e "
+        f"{perfil.arquivo_pilhas}\n"
+    )
+    sys.stderr.write(perfil.funcoes_quentes())
+    return codigo
+
+
+def _executar(args: argparse.Namespace, meses: List[str], clinicas: Dict[str, str]) -> int:
+    """Executa a conciliação pedida na linha de comando e escreve as saídas"""
+    cache_dir = None if args.sem_cache else args.cache_dir
+
+    if clinicas:
+        # Um único mês de uma única clínica não compensa subir o pool de processos
+        workers = args.workers if args.workers is not None else (
+            1 if len(clinicas) == 1 and len(meses) == 1 else None
+        )
+        consolidado = ClinicasController(
+            clinicas, cache_dir=cache_dir, reutilizar_resultados=not args.recalcular
+        ).executar_conciliacao(meses, max_workers=workers, fontes=args.fontes)
+        codigo = calcular_codigo_saida_clinicas(
+            consolidado, args.limite_alerta, args.limite_critico
+        )
+        with _abrir_saida(args.saida) as saida:
+            if args.formato == "csv":
+                escrever_csv_clinicas(
+                    consolidado, args.limite_alerta, args.limite_critico, saida
+                )
+            else:
+                escrever_json_clinicas(
+                    consolidado, codigo, args.limite_alerta, args.limite_critico, saida
+                )
+        if args.metricas_prometheus:
+            escrever_metricas_prometheus(
+                args.metricas_prometheus, consolidado.lotes,
+                args.limite_alerta, args.limite_critico, codigo, consolidado.erros,
+            )
+        if args.metricas:
+            for nome, lote_clinica in consolidado.lotes.items():
+                escrever_metricas(lote_clinica, sys.stderr, f"{nome} ")
+        return codigo
+
+    # Um único mês não compensa subir o pool de processos
+    workers = args.workers if args.workers is not None else (1 if len(meses) == 1 else None)
+
+    controller = ConciliacaoController(
+        args.base_path, cache_dir=cache_dir, perfil_memoria=bool(args.perfil_memoria),
+        reutilizar_resultados=not args.recalcular,
+    )
+    if args.backend == "sql":
+        lote = controller.executar_conciliacao_lote_sql(meses, fontes=args.fontes)
+    else:
+        lote = controller.executar_conciliacao_lote(
+            meses, max_workers=workers, fontes=args.fontes
+        )
+    codigo = calcular_codigo_saida(lote, args.limite_alerta, args.limite_critico)
+
+    with _abrir_saida(args.saida) as saida:
+        if args.formato == "csv":
+            escrever_csv(lote, args.limite_alerta, args.limite_critico, saida)
+        else:
+            escrever_json(lote, codigo, args.limite_alerta, args.limite_critico, saida)
+    if args.metricas:
+        escrever_metricas(lote, sys.stderr)
+    if args.metricas_prometheus:
+        escrever_metricas_prometheus(
+            args.metricas_prometheus, {"": lote}, args.limite_alerta, args.limite_critico, codigo
+        )
+    if args.perfil_memoria:
+        with open(args.perfil_memoria, "w", encoding="utf-8") as relatorio:
+            escrever_perfil_memoria(lote, relatorio)
+
+    if args.exportar:
+        arquivos = exportar(
+            lote.resultados, args.exportar, args.limite_alerta, args.limite_critico
+        )
+        logging.getLogger(__name__).info("Exportado para %s", ", ".join(arquivos))
+
+    return codigo
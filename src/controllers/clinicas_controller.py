@@ -0,0 +1,165 @@
+"""
+Controller de várias clínicas - concilia diversos diretórios base em uma execução
+"""
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from src.controllers.conciliacao_controller import ConciliacaoController
+from src.models.analisador import ResultadoClinicas, ResultadoLote
+from src.models.data_loader import PADRAO_ARQUIVO_FONTE
+
+
+def nome_clinica(caminho: str) -> str:
+    """Nome da clínica a partir do diretório base (último componente do caminho)."""
+    return os.path.basename(os.path.normpath(caminho))
+
+
+def _pasta_cache_clinica(cache_dir: str, nome: str) -> str:
+    """Subdiretório de cache exclusivo da clínica."""
+    return os.path.join(cache_dir, 'clinicas', re.sub(r'[^\w.-]', '_', nome))
+
+
+def descobrir_clinicas(raiz: str) -> Dict[str, str]:
+    """
+    Lista as clínicas de um diretório raiz
+
+    Cada subdiretório imediato que contenha algum arquivo de origem
+    (em qualquer profundidade) é uma clínica.
+
+    Returns:
+        Dict nome -> diretório base, em ordem alfabética
+    """
+    clinicas = {}
+    for entrada in sorted(os.scandir(raiz), key=lambda e: e.name):
+        if not entrada.is_dir() or entrada.name.startswith('.'):
+            continue
+        for _root, _dirs, files in os.walk(entrada.path):
+            if any(PADRAO_ARQUIVO_FONTE.match(nome) for nome in files):
+                clinicas[entrada.name] = entrada.path
+                break
+    return clinicas
+
+
+def _conciliar_clinica_isolada(
+    base_path: str,
+    meses: List[str],
+    cache_dir: Optional[str] = None,
+    fontes: Optional[List[str]] = None,
+    reutilizar_resultados: bool = True,
+) -> Tuple[ResultadoLote, float]:
+    """Concilia os meses de uma clínica em um processo do pool."""
+    inicio = time.perf_counter()
+    controller = ConciliacaoController(
+        base_path, cache_dir=cache_dir, reutilizar_resultados=reutilizar_resultados
+    )
+    lote = controller.executar_conciliacao_lote(meses, max_workers=1, fontes=fontes)
+    return lote, time.perf_counter() - inicio
+
+
+class ClinicasController:
+    """
+    Orquestra a conciliação de várias clínicas (um diretório base por clínica)
+
+    Cada clínica é processada em um processo do pool, com seu próprio
+    controller e seu próprio subdiretório de cache; um erro em uma clínica
+    não interrompe as demais. Os meses de uma clínica são processados em
+    sequência dentro do seu processo, de modo que ``max_workers`` limita o
+    total de processos simultâneos.
+
+    Args:
+        clinicas: Dict nome -> diretório base da clínica
+        cache_dir: Diretório raiz dos artefatos persistentes (opcional)
+        reutilizar_resultados: Com False, refaz os meses com resultados gravados
+    """
+
+    def __init__(
+        self,
+        clinicas: Dict[str, str],
+        cache_dir: Optional[str] = None,
+        reutilizar_resultados: bool = True,
+    ):
+        self.clinicas = dict(clinicas)
+        self.cache_dir = cache_dir
+        self.reutilizar_resultados = reutilizar_resultados
+        self.logger = logging.getLogger(__name__)
+
+    def cache_dir_clinica(self, nome: str) -> Optional[str]:
+        """Diretório de cache usado pela clínica (None sem cache)."""
+        if self.cache_dir is None:
+            return None
+        return _pasta_cache_clinica(self.cache_dir, nome)
+
+    def executar_conciliacao(
+        self,
+        meses: List[str],
+        max_workers: Optional[int] = None,
+        fontes: Optional[List[str]] = None,
+    ) -> ResultadoClinicas:
+        """
+        Concilia os mesmos meses em todas as clínicas
+
+        Args:
+            meses: Lista de meses no formato "072025"
+            max_workers: Limite de processos simultâneos (padrão: nº de CPUs);
+                com 1 as clínicas são processadas no próprio processo
+            fontes: Restringe a conciliação a estas fontes (padrão: todas)
+
+        Returns:
+            ResultadoClinicas com o lote, o tempo e o erro de cada clínica
+        """
+        self.logger.info(
+            f"Iniciando conciliação de {len(meses)} mês(es) em {len(self.clinicas)} clínica(s)"
+        )
+        consolidado = ResultadoClinicas()
+        inicio = time.perf_counter()
+
+        if max_workers == 1:
+            for nome, base_path in self.clinicas.items():
+                try:
+                    lote, duracao = _conciliar_clinica_isolada(
+                        base_path, meses, self.cache_dir_clinica(nome), fontes,
+                        self.reutilizar_resultados,
+                    )
+                    consolidado.lotes[nome] = lote
+                    consolidado.tempos[nome] = duracao
+                except Exception as exc:  # pylint: disable=broad-except
+                    self.logger.error("Erro na clínica %s: %s", nome, exc)
+                    consolidado.erros[nome] = str(exc)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futuros = {
+                    executor.submit(
+                        _conciliar_clinica_isolada,
+                        base_path, meses, self.cache_dir_clinica(nome), fontes,
+                        self.reutilizar_resultados,
+                    ): nome
+                    for nome, base_path in self.clinicas.items()
+                }
+                for futuro in as_completed(futuros):
+                    nome = futuros[futuro]
+                    try:
+                        lote, duracao = futuro.result()
+                        consolidado.lotes[nome] = lote
+                        consolidado.tempos[nome] = duracao
+                    except Exception as exc:  # pylint: disable=broad-except
+                        self.logger.error("Erro na clínica %s: %s", nome, exc)
+                        consolidado.erros[nome] = str(exc)
+
+        # Mantém a ordem das clínicas, independente da ordem de término
+        consolidado.lotes = {
+            n: consolidado.lotes[n] for n in self.clinicas if n in consolidado.lotes
+        }
+        consolidado.tempos = {
+            n: consolidado.tempos[n] for n in self.clinicas if n in consolidado.tempos
+        }
+        consolidado.duracao_total = time.perf_counter() - inicio
+
+        self.logger.info(
+            f"Conciliação de {len(self.clinicas)} clínica(s) concluída em "
+            f"{consolidado.duracao_total:.2f}s ({len(consolidado.erros)} com erro)"
+        )
+        return consolidado
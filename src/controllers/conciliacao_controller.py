@@ -2,21 +2,135 @@
 Controller Principal - Coordena a lógica de negócio
 """
 import logging
-from typing import Dict, List
+import os
+import threading
+import time
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 
-from src.models.analisador import Analisador, ResultadoAnalise
+from src.models.agregados import AgregadosStore, periodo_mes
+from src.models.analisador import Analisador, ResultadoAnalise, ResultadoLote
+from src.models.analisador_sql import AnalisadorSQL
+from src.models.cache_resultados import CacheResultados
+from src.models.cache_sessao import (
+    LIMITE_MEMORIA_CACHE_PADRAO,
+    CacheSessao,
+    tamanho_dados,
+)
 from src.models.data_loader import DataLoader
+from src.models.estatisticas import calcular_estatisticas, contar_nulos
+from src.models.indice_recebiveis import IndiceRecebiveis
+from src.models.instrumentacao import coletar, etapa, registrar_cache
+from src.models.taxas import AnalisadorTaxas, ResultadoTaxas, carregar_tabela_taxas
+
+
+def expandir_meses(inicio: str, fim: str) -> List[str]:
+    """
+    Expande um intervalo de meses no formato MMAAAA (inclusivo)
+
+    Args:
+        inicio: Primeiro mês, ex: "012025"
+        fim: Último mês, ex: "122025"
+
+    Returns:
+        Lista de meses em ordem cronológica
+    """
+    mes, ano = int(inicio[:2]), int(inicio[2:])
+    mes_fim, ano_fim = int(fim[:2]), int(fim[2:])
+    if not 1 <= mes <= 12 or not 1 <= mes_fim <= 12:
+        raise ValueError(f"Intervalo de meses inválido: {inicio} - {fim}")
+
+    meses = []
+    while (ano, mes) <= (ano_fim, mes_fim):
+        meses.append(f"{mes:02d}{ano:04d}")
+        mes += 1
+        if mes > 12:
+            mes, ano = 1, ano + 1
+    return meses
+
+
+def _conciliar_mes_isolado(
+    base_path: str,
+    mes_ano: str,
+    cache_dir: Optional[str] = None,
+    fontes: Optional[List[str]] = None,
+    perfil_memoria: bool = False,
+    reutilizar_resultados: bool = True,
+) -> Tuple[List[ResultadoAnalise], float]:
+    """Executa a conciliação de um mês em um processo do pool."""
+    inicio = time.perf_counter()
+    controller = ConciliacaoController(
+        base_path, cache_dir=cache_dir, perfil_memoria=perfil_memoria,
+        reutilizar_resultados=reutilizar_resultados,
+    )
+    resultados = controller.executar_conciliacao(mes_ano, fontes=fontes)
+    return resultados, time.perf_counter() - inicio
 
 
 class ConciliacaoController:
     """Controller principal para orquestrar a conciliação"""
     
-    def __init__(self, base_path: str):
+    def __init__(
+        self,
+        base_path: str,
+        cache_dir: Optional[str] = None,
+        prefetch: bool = False,
+        limite_cache_bytes: int = LIMITE_MEMORIA_CACHE_PADRAO,
+        perfil_memoria: bool = False,
+        reutilizar_resultados: bool = True,
+        tabela_taxas: Optional[str] = None,
+    ):
         self.data_loader = DataLoader(base_path)
         self.analisador = Analisador()
+        # Sem arquivo de taxas (JSON, ver carregar_tabela_taxas) vale TABELA_TAXAS_PADRAO
+        self.analisador_taxas = AnalisadorTaxas(
+            carregar_tabela_taxas(tabela_taxas) if tabela_taxas else None
+        )
         self.logger = logging.getLogger(__name__)
+
+        # Artefatos persistentes (agregados, índices) ficam em cache_dir, se informado
+        self.cache_dir = cache_dir
+        self.agregados: Optional[AgregadosStore] = None
+        self.indice_recebiveis: Optional[IndiceRecebiveis] = None
+        self.analisador_sql: Optional[AnalisadorSQL] = None
+        self.cache_resultados: Optional[CacheResultados] = None
+        if cache_dir:
+            self.agregados = AgregadosStore(os.path.join(cache_dir, 'agregados.sqlite3'))
+            self.indice_recebiveis = IndiceRecebiveis(
+                os.path.join(cache_dir, 'recebiveis.sqlite3')
+            )
+            self.analisador_sql = AnalisadorSQL(
+                os.path.join(cache_dir, 'lancamentos.sqlite3'), self.analisador
+            )
+            self.cache_resultados = CacheResultados(
+                os.path.join(cache_dir, 'resultados.sqlite3')
+            )
+
+        # Meses já carregados na sessão; com prefetch, os meses vizinhos são
+        # carregados em segundo plano após cada conciliação
+        self.cache_sessao = CacheSessao(limite_cache_bytes)
+        self.prefetch = prefetch
+        self._executor_prefetch: Optional[ThreadPoolExecutor] = None
+        self._prefetch_futuros: Dict[str, Future] = {}
+        self._prefetch_cancelado = threading.Event()
+
+        # Mede a memória de cada etapa (tracemalloc); caro, só para diagnóstico
+        self.perfil_memoria = perfil_memoria
+
+        # Com False (ou medindo memória), os resultados gravados são ignorados
+        # e o mês é recalculado; o resultado novo é gravado de qualquer forma
+        self.reutilizar_resultados = reutilizar_resultados and not perfil_memoria
+
+        # (mês, fonte) -> (impressão digital do arquivo da fonte, detalhes)
+        self._cache_detalhes: Dict[Tuple[str, str], Tuple[str, Dict]] = {}
+        self._lock_detalhes = threading.Lock()
         
         # Configuração do logging
         logging.basicConfig(
@@ -24,31 +138,509 @@ class ConciliacaoController:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
 
-    def executar_conciliacao(self, mes_ano: str) -> List[ResultadoAnalise]:
+    def executar_conciliacao(
+        self, mes_ano: str, fontes: Optional[List[str]] = None
+    ) -> List[ResultadoAnalise]:
         """
         Executa conciliação completa para um mês
         
         Args:
             mes_ano: String no formato "072025"
+            fontes: Restringe a conciliação aos pares formados por estas fontes
+                (padrão: todas)
             
         Returns:
             Lista com resultados de análise
         """
         self.logger.info(f"Iniciando conciliação para {mes_ano}")
-        
+
+        with coletar(mes_ano, memoria=self.perfil_memoria) as metricas:
+            # 1. Reaproveita os resultados gravados, se arquivos e analisador não mudaram
+            gravados = None
+            if self.cache_resultados is not None:
+                # Antes da leitura: um arquivo alterado durante ela invalida a gravação
+                fingerprint = self.data_loader.fingerprint_mes(mes_ano)
+                if self.reutilizar_resultados:
+                    with etapa('ler_resultados_gravados') as medida:
+                        gravados = self.cache_resultados.obter(
+                            mes_ano, fingerprint, self.analisador.versao, fontes
+                        )
+                        medida.linhas_saida = len(gravados or [])
+
+            if gravados is not None:
+                resultados = gravados
+            else:
+                resultados = self._conciliar_arquivos(mes_ano, fontes)
+                if self.cache_resultados is not None:
+                    with etapa('gravar_resultados'):
+                        self.cache_resultados.guardar(
+                            mes_ano, fingerprint, self.analisador.versao, resultados, fontes
+                        )
+
+            # Adianta o carregamento dos meses que o operador deve abrir em seguida
+            if fontes is None and self.prefetch:
+                self.prefetch_meses_vizinhos(mes_ano)
+
+        for resultado in resultados:
+            resultado.metricas = metricas
+        self.logger.info(
+            f"Conciliação concluída. {len(resultados)} análises realizadas "
+            f"em {metricas.duracao_total:.2f}s."
+        )
+
+        return resultados
+
+    def _conciliar_arquivos(
+        self, mes_ano: str, fontes: Optional[List[str]] = None
+    ) -> List[ResultadoAnalise]:
+        """Carrega os arquivos do mês e analisa os pares (executar_conciliacao sem cache)"""
         # 1. Carrega dados
-        dados = self.data_loader.carregar_dados_mes(mes_ano)
-        
+        with etapa('carregar_dados') as medida:
+            if fontes is None:
+                dados = self.carregar_dados(mes_ano)
+            else:
+                dados = self.data_loader.carregar_dados_mes(mes_ano, fontes=fontes)
+            medida.linhas_saida = sum(len(df) for df in dados.values())
+
         # 2. Verifica se os dados foram carregados
         self._verificar_dados_carregados(dados)
-        
+
         # 3. Executa análises
         resultados = self.analisador.analisar_todos_pares(dados)
-        
-        self.logger.info(f"Conciliação concluída. {len(resultados)} análises realizadas.")
-        
+
+        if fontes is None:
+            # 4. Materializa agregados e índice de recebíveis, se os arquivos mudaram
+            with etapa('atualizar_artefatos'):
+                self.atualizar_artefatos_mes(mes_ano, dados)
+        else:
+            # Pares com fontes não carregadas comparariam contra zero
+            resultados = [r for r in resultados if set(r.par_fontes) <= set(fontes)]
         return resultados
 
+    def carregar_dados(self, mes_ano: str) -> Dict[str, pd.DataFrame]:
+        """
+        Carrega os dados do mês, reaproveitando o cache da sessão
+
+        Se o mês estiver sendo pré-carregado, aguarda o término em vez de
+        ler os arquivos de novo. Os DataFrames retornados são compartilhados
+        com o cache e não devem ser alterados.
+
+        Args:
+            mes_ano: String no formato "072025"
+
+        Returns:
+            Dict com DataFrames de cada fonte
+        """
+        futuro = self._prefetch_futuros.get(mes_ano)
+        if futuro is not None and not futuro.cancelled():
+            try:
+                futuro.result()
+            except Exception:  # pylint: disable=broad-except
+                pass  # Falha no pré-carregamento: carrega normalmente abaixo
+
+        fingerprint = self.data_loader.fingerprint_mes(mes_ano)
+        dados = self.cache_sessao.obter(mes_ano, fingerprint)
+        if dados is None:
+            dados = self.data_loader.carregar_dados_mes(mes_ano)
+            self.cache_sessao.guardar(mes_ano, fingerprint, dados)
+        return dados
+
+    def prefetch_meses_vizinhos(self, mes_ano: str) -> List[str]:
+        """
+        Agenda o carregamento, em segundo plano, dos meses vizinhos existentes
+
+        Considera o mês anterior e o seguinte entre os disponíveis no
+        diretório base. Um novo agendamento cancela o anterior; meses que
+        não cabem no cache sem remover outros são descartados.
+
+        Args:
+            mes_ano: Mês recém-conciliado, no formato "072025"
+
+        Returns:
+            Lista dos meses agendados
+        """
+        self.cancelar_prefetch()
+        candidatos = [
+            m for m in self._meses_vizinhos(mes_ano)
+            if not self.cache_sessao.contem(m, self.data_loader.fingerprint_mes(m))
+        ]
+        if not candidatos:
+            return []
+
+        if self._executor_prefetch is None:
+            self._executor_prefetch = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='prefetch'
+            )
+        cancelado = threading.Event()
+        self._prefetch_cancelado = cancelado
+        for candidato in candidatos:
+            self._prefetch_futuros[candidato] = self._executor_prefetch.submit(
+                self._prefetch_mes, candidato, cancelado
+            )
+        self.logger.info("Pré-carregando %s", ", ".join(candidatos))
+        return candidatos
+
+    def cancelar_prefetch(self) -> None:
+        """Cancela os pré-carregamentos pendentes e descarta os em andamento"""
+        self._prefetch_cancelado.set()
+        for futuro in self._prefetch_futuros.values():
+            futuro.cancel()
+        self._prefetch_futuros = {}
+
+    def encerrar(self) -> None:
+        """Cancela o pré-carregamento e libera a thread de segundo plano"""
+        self.cancelar_prefetch()
+        if self._executor_prefetch is not None:
+            self._executor_prefetch.shutdown(wait=False)
+            self._executor_prefetch = None
+
+    def _prefetch_mes(self, mes_ano: str, cancelado: threading.Event) -> bool:
+        """Carrega um mês para o cache da sessão (executa na thread de prefetch)"""
+        if cancelado.is_set():
+            return False
+        fingerprint = self.data_loader.fingerprint_mes(mes_ano)
+        dados = self.data_loader.carregar_dados_mes(mes_ano)
+        # A leitura em andamento não é interrompida; o resultado é descartado
+        if cancelado.is_set():
+            return False
+        if not self.cache_sessao.cabe(tamanho_dados(dados)):
+            self.logger.info("Pré-carregamento de %s descartado: limite de memória", mes_ano)
+            return False
+        return self.cache_sessao.guardar(mes_ano, fingerprint, dados)
+
+    def _meses_vizinhos(self, mes_ano: str) -> List[str]:
+        """Mês disponível imediatamente anterior e seguinte a ``mes_ano``"""
+        periodo = periodo_mes(mes_ano)
+        disponiveis = self.data_loader.listar_meses_disponiveis()
+        anteriores = [m for m in disponiveis if periodo_mes(m) < periodo]
+        seguintes = [m for m in disponiveis if periodo_mes(m) > periodo]
+        vizinhos = []
+        if anteriores:
+            vizinhos.append(max(anteriores, key=periodo_mes))
+        if seguintes:
+            vizinhos.append(min(seguintes, key=periodo_mes))
+        return vizinhos
+
+    def executar_conciliacao_lote(
+        self,
+        meses: List[str],
+        max_workers: Optional[int] = None,
+        fontes: Optional[List[str]] = None,
+    ) -> ResultadoLote:
+        """
+        Executa a conciliação de vários meses em paralelo
+
+        Cada mês é carregado e analisado em um processo separado; com
+        ``max_workers=1`` os meses são processados no próprio processo.
+
+        Args:
+            meses: Lista de meses no formato "072025"
+            max_workers: Limite de processos simultâneos (padrão: nº de CPUs)
+            fontes: Restringe a conciliação a estas fontes (padrão: todas)
+
+        Returns:
+            ResultadoLote com resultados, tempos e erros por mês
+        """
+        self.logger.info(f"Iniciando conciliação em lote para {len(meses)} meses")
+        lote = ResultadoLote()
+        inicio = time.perf_counter()
+        base_path = self.data_loader.base_path
+
+        if max_workers == 1:
+            for mes_ano in meses:
+                try:
+                    resultados, duracao = _conciliar_mes_isolado(
+                        base_path, mes_ano, self.cache_dir, fontes, self.perfil_memoria,
+                        self.reutilizar_resultados,
+                    )
+                    lote.resultados[mes_ano] = resultados
+                    lote.tempos[mes_ano] = duracao
+                except Exception as exc:  # pylint: disable=broad-except
+                    self.logger.error("Erro na conciliação de %s: %s", mes_ano, exc)
+                    lote.erros[mes_ano] = str(exc)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futuros = {
+                    executor.submit(
+                        _conciliar_mes_isolado, base_path, mes_ano, self.cache_dir, fontes,
+                        self.perfil_memoria, self.reutilizar_resultados,
+                    ): mes_ano
+                    for mes_ano in meses
+                }
+                for futuro in as_completed(futuros):
+                    mes_ano = futuros[futuro]
+                    try:
+                        resultados, duracao = futuro.result()
+                        lote.resultados[mes_ano] = resultados
+                        lote.tempos[mes_ano] = duracao
+                    except Exception as exc:  # pylint: disable=broad-except
+                        self.logger.error("Erro na conciliação de %s: %s", mes_ano, exc)
+                        lote.erros[mes_ano] = str(exc)
+
+        # Mantém a ordem cronológica solicitada, independente da ordem de término
+        lote.resultados = {m: lote.resultados[m] for m in meses if m in lote.resultados}
+        lote.tempos = {m: lote.tempos[m] for m in meses if m in lote.tempos}
+        lote.duracao_total = time.perf_counter() - inicio
+
+        self.logger.info(
+            f"Conciliação em lote concluída em {lote.duracao_total:.2f}s "
+            f"({len(lote.erros)} erro(s))"
+        )
+        return lote
+
+    def ingerir_lancamentos(self, meses: Optional[List[str]] = None) -> List[str]:
+        """
+        Grava na base SQL os lançamentos dos meses cujos arquivos mudaram
+
+        Args:
+            meses: Meses a considerar (padrão: todos os meses do diretório base)
+
+        Returns:
+            Lista dos meses efetivamente ingeridos
+        """
+        if self.analisador_sql is None:
+            raise RuntimeError("Base SQL de lançamentos não configurada (cache_dir)")
+
+        if meses is None:
+            meses = self.data_loader.listar_meses_disponiveis()
+
+        ingeridos = []
+        for mes_ano in meses:
+            fingerprint = self.data_loader.fingerprint_mes(mes_ano)
+            atualizar = self.analisador_sql.precisa_atualizar(mes_ano, fingerprint)
+            registrar_cache('lancamentos_sql', not atualizar)
+            if not atualizar:
+                continue
+            dados = self.carregar_dados(mes_ano)
+            self._verificar_dados_carregados(dados)
+            self.analisador_sql.ingerir_mes(mes_ano, fingerprint, dados)
+            ingeridos.append(mes_ano)
+        return ingeridos
+
+    def executar_conciliacao_sql(
+        self, inicio: str, fim: Optional[str] = None, fontes: Optional[List[str]] = None
+    ) -> List[ResultadoAnalise]:
+        """
+        Conciliação por consultas à base SQL, para um mês ou intervalo
+
+        Os meses do intervalo presentes no diretório base são ingeridos antes,
+        se seus arquivos mudaram; os resultados são os mesmos de
+        executar_conciliacao sobre os mesmos dados.
+
+        Args:
+            inicio: Primeiro mês, no formato "072025"
+            fim: Último mês (padrão: o próprio ``inicio``)
+            fontes: Restringe a conciliação aos pares formados por estas fontes
+
+        Returns:
+            Lista com resultados de análise
+        """
+        if self.analisador_sql is None:
+            raise RuntimeError("Base SQL de lançamentos não configurada (cache_dir)")
+
+        meses = expandir_meses(inicio, fim or inicio)
+        disponiveis = set(self.data_loader.listar_meses_disponiveis())
+        with coletar(inicio if fim in (None, inicio) else f"{inicio}-{fim}") as metricas:
+            with etapa('ingerir_lancamentos') as medida:
+                medida.linhas_saida = len(
+                    self.ingerir_lancamentos([m for m in meses if m in disponiveis])
+                )
+            with etapa('analisar_pares_sql'):
+                resultados = self.analisador_sql.analisar_todos_pares(inicio, fim)
+        if fontes is not None:
+            resultados = [r for r in resultados if set(r.par_fontes) <= set(fontes)]
+        for resultado in resultados:
+            resultado.metricas = metricas
+        return resultados
+
+    def executar_conciliacao_lote_sql(
+        self, meses: List[str], fontes: Optional[List[str]] = None
+    ) -> ResultadoLote:
+        """
+        Conciliação de vários meses pela base SQL
+
+        Só os meses alterados são lidos dos arquivos; os demais são
+        respondidos diretamente pelas consultas.
+
+        Returns:
+            ResultadoLote com resultados, tempos e erros por mês
+        """
+        lote = ResultadoLote()
+        inicio = time.perf_counter()
+        for mes_ano in meses:
+            inicio_mes = time.perf_counter()
+            try:
+                lote.resultados[mes_ano] = self.executar_conciliacao_sql(mes_ano, fontes=fontes)
+                lote.tempos[mes_ano] = time.perf_counter() - inicio_mes
+            except Exception as exc:  # pylint: disable=broad-except
+                self.logger.error("Erro na conciliação de %s: %s", mes_ano, exc)
+                lote.erros[mes_ano] = str(exc)
+        lote.duracao_total = time.perf_counter() - inicio
+        return lote
+
+    def analisar_taxas(self, mes_ano: str) -> ResultadoTaxas:
+        """
+        Confere as taxas de adquirência cobradas no mês contra a tabela contratada
+
+        Args:
+            mes_ano: String no formato "072025"
+
+        Returns:
+            ResultadoTaxas com resumo por bandeira/parcelas e cobranças fora do contrato
+        """
+        dados = self.carregar_dados(mes_ano)
+        return self.analisador_taxas.analisar(dados)
+
+    def atualizar_agregados(self, meses: List[str]) -> List[str]:
+        """
+        Reconstrói os agregados apenas dos meses cujos arquivos mudaram
+
+        Args:
+            meses: Lista de meses no formato "072025"
+
+        Returns:
+            Lista dos meses efetivamente reprocessados
+        """
+        if self.agregados is None:
+            raise RuntimeError("Armazenamento de agregados não configurado (cache_dir)")
+
+        atualizados = []
+        for mes_ano in meses:
+            fingerprint = self.data_loader.fingerprint_mes(mes_ano)
+            versao = self.analisador.versao
+            if not self.agregados.precisa_atualizar(mes_ano, fingerprint, versao):
+                continue
+            dados = self.data_loader.carregar_dados_mes(mes_ano)
+            self.agregados.gravar_mes(
+                mes_ano, fingerprint, versao, self.analisador.agregar_totais(dados)
+            )
+            atualizados.append(mes_ano)
+        return atualizados
+
+    def obter_visao_acumulada(
+        self, mes_ano: str, janela_meses: Optional[int] = None
+    ) -> Tuple[List[ResultadoAnalise], List[str]]:
+        """
+        Analisa os pares sobre totais acumulados
+
+        Antes de somar, os agregados dos meses da janela com arquivos de
+        origem são atualizados por ``atualizar_agregados``: só os meses nunca
+        conciliados ou com arquivos alterados são relidos.
+
+        Args:
+            mes_ano: Último mês da visão, no formato "072025"
+            janela_meses: Tamanho da janela móvel; None para o ano até a data
+
+        Returns:
+            Tupla (resultados por par, meses com agregados na janela)
+        """
+        if self.agregados is None:
+            raise RuntimeError("Armazenamento de agregados não configurado (cache_dir)")
+
+        if janela_meses is None:
+            inicio = f"01{mes_ano[2:]}"
+        else:
+            mes, ano = int(mes_ano[:2]), int(mes_ano[2:])
+            indice = ano * 12 + (mes - 1) - (janela_meses - 1)
+            inicio = f"{indice % 12 + 1:02d}{indice // 12:04d}"
+
+        com_arquivos = set(self.data_loader.listar_meses_disponiveis())
+        self.atualizar_agregados(
+            [m for m in expandir_meses(inicio, mes_ano) if m in com_arquivos]
+        )
+
+        totais = self.agregados.totais_periodo(inicio, mes_ano)
+        totais_faturamento = {k: v for k, v in totais.items() if k.startswith('faturamento')}
+        totais_pagamento = {k: v for k, v in totais.items() if k.startswith('pagamento')}
+
+        resultados = self.analisador.analisar_totais(totais_faturamento, totais_pagamento)
+        return resultados, self.agregados.meses_disponiveis(inicio, mes_ano)
+
+    def atualizar_indice_recebiveis(self, meses: Optional[List[str]] = None) -> List[str]:
+        """
+        Indexa vendas e recebíveis C6 dos meses cujos arquivos mudaram
+
+        Args:
+            meses: Meses a considerar (padrão: todos os meses do diretório base)
+
+        Returns:
+            Lista dos meses efetivamente reindexados
+        """
+        if self.indice_recebiveis is None:
+            raise RuntimeError("Índice de recebíveis não configurado (cache_dir)")
+
+        if meses is None:
+            meses = self.data_loader.listar_meses_disponiveis()
+
+        atualizados = []
+        for mes_ano in meses:
+            fingerprint = self.data_loader.fingerprint_mes(mes_ano)
+            versao = self.analisador.versao
+            if not self.indice_recebiveis.precisa_atualizar(mes_ano, fingerprint, versao):
+                continue
+            dados = self.data_loader.carregar_dados_mes(mes_ano)
+            self.indice_recebiveis.indexar_mes(
+                mes_ano, fingerprint, versao,
+                dados.get('faturamento_c6', pd.DataFrame()),
+                dados.get('pagamento_c6', pd.DataFrame()),
+            )
+            atualizados.append(mes_ano)
+        return atualizados
+
+    def vincular_recebiveis(self, mes_ano: str) -> pd.DataFrame:
+        """
+        Vincula os recebíveis C6 de um mês às vendas de origem
+
+        As vendas podem estar em qualquer mês do diretório base (ex: parcelas
+        de vendas de abril recebidas em julho); o índice é atualizado apenas
+        para os meses alterados e a busca é feita por consulta indexada.
+
+        Args:
+            mes_ano: Mês dos recebíveis, no formato "072025"
+
+        Returns:
+            DataFrame de IndiceRecebiveis.vincular
+        """
+        if self.indice_recebiveis is None:
+            raise RuntimeError("Índice de recebíveis não configurado (cache_dir)")
+
+        self.atualizar_indice_recebiveis()
+        pagamento = self.carregar_dados(mes_ano).get('pagamento_c6')
+        if pagamento is None:
+            pagamento = pd.DataFrame()
+        return self.indice_recebiveis.vincular(pagamento)
+
+    def atualizar_artefatos_mes(self, mes_ano: str, dados: Dict[str, pd.DataFrame]) -> None:
+        """Grava agregados e índice de recebíveis quando a impressão digital mudou"""
+        if self.agregados is None and self.indice_recebiveis is None:
+            return
+        try:
+            fingerprint = self.data_loader.fingerprint_mes(mes_ano)
+            if self.agregados is not None:
+                atualizar = self.agregados.precisa_atualizar(
+                    mes_ano, fingerprint, self.analisador.versao
+                )
+                registrar_cache('agregados', not atualizar)
+                if atualizar:
+                    self.agregados.gravar_mes(
+                        mes_ano, fingerprint, self.analisador.versao,
+                        self.analisador.agregar_totais(dados),
+                    )
+            if self.indice_recebiveis is not None:
+                atualizar = self.indice_recebiveis.precisa_atualizar(
+                    mes_ano, fingerprint, self.analisador.versao
+                )
+                registrar_cache('indice_recebiveis', not atualizar)
+                if atualizar:
+                    self.indice_recebiveis.indexar_mes(
+                        mes_ano, fingerprint, self.analisador.versao,
+                        dados.get('faturamento_c6', pd.DataFrame()),
+                        dados.get('pagamento_c6', pd.DataFrame()),
+                    )
+        except Exception as exc:  # pylint: disable=broad-except
+            # Os artefatos são um subproduto: falhas não invalidam a conciliação
+            self.logger.error("Erro ao gravar artefatos de %s: %s", mes_ano, exc)
+
     def obter_resumo_dados(self, mes_ano: str) -> Dict[str, Dict]:
         """
         Obtém resumo dos dados carregados
@@ -59,12 +651,13 @@ class ConciliacaoController:
         Returns:
             Dict com informações resumidas
         """
-        dados = self.data_loader.carregar_dados_mes(mes_ano)
+        dados = self.carregar_dados(mes_ano)
         
         resumo = {}
         for fonte, df in dados.items():
             resumo[fonte] = {
                 'registros': len(df),
+                'descartados': df.attrs.get('linhas_descartadas', 0),
                 'colunas': list(df.columns) if not df.empty else [],
                 'amostra': df.head(3).to_dict('records') if not df.empty else []
             }
@@ -78,11 +671,29 @@ class ConciliacaoController:
                 self.logger.warning(f"Nenhum dado carregado para {fonte}")
             else:
                 self.logger.info(f"{fonte}: {len(df)} registros carregados")
+            descartadas = df.attrs.get('linhas_descartadas', 0)
+            if descartadas:
+                self.logger.info(f"{fonte}: {descartadas} linhas descartadas na leitura")
+
+    def iterar_registros_fonte(self, mes_ano: str, fonte: str) -> Iterator[Tuple]:
+        """
+        Itera as linhas de uma fonte sob demanda, na ordem de suas colunas
+
+        Nenhuma linha é convertida antes de ser consumida, então exibir só
+        a primeira página de um mês grande não materializa o restante.
+        """
+        df = self.carregar_dados(mes_ano).get(fonte)
+        if df is None:
+            return iter(())
+        return df.itertuples(index=False, name=None)
 
     def obter_detalhes_fonte(self, mes_ano: str, fonte: str) -> Dict:
         """
         Obtém detalhes específicos de uma fonte
         
+        As estatísticas são calculadas sobre a fonte normalizada (valores em
+        R$ já convertidos) e ficam em cache até o arquivo da fonte mudar.
+
         Args:
             mes_ano: String no formato "072025"
             fonte: Nome da fonte (ex: 'faturamento_c6', 'pagamento_gds')
@@ -90,7 +701,19 @@ class ConciliacaoController:
         Returns:
             Dict com detalhes da fonte
         """
-        dados = self.data_loader.carregar_dados_mes(mes_ano)
+        fingerprint = self.data_loader.fingerprint_fonte(mes_ano, fonte)
+        with self._lock_detalhes:
+            em_cache = self._cache_detalhes.get((mes_ano, fonte))
+        if em_cache is not None and em_cache[0] == fingerprint:
+            return em_cache[1]
+
+        detalhes = self._calcular_detalhes_fonte(mes_ano, fonte)
+        with self._lock_detalhes:
+            self._cache_detalhes[(mes_ano, fonte)] = (fingerprint, detalhes)
+        return detalhes
+
+    def _calcular_detalhes_fonte(self, mes_ano: str, fonte: str) -> Dict:
+        dados = self.carregar_dados(mes_ano)
         
         if fonte not in dados:
             return {'erro': f'Fonte {fonte} não encontrada'}
@@ -100,53 +723,23 @@ class ConciliacaoController:
         if df.empty:
             return {'erro': f'Nenhum dado encontrado para {fonte}'}
         
-        # Calcula estatísticas básicas para colunas numéricas
-        estatisticas = {}
-        for coluna in df.columns:
-            if df[coluna].dtype in ['int64', 'float64']:
-                estatisticas[coluna] = {
-                    'total': float(df[coluna].sum()),
-                    'media': float(df[coluna].mean()),
-                    'minimo': float(df[coluna].min()),
-                    'maximo': float(df[coluna].max())
-                }
-        
-        # Calcula total principal baseado no tipo de fonte
-        total_principal = 0.0
-        tipo_total = ""
+        estatisticas = calcular_estatisticas(self.analisador.padronizar_fonte(fonte, df))
         
+        # Total principal conforme o tipo de fonte
         if 'faturamento' in fonte:
-            # Para faturamento, busca coluna de valor faturado
-            coluna_valor = None
-            if 'valor_faturado' in df.columns:
-                coluna_valor = 'valor_faturado'
-            elif 'valor_venda' in df.columns:
-                coluna_valor = 'valor_venda'
-            elif 'valor' in df.columns:
-                coluna_valor = 'valor'
-            
-            if coluna_valor and df[coluna_valor].dtype in ['int64', 'float64']:
-                total_principal = float(df[coluna_valor].sum())
+            candidatas = ['valor_faturado', 'valor_venda', 'valor']
             tipo_total = "Valor Faturado"
-            
-        elif 'pagamento' in fonte:
-            # Para pagamento, busca coluna de valor recebível
-            coluna_valor = None
-            if 'valor_recebivel' in df.columns:
-                coluna_valor = 'valor_recebivel'
-            elif 'valor_parcela' in df.columns:
-                coluna_valor = 'valor_parcela'
-            elif 'valor' in df.columns:
-                coluna_valor = 'valor'
-            
-            if coluna_valor and df[coluna_valor].dtype in ['int64', 'float64']:
-                total_principal = float(df[coluna_valor].sum())
+        else:
+            candidatas = ['valor_recebivel', 'valor_parcela', 'valor']
             tipo_total = "Valor Recebível"
+        coluna_valor = next((c for c in candidatas if c in estatisticas), None)
+        total_principal = estatisticas[coluna_valor]['total'] if coluna_valor else 0.0
         
         return {
             'registros': len(df),
             'colunas': list(df.columns),
             'estatisticas': estatisticas,
+            'nulos': contar_nulos(df),
             'total_principal': total_principal,
             'tipo_total': tipo_total,
             'primeiros_registros': df.head(5).to_dict('records'),
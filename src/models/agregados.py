@@ -0,0 +1,164 @@
+"""Armazenamento de totais pré-agregados por mês, fonte, dia e método."""
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .analisador import FONTES_FATURAMENTO, FONTES_PAGAMENTO
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    mes_ano TEXT PRIMARY KEY,
+    periodo INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    atualizado_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totais (
+    periodo INTEGER NOT NULL,
+    fonte TEXT NOT NULL,
+    dia TEXT NOT NULL,
+    metodo TEXT NOT NULL,
+    total REAL NOT NULL,
+    registros INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_totais_periodo_fonte ON totais (periodo, fonte);
+"""
+
+
+def periodo_mes(mes_ano: str) -> int:
+    """Converte "072025" em 202507, que ordena cronologicamente."""
+    return int(mes_ano[2:]) * 100 + int(mes_ano[:2])
+
+
+def mes_do_periodo(periodo: int) -> str:
+    """Converte 202507 de volta para "072025"."""
+    return f"{periodo % 100:02d}{periodo // 100:04d}"
+
+
+def _chave(fingerprint: str, versao_analisador: str) -> str:
+    """Impressão digital dos arquivos com a versão das regras que geraram os totais."""
+    return f"{fingerprint}|{versao_analisador}"
+
+
+class AgregadosStore:
+    """
+    Totais mensais materializados em SQLite
+
+    Cada conciliação grava, como subproduto, os totais e contagens por
+    fonte, dia e método de pagamento do mês. As visões acumuladas (ano até
+    a data e janela móvel) consultam apenas esta tabela, sem reler os
+    arquivos exportados.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        pasta = os.path.dirname(db_path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão que confirma a transação e é fechada ao sair."""
+        # Timeout generoso: conciliações em lote gravam a partir de vários processos
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def fingerprint(self, mes_ano: str) -> Optional[str]:
+        """Retorna a chave (impressão digital e versão) registrada para o mês, se houver."""
+        with self._conectar() as conn:
+            linha = conn.execute(
+                "SELECT fingerprint FROM fingerprints WHERE mes_ano = ?", (mes_ano,)
+            ).fetchone()
+        return linha[0] if linha else None
+
+    def precisa_atualizar(self, mes_ano: str, fingerprint: str, versao_analisador: str) -> bool:
+        """Indica se os arquivos do mês ou a versão do analisador mudaram desde a gravação."""
+        return self.fingerprint(mes_ano) != _chave(fingerprint, versao_analisador)
+
+    def gravar_mes(
+        self, mes_ano: str, fingerprint: str, versao_analisador: str, agregados: pd.DataFrame
+    ) -> None:
+        """
+        Substitui os agregados de um mês em uma única transação
+
+        Args:
+            mes_ano: String no formato "072025"
+            fingerprint: Impressão digital dos arquivos de origem
+            versao_analisador: ``Analisador.versao`` que gerou os agregados
+            agregados: DataFrame de Analisador.agregar_totais
+        """
+        periodo = periodo_mes(mes_ano)
+        linhas = [
+            (periodo, fonte, dia, metodo, float(total), int(registros))
+            for fonte, dia, metodo, total, registros in agregados[
+                ['fonte', 'dia', 'metodo', 'total', 'registros']
+            ].itertuples(index=False, name=None)
+        ]
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM totais WHERE periodo = ?", (periodo,))
+            conn.executemany(
+                "INSERT INTO totais (periodo, fonte, dia, metodo, total, registros) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                linhas,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (mes_ano, periodo, fingerprint, atualizado_em) "
+                "VALUES (?, ?, ?, ?)",
+                (mes_ano, periodo, _chave(fingerprint, versao_analisador), time.time()),
+            )
+        self.logger.info("Agregados de %s gravados (%d linhas)", mes_ano, len(linhas))
+
+    def meses_disponiveis(self, inicio: str, fim: str) -> List[str]:
+        """Lista os meses com agregados gravados no intervalo (inclusivo)."""
+        with self._conectar() as conn:
+            linhas = conn.execute(
+                "SELECT periodo FROM fingerprints WHERE periodo BETWEEN ? AND ? ORDER BY periodo",
+                (periodo_mes(inicio), periodo_mes(fim)),
+            ).fetchall()
+        return [mes_do_periodo(p) for (p,) in linhas]
+
+    def totais_periodo(self, inicio: str, fim: str) -> Dict[str, Dict]:
+        """
+        Soma os totais de cada fonte entre dois meses (inclusivo)
+
+        Returns:
+            Dict fonte -> {'total': float, 'registros': int}, no mesmo formato
+            de Analisador.calcular_totais_*
+        """
+        with self._conectar() as conn:
+            linhas = conn.execute(
+                "SELECT fonte, SUM(total), SUM(registros) FROM totais "
+                "WHERE periodo BETWEEN ? AND ? GROUP BY fonte",
+                (periodo_mes(inicio), periodo_mes(fim)),
+            ).fetchall()
+
+        totais: Dict[str, Dict] = {
+            fonte: {'total': 0.0, 'registros': 0}
+            for fonte in FONTES_FATURAMENTO + FONTES_PAGAMENTO
+        }
+        for fonte, total, registros in linhas:
+            totais[fonte] = {'total': float(total), 'registros': int(registros)}
+        return totais
+
+    def totais_detalhados(self, inicio: str, fim: str) -> pd.DataFrame:
+        """Retorna os agregados por mês, fonte, dia e método no intervalo."""
+        with self._conectar() as conn:
+            df = pd.read_sql_query(
+                "SELECT periodo, fonte, dia, metodo, total, registros FROM totais "
+                "WHERE periodo BETWEEN ? AND ? ORDER BY periodo, fonte, dia, metodo",
+                conn,
+                params=(periodo_mes(inicio), periodo_mes(fim)),
+            )
+        df.insert(0, 'mes_ano', df.pop('periodo').map(mes_do_periodo))
+        return df
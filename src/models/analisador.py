@@ -3,8 +3,24 @@ import logging
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .instrumentacao import MetricasExecucao, etapa
+from .registros import TabelaDivergencias
+from .tolerancias import (  # noqa: F401 - reexportados para os consumidores do analisador
+    LIMITE_ALERTA_PERCENTUAL,
+    LIMITE_CRITICO_PERCENTUAL,
+    classificar_divergencia,
+    classificar_resultado,
+)
+from .validacao import (
+    ErrosValidacao,
+    TabelaErrosValidacao,
+    converter_brl,
+    converter_data,
+)
+
 
 def _to_float_brl(value):
     """Convert BRL-formatted strings to float.
@@ -33,6 +49,61 @@ def _to_float_brl(value):
     except Exception:  # pylint: disable=broad-except
         return 0.0
 
+def _serie_brl(serie: pd.Series) -> pd.Series:
+    """Versão vetorizada de ``_to_float_brl`` para uma coluna inteira.
+
+    Segue as mesmas regras (``R$`` e espaços removidos; com vírgula e ponto,
+    o ponto é separador de milhar), mas opera com métodos ``.str`` sobre a
+    coluna. Valores vazios ou inválidos viram 0.0.
+    """
+    return converter_brl(serie)[0]
+
+FONTES_FATURAMENTO: List[str] = ['faturamento_c6', 'faturamento_gds', 'faturamento_wab']
+FONTES_PAGAMENTO: List[str] = ['pagamento_c6', 'pagamento_gds']
+
+PARES_FATURAMENTO: List[Tuple[str, str]] = [
+    ('faturamento_c6', 'faturamento_gds'),
+    ('faturamento_c6', 'faturamento_wab'),
+    ('faturamento_gds', 'faturamento_wab'),
+]
+PARES_PAGAMENTO: List[Tuple[str, str]] = [('pagamento_c6', 'pagamento_gds')]
+
+# Coluna adicionada ao C6 com a classificação de duplicidade ('' = mantida)
+COLUNA_DUPLICIDADE = 'classificacao_duplicidade'
+
+# Colunas candidatas (em ordem de preferência) para as agregações por dia e método
+COLUNAS_DATA_FONTE: Dict[str, List[str]] = {
+    'faturamento_c6': ['data', 'data_venda'],
+    'faturamento_gds': ['data_emissao', 'data_venda'],
+    'faturamento_wab': ['data'],
+    'pagamento_c6': ['data_recebivel', 'data_venda'],
+    'pagamento_gds': ['data_baixa', 'data_pagamento', 'data_emissao'],
+}
+COLUNAS_METODO_FONTE: Dict[str, List[str]] = {
+    'faturamento_c6': ['operacao', 'bandeira'],
+    'faturamento_gds': ['metodo'],
+    'faturamento_wab': ['forma_pagamento'],
+    'pagamento_c6': ['tipo_operacao', 'bandeira'],
+    'pagamento_gds': ['metodo'],
+}
+COLUNAS_HORA_FONTE: Dict[str, List[str]] = {
+    'faturamento_c6': ['hora'],
+    'pagamento_c6': ['hora_venda'],
+}
+COLUNAS_CARTAO = ['num_cartao']
+COLUNAS_PACIENTE = ['paciente']
+COLUNAS_STATUS = ['status', 'pago']
+
+# Versão das regras de análise: incrementar ao mudar qualquer regra que altere
+# os resultados (normalização, filtros, duplicidades), invalidando os
+# resultados gravados no cache
+VERSAO_ANALISADOR = 6
+
+# Colunas de Analisador.normalizar_lancamentos
+COLUNAS_LANCAMENTO = [
+    'linha', 'dia', 'hora', 'valor', 'metodo', 'cartao', 'paciente', 'status', 'duplicidade',
+]
+
 @dataclass
 class ResultadoAnalise:
     """Resultado da análise de um par de fontes."""
@@ -44,13 +115,47 @@ class ResultadoAnalise:
     diferenca: float
     percentual_diferenca: float
     tipo_analise: str = "faturamento"  # "faturamento" ou "pagamento"
-    detalhes_divergencias: List[Dict] = field(default_factory=list)
+    detalhes_divergencias: TabelaDivergencias = field(default_factory=TabelaDivergencias)
+    # Fonte do par -> linhas que falharam na validação (validacao.py)
+    erros_validacao: Dict[str, TabelaErrosValidacao] = field(default_factory=dict)
+    # Etapas da execução que produziu o resultado (a mesma para todos os pares dela)
+    metricas: Optional[MetricasExecucao] = None
+
+    def __post_init__(self):
+        # Aceita também a forma antiga, uma lista de dicts
+        if not isinstance(self.detalhes_divergencias, TabelaDivergencias):
+            self.detalhes_divergencias = TabelaDivergencias.de_registros(
+                self.detalhes_divergencias
+            )
+
+@dataclass
+class ResultadoLote:
+    """Resultado da conciliação de vários meses."""
+    resultados: Dict[str, List[ResultadoAnalise]] = field(default_factory=dict)
+    tempos: Dict[str, float] = field(default_factory=dict)
+    erros: Dict[str, str] = field(default_factory=dict)
+    duracao_total: float = 0.0
+
+@dataclass
+class ResultadoClinicas:
+    """Resultado consolidado da conciliação de várias clínicas."""
+    lotes: Dict[str, ResultadoLote] = field(default_factory=dict)
+    tempos: Dict[str, float] = field(default_factory=dict)
+    erros: Dict[str, str] = field(default_factory=dict)
+    duracao_total: float = 0.0
 
 class Analisador:
     """Classe responsável pela análise e comparação dos totais entre fontes"""
     
-    def __init__(self):
+    def __init__(self, janela_duplicidade_segundos: int = 60):
         self.logger = logging.getLogger(__name__)
+        # Tentativas do mesmo cartão e valor dentro desta janela são agrupadas
+        self.janela_duplicidade_segundos = janela_duplicidade_segundos
+
+    @property
+    def versao(self) -> str:
+        """Versão das regras com os parâmetros que alteram os resultados"""
+        return f"{VERSAO_ANALISADOR}:janela={self.janela_duplicidade_segundos}"
     
     def analisar(self, dados: Dict[str, pd.DataFrame]) -> List[ResultadoAnalise]:
         """
@@ -93,119 +198,361 @@ class Analisador:
         """
         totais: Dict[str, Dict] = {}
 
-        # C6 Faturamento
-        if 'faturamento_c6' in dados and not dados['faturamento_c6'].empty:
-            df_c6 = dados['faturamento_c6'].copy()
-            df_c6 = self._padronizar_valores_c6_faturamento(df_c6)
-
-            # Usa coluna valor_faturado (principal do C6)
-            if 'valor_faturado' in df_c6.columns:
-                coluna_valor = 'valor_faturado'
-            elif 'valor_venda' in df_c6.columns:
-                coluna_valor = 'valor_venda'
+        for fonte in FONTES_FATURAMENTO:
+            if fonte in dados and not dados[fonte].empty:
+                with etapa('totais', fonte, linhas_entrada=len(dados[fonte])) as medida:
+                    erros = ErrosValidacao(fonte)
+                    df, coluna_valor = self._preparar_fonte(fonte, dados[fonte], erros)
+                    totais[fonte] = {
+                        'total': self._somar_valores(df, coluna_valor),
+                        'registros': len(df),
+                        'validacao': self._concluir_validacao(erros),
+                    }
+                    if COLUNA_DUPLICIDADE in df.columns:
+                        # C6: expõe o total bruto e o total sem retentativas/duplicatas
+                        sinalizadas = df[COLUNA_DUPLICIDADE] != ''
+                        totais[fonte].update({
+                            'total_bruto': totais[fonte]['total'],
+                            'registros_brutos': len(df),
+                            'total': self._somar_valores(df[~sinalizadas], coluna_valor),
+                            'registros': int((~sinalizadas).sum()),
+                            'duplicidades': self._listar_duplicidades(
+                                fonte, df[sinalizadas], coluna_valor
+                            ),
+                        })
+                    medida.registrar_saida(df, totais[fonte]['registros'])
             else:
-                coluna_valor = 'valor'
+                totais[fonte] = {'total': 0.0, 'registros': 0}
 
-            if coluna_valor in df_c6.columns:
-                total_c6 = pd.to_numeric(df_c6[coluna_valor], errors="coerce").fillna(0).sum()
-            else:
-                total_c6 = 0.0
+        return totais
 
-            totais['faturamento_c6'] = {
-                'total': total_c6,
-                'registros': len(df_c6),
-            }
-        else:
-            totais['faturamento_c6'] = {'total': 0.0, 'registros': 0}
+    def calcular_totais_pagamento(self, dados: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """
+        Calcula totais de pagamento por fonte
+        
+        Args:
+            dados: Dict com DataFrames de cada fonte
+            
+        Returns:
+            Dict com totais por fonte
+        """
+        totais: Dict[str, Dict] = {}
 
-        # GDS Faturamento
-        if 'faturamento_gds' in dados and not dados['faturamento_gds'].empty:
-            df_gds = dados['faturamento_gds'].copy()
-            df_gds = self._padronizar_valores_gds(df_gds)
+        for fonte in FONTES_PAGAMENTO:
+            if fonte in dados and not dados[fonte].empty:
+                with etapa('totais', fonte, linhas_entrada=len(dados[fonte])) as medida:
+                    erros = ErrosValidacao(fonte)
+                    df, coluna_valor = self._preparar_fonte(fonte, dados[fonte], erros)
+                    totais[fonte] = {
+                        'total': self._somar_valores(df, coluna_valor),
+                        'registros': len(df),
+                        'validacao': self._concluir_validacao(erros),
+                    }
+                    medida.registrar_saida(df)
 
-            coluna_valor = 'valor' if 'valor' in df_gds.columns else 'valor_venda'
+        return totais
 
-            if coluna_valor in df_gds.columns:
-                total_gds = pd.to_numeric(df_gds[coluna_valor], errors="coerce").fillna(0).sum()
-            else:
-                total_gds = 0.0
+    def _concluir_validacao(self, erros: ErrosValidacao) -> TabelaErrosValidacao:
+        """Fecha a tabela de erros da fonte e avisa no log quando houver algum"""
+        tabela = erros.tabela()
+        if tabela:
+            self.logger.warning(
+                "%s: %d célula(s) fora do esquema (%s)",
+                erros.fonte,
+                len(tabela),
+                ", ".join(f"{regra}={n}" for regra, n in sorted(tabela.contar('regra').items())),
+            )
+        return tabela
 
-            totais['faturamento_gds'] = {
-                'total': total_gds,
-                'registros': len(df_gds),
-            }
-        else:
-            totais['faturamento_gds'] = {'total': 0.0, 'registros': 0}
+    def agregar_totais(self, dados: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Agrega totais e contagens por fonte, dia e método de pagamento
 
-        # WAB Faturamento
-        if 'faturamento_wab' in dados and not dados['faturamento_wab'].empty:
-            df_wab = dados['faturamento_wab'].copy()
-            df_wab = self._padronizar_valores_wab(df_wab)
+        Usa a mesma normalização e os mesmos filtros dos totais da conciliação,
+        de modo que a soma das agregações de uma fonte é igual ao seu total.
 
-            coluna_valor = 'valor' if 'valor' in df_wab.columns else 'valor_venda'
+        Args:
+            dados: Dict com DataFrames de cada fonte
 
-            if coluna_valor in df_wab.columns:
-                total_wab = pd.to_numeric(df_wab[coluna_valor], errors="coerce").fillna(0).sum()
-            else:
-                total_wab = 0.0
-            totais['faturamento_wab'] = {
-                'total': total_wab,
-                'registros': len(df_wab),
-            }
-        else:
-            totais['faturamento_wab'] = {'total': 0.0, 'registros': 0}
+        Returns:
+            DataFrame com colunas fonte, dia (AAAA-MM-DD), metodo, total e registros
+        """
+        partes = []
+        for fonte in FONTES_FATURAMENTO + FONTES_PAGAMENTO:
+            if fonte not in dados or dados[fonte].empty:
+                continue
+            lancamentos = self.normalizar_lancamentos(fonte, dados[fonte])
+            lancamentos = lancamentos[lancamentos['duplicidade'] == '']
+            if lancamentos.empty:
+                continue
+
+            agregado = (
+                lancamentos.groupby(['dia', 'metodo'], sort=True)['valor']
+                .agg(total='sum', registros='size')
+                .reset_index()
+            )
+            agregado.insert(0, 'fonte', fonte)
+            partes.append(agregado)
 
-        return totais
+        if not partes:
+            return pd.DataFrame(columns=['fonte', 'dia', 'metodo', 'total', 'registros'])
+        return pd.concat(partes, ignore_index=True)
 
-    def calcular_totais_pagamento(self, dados: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+    def normalizar_lancamentos(self, fonte: str, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Calcula totais de pagamento por fonte
-        
+        Reduz uma fonte a lançamentos com colunas comuns a todas as fontes
+
+        Aplica a mesma padronização e os mesmos filtros dos totais. Cada linha
+        mantida pelos filtros vira um lançamento; ``duplicidade`` traz a
+        classificação do C6 ('' para lançamentos que entram no total).
+
         Args:
-            dados: Dict com DataFrames de cada fonte
-            
+            fonte: Nome da fonte (ex: 'faturamento_c6')
+            df: DataFrame da fonte como carregado pelo DataLoader
+
         Returns:
-            Dict com totais por fonte
+            DataFrame com as colunas de ``COLUNAS_LANCAMENTO``; ``linha`` é o
+            índice da linha no DataFrame carregado e ``dia`` vem como AAAA-MM-DD
         """
-        totais: Dict[str, Dict] = {}
+        if df.empty:
+            return pd.DataFrame(columns=COLUNAS_LANCAMENTO)
+        df, coluna_valor = self._preparar_fonte(fonte, df)
 
-        # C6 Pagamento
-        if 'pagamento_c6' in dados and not dados['pagamento_c6'].empty:
-            df_c6 = dados['pagamento_c6'].copy()
-            df_c6 = self._padronizar_valores_c6_pagamento(df_c6)
+        if coluna_valor:
+            valores = pd.to_numeric(df[coluna_valor], errors='coerce').fillna(0)
+        else:
+            valores = pd.Series(0.0, index=df.index)
+
+        coluna_data = self._primeira_coluna(df, COLUNAS_DATA_FONTE[fonte])
+        if coluna_data:
+            datas = df[coluna_data]
+            if not pd.api.types.is_datetime64_any_dtype(datas):
+                datas = pd.to_datetime(datas, format='%d/%m/%Y', errors='coerce')
+            dias = datas.dt.strftime('%Y-%m-%d').fillna('')
+        else:
+            dias = pd.Series('', index=df.index)
+
+        def texto(candidatas: List[str]) -> pd.Series:
+            coluna = self._primeira_coluna(df, candidatas)
+            if coluna is None:
+                return pd.Series('', index=df.index)
+            return df[coluna].fillna('').astype(str).str.strip()
+
+        if COLUNA_DUPLICIDADE in df.columns:
+            duplicidade = df[COLUNA_DUPLICIDADE]
+        else:
+            duplicidade = pd.Series('', index=df.index)
+
+        return pd.DataFrame({
+            'linha': df.index,
+            'dia': dias,
+            'hora': texto(COLUNAS_HORA_FONTE.get(fonte, [])),
+            'valor': valores.astype(float),
+            'metodo': texto(COLUNAS_METODO_FONTE[fonte]),
+            'cartao': texto(COLUNAS_CARTAO),
+            'paciente': texto(COLUNAS_PACIENTE),
+            'status': texto(COLUNAS_STATUS),
+            'duplicidade': duplicidade,
+        }, index=df.index)
+
+    def _preparar_fonte(
+        self, fonte: str, df: pd.DataFrame, erros: Optional[ErrosValidacao] = None
+    ) -> Tuple[pd.DataFrame, Optional[str]]:
+        """
+        Normaliza e filtra uma fonte para o cálculo de totais
+
+        Args:
+            erros: Recebe, na mesma passada, as células que falharam na validação
+
+        Returns:
+            Tupla (DataFrame normalizado e filtrado, coluna de valor ou None)
+        """
+        with etapa('preparar', fonte, linhas_entrada=len(df)) as medida:
+            df_pad, coluna_valor = self._filtrar_fonte(fonte, df, erros)
+            medida.registrar_saida(df_pad)
+        return df_pad, coluna_valor
+
+    def _filtrar_fonte(
+        self, fonte: str, df: pd.DataFrame, erros: Optional[ErrosValidacao] = None
+    ) -> Tuple[pd.DataFrame, Optional[str]]:
+        df_pad = self.padronizar_fonte(fonte, df, erros)
+        if fonte == 'faturamento_c6':
+            candidatas = ['valor_faturado', 'valor_venda', 'valor']
+            coluna_valor = self._primeira_coluna(df_pad, candidatas)
+            if coluna_valor:
+                with etapa('duplicidades', fonte, linhas_entrada=len(df_pad)) as medida:
+                    df_pad = self.detectar_duplicidades_c6(df_pad, coluna_valor)
+                    medida.registrar_saida(
+                        df_pad, int((df_pad[COLUNA_DUPLICIDADE] == '').sum())
+                    )
+            # Recusadas avulsas não entram no total; as que foram sinalizadas
+            # como retentativa ficam para o relatório de duplicidades
+            if 'status' in df_pad.columns:
+                recusada = (
+                    df_pad['status'].astype('string').str.contains('Recusada', regex=False)
+                    .fillna(False).astype(bool)
+                )
+                if COLUNA_DUPLICIDADE in df_pad.columns:
+                    recusada &= df_pad[COLUNA_DUPLICIDADE] == ''
+                df_pad = df_pad[~recusada]
+        elif fonte == 'faturamento_gds':
+            candidatas = ['valor', 'valor_venda']
+        elif fonte == 'faturamento_wab':
+            # O WAB informa o valor recebido em 'VALOR PAGO'
+            candidatas = ['valor_pago', 'valor', 'valor_venda']
+        elif fonte == 'pagamento_c6':
             # Filtra apenas recebidos se a coluna existir
-            if 'status' in df_c6.columns:
-                df_c6 = df_c6[df_c6['status'].str.contains('Recebido', na=False)]
-            # Use a coluna de valor disponível
-            valor_col = 'valor_recebivel' if 'valor_recebivel' in df_c6.columns else 'valor'
-
-            total_c6 = pd.to_numeric(df_c6[valor_col], errors="coerce").fillna(0).sum()
-            totais['pagamento_c6'] = {
-                'total': total_c6,
-                'registros': len(df_c6),
-                'detalhes': df_c6.head(5).to_dict('records'),  # Limitado para performance
-            }
-
-        # GDS Pagamento
-        if 'pagamento_gds' in dados and not dados['pagamento_gds'].empty:
-            df_gds = dados['pagamento_gds'].copy()
-            df_gds = self._padronizar_valores_gds(df_gds)
+            if 'status' in df_pad.columns:
+                df_pad = df_pad[df_pad['status'].str.contains('Recebido', na=False)]
+            candidatas = ['valor_recebivel', 'valor']
+        elif fonte == 'pagamento_gds':
             # Filtra apenas receitas pagas se as colunas existirem
-            if 'tipo' in df_gds.columns:
-                df_gds = df_gds[df_gds['tipo'].str.contains('Receita', na=False)]
-            if 'pago' in df_gds.columns:
-                df_gds = df_gds[df_gds['pago'].str.contains('Sim', na=False)]
-            # Use a coluna de valor disponível
-            valor_col = 'valor_liquido' if 'valor_liquido' in df_gds.columns else 'valor'
-
-            total_gds = pd.to_numeric(df_gds[valor_col], errors="coerce").fillna(0).sum()
-            totais['pagamento_gds'] = {
-                'total': total_gds,
-                'registros': len(df_gds),
-                'detalhes': df_gds.head(5).to_dict('records'),
-            }
+            if 'tipo' in df_pad.columns:
+                df_pad = df_pad[df_pad['tipo'].str.contains('Receita', na=False)]
+            if 'pago' in df_pad.columns:
+                df_pad = df_pad[df_pad['pago'].str.contains('Sim', na=False)]
+            candidatas = ['valor_liquido', 'valor']
+        else:
+            raise ValueError(f"Fonte desconhecida: {fonte}")
+
+        coluna_total = self._primeira_coluna(df_pad, candidatas)
+        if erros is not None:
+            erros.restringir_linhas(df_pad.index)
+            if coluna_total is None:
+                erros.registrar_coluna_total(candidatas)
+        return df_pad, coluna_total
+
+    def padronizar_fonte(
+        self, fonte: str, df: pd.DataFrame, erros: Optional[ErrosValidacao] = None
+    ) -> pd.DataFrame:
+        """
+        Converte valores em R$ para float e datas para datetime, sem filtrar linhas
 
-        return totais
+        Args:
+            erros: Recebe as células inválidas e vazias apontadas pelos
+                conversores e os problemas de cabeçalho vindos do DataLoader
+
+        Raises:
+            ValueError: Fonte desconhecida
+        """
+        padronizadores = {
+            'faturamento_c6': self._padronizar_valores_c6_faturamento,
+            'faturamento_gds': self._padronizar_valores_gds,
+            'faturamento_wab': self._padronizar_valores_wab,
+            'pagamento_c6': self._padronizar_valores_c6_pagamento,
+            'pagamento_gds': self._padronizar_valores_gds,
+        }
+        if fonte not in padronizadores:
+            raise ValueError(f"Fonte desconhecida: {fonte}")
+        with etapa('padronizar', fonte, linhas_entrada=len(df)) as medida:
+            if erros is not None:
+                erros.registrar_cabecalho(df)
+            df_pad = padronizadores[fonte](df, erros)
+            medida.registrar_saida(df_pad)
+        return df_pad
+
+    def detectar_duplicidades_c6(self, df: pd.DataFrame, coluna_valor: str) -> pd.DataFrame:
+        """
+        Sinaliza retentativas e duplicatas no faturamento C6
+
+        Ordena as transações por (cartão, valor em centavos) — com um hash
+        vetorizado — e data+hora; uma transação entra no grupo da anterior
+        quando tem o mesmo cartão e valor e ocorreu até
+        ``janela_duplicidade_segundos`` depois dela (tentativas em sequência
+        formam um único grupo, mesmo cruzando a virada de um minuto). Em cada
+        grupo é mantida a primeira transação aprovada (ou a primeira, se
+        nenhuma foi aprovada); as demais são classificadas como
+        ``'retentativa'`` quando o status difere do mantido (ex: uma
+        ``Recusada`` ao lado da ``Aprovada``) ou ``'duplicata'`` quando é igual.
+
+        Args:
+            df: DataFrame C6 já padronizado (valores numéricos, ``data`` em datetime)
+            coluna_valor: Coluna com o valor da transação
+
+        Returns:
+            Cópia do DataFrame com a coluna ``classificacao_duplicidade``
+            ('' para transações mantidas). Sem as colunas necessárias
+            (``num_cartao``, ``data``, ``hora``) nada é sinalizado.
+        """
+        df_marcado = df.copy()
+        df_marcado[COLUNA_DUPLICIDADE] = ''
+        if df.empty or not {'num_cartao', 'data', 'hora'}.issubset(df.columns):
+            return df_marcado
+
+        cartao = df['num_cartao'].astype(str).str.strip()
+        centavos = (
+            pd.to_numeric(df[coluna_valor], errors='coerce').fillna(0) * 100
+        ).round().astype('int64')
+        datas = df['data']
+        if not pd.api.types.is_datetime64_any_dtype(datas):
+            datas = pd.to_datetime(datas, format='%d/%m/%Y', errors='coerce')
+        instante = datas + pd.to_timedelta(df['hora'].astype(str).str.strip(), errors='coerce')
+        validas = instante.notna() & ~cartao.isin(['', 'nan', '-'])
+        if validas.sum() < 2:
+            return df_marcado
+
+        chave = pd.util.hash_pandas_object(
+            pd.DataFrame({'cartao': cartao, 'centavos': centavos}), index=False
+        )
+        if 'status' in df.columns:
+            status = df['status'].fillna('').astype(str).str.strip()
+        else:
+            status = pd.Series('', index=df.index)
+        aprovada = status.str.contains('Aprovada', na=False)
+
+        grupos = pd.DataFrame(
+            {'chave': chave, 'instante': instante, 'aprovada': aprovada, 'status': status}
+        )[validas].sort_values(['chave', 'instante'], kind='stable')
+        janela = pd.Timedelta(seconds=self.janela_duplicidade_segundos)
+        continua = grupos['chave'].eq(grupos['chave'].shift()) & (
+            grupos['instante'].diff() <= janela
+        )
+        grupos['grupo'] = (~continua).cumsum()
+        grupos = grupos.sort_values(
+            ['grupo', 'aprovada'], ascending=[True, False], kind='stable'
+        )
+        descartada = grupos['grupo'].duplicated()
+        status_mantido = grupos.groupby('grupo')['status'].transform('first')
+        classificacao = pd.Series(
+            np.where(grupos['status'] == status_mantido, 'duplicata', 'retentativa'),
+            index=grupos.index,
+        )[descartada]
+
+        df_marcado.loc[classificacao.index, COLUNA_DUPLICIDADE] = classificacao
+        if not classificacao.empty:
+            self.logger.info(
+                "C6: %d retentativa(s) e %d duplicata(s) sinalizadas",
+                int((classificacao == 'retentativa').sum()),
+                int((classificacao == 'duplicata').sum()),
+            )
+        return df_marcado
+
+    def _listar_duplicidades(
+        self, fonte: str, df: pd.DataFrame, coluna_valor: Optional[str]
+    ) -> TabelaDivergencias:
+        """Monta os detalhes das transações sinalizadas como duplicidade"""
+        if df.empty:
+            return TabelaDivergencias()
+        colunas = {c: df[c] for c in ['data', 'hora', 'num_cartao', 'status'] if c in df.columns}
+        if 'data' in colunas and pd.api.types.is_datetime64_any_dtype(colunas['data']):
+            colunas['data'] = colunas['data'].dt.strftime('%d/%m/%Y')
+        if coluna_valor:
+            colunas['valor'] = df[coluna_valor]
+        colunas['tipo'] = df[COLUNA_DUPLICIDADE]
+        colunas['fonte'] = pd.Series(fonte, index=df.index)
+        return TabelaDivergencias.de_colunas(colunas, len(df))
+
+    @staticmethod
+    def _primeira_coluna(df: pd.DataFrame, candidatas: List[str]) -> Optional[str]:
+        """Retorna a primeira coluna candidata presente no DataFrame"""
+        return next((c for c in candidatas if c in df.columns), None)
+
+    @staticmethod
+    def _somar_valores(df: pd.DataFrame, coluna_valor: Optional[str]) -> float:
+        """Soma uma coluna de valores, tratando valores inválidos como zero"""
+        if coluna_valor is None:
+            return 0.0
+        return float(pd.to_numeric(df[coluna_valor], errors="coerce").fillna(0).sum())
 
     def analisar_par_faturamento(
         self, fonte1: str, fonte2: str, totais: Dict[str, Dict]
@@ -223,8 +570,12 @@ class Analisador:
         else:
             percentual_diferenca = (diferenca / max(total1, total2)) * 100
 
-        # Identifica divergências (implementar lógica detalhada se necessário)
-        detalhes_divergencias: List[Dict] = []
+        # Transações do C6 descartadas do total (retentativas e duplicatas)
+        detalhes_divergencias = TabelaDivergencias.concatenar(
+            totais[fonte]['duplicidades']
+            for fonte in (fonte1, fonte2)
+            if 'duplicidades' in totais.get(fonte, {})
+        )
 
         return ResultadoAnalise(
             par_fontes=(fonte1, fonte2),
@@ -236,6 +587,7 @@ class Analisador:
             registros_fonte_1=registros1,
             registros_fonte_2=registros2,
             detalhes_divergencias=detalhes_divergencias,
+            erros_validacao=self._erros_validacao_par(fonte1, fonte2, totais),
         )
 
     def analisar_par_pagamento(
@@ -254,8 +606,6 @@ class Analisador:
         else:
             percentual_diferenca = (diferenca / max(total1, total2)) * 100
 
-        detalhes_divergencias: List[Dict] = []
-
         return ResultadoAnalise(
             par_fontes=(fonte1, fonte2),
             tipo_analise="pagamento",
@@ -265,9 +615,20 @@ class Analisador:
             percentual_diferenca=percentual_diferenca,
             registros_fonte_1=registros1,
             registros_fonte_2=registros2,
-            detalhes_divergencias=detalhes_divergencias,
+            erros_validacao=self._erros_validacao_par(fonte1, fonte2, totais),
         )
 
+    @staticmethod
+    def _erros_validacao_par(
+        fonte1: str, fonte2: str, totais: Dict[str, Dict]
+    ) -> Dict[str, TabelaErrosValidacao]:
+        """Tabelas de validação das fontes do par (compartilhadas entre pares)"""
+        return {
+            fonte: totais[fonte]['validacao']
+            for fonte in (fonte1, fonte2)
+            if 'validacao' in totais.get(fonte, {})
+        }
+
     def analisar_todos_pares(self, dados: Dict[str, pd.DataFrame]) -> List[ResultadoAnalise]:
         """
         Executa análise completa de todos os pares definidos
@@ -275,27 +636,32 @@ class Analisador:
         Returns:
             Lista com todos os resultados de análise
         """
+        linhas = sum(len(df) for df in dados.values())
+        with etapa('analisar_pares', linhas_entrada=linhas) as medida:
+            # Calcula totais
+            totais_faturamento = self.calcular_totais_faturamento(dados)
+            totais_pagamento = self.calcular_totais_pagamento(dados)
+
+            resultados = self.analisar_totais(totais_faturamento, totais_pagamento)
+            medida.linhas_saida = len(resultados)
+        return resultados
+
+    def analisar_totais(
+        self, totais_faturamento: Dict[str, Dict], totais_pagamento: Dict[str, Dict]
+    ) -> List[ResultadoAnalise]:
+        """
+        Analisa todos os pares a partir de totais já calculados
+
+        Permite reaproveitar totais pré-agregados (ex: visões acumuladas)
+        sem recarregar os arquivos de origem.
+        """
         resultados = []
-        
-        # Calcula totais
-        totais_faturamento = self.calcular_totais_faturamento(dados)
-        totais_pagamento = self.calcular_totais_pagamento(dados)
-        
-        # Pares de análise de faturamento
-        pares_faturamento = [
-            ('faturamento_c6', 'faturamento_gds'),
-            ('faturamento_c6', 'faturamento_wab'),
-            ('faturamento_gds', 'faturamento_wab'),
-        ]
-        
-        for fonte1, fonte2 in pares_faturamento:
+
+        for fonte1, fonte2 in PARES_FATURAMENTO:
             resultado = self.analisar_par_faturamento(fonte1, fonte2, totais_faturamento)
             resultados.append(resultado)
-        
-        # Pares de análise de pagamento
-        pares_pagamento = [('pagamento_c6', 'pagamento_gds')]
-        
-        for fonte1, fonte2 in pares_pagamento:
+
+        for fonte1, fonte2 in PARES_PAGAMENTO:
             resultado = self.analisar_par_pagamento(fonte1, fonte2, totais_pagamento)
             resultados.append(resultado)
         
@@ -337,7 +703,31 @@ class Analisador:
             percentual_diferenca=percentual_diferenca,
         )
 
-    def _padronizar_valores_c6_faturamento(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _converter_valores(
+        df: pd.DataFrame, coluna: str, erros: Optional[ErrosValidacao]
+    ) -> None:
+        """Converte uma coluna em R$ no lugar, registrando as células inválidas"""
+        original = df[coluna]
+        valores, invalidos, vazios = converter_brl(original)
+        if erros is not None:
+            erros.registrar_valores(coluna, original, valores, invalidos, vazios)
+        df[coluna] = valores
+
+    @staticmethod
+    def _converter_datas(
+        df: pd.DataFrame, coluna: str, erros: Optional[ErrosValidacao]
+    ) -> None:
+        """Converte uma coluna dd/mm/aaaa no lugar, registrando as datas inválidas"""
+        original = df[coluna]
+        datas, invalidas, vazias = converter_data(original)
+        if erros is not None:
+            erros.registrar_datas(coluna, original, invalidas, vazias)
+        df[coluna] = datas
+
+    def _padronizar_valores_c6_faturamento(
+        self, df: pd.DataFrame, erros: Optional[ErrosValidacao] = None
+    ) -> pd.DataFrame:
         """Padroniza valores monetários do C6 faturamento."""
         df_copy = df.copy()
 
@@ -354,22 +744,26 @@ class Analisador:
 
         for coluna in colunas_valor:
             if coluna in df_copy.columns:
-                df_copy[coluna] = df_copy[coluna].map(_to_float_brl)
+                self._converter_valores(df_copy, coluna, erros)
 
         for col in df_copy.columns:
             if 'data' in col.lower():
-                df_copy[col] = pd.to_datetime(df_copy[col], format='%d/%m/%Y', errors='coerce')
+                self._converter_datas(df_copy, col, erros)
 
         return df_copy
 
-    def _padronizar_valores_c6_pagamento(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _padronizar_valores_c6_pagamento(
+        self, df: pd.DataFrame, erros: Optional[ErrosValidacao] = None
+    ) -> pd.DataFrame:
         """Padroniza valores monetários do C6 pagamento."""
         df_copy = df.copy()
 
         colunas_valor = [
             col
             for col in df_copy.columns
-            if any(
+            # "data_recebivel" contém "recebivel", mas é data
+            if not col.lower().startswith('data_')
+            and any(
                 palavra in col.lower()
                 for palavra in ['valor', 'total', 'parcela', 'receita', 'recebivel', 'desconto']
             )
@@ -379,15 +773,17 @@ class Analisador:
 
         for coluna in colunas_valor:
             if coluna in df_copy.columns:
-                df_copy[coluna] = df_copy[coluna].map(_to_float_brl)
+                self._converter_valores(df_copy, coluna, erros)
 
         for coluna_data in ['data_venda', 'data_recebivel']:
             if coluna_data in df_copy.columns:
-                df_copy[coluna_data] = pd.to_datetime(df_copy[coluna_data], format='%d/%m/%Y', errors='coerce')
+                self._converter_datas(df_copy, coluna_data, erros)
 
         return df_copy
 
-    def _padronizar_valores_gds(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _padronizar_valores_gds(
+        self, df: pd.DataFrame, erros: Optional[ErrosValidacao] = None
+    ) -> pd.DataFrame:
         """Padroniza valores monetários do GDS."""
         df_copy = df.copy()
 
@@ -401,17 +797,17 @@ class Analisador:
 
         for coluna in colunas_valor:
             if coluna in df_copy.columns:
-                df_copy[coluna] = df_copy[coluna].map(_to_float_brl)
+                self._converter_valores(df_copy, coluna, erros)
 
         for coluna_data in ['data_emissao', 'data_vencimento', 'data_baixa']:
             if coluna_data in df_copy.columns:
-                df_copy[coluna_data] = pd.to_datetime(
-                    df_copy[coluna_data], format='%d/%m/%Y', errors='coerce'
-                )
+                self._converter_datas(df_copy, coluna_data, erros)
 
         return df_copy
 
-    def _padronizar_valores_wab(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _padronizar_valores_wab(
+        self, df: pd.DataFrame, erros: Optional[ErrosValidacao] = None
+    ) -> pd.DataFrame:
         """Padroniza valores monetários do WAB."""
         df_copy = df.copy()
 
@@ -423,9 +819,9 @@ class Analisador:
 
         for coluna in colunas_valor:
             if coluna in df_copy.columns:
-                df_copy[coluna] = pd.to_numeric(df_copy[coluna], errors='coerce').fillna(0)
+                self._converter_valores(df_copy, coluna, erros)
 
         if 'data' in df_copy.columns:
-            df_copy['data'] = pd.to_datetime(df_copy['data'], format='%d/%m/%Y', errors='coerce')
+            self._converter_datas(df_copy, 'data', erros)
 
         return df_copy
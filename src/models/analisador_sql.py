@@ -0,0 +1,335 @@
+"""Base SQLite de lançamentos normalizados e análise por consultas indexadas."""
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .agregados import mes_do_periodo, periodo_mes
+from .analisador import (
+    FONTES_FATURAMENTO,
+    FONTES_PAGAMENTO,
+    Analisador,
+    ResultadoAnalise,
+)
+from .registros import TabelaDivergencias
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meses (
+    mes_ano TEXT PRIMARY KEY,
+    periodo INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    ingerido_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lancamentos (
+    periodo INTEGER NOT NULL,
+    fonte TEXT NOT NULL,
+    linha INTEGER NOT NULL,
+    dia TEXT NOT NULL,
+    hora TEXT NOT NULL,
+    centavos INTEGER NOT NULL,
+    metodo TEXT NOT NULL,
+    cartao TEXT NOT NULL,
+    paciente TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duplicidade TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lancamentos_periodo_fonte ON lancamentos (periodo, fonte);
+CREATE INDEX IF NOT EXISTS idx_lancamentos_fonte_dia_centavos
+    ON lancamentos (fonte, dia, centavos);
+CREATE INDEX IF NOT EXISTS idx_lancamentos_centavos ON lancamentos (centavos);
+CREATE INDEX IF NOT EXISTS idx_lancamentos_cartao ON lancamentos (cartao);
+CREATE INDEX IF NOT EXISTS idx_lancamentos_paciente ON lancamentos (paciente COLLATE NOCASE);
+"""
+
+# Pareia lançamentos de duas fontes pelo mesmo dia e valor; repetições do mesmo
+# (dia, valor) são casadas uma a uma, na ordem de hora e linha
+_SQL_PAREAR = """
+WITH a AS (
+    SELECT periodo, linha, dia, centavos,
+           ROW_NUMBER() OVER (PARTITION BY dia, centavos ORDER BY hora, periodo, linha) AS n
+    FROM lancamentos
+    WHERE fonte = :fonte_1 AND periodo BETWEEN :inicio AND :fim AND duplicidade = ''
+), b AS (
+    SELECT periodo, linha, dia, centavos,
+           ROW_NUMBER() OVER (PARTITION BY dia, centavos ORDER BY hora, periodo, linha) AS n
+    FROM lancamentos
+    WHERE fonte = :fonte_2 AND periodo BETWEEN :inicio AND :fim AND duplicidade = ''
+)
+SELECT a.dia, a.centavos, a.periodo AS periodo_1, a.linha AS linha_1,
+       b.periodo AS periodo_2, b.linha AS linha_2
+FROM a LEFT JOIN b ON a.dia = b.dia AND a.centavos = b.centavos AND a.n = b.n
+UNION ALL
+SELECT b.dia, b.centavos, NULL, NULL, b.periodo, b.linha
+FROM b LEFT JOIN a ON a.dia = b.dia AND a.centavos = b.centavos AND a.n = b.n
+WHERE a.linha IS NULL
+ORDER BY 1, 2
+"""
+
+
+class AnalisadorSQL:
+    """
+    Conciliação a partir de uma base SQLite de lançamentos
+
+    A ingestão grava, mês a mês, os lançamentos normalizados de cada fonte
+    (os mesmos de Analisador.normalizar_lancamentos, com valores em
+    centavos). As análises são consultas agregadas e indexadas sobre essa
+    tabela: os totais e pares de ResultadoAnalise, as quebras por dia e o
+    pareamento de registros funcionam para qualquer intervalo de meses sem
+    carregar os arquivos em memória.
+    """
+
+    def __init__(self, db_path: str, analisador: Optional[Analisador] = None):
+        self.db_path = db_path
+        self.analisador = analisador or Analisador()
+        self.logger = logging.getLogger(__name__)
+        pasta = os.path.dirname(db_path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão que confirma a transação e é fechada ao sair."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Ingestão
+    # ------------------------------------------------------------------
+
+    def _chave(self, fingerprint: str) -> str:
+        """Impressão digital dos arquivos com a versão das regras que normalizaram as linhas"""
+        return f"{fingerprint}|{self.analisador.versao}"
+
+    def precisa_atualizar(self, mes_ano: str, fingerprint: str) -> bool:
+        """Indica se os arquivos do mês ou a versão do analisador mudaram desde a ingestão."""
+        with self._conectar() as conn:
+            linha = conn.execute(
+                "SELECT fingerprint FROM meses WHERE mes_ano = ?", (mes_ano,)
+            ).fetchone()
+        return linha is None or linha[0] != self._chave(fingerprint)
+
+    def meses_ingeridos(self) -> List[str]:
+        """Meses presentes na base, em ordem cronológica."""
+        with self._conectar() as conn:
+            linhas = conn.execute("SELECT periodo FROM meses ORDER BY periodo").fetchall()
+        return [mes_do_periodo(p) for (p,) in linhas]
+
+    def ingerir_mes(
+        self, mes_ano: str, fingerprint: str, dados: Dict[str, pd.DataFrame]
+    ) -> int:
+        """
+        Substitui os lançamentos de um mês em uma única transação
+
+        Args:
+            mes_ano: String no formato "072025"
+            fingerprint: Impressão digital dos arquivos de origem
+            dados: Dict com DataFrames de cada fonte (como em carregar_dados_mes)
+
+        Returns:
+            Quantidade de lançamentos gravados
+        """
+        periodo = periodo_mes(mes_ano)
+        linhas: List[Tuple] = []
+        for fonte in FONTES_FATURAMENTO + FONTES_PAGAMENTO:
+            df = dados.get(fonte)
+            if df is None or df.empty:
+                continue
+            lancamentos = self.analisador.normalizar_lancamentos(fonte, df)
+            centavos = (lancamentos['valor'] * 100).round().astype('int64')
+            linhas.extend(
+                (periodo, fonte, int(linha), dia, hora, int(valor), metodo, cartao,
+                 paciente, status, duplicidade)
+                for linha, dia, hora, valor, metodo, cartao, paciente, status, duplicidade
+                in zip(
+                    lancamentos['linha'], lancamentos['dia'], lancamentos['hora'], centavos,
+                    lancamentos['metodo'], lancamentos['cartao'], lancamentos['paciente'],
+                    lancamentos['status'], lancamentos['duplicidade'],
+                )
+            )
+
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM lancamentos WHERE periodo = ?", (periodo,))
+            conn.executemany(
+                "INSERT INTO lancamentos (periodo, fonte, linha, dia, hora, centavos, metodo, "
+                "cartao, paciente, status, duplicidade) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                linhas,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meses (mes_ano, periodo, fingerprint, ingerido_em) "
+                "VALUES (?, ?, ?, ?)",
+                (mes_ano, periodo, self._chave(fingerprint), time.time()),
+            )
+        self.logger.info("Lançamentos de %s ingeridos (%d linhas)", mes_ano, len(linhas))
+        return len(linhas)
+
+    # ------------------------------------------------------------------
+    # Totais e pares
+    # ------------------------------------------------------------------
+
+    def calcular_totais(self, inicio: str, fim: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Totais por fonte no intervalo, no formato de Analisador.calcular_totais_*
+
+        O faturamento C6 traz também total_bruto, registros_brutos e a lista de
+        duplicidades descartadas do total.
+        """
+        intervalo = self._intervalo(inicio, fim)
+        with self._conectar() as conn:
+            linhas = conn.execute(
+                "SELECT fonte, "
+                "       SUM(CASE WHEN duplicidade = '' THEN centavos ELSE 0 END), "
+                "       SUM(duplicidade = ''), SUM(centavos), COUNT(*) "
+                "FROM lancamentos WHERE periodo BETWEEN ? AND ? GROUP BY fonte",
+                intervalo,
+            ).fetchall()
+            duplicidades = conn.execute(
+                "SELECT fonte, duplicidade, strftime('%d/%m/%Y', dia), hora, cartao, status, "
+                "       centavos "
+                "FROM lancamentos "
+                "WHERE periodo BETWEEN ? AND ? AND fonte = 'faturamento_c6' AND duplicidade <> '' "
+                "ORDER BY periodo, linha",
+                intervalo,
+            ).fetchall()
+
+        colunas_duplicidades: Dict[str, Any] = dict(
+            zip(TabelaDivergencias.COLUNAS, zip(*duplicidades))
+        )
+        if duplicidades:
+            colunas_duplicidades['valor'] = [c / 100 for c in colunas_duplicidades['valor']]
+
+        totais: Dict[str, Dict] = {
+            fonte: {'total': 0.0, 'registros': 0} for fonte in FONTES_FATURAMENTO
+        }
+        for fonte, centavos, registros, centavos_brutos, registros_brutos in linhas:
+            totais[fonte] = {'total': centavos / 100, 'registros': int(registros)}
+            if fonte == 'faturamento_c6':
+                totais[fonte].update({
+                    'total_bruto': centavos_brutos / 100,
+                    'registros_brutos': int(registros_brutos),
+                    'duplicidades': TabelaDivergencias.de_colunas(
+                        colunas_duplicidades, len(duplicidades)
+                    ),
+                })
+        return totais
+
+    def analisar_todos_pares(
+        self, inicio: str, fim: Optional[str] = None
+    ) -> List[ResultadoAnalise]:
+        """
+        Mesmos pares de Analisador.analisar_todos_pares, para um mês ou intervalo
+
+        Args:
+            inicio: Primeiro mês ("072025")
+            fim: Último mês (padrão: o próprio ``inicio``)
+        """
+        totais = self.calcular_totais(inicio, fim)
+        totais_faturamento = {f: totais[f] for f in FONTES_FATURAMENTO}
+        totais_pagamento = {f: totais[f] for f in FONTES_PAGAMENTO if f in totais}
+        return self.analisador.analisar_totais(totais_faturamento, totais_pagamento)
+
+    # ------------------------------------------------------------------
+    # Quebras e pareamento
+    # ------------------------------------------------------------------
+
+    def totais_por_dia(
+        self, inicio: str, fim: Optional[str] = None, fontes: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Totais por fonte, dia e método, como Analisador.agregar_totais
+
+        Returns:
+            DataFrame com colunas fonte, dia (AAAA-MM-DD), metodo, total e registros
+        """
+        sql = (
+            "SELECT fonte, dia, metodo, SUM(centavos) / 100.0 AS total, COUNT(*) AS registros "
+            "FROM lancamentos WHERE periodo BETWEEN ? AND ? AND duplicidade = '' "
+        )
+        parametros: List[Union[str, int]] = list(self._intervalo(inicio, fim))
+        if fontes:
+            sql += f"AND fonte IN ({', '.join('?' * len(fontes))}) "
+            parametros.extend(fontes)
+        sql += "GROUP BY fonte, dia, metodo ORDER BY fonte, dia, metodo"
+        with self._conectar() as conn:
+            return pd.read_sql_query(sql, conn, params=parametros)
+
+    def parear_registros(
+        self, fonte_1: str, fonte_2: str, inicio: str, fim: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Pareia os lançamentos de duas fontes por dia e valor
+
+        Returns:
+            DataFrame com dia, valor, mes_ano_1, linha_1, mes_ano_2 e linha_2;
+            lançamentos sem par têm o lado oposto vazio (None/<NA>). ``linha``
+            é o índice da linha no DataFrame carregado do mês.
+        """
+        periodo_inicio, periodo_fim = self._intervalo(inicio, fim)
+        with self._conectar() as conn:
+            df = pd.read_sql_query(
+                _SQL_PAREAR, conn,
+                params={
+                    'fonte_1': fonte_1, 'fonte_2': fonte_2,
+                    'inicio': periodo_inicio, 'fim': periodo_fim,
+                },
+            )
+        df['valor'] = df['centavos'] / 100
+        for lado in ('1', '2'):
+            df[f'linha_{lado}'] = df[f'linha_{lado}'].astype('Int64')
+            df[f'mes_ano_{lado}'] = df[f'periodo_{lado}'].map(
+                lambda p: mes_do_periodo(int(p)) if pd.notna(p) else None
+            )
+        return df[['dia', 'valor', 'mes_ano_1', 'linha_1', 'mes_ano_2', 'linha_2']]
+
+    def buscar_lancamentos(
+        self,
+        inicio: Optional[str] = None,
+        fim: Optional[str] = None,
+        fonte: Optional[str] = None,
+        cartao: Optional[str] = None,
+        paciente: Optional[str] = None,
+        valor: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """Busca lançamentos por cartão, paciente e/ou valor no histórico."""
+        condicoes: List[str] = []
+        parametros: List[Union[str, int]] = []
+        if inicio:
+            condicoes.append("periodo BETWEEN ? AND ?")
+            parametros.extend(self._intervalo(inicio, fim))
+        if fonte:
+            condicoes.append("fonte = ?")
+            parametros.append(fonte)
+        if cartao:
+            condicoes.append("cartao = ?")
+            parametros.append(cartao)
+        if paciente:
+            condicoes.append("paciente = ? COLLATE NOCASE")
+            parametros.append(paciente)
+        if valor is not None:
+            condicoes.append("centavos = ?")
+            parametros.append(int(round(valor * 100)))
+
+        sql = (
+            "SELECT periodo, fonte, linha, dia, hora, centavos / 100.0 AS valor, metodo, "
+            "cartao, paciente, status, duplicidade FROM lancamentos"
+        )
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += " ORDER BY periodo, fonte, linha"
+        with self._conectar() as conn:
+            df = pd.read_sql_query(sql, conn, params=parametros)
+        df.insert(0, 'mes_ano', df.pop('periodo').map(mes_do_periodo))
+        return df
+
+    @staticmethod
+    def _intervalo(inicio: str, fim: Optional[str]) -> Tuple[int, int]:
+        return periodo_mes(inicio), periodo_mes(fim or inicio)
@@ -0,0 +1,236 @@
+"""Resultados de conciliações já calculadas, gravados por mês em SQLite."""
+import json
+import logging
+import os
+import sqlite3
+import struct
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Type
+
+import numpy as np
+
+from .analisador import ResultadoAnalise
+from .instrumentacao import registrar_cache
+from .registros import TabelaDivergencias, TabelaRegistros
+from .validacao import TabelaErrosValidacao
+
+# Versão do formato binário; faz parte da chave, como a versão do analisador
+FORMATO = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    mes_ano TEXT NOT NULL,
+    fontes TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    versao TEXT NOT NULL,
+    gravado_em REAL NOT NULL,
+    dados BLOB NOT NULL,
+    PRIMARY KEY (mes_ano, fontes)
+);
+"""
+
+_CAMPOS_ESCALARES = (
+    'total_fonte_1', 'total_fonte_2', 'registros_fonte_1', 'registros_fonte_2',
+    'diferenca', 'percentual_diferenca', 'tipo_analise',
+)
+
+# Tamanho do cabeçalho JSON, antes dele no bloco descomprimido
+_PREFIXO = struct.Struct('<I')
+
+# Tipos de tabela gravados no bloco
+_TIPOS_TABELA: Dict[str, Type[TabelaRegistros]] = {
+    'divergencias': TabelaDivergencias,
+    'validacao': TabelaErrosValidacao,
+}
+
+
+def serializar_resultados(resultados: Sequence[ResultadoAnalise]) -> bytes:
+    """
+    Codifica os resultados de um mês em um bloco binário compacto
+
+    O bloco (comprimido com zlib) é um cabeçalho JSON com os campos de cada
+    par e as categorias de texto das tabelas (divergências e erros de
+    validação), seguido dos arrays das colunas em bytes. Uma tabela
+    compartilhada por vários pares (as duplicidades do C6, a validação de
+    uma fonte) é gravada uma única vez. As métricas da execução não são
+    gravadas.
+    """
+    tabelas: List[Dict] = []
+    indices: Dict[int, int] = {}
+    blocos: List[bytes] = []
+
+    def indexar(tabela: TabelaRegistros, tipo: str) -> int:
+        if id(tabela) not in indices:
+            indices[id(tabela)] = len(tabelas)
+            tamanho, categorias, arrays = tabela.para_estado()
+            colunas = []
+            for coluna, array in arrays.items():
+                dados = np.ascontiguousarray(array).tobytes()
+                colunas.append([coluna, array.dtype.str, len(dados)])
+                blocos.append(dados)
+            tabelas.append({
+                'tipo': tipo, 'tamanho': tamanho, 'categorias': categorias, 'colunas': colunas,
+            })
+        return indices[id(tabela)]
+
+    pares = []
+    for r in resultados:
+        pares.append({
+            'par_fontes': list(r.par_fontes),
+            **{campo: getattr(r, campo) for campo in _CAMPOS_ESCALARES},
+            'divergencias': indexar(r.detalhes_divergencias, 'divergencias'),
+            'validacao': {
+                fonte: indexar(tabela, 'validacao')
+                for fonte, tabela in r.erros_validacao.items()
+            },
+        })
+
+    cabecalho = json.dumps(
+        {'formato': FORMATO, 'pares': pares, 'tabelas': tabelas},
+        ensure_ascii=False, separators=(',', ':'),
+    ).encode('utf-8')
+    return zlib.compress(_PREFIXO.pack(len(cabecalho)) + cabecalho + b''.join(blocos))
+
+
+def desserializar_resultados(dados: bytes) -> List[ResultadoAnalise]:
+    """
+    Reconstrói os resultados gravados por ``serializar_resultados``
+
+    Raises:
+        ValueError: Se o bloco estiver corrompido ou em outro formato
+    """
+    try:
+        bruto = zlib.decompress(dados)
+        (tamanho_cabecalho,) = _PREFIXO.unpack_from(bruto)
+        inicio = _PREFIXO.size + tamanho_cabecalho
+        cabecalho = json.loads(bruto[_PREFIXO.size:inicio].decode('utf-8'))
+    except (zlib.error, struct.error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Resultados gravados ilegíveis: {exc}") from exc
+    if cabecalho.get('formato') != FORMATO:
+        raise ValueError(f"Formato de resultados {cabecalho.get('formato')} não suportado")
+
+    tabelas: List[TabelaRegistros] = []
+    posicao = inicio
+    for tabela in cabecalho['tabelas']:
+        arrays = {}
+        for coluna, tipo, tamanho in tabela['colunas']:
+            if posicao + tamanho > len(bruto):
+                raise ValueError("Resultados gravados truncados")
+            dtype = np.dtype(tipo)
+            arrays[coluna] = np.frombuffer(
+                bruto, dtype=dtype, count=tamanho // dtype.itemsize, offset=posicao
+            )
+            posicao += tamanho
+        tabelas.append(_TIPOS_TABELA[tabela['tipo']].de_estado(
+            tabela['tamanho'], tabela['categorias'], arrays
+        ))
+
+    return [
+        ResultadoAnalise(
+            par_fontes=(par['par_fontes'][0], par['par_fontes'][1]),
+            detalhes_divergencias=tabelas[par['divergencias']],
+            erros_validacao={
+                fonte: tabelas[indice]
+                for fonte, indice in par['validacao'].items()
+            },
+            **{campo: par[campo] for campo in _CAMPOS_ESCALARES},
+        )
+        for par in cabecalho['pares']
+    ]
+
+
+class CacheResultados:
+    """
+    Resultados de cada mês, reaproveitados enquanto as entradas não mudarem
+
+    A chave é o mês, as fontes conciliadas, a impressão digital dos arquivos
+    do mês e a versão do analisador: arquivos alterados ou regras novas
+    fazem o mês ser recalculado. Cada mês guarda só a gravação mais recente.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        pasta = os.path.dirname(db_path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão que confirma a transação e é fechada ao sair."""
+        # Timeout generoso: conciliações em lote gravam a partir de vários processos
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _chave_fontes(fontes: Optional[Sequence[str]]) -> str:
+        return ','.join(sorted(fontes)) if fontes is not None else '*'
+
+    @staticmethod
+    def _versao(versao_analisador: str) -> str:
+        return f"{versao_analisador}|formato={FORMATO}"
+
+    def obter(
+        self,
+        mes_ano: str,
+        fingerprint: str,
+        versao_analisador: str,
+        fontes: Optional[Sequence[str]] = None,
+    ) -> Optional[List[ResultadoAnalise]]:
+        """
+        Resultados gravados do mês, se as entradas e o analisador forem os mesmos
+
+        Args:
+            mes_ano: Mês no formato "072025"
+            fingerprint: Impressão digital atual dos arquivos do mês
+            versao_analisador: ``Analisador.versao``
+            fontes: Fontes conciliadas (padrão: todas)
+        """
+        with self._conectar() as conn:
+            linha = conn.execute(
+                "SELECT dados FROM resultados "
+                "WHERE mes_ano = ? AND fontes = ? AND fingerprint = ? AND versao = ?",
+                (mes_ano, self._chave_fontes(fontes), fingerprint,
+                 self._versao(versao_analisador)),
+            ).fetchone()
+        resultados = None
+        if linha is not None:
+            try:
+                resultados = desserializar_resultados(linha[0])
+            except (ValueError, KeyError, TypeError, IndexError) as exc:
+                self.logger.warning("Resultados gravados de %s descartados: %s", mes_ano, exc)
+        registrar_cache('resultados', resultados is not None)
+        return resultados
+
+    def guardar(
+        self,
+        mes_ano: str,
+        fingerprint: str,
+        versao_analisador: str,
+        resultados: Sequence[ResultadoAnalise],
+        fontes: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Grava os resultados do mês, substituindo a gravação anterior
+
+        Returns:
+            Bytes gravados
+        """
+        dados = serializar_resultados(resultados)
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO resultados "
+                "(mes_ano, fontes, fingerprint, versao, gravado_em, dados) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (mes_ano, self._chave_fontes(fontes), fingerprint,
+                 self._versao(versao_analisador), time.time(), sqlite3.Binary(dados)),
+            )
+        return len(dados)
@@ -0,0 +1,104 @@
+"""Cache em memória dos meses carregados durante uma sessão."""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.models.instrumentacao import registrar_cache
+
+# Limite padrão de memória ocupada pelos DataFrames em cache
+LIMITE_MEMORIA_CACHE_PADRAO = 256 * 1024 * 1024
+
+
+def tamanho_dados(dados: Dict[str, pd.DataFrame]) -> int:
+    """Bytes ocupados pelos DataFrames de um mês (inclui o conteúdo das strings)."""
+    return int(sum(df.memory_usage(deep=True).sum() for df in dados.values()))
+
+
+class CacheSessao:
+    """
+    Meses já carregados, indexados por mês e impressão digital dos arquivos
+
+    Uma entrada só é devolvida se a impressão digital atual dos arquivos for
+    a mesma da gravação; arquivos alterados invalidam o mês. Quando o total
+    em memória passa do limite, os meses usados há mais tempo são removidos.
+    Seguro para uso a partir da thread de pré-carregamento.
+    """
+
+    def __init__(self, limite_bytes: int = LIMITE_MEMORIA_CACHE_PADRAO):
+        self.limite_bytes = limite_bytes
+        self.logger = logging.getLogger(__name__)
+        self._entradas: "OrderedDict[str, Tuple[str, Dict[str, pd.DataFrame], int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    @property
+    def tamanho_bytes(self) -> int:
+        """Total de bytes em cache."""
+        with self._lock:
+            return sum(tamanho for _, _, tamanho in self._entradas.values())
+
+    @property
+    def meses(self) -> List[str]:
+        """Meses em cache, do usado há mais tempo ao mais recente."""
+        with self._lock:
+            return list(self._entradas)
+
+    def contem(self, mes_ano: str, fingerprint: str) -> bool:
+        """Indica se o mês está em cache com a mesma impressão digital (sem contar acesso)."""
+        with self._lock:
+            entrada = self._entradas.get(mes_ano)
+            return entrada is not None and entrada[0] == fingerprint
+
+    def obter(self, mes_ano: str, fingerprint: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """Retorna os dados do mês se ainda forem válidos para a impressão digital."""
+        with self._lock:
+            entrada = self._entradas.get(mes_ano)
+            if entrada is None or entrada[0] != fingerprint:
+                if entrada is not None:
+                    del self._entradas[mes_ano]
+                self.falhas += 1
+                registrar_cache('sessao', False)
+                return None
+            self._entradas.move_to_end(mes_ano)
+            self.acertos += 1
+            registrar_cache('sessao', True)
+            return entrada[1]
+
+    def guardar(self, mes_ano: str, fingerprint: str, dados: Dict[str, pd.DataFrame]) -> bool:
+        """
+        Guarda os dados de um mês, removendo os menos usados se necessário
+
+        Returns:
+            False se o mês sozinho não cabe no limite (nada é guardado)
+        """
+        tamanho = tamanho_dados(dados)
+        if tamanho > self.limite_bytes:
+            self.logger.info(
+                "Mês %s (%.1f MB) não cabe no cache da sessão", mes_ano, tamanho / 1024 ** 2
+            )
+            return False
+
+        with self._lock:
+            self._entradas.pop(mes_ano, None)
+            ocupado = sum(t for _, _, t in self._entradas.values())
+            while self._entradas and ocupado + tamanho > self.limite_bytes:
+                removido, (_, _, tamanho_removido) = self._entradas.popitem(last=False)
+                ocupado -= tamanho_removido
+                self.logger.info("Mês %s removido do cache da sessão", removido)
+            self._entradas[mes_ano] = (fingerprint, dados, tamanho)
+        return True
+
+    def cabe(self, dados_bytes: int) -> bool:
+        """Indica se ``dados_bytes`` cabem sem remover nenhum mês em cache."""
+        return self.tamanho_bytes + dados_bytes <= self.limite_bytes
+
+    def limpar(self) -> None:
+        """Remove todos os meses."""
+        with self._lock:
+            self._entradas.clear()
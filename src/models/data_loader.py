@@ -1,15 +1,23 @@
 """Data Loader - Modelo para carregamento e padronização dos dados."""
+import hashlib
 import logging
 import os
-from typing import Dict, List, Optional
+import re
+from typing import Collection, Dict, List, Optional, Tuple
 
 import pandas as pd
 
-from .analisador import _to_float_brl
 from .c6_loader import (
     FATURAMENTO_C6_COLS,
     PAGAMENTO_C6_COLS,
 )
+from .instrumentacao import etapa
+from .validacao import (
+    ATRIBUTO_COLUNAS_AUSENTES,
+    ATRIBUTO_COLUNAS_DERIVADAS,
+    ATRIBUTO_COLUNAS_INESPERADAS,
+    converter_brl,
+)
 from .wab_loader import (
     WAB_COLS,
 )
@@ -23,6 +31,29 @@ from .wab_loader import (
     ler_wab_txt as wab_txt,
 )
 
+NOMES_PASTAS_MESES: Dict[str, str] = {
+    '01': 'janeiro', '02': 'fevereiro', '03': 'marco', '04': 'abril',
+    '05': 'maio', '06': 'junho', '07': 'julho', '08': 'agosto',
+    '09': 'setembro', '10': 'outubro', '11': 'novembro', '12': 'dezembro',
+}
+
+
+# Predicados de linha por fonte, aplicados durante a leitura (antes da
+# normalização de valores e datas): (coluna, operação, texto). O faturamento
+# C6 não é filtrado aqui: as recusadas são necessárias para o analisador
+# reconhecer as retentativas e só saem do total depois disso.
+FiltroLinha = Tuple[str, str, str]
+FILTROS_LINHAS: Dict[str, List[FiltroLinha]] = {
+    'pagamento_c6': [('status', 'contem', 'Recebido')],
+    'pagamento_gds': [('tipo', 'contem', 'Receita'), ('pago', 'contem', 'Sim')],
+}
+
+TAMANHO_BLOCO_LEITURA = 50_000
+
+PADRAO_ARQUIVO_FONTE = re.compile(
+    r'^(?:faturamento|pagamento)_(?:C6|GDS|WAB)_(\d{6})\.(?:csv|json)$'
+)
+
 
 class DataLoader:
     """Classe responsável pelo carregamento e padronização dos dados de faturamento e pagamento"""
@@ -61,8 +92,19 @@ class DataLoader:
 
         self.wab_cols = WAB_COLS
 
+        # Filtros aplicados em carregar_dados_mes; podem ser ajustados por fonte
+        self.filtros_linhas: Dict[str, List[FiltroLinha]] = {
+            fonte: list(filtros) for fonte, filtros in FILTROS_LINHAS.items()
+        }
+
     def padronizar_colunas(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Padroniza nomes de colunas para um formato interno consistente."""
+        """
+        Padroniza nomes de colunas para um formato interno consistente.
+
+        Converte as colunas de R$ conhecidas para float; células que não são
+        número mantêm o texto original, para a validação do analisador
+        apontá-las.
+        """
         if df.empty:
             return df
 
@@ -93,34 +135,87 @@ class DataLoader:
             'valor_parcela',
         ]:
             if coluna in df_pad.columns:
-                df_pad[coluna] = df_pad[coluna].map(_to_float_brl)
+                valores, invalidos, _vazios = converter_brl(df_pad[coluna])
+                df_pad[coluna] = (
+                    valores.astype(object).where(~invalidos, df_pad[coluna])
+                    if invalidos.any() else valores
+                )
 
         # Cria coluna 'valor' genérica quando possível para evitar KeyError
         if 'valor' not in df_pad.columns:
-            if 'valor_venda' in df_pad.columns:
-                df_pad['valor'] = df_pad['valor_venda']
-            elif 'valor_recebivel' in df_pad.columns:
-                df_pad['valor'] = df_pad['valor_recebivel']
-            elif 'valor_pagamento' in df_pad.columns:
-                df_pad['valor'] = df_pad['valor_pagamento']
+            origem = next(
+                (c for c in ('valor_venda', 'valor_recebivel', 'valor_pagamento')
+                 if c in df_pad.columns),
+                None,
+            )
+            if origem:
+                df_pad['valor'] = df_pad[origem]
+                # Cópia de outra coluna: a validação não aponta o mesmo erro duas vezes
+                df_pad.attrs[ATRIBUTO_COLUNAS_DERIVADAS] = ['valor']
 
         return df_pad
 
+    @staticmethod
+    def verificar_cabecalho(df: pd.DataFrame, esquema: Collection[str]) -> None:
+        """
+        Compara as colunas lidas com o esquema da fonte
+
+        Anota em ``df.attrs`` as colunas fora do esquema e as do esquema que
+        não vieram no arquivo; a validação do analisador as reporta. Colunas
+        sem nome e sem nenhum valor (``;;;`` no fim das linhas do C6) são
+        ignoradas.
+        """
+        inesperadas = [
+            str(c) for c in df.columns
+            if c not in esquema and not (str(c).startswith('Unnamed:') and df[c].isna().all())
+        ]
+        df.attrs[ATRIBUTO_COLUNAS_INESPERADAS] = inesperadas
+        df.attrs[ATRIBUTO_COLUNAS_AUSENTES] = [c for c in esquema if c not in df.columns]
+
     def ler_csv(
         self,
         file_path: str,
         column_mapping: Optional[Dict[str, str]] = None,
+        filtros: Optional[List[FiltroLinha]] = None,
     ) -> pd.DataFrame:
-        """Lê arquivo CSV e aplica mapeamento de colunas."""
-        mapping = column_mapping or {}
+        """
+        Lê arquivo CSV e aplica mapeamento de colunas.
 
+        Com ``filtros``, o arquivo é lido em blocos e as linhas que não
+        satisfazem os predicados são descartadas bloco a bloco, antes da
+        padronização de valores. A quantidade descartada fica em
+        ``df.attrs['linhas_descartadas']``.
+        """
+        mapping = column_mapping or {}
 
         try:
-            df = pd.read_csv(file_path, sep=None, engine="python")
-            df.columns = df.columns.str.strip()
+            if filtros:
+                blocos = []
+                descartadas = 0
+                leitor = pd.read_csv(
+                    file_path, sep=None, engine="python", chunksize=TAMANHO_BLOCO_LEITURA
+                )
+                for bloco in leitor:
+                    bloco = self._renomear_colunas(bloco, mapping)
+                    filtrado = self._aplicar_filtros(bloco, filtros)
+                    descartadas += len(bloco) - len(filtrado)
+                    blocos.append(filtrado)
+                df = pd.concat(blocos) if blocos else pd.DataFrame()
+            else:
+                df = pd.read_csv(file_path, sep=None, engine="python")
+                df = self._renomear_colunas(df, mapping)
+                descartadas = 0
+
             if mapping:
-                df = df.rename(columns=mapping)
+                self.verificar_cabecalho(df, list(mapping.values()))
             df = self.padronizar_colunas(df)
+            df.attrs['linhas_descartadas'] = descartadas
+            if descartadas:
+                self.logger.info(
+                    "%s: %d linha(s) descartada(s) pelos filtros de leitura",
+                    os.path.basename(file_path),
+                    descartadas,
+                )
 
             return df
         except FileNotFoundError:
@@ -130,6 +225,40 @@ class DataLoader:
             self.logger.error("Erro ao ler CSV %s: %s", file_path, exc)
             return pd.DataFrame()
 
+    @staticmethod
+    def _renomear_colunas(df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
+        """Limpa os cabeçalhos e aplica o mapeamento de colunas"""
+        # Exportações do C6 e do GDS começam com BOM UTF-8
+        df.columns = df.columns.str.strip().str.lstrip('\ufeff')
+        if mapping:
+            df = df.rename(columns=mapping)
+        return df
+
+    @staticmethod
+    def _aplicar_filtros(df: pd.DataFrame, filtros: List[FiltroLinha]) -> pd.DataFrame:
+        """
+        Aplica predicados (coluna, operação, texto) a um bloco de linhas
+
+        Operações: ``'contem'`` (valores vazios são descartados) e
+        ``'nao_contem'`` (valores vazios são mantidos). Predicados sobre
+        colunas ausentes são ignorados.
+        """
+        mascara = pd.Series(True, index=df.index)
+        for coluna, operacao, texto in filtros:
+            if coluna not in df.columns:
+                continue
+            contem = (
+                df[coluna].astype('string').str.contains(texto, regex=False)
+                .fillna(False).astype(bool)
+            )
+            if operacao == 'contem':
+                mascara &= contem
+            elif operacao == 'nao_contem':
+                mascara &= ~contem
+            else:
+                raise ValueError(f"Operação de filtro desconhecida: {operacao}")
+        return df[mascara]
+
     def ler_wab_txt(self, file_path: str) -> pd.DataFrame:
         """
         Lê o arquivo WAB em formato TXT (LEGADO - usado apenas para conversão inicial)
@@ -157,6 +286,8 @@ class DataLoader:
         """
 
         df = wab_json(file_path)
+        if not df.empty:
+            self.verificar_cabecalho(df, list(self.wab_cols.values()))
         return self.padronizar_colunas(df)
 
 
@@ -164,60 +295,116 @@ class DataLoader:
         """Converte arquivo WAB TXT para JSON."""
         return wab_converter(txt_path, json_path)
 
-    def carregar_dados_mes(self, mes_ano: str) -> Dict[str, pd.DataFrame]:
+    def caminhos_fontes(self, mes_ano: str) -> Dict[str, str]:
+        """
+        Retorna o caminho esperado do arquivo de cada fonte de um mês
+
+        Args:
+            mes_ano: String no formato "072025" (mês + ano)
+
+        Returns:
+            Dict fonte -> caminho do arquivo (que pode não existir)
+        """
+        pasta_mes = self._resolver_pasta_mes(mes_ano)
+        return {
+            'faturamento_c6': os.path.join(pasta_mes, f'faturamento_C6_{mes_ano}.csv'),
+            'faturamento_gds': os.path.join(pasta_mes, f'faturamento_GDS_{mes_ano}.csv'),
+            # WAB agora usa JSON exclusivamente
+            'faturamento_wab': os.path.join(pasta_mes, f'faturamento_WAB_{mes_ano}.json'),
+            'pagamento_c6': os.path.join(pasta_mes, f'pagamento_C6_{mes_ano}.csv'),
+            'pagamento_gds': os.path.join(pasta_mes, f'pagamento_GDS_{mes_ano}.csv'),
+        }
+
+    def listar_meses_disponiveis(self) -> List[str]:
+        """
+        Lista os meses (MMAAAA) com algum arquivo de origem no diretório base
+
+        Returns:
+            Meses em ordem cronológica
+        """
+        meses = set()
+        for _root, _dirs, files in os.walk(self.base_path):
+            for nome in files:
+                encontrado = PADRAO_ARQUIVO_FONTE.match(nome)
+                if encontrado:
+                    meses.add(encontrado.group(1))
+        return sorted(meses, key=lambda m: (m[2:], m[:2]))
+
+    def fingerprint_mes(self, mes_ano: str) -> str:
+        """
+        Calcula uma impressão digital dos arquivos de origem de um mês
+
+        Usa apenas nome, tamanho e data de modificação de cada arquivo
+        (sem ler o conteúdo), então é barata o bastante para ser consultada
+        antes de decidir se um mês precisa ser reprocessado.
+        """
+        partes = [
+            self._assinatura_arquivo(fonte, caminho)
+            for fonte, caminho in sorted(self.caminhos_fontes(mes_ano).items())
+        ]
+        return hashlib.sha1("|".join(partes).encode("utf-8")).hexdigest()
+
+    def fingerprint_fonte(self, mes_ano: str, fonte: str) -> str:
+        """Impressão digital do arquivo de uma única fonte do mês (como fingerprint_mes)"""
+        caminho = self.caminhos_fontes(mes_ano).get(fonte)
+        assinatura = self._assinatura_arquivo(fonte, caminho) if caminho else f"{fonte}:-"
+        return hashlib.sha1(assinatura.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _assinatura_arquivo(fonte: str, caminho: str) -> str:
+        try:
+            info = os.stat(caminho)
+            return f"{fonte}:{info.st_size}:{info.st_mtime_ns}"
+        except OSError:
+            return f"{fonte}:-"
+
+    def carregar_dados_mes(
+        self, mes_ano: str, fontes: Optional[List[str]] = None
+    ) -> Dict[str, pd.DataFrame]:
         """
         Carrega todos os dados de faturamento e pagamento para um mês específico
         
         Args:
             mes_ano: String no formato "072025" (mês + ano)
+            fontes: Carrega apenas estas fontes (padrão: todas)
             
         Returns:
             Dict com DataFrames de cada fonte
         """
-        pasta_mes = os.path.join(self.base_path, self._get_pasta_mes(mes_ano))
-        
-        dados = {}
-        
-        # Faturamentos
-        arquivos_faturamento = {
-            'faturamento_c6': (f'faturamento_C6_{mes_ano}.csv', self.faturamento_c6_cols),
-            'faturamento_gds': (f'faturamento_GDS_{mes_ano}.csv', self.faturamento_gds_cols),
-            'faturamento_wab': (f'faturamento_WAB_{mes_ano}.json', None)  # WAB agora usa JSON exclusivamente
-        }
-        
-        # Pagamentos
-        arquivos_pagamento = {
-            'pagamento_c6': (f'pagamento_C6_{mes_ano}.csv', self.pagamento_c6_cols),
-            'pagamento_gds': (f'pagamento_GDS_{mes_ano}.csv', self.pagamento_gds_cols)
+        mapeamentos = {
+            'faturamento_c6': self.faturamento_c6_cols,
+            'faturamento_gds': self.faturamento_gds_cols,
+            'pagamento_c6': self.pagamento_c6_cols,
+            'pagamento_gds': self.pagamento_gds_cols,
         }
-        
-        # Carrega faturamentos
-        for key, (filename, cols) in arquivos_faturamento.items():
-            if key == 'faturamento_wab':
-                # Para WAB, usa apenas JSON como fonte oficial
-                json_path = os.path.join(pasta_mes, filename)
-                
-                if os.path.exists(json_path):
-                    dados[key] = self.ler_wab_json(json_path)
-                else:
-                    self.logger.warning(f"Arquivo WAB JSON não encontrado: {json_path}")
-                    dados[key] = pd.DataFrame()
-            else:
-                file_path = os.path.join(pasta_mes, filename)
-                if os.path.exists(file_path):
-                    dados[key] = self.ler_csv(file_path, cols)
+
+        dados = {}
+        for key, file_path in self.caminhos_fontes(mes_ano).items():
+            if fontes is not None and key not in fontes:
+                continue
+            if not os.path.exists(file_path):
+                if key == 'faturamento_wab':
+                    self.logger.warning(f"Arquivo WAB JSON não encontrado: {file_path}")
                 else:
                     self.logger.warning(f"Arquivo não encontrado: {file_path}")
-                    dados[key] = pd.DataFrame()
-        
-        # Carrega pagamentos
-        for key, (filename, cols) in arquivos_pagamento.items():
-            file_path = os.path.join(pasta_mes, filename)
-            if os.path.exists(file_path):
-                dados[key] = self.ler_csv(file_path, cols)
-            else:
-                self.logger.warning(f"Arquivo não encontrado: {file_path}")
                 dados[key] = pd.DataFrame()
+            elif key == 'faturamento_wab':
+                # Para WAB, usa apenas JSON como fonte oficial
+                with etapa(
+                    'ler_wab_json', key, bytes_lidos=os.path.getsize(file_path)
+                ) as medida:
+                    dados[key] = self.ler_wab_json(file_path)
+                    medida.registrar_saida(dados[key])
+                    medida.linhas_entrada = medida.linhas_saida
+            else:
+                with etapa('ler_csv', key, bytes_lidos=os.path.getsize(file_path)) as medida:
+                    dados[key] = self.ler_csv(
+                        file_path, mapeamentos[key], self.filtros_linhas.get(key)
+                    )
+                    medida.registrar_saida(dados[key])
+                    medida.linhas_entrada = (
+                        medida.linhas_saida + dados[key].attrs.get('linhas_descartadas', 0)
+                    )
         
         return dados
 
@@ -238,7 +425,7 @@ class DataLoader:
         try:
             if mes_ano:
                 # Converte apenas um mês específico
-                pasta_mes = os.path.join(self.base_path, self._get_pasta_mes(mes_ano))
+                pasta_mes = self._resolver_pasta_mes(mes_ano)
                 txt_path = os.path.join(pasta_mes, f'faturamento_WAB_{mes_ano}.txt')
                 
                 if os.path.exists(txt_path):
@@ -290,6 +477,24 @@ class DataLoader:
             return mes_ano
         return mes_ano.lower()
 
+    def _resolver_pasta_mes(self, mes_ano: str) -> str:
+        """
+        Resolve a pasta de um mês no diretório base.
+
+        Aceita tanto a pasta numérica ("072025") quanto a pasta nomeada pelo
+        mês ("julho"), que é o formato usado em ``faturamentos/``.
+        """
+        pasta = os.path.join(self.base_path, self._get_pasta_mes(mes_ano))
+        if os.path.isdir(pasta) or not mes_ano.isdigit():
+            return pasta
+
+        nome_mes = NOMES_PASTAS_MESES.get(mes_ano[:2])
+        if nome_mes:
+            pasta_nomeada = os.path.join(self.base_path, nome_mes)
+            if os.path.isdir(pasta_nomeada):
+                return pasta_nomeada
+        return pasta
+
     def padronizar_valores_monetarios(self, df: pd.DataFrame, colunas_valor: List[str]) -> pd.DataFrame:
         """Padroniza valores monetários removendo formatação"""
         df_copy = df.copy()
@@ -0,0 +1,79 @@
+"""Estatísticas descritivas das colunas de uma fonte, calculadas em bloco."""
+import warnings
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Quantis incluídos nas estatísticas de cada coluna numérica
+QUANTIS: Dict[str, float] = {'q1': 0.25, 'mediana': 0.5, 'q3': 0.75}
+
+
+def calcular_estatisticas(
+    df: pd.DataFrame, quantis: Dict[str, float] = QUANTIS
+) -> Dict[str, Dict[str, float]]:
+    """
+    Estatísticas de todas as colunas numéricas de uma vez
+
+    As colunas numéricas são convertidas em uma única matriz float64 e cada
+    agregado é uma redução numpy sobre o eixo das linhas (todas as colunas
+    juntas), ignorando valores ausentes.
+
+    Args:
+        df: DataFrame já normalizado (valores em R$ convertidos para float)
+        quantis: Nome -> quantil (0 a 1) a incluir
+
+    Returns:
+        Dict coluna -> {total, media, minimo, maximo, contagem, <quantis>};
+        colunas sem nenhum valor preenchido ficam de fora
+    """
+    numericas = df.select_dtypes(include='number')
+    if numericas.shape[1] == 0:
+        return {}
+
+    matriz = numericas.to_numpy(dtype='float64', na_value=np.nan)
+    presentes = ~np.isnan(matriz)
+    contagem = presentes.sum(axis=0)
+    with warnings.catch_warnings():
+        # Colunas sem nenhum valor geram "All-NaN slice" / "Mean of empty slice"
+        warnings.simplefilter('ignore', RuntimeWarning)
+        total = np.nansum(matriz, axis=0)
+        media = np.nanmean(matriz, axis=0)
+        minimo = np.nanmin(matriz, axis=0)
+        maximo = np.nanmax(matriz, axis=0)
+        valores_quantis = (
+            np.nanquantile(matriz, list(quantis.values()), axis=0)
+            if quantis and len(matriz) else np.full((len(quantis), matriz.shape[1]), np.nan)
+        )
+
+    estatisticas: Dict[str, Dict[str, float]] = {}
+    for i, coluna in enumerate(numericas.columns):
+        if not contagem[i]:
+            continue
+        estatisticas[str(coluna)] = {
+            'total': float(total[i]),
+            'media': float(media[i]),
+            'minimo': float(minimo[i]),
+            'maximo': float(maximo[i]),
+            'contagem': int(contagem[i]),
+            **{nome: float(valores_quantis[j][i]) for j, nome in enumerate(quantis)},
+        }
+    return estatisticas
+
+
+def contar_nulos(df: pd.DataFrame, colunas: Sequence[str] = ()) -> Dict[str, int]:
+    """
+    Valores ausentes por coluna no DataFrame como foi lido
+
+    Textos vazios ou só com espaços contam como ausentes, já que os
+    arquivos de origem exportam campos vazios assim.
+    """
+    colunas = list(colunas) or list(df.columns)
+    if not colunas or df.empty:
+        return {str(c): 0 for c in colunas}
+    ausentes = df[colunas].isna()
+    texto = df[colunas].select_dtypes(include=['object', 'string'])
+    if texto.shape[1]:
+        vazios = texto.apply(lambda s: s.astype('string').str.strip().eq('')).fillna(False)
+        ausentes[vazios.columns] = ausentes[vazios.columns] | vazios.astype(bool)
+    return {str(c): int(n) for c, n in ausentes.sum().items()}
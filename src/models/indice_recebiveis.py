@@ -0,0 +1,285 @@
+"""Índice persistente de vendas e recebíveis do C6 entre meses."""
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from .validacao import converter_brl
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meses_indexados (
+    mes_ano TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vendas (
+    mes_ano TEXT NOT NULL,
+    linha INTEGER NOT NULL,
+    num_cartao TEXT NOT NULL,
+    data_venda TEXT NOT NULL,
+    hora_venda TEXT NOT NULL,
+    valor_centavos INTEGER NOT NULL,
+    parcelas TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_vendas_chave ON vendas (num_cartao, data_venda, valor_centavos);
+CREATE INDEX IF NOT EXISTS idx_vendas_mes ON vendas (mes_ano);
+CREATE TABLE IF NOT EXISTS recebiveis (
+    mes_ano TEXT NOT NULL,
+    codigo_venda TEXT NOT NULL,
+    num_cartao TEXT NOT NULL,
+    data_venda TEXT NOT NULL,
+    hora_venda TEXT NOT NULL,
+    valor_venda_centavos INTEGER NOT NULL,
+    parcela TEXT NOT NULL,
+    valor_recebivel_centavos INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recebiveis_venda ON recebiveis (codigo_venda, num_cartao, data_venda);
+CREATE INDEX IF NOT EXISTS idx_recebiveis_mes ON recebiveis (mes_ano);
+"""
+
+# Escolhe, para cada recebível, a venda de mesmo cartão/data/valor com horário mais próximo
+_SQL_VINCULAR = """
+SELECT posicao, mes_origem, linha_origem, hora_origem
+FROM (
+    SELECT c.posicao, v.mes_ano AS mes_origem, v.linha AS linha_origem, v.hora_venda AS hora_origem,
+           ROW_NUMBER() OVER (
+               PARTITION BY c.posicao
+               ORDER BY ABS(
+                   COALESCE(strftime('%s', '2000-01-01 ' || v.hora_venda), 0)
+                   - COALESCE(strftime('%s', '2000-01-01 ' || c.hora_venda), 0)
+               )
+           ) AS ordem
+    FROM temp.consulta c
+    JOIN vendas v
+      ON v.num_cartao = c.num_cartao
+     AND v.data_venda = c.data_venda
+     AND v.valor_centavos = c.valor_centavos
+)
+WHERE ordem = 1
+ORDER BY posicao
+"""
+
+
+def _centavos(serie: pd.Series) -> pd.Series:
+    """Converte valores BRL em centavos inteiros."""
+    return (converter_brl(serie)[0] * 100).round().astype('int64')
+
+
+def _datas_iso(serie: pd.Series) -> pd.Series:
+    """Converte datas dd/mm/aaaa (ou datetime) para AAAA-MM-DD."""
+    if not pd.api.types.is_datetime64_any_dtype(serie):
+        serie = pd.to_datetime(serie, format='%d/%m/%Y', errors='coerce')
+    return serie.dt.strftime('%Y-%m-%d').fillna('')
+
+
+def _texto(df: pd.DataFrame, coluna: str) -> pd.Series:
+    """Coluna como texto limpo, ou vazia quando ausente."""
+    if coluna not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[coluna].fillna('').astype(str).str.strip()
+
+
+class IndiceRecebiveis:
+    """
+    Índice SQLite das vendas (faturamento C6) e recebíveis (pagamento C6)
+
+    Cada mês é indexado uma vez e reindexado apenas quando seus arquivos
+    mudam. Os recebíveis de um mês (que podem vir de vendas de meses
+    anteriores, ex: parcelas) são vinculados à venda de origem com uma
+    consulta indexada por cartão, data e valor, sem recarregar os meses
+    de origem.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        pasta = os.path.dirname(db_path)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão que confirma a transação e é fechada ao sair."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _chave(fingerprint: str, versao_analisador: str) -> str:
+        """Impressão digital dos arquivos com a versão das regras que os leram."""
+        return f"{fingerprint}|{versao_analisador}"
+
+    def precisa_atualizar(self, mes_ano: str, fingerprint: str, versao_analisador: str) -> bool:
+        """Indica se o mês ainda não foi indexado com estes arquivos e esta versão."""
+        with self._conectar() as conn:
+            linha = conn.execute(
+                "SELECT fingerprint FROM meses_indexados WHERE mes_ano = ?", (mes_ano,)
+            ).fetchone()
+        return linha is None or linha[0] != self._chave(fingerprint, versao_analisador)
+
+    def meses_indexados(self) -> List[str]:
+        """Lista os meses presentes no índice."""
+        with self._conectar() as conn:
+            linhas = conn.execute("SELECT mes_ano FROM meses_indexados").fetchall()
+        return sorted((m for (m,) in linhas), key=lambda m: (m[2:], m[:2]))
+
+    def indexar_mes(
+        self,
+        mes_ano: str,
+        fingerprint: str,
+        versao_analisador: str,
+        faturamento_c6: pd.DataFrame,
+        pagamento_c6: pd.DataFrame,
+    ) -> None:
+        """
+        Substitui as vendas e recebíveis de um mês no índice
+
+        Args:
+            mes_ano: String no formato "072025"
+            fingerprint: Impressão digital dos arquivos de origem do mês
+            versao_analisador: ``Analisador.versao`` em uso na leitura
+            faturamento_c6: Vendas do mês (colunas mapeadas do C6)
+            pagamento_c6: Recebíveis do mês (colunas mapeadas do C6)
+        """
+        vendas = self._preparar_vendas(mes_ano, faturamento_c6)
+        recebiveis = self._preparar_recebiveis(mes_ano, pagamento_c6)
+
+        with self._conectar() as conn:
+            conn.execute("DELETE FROM vendas WHERE mes_ano = ?", (mes_ano,))
+            conn.execute("DELETE FROM recebiveis WHERE mes_ano = ?", (mes_ano,))
+            conn.executemany(
+                "INSERT INTO vendas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                vendas.itertuples(index=False, name=None),
+            )
+            conn.executemany(
+                "INSERT INTO recebiveis VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                recebiveis.itertuples(index=False, name=None),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meses_indexados (mes_ano, fingerprint) VALUES (?, ?)",
+                (mes_ano, self._chave(fingerprint, versao_analisador)),
+            )
+        self.logger.info(
+            "Índice de recebíveis: %s com %d vendas e %d recebíveis",
+            mes_ano, len(vendas), len(recebiveis),
+        )
+
+    def vincular(self, pagamento_c6: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vincula recebíveis às vendas de origem em qualquer mês indexado
+
+        Args:
+            pagamento_c6: Recebíveis (colunas mapeadas do C6)
+
+        Returns:
+            DataFrame alinhado ao de entrada com as colunas codigo_venda,
+            num_cartao, data_venda, mes_origem, linha_origem e hora_origem
+            (vazias quando a venda de origem não está indexada)
+        """
+        colunas = ['codigo_venda', 'num_cartao', 'data_venda',
+                   'mes_origem', 'linha_origem', 'hora_origem']
+        if pagamento_c6.empty:
+            return pd.DataFrame(columns=colunas)
+
+        valor = 'valor_venda' if 'valor_venda' in pagamento_c6.columns else 'valor'
+        consulta = pd.DataFrame({
+            'posicao': range(len(pagamento_c6)),
+            'codigo_venda': _texto(pagamento_c6, 'codigo_venda').to_numpy(),
+            'num_cartao': _texto(pagamento_c6, 'num_cartao').to_numpy(),
+            'data_venda': _datas_iso(pagamento_c6['data_venda']).to_numpy()
+            if 'data_venda' in pagamento_c6.columns else '',
+            'hora_venda': _texto(pagamento_c6, 'hora_venda').to_numpy(),
+            'valor_centavos': _centavos(pagamento_c6[valor]).to_numpy()
+            if valor in pagamento_c6.columns else 0,
+        })
+
+        with self._conectar() as conn:
+            conn.execute(
+                "CREATE TEMP TABLE consulta (posicao INTEGER, codigo_venda TEXT, "
+                "num_cartao TEXT, data_venda TEXT, hora_venda TEXT, valor_centavos INTEGER)"
+            )
+            conn.executemany(
+                "INSERT INTO temp.consulta VALUES (?, ?, ?, ?, ?, ?)",
+                consulta.itertuples(index=False, name=None),
+            )
+            linhas = conn.execute(_SQL_VINCULAR).fetchall()
+
+        vinculos = pd.DataFrame(
+            linhas, columns=['posicao', 'mes_origem', 'linha_origem', 'hora_origem']
+        ).set_index('posicao')
+        resultado = consulta[['codigo_venda', 'num_cartao', 'data_venda']].join(vinculos)
+        resultado.index = pagamento_c6.index
+        return resultado
+
+    def origem_venda(
+        self, codigo_venda: str, num_cartao: str, data_venda: str
+    ) -> Optional[dict]:
+        """
+        Busca a venda de origem de um recebível já indexado
+
+        Args:
+            codigo_venda: Código da venda no C6
+            num_cartao: Número (mascarado) do cartão
+            data_venda: Data da venda em dd/mm/aaaa
+
+        Returns:
+            Dict com mes_ano, linha, hora_venda e valor da venda, ou None
+        """
+        data_iso = _datas_iso(pd.Series([data_venda])).iloc[0]
+        with self._conectar() as conn:
+            linha = conn.execute(
+                "SELECT v.mes_ano, v.linha, v.hora_venda, v.valor_centavos "
+                "FROM recebiveis r JOIN vendas v "
+                "  ON v.num_cartao = r.num_cartao AND v.data_venda = r.data_venda "
+                " AND v.valor_centavos = r.valor_venda_centavos "
+                "WHERE r.codigo_venda = ? AND r.num_cartao = ? AND r.data_venda = ? "
+                "LIMIT 1",
+                (codigo_venda, num_cartao, data_iso),
+            ).fetchone()
+        if linha is None:
+            return None
+        mes_ano, posicao, hora, centavos = linha
+        return {'mes_ano': mes_ano, 'linha': posicao, 'hora_venda': hora,
+                'valor': centavos / 100}
+
+    def _preparar_vendas(self, mes_ano: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Extrai as colunas indexadas das vendas do faturamento C6."""
+        if df.empty or 'data' not in df.columns:
+            return pd.DataFrame(columns=['mes_ano'])
+        valor = 'valor_faturado' if 'valor_faturado' in df.columns else 'valor'
+        vendas = pd.DataFrame({
+            'mes_ano': mes_ano,
+            # Posição da linha no arquivo (preservada pelos filtros de leitura)
+            'linha': df.index.to_numpy(),
+            'num_cartao': _texto(df, 'num_cartao').to_numpy(),
+            'data_venda': _datas_iso(df['data']).to_numpy(),
+            'hora_venda': _texto(df, 'hora').to_numpy(),
+            'valor_centavos': _centavos(df[valor]).to_numpy() if valor in df.columns else 0,
+            'parcelas': _texto(df, 'parcelas').to_numpy(),
+        })
+        return vendas[vendas['data_venda'] != '']
+
+    def _preparar_recebiveis(self, mes_ano: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Extrai as colunas indexadas dos recebíveis do pagamento C6."""
+        if df.empty or 'data_venda' not in df.columns:
+            return pd.DataFrame(columns=['mes_ano'])
+        recebiveis = pd.DataFrame({
+            'mes_ano': mes_ano,
+            'codigo_venda': _texto(df, 'codigo_venda').to_numpy(),
+            'num_cartao': _texto(df, 'num_cartao').to_numpy(),
+            'data_venda': _datas_iso(df['data_venda']).to_numpy(),
+            'hora_venda': _texto(df, 'hora_venda').to_numpy(),
+            'valor_venda_centavos': _centavos(df['valor_venda']).to_numpy()
+            if 'valor_venda' in df.columns else 0,
+            'parcela': _texto(df, 'parcelas').to_numpy(),
+            'valor_recebivel_centavos': _centavos(df['valor_recebivel']).to_numpy()
+            if 'valor_recebivel' in df.columns else 0,
+        })
+        return recebiveis[recebiveis['data_venda'] != '']
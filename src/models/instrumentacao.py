@@ -0,0 +1,266 @@
+"""
+Instrumentação por etapa - tempo, linhas e bytes de leituras, padronizações e análises
+
+Os models marcam suas etapas com ``etapa(...)``; o controller abre uma
+``coletar()`` por execução e recebe as etapas registradas na thread. Fora
+de uma coleta ativa, ``etapa`` só consulta uma variável thread-local e não
+mede nada; dentro dela, cada etapa custa duas leituras de perf_counter e um
+append, o que permite deixar a instrumentação sempre ligada.
+
+Com ``coletar(memoria=True)`` (opcional, caro) cada etapa também registra,
+via tracemalloc, o pico e o saldo de memória alocada durante o bloco, os
+locais que mais retiveram memória e o ``memory_usage(deep=True)`` do
+DataFrame produzido. O tracemalloc é global ao processo: use o modo de
+memória com uma conciliação por vez.
+"""
+import os
+import sysconfig
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Locais de alocação guardados por etapa no modo de memória
+LOCAIS_MEMORIA_PADRAO = 5
+
+_RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_RAIZ_STDLIB = sysconfig.get_paths()['stdlib']
+# Alocações da própria medição não entram nos locais reportados
+_ARQUIVOS_IGNORADOS = frozenset({tracemalloc.__file__, os.path.abspath(__file__)})
+
+
+@dataclass
+class Etapa:
+    """Uma etapa medida (leitura, padronização, análise...)."""
+    nome: str
+    fonte: str = ''
+    # Aninhamento: etapas internas a outra têm profundidade maior
+    profundidade: int = 0
+    duracao: float = 0.0
+    linhas_entrada: int = 0
+    linhas_saida: int = 0
+    bytes_lidos: int = 0
+    # Modo de memória: pico acima do início, saldo ao final, DataFrame de
+    # saída e locais (arquivo:linha, bytes, blocos) que mais retiveram memória
+    pico_bytes: int = 0
+    retidos_bytes: int = 0
+    bytes_dataframe: int = 0
+    locais: List[Tuple[str, int, int]] = field(default_factory=list)
+
+    def registrar_saida(self, df: 'pd.DataFrame', linhas: Optional[int] = None) -> None:
+        """
+        Registra o DataFrame produzido pela etapa
+
+        Args:
+            df: DataFrame de saída
+            linhas: Linhas de saída, se diferentes de ``len(df)``
+        """
+        self.linhas_saida = len(df) if linhas is None else linhas
+        metricas = coleta_ativa()
+        if metricas is not None and metricas.memoria:
+            self.bytes_dataframe = int(df.memory_usage(deep=True).sum())
+
+
+@dataclass
+class MetricasExecucao:
+    """Etapas de uma execução, na ordem em que começaram."""
+    rotulo: str = ''
+    etapas: List[Etapa] = field(default_factory=list)
+    duracao_total: float = 0.0
+    # Consultas a caches durante a execução: nome -> {acertos, falhas}
+    caches: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    memoria: bool = False
+    locais_memoria: int = LOCAIS_MEMORIA_PADRAO
+    # Modo de memória: pico da execução inteira acima do início
+    pico_bytes: int = 0
+
+    def agregar(self) -> Dict[str, Dict[str, float]]:
+        """
+        Totais por nome de etapa
+
+        Returns:
+            Dict nome -> {chamadas, duracao, linhas_entrada, linhas_saida,
+            bytes_lidos}; a duração de uma etapa inclui as internas a ela
+        """
+        agregado: Dict[str, Dict[str, float]] = {}
+        for e in self.etapas:
+            total = agregado.setdefault(e.nome, {
+                'chamadas': 0, 'duracao': 0.0, 'linhas_entrada': 0,
+                'linhas_saida': 0, 'bytes_lidos': 0,
+            })
+            total['chamadas'] += 1
+            total['duracao'] += e.duracao
+            total['linhas_entrada'] += e.linhas_entrada
+            total['linhas_saida'] += e.linhas_saida
+            total['bytes_lidos'] += e.bytes_lidos
+        return agregado
+
+
+_estado = threading.local()
+
+
+def coleta_ativa() -> Optional[MetricasExecucao]:
+    """Coleta aberta na thread corrente (None fora de ``coletar``)."""
+    return getattr(_estado, 'metricas', None)
+
+
+def registrar_cache(nome: str, acerto: bool) -> None:
+    """Conta uma consulta ao cache ``nome`` na coleta ativa (nada fora de ``coletar``)."""
+    metricas = coleta_ativa()
+    if metricas is None:
+        return
+    contagem = metricas.caches.setdefault(nome, {'acertos': 0, 'falhas': 0})
+    contagem['acertos' if acerto else 'falhas'] += 1
+
+
+@contextmanager
+def coletar(
+    rotulo: str = '', memoria: bool = False, locais: int = LOCAIS_MEMORIA_PADRAO
+) -> Iterator[MetricasExecucao]:
+    """
+    Registra as etapas executadas na thread até o fim do bloco
+
+    Coletas podem ser aninhadas: a interna recebe as etapas do seu bloco e
+    a externa volta a ser a ativa ao final.
+
+    Args:
+        rotulo: Identificação da execução (ex: o mês)
+        memoria: Mede também a memória de cada etapa com tracemalloc
+        locais: Locais de alocação guardados por etapa no modo de memória
+            (0 dispensa os snapshots, bem mais baratos sem eles)
+    """
+    metricas = MetricasExecucao(rotulo, memoria=memoria, locais_memoria=locais)
+    anterior = (coleta_ativa(), getattr(_estado, 'profundidade', 0),
+                getattr(_estado, 'picos', []))
+    _estado.metricas, _estado.profundidade, _estado.picos = metricas, 0, []
+    iniciou_tracemalloc = memoria and not tracemalloc.is_tracing()
+    if iniciou_tracemalloc:
+        tracemalloc.start()
+    base = _abrir_medida_memoria()[0] if memoria else 0
+    inicio = time.perf_counter()
+    try:
+        yield metricas
+    finally:
+        metricas.duracao_total = time.perf_counter() - inicio
+        if memoria:
+            pico, _ = _fechar_medida_memoria()
+            metricas.pico_bytes = max(0, pico - base)
+        if iniciou_tracemalloc:
+            tracemalloc.stop()
+        _estado.metricas, _estado.profundidade, _estado.picos = anterior
+
+
+@contextmanager
+def etapa(
+    nome: str, fonte: str = '', linhas_entrada: int = 0, bytes_lidos: int = 0
+) -> Iterator[Etapa]:
+    """
+    Mede o bloco como uma etapa da coleta ativa
+
+    O bloco pode completar a etapa devolvida (ex: ``linhas_saida`` ou
+    ``registrar_saida(df)``) antes de terminar. Sem coleta ativa a etapa é
+    descartada.
+    """
+    registro = Etapa(nome, fonte, linhas_entrada=linhas_entrada, bytes_lidos=bytes_lidos)
+    metricas = coleta_ativa()
+    if metricas is None:
+        yield registro
+        return
+
+    registro.profundidade = _estado.profundidade
+    metricas.etapas.append(registro)
+    _estado.profundidade += 1
+    memoria = metricas.memoria and tracemalloc.is_tracing()
+    if memoria:
+        base, sobrecarga, snapshot = _abrir_medida_memoria(metricas.locais_memoria > 0)
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro.duracao = time.perf_counter() - inicio
+        _estado.profundidade -= 1
+        if memoria:
+            pico, atual = _fechar_medida_memoria(sobrecarga)
+            registro.pico_bytes = max(0, pico - base)
+            registro.retidos_bytes = atual - base
+            if snapshot is not None:
+                registro.locais = _maiores_locais(snapshot, metricas.locais_memoria)
+                # Os snapshots não podem contar no pico da etapa externa
+                snapshot = None
+                tracemalloc.reset_peak()
+
+
+def _abrir_medida_memoria(
+    com_snapshot: bool = False,
+) -> Tuple[int, int, Optional[tracemalloc.Snapshot]]:
+    """
+    Empilha uma medida de memória
+
+    O pico do tracemalloc é único no processo: cada medida aberta guarda o
+    maior pico já visto por ela, e o contador é zerado para a nova medida.
+
+    Returns:
+        Tupla (memória rastreada no início, bytes ocupados pelo snapshot
+        inicial, snapshot inicial ou None)
+    """
+    atual, pico = tracemalloc.get_traced_memory()
+    if _estado.picos:
+        _estado.picos[-1] = max(_estado.picos[-1], pico)
+    snapshot = tracemalloc.take_snapshot() if com_snapshot else None
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    _estado.picos.append(base)
+    return base, base - atual, snapshot
+
+
+def _fechar_medida_memoria(sobrecarga: int = 0) -> Tuple[int, int]:
+    """
+    Desempilha a medida aberta por último
+
+    O snapshot inicial fica fora da base da própria medida, mas ocupava
+    memória durante ela: seu tamanho é descontado do pico repassado à
+    medida externa.
+
+    Returns:
+        Tupla (maior memória rastreada durante a medida, memória atual)
+    """
+    atual, pico = tracemalloc.get_traced_memory()
+    pico = max(_estado.picos.pop(), pico)
+    if _estado.picos:
+        _estado.picos[-1] = max(_estado.picos[-1], pico - sobrecarga)
+    return pico, atual
+
+
+def _maiores_locais(inicial: tracemalloc.Snapshot, quantidade: int) -> List[Tuple[str, int, int]]:
+    """Locais (arquivo:linha) com maior saldo de memória desde o snapshot inicial"""
+    # Filtrar as estatísticas agrupadas sai muito mais barato que filter_traces
+    diferencas = tracemalloc.take_snapshot().compare_to(inicial, 'lineno')
+    locais: List[Tuple[str, int, int]] = []
+    for estatistica in diferencas:
+        quadro = estatistica.traceback[0]
+        if estatistica.size_diff <= 0 or quadro.filename in _ARQUIVOS_IGNORADOS:
+            continue
+        locais.append((
+            f"{caminho_curto(quadro.filename)}:{quadro.lineno}",
+            estatistica.size_diff,
+            estatistica.count_diff,
+        ))
+        if len(locais) == quantidade:
+            break
+    return locais
+
+
+def caminho_curto(caminho: str) -> str:
+    """Caminho a partir do site-packages, do projeto ou da biblioteca padrão"""
+    marcador = os.sep + 'site-packages' + os.sep
+    if marcador in caminho:
+        return caminho.split(marcador, 1)[1]
+    for raiz in (_RAIZ_PROJETO, _RAIZ_STDLIB):
+        if caminho.startswith(raiz + os.sep):
+            return os.path.relpath(caminho, raiz)
+    return caminho
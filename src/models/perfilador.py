@@ -0,0 +1,167 @@
+"""
+Perfil de CPU de uma execução - cProfile com saída para flamegraph
+
+``perfilar()`` envolve um bloco (uma conciliação, uma sessão do menu) no
+cProfile e grava, ao final:
+
+- ``<prefixo>.prof``: estatísticas do cProfile (pstats, snakeviz, gprof2dot)
+- ``<prefixo>.folded``: pilhas colapsadas (``a;b;c microssegundos``), para
+  gerar o flamegraph offline com flamegraph.pl, speedscope ou inferno
+
+O cProfile só guarda pares chamador -> chamado, não pilhas completas: as
+pilhas colapsadas são reconstruídas descendo o grafo de chamadas e
+repartindo o tempo de cada função entre os caminhos na proporção do tempo
+de cada aresta. Só a thread que abre ``perfilar()`` é medida.
+"""
+import cProfile
+import io
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.models.instrumentacao import caminho_curto
+
+PREFIXO_PADRAO = 'swaif_perfil'
+
+# Funções exibidas no resumo ao final da execução
+FUNCOES_QUENTES_PADRAO = 20
+
+# Caminhos abaixo desta fração do tempo total não viram pilhas próprias
+FRACAO_MINIMA_PILHA = 0.0005
+PROFUNDIDADE_MAXIMA_PILHA = 200
+
+# (arquivo, linha, função), como nas chaves do pstats
+Funcao = Tuple[str, int, str]
+
+
+@dataclass
+class PerfilExecucao:
+    """Arquivos gravados e estatísticas de um bloco perfilado"""
+    arquivo_prof: str
+    arquivo_pilhas: str
+    duracao: float = 0.0
+    stats: Optional[pstats.Stats] = None
+
+    def funcoes_quentes(
+        self, quantidade: int = FUNCOES_QUENTES_PADRAO, ordem: str = 'tottime'
+    ) -> str:
+        """
+        Tabela do pstats com as funções que mais consumiram tempo
+
+        Args:
+            quantidade: Número de funções listadas
+            ordem: Critério do pstats ('tottime' = tempo próprio,
+                'cumulative' = incluindo as chamadas)
+        """
+        if self.stats is None:
+            return ''
+        saida = io.StringIO()
+        stats = pstats.Stats(self.arquivo_prof, stream=saida)
+        stats.strip_dirs().sort_stats(ordem).print_stats(quantidade)
+        return saida.getvalue()
+
+
+@contextmanager
+def perfilar(prefixo: str = PREFIXO_PADRAO) -> Iterator[PerfilExecucao]:
+    """
+    Executa o bloco sob o cProfile e grava ``<prefixo>.prof`` e ``<prefixo>.folded``
+
+    Os arquivos são gravados mesmo se o bloco terminar com exceção.
+    """
+    perfil = PerfilExecucao(f"{prefixo}.prof", f"{prefixo}.folded")
+    pasta = os.path.dirname(prefixo)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    profiler = cProfile.Profile()
+    inicio = time.perf_counter()
+    profiler.enable()
+    try:
+        yield perfil
+    finally:
+        profiler.disable()
+        perfil.duracao = time.perf_counter() - inicio
+        profiler.dump_stats(perfil.arquivo_prof)
+        perfil.stats = pstats.Stats(profiler)
+        escrever_pilhas_colapsadas(perfil.stats, perfil.arquivo_pilhas)
+
+
+def escrever_pilhas_colapsadas(stats: pstats.Stats, caminho: str) -> int:
+    """
+    Grava as pilhas colapsadas, uma por linha, com o tempo em microssegundos
+
+    Returns:
+        Quantidade de pilhas gravadas
+    """
+    pilhas = pilhas_colapsadas(stats)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for pilha, microssegundos in sorted(pilhas.items()):
+            arquivo.write(f"{pilha} {microssegundos}\n")
+    return len(pilhas)
+
+
+def pilhas_colapsadas(stats: pstats.Stats) -> Dict[str, int]:
+    """
+    Reconstrói as pilhas de chamadas do cProfile com o tempo próprio de cada uma
+
+    Cada função alcançada por um caminho com uma fração do seu tempo
+    acumulado contribui com a mesma fração do seu tempo próprio para a
+    pilha desse caminho, e repassa às chamadas a fração correspondente do
+    tempo de cada aresta. Chamadas recursivas ficam no tempo próprio do
+    primeiro quadro da recursão.
+
+    Returns:
+        Dict "raiz;...;função" -> microssegundos
+    """
+    dados = stats.stats  # type: ignore[attr-defined]
+    chamadas: Dict[Funcao, List[Tuple[Funcao, float]]] = {}
+    raizes: List[Funcao] = []
+    for funcao, (_, _, _, _, chamadores) in dados.items():
+        if not chamadores:
+            raizes.append(funcao)
+        for chamador, aresta in chamadores.items():
+            chamadas.setdefault(chamador, []).append((funcao, aresta[3]))
+    raizes = [f for f in raizes if not f[2].startswith("<method 'disable' of '_lsprof")]
+
+    total = sum(dados[f][3] for f in raizes)
+    minimo = total * FRACAO_MINIMA_PILHA
+    rotulos: Dict[Funcao, str] = {}
+    pilhas: Dict[str, float] = {}
+
+    def rotulo(funcao: Funcao) -> str:
+        if funcao not in rotulos:
+            arquivo, linha, nome = funcao
+            texto = nome if arquivo == '~' else f"{nome} ({caminho_curto(arquivo)}:{linha})"
+            rotulos[funcao] = texto.replace(';', ',')
+        return rotulos[funcao]
+
+    # Pilha explícita: (função, tempo atribuído ao caminho, caminho até ela)
+    pendentes: List[Tuple[Funcao, float, Tuple[Funcao, ...]]] = [
+        (f, dados[f][3], ()) for f in raizes
+    ]
+    while pendentes:
+        funcao, tempo, caminho = pendentes.pop()
+        caminho = caminho + (funcao,)
+        _, _, proprio, acumulado, _ = dados[funcao]
+        fracao = tempo / acumulado if acumulado else 0.0
+        tempo_proprio = proprio * fracao
+        for chamada, tempo_aresta in chamadas.get(funcao, ()):
+            tempo_chamada = tempo_aresta * fracao
+            if chamada in caminho:
+                # Recursão: o tempo próprio do primeiro quadro já inclui o dela
+                continue
+            if tempo_chamada < minimo or len(caminho) >= PROFUNDIDADE_MAXIMA_PILHA:
+                tempo_proprio += tempo_chamada
+            else:
+                pendentes.append((chamada, tempo_chamada, caminho))
+        if tempo_proprio > 0:
+            chave = ';'.join(rotulo(f) for f in caminho)
+            pilhas[chave] = pilhas.get(chave, 0.0) + tempo_proprio
+
+    return {
+        pilha: round(segundos * 1_000_000)
+        for pilha, segundos in pilhas.items()
+        if round(segundos * 1_000_000) > 0
+    }
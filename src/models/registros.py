@@ -0,0 +1,274 @@
+"""
+Registros compactos - tabelas por coluna com visões de linha sob demanda
+
+Os registros de um resultado (hoje, as divergências; no futuro, pares
+casados e lançamentos sem par) ficam em um array por coluna, e não em um
+dict por linha: as colunas de texto são codificadas como dicionário
+(categorias + códigos int32) e as numéricas como float64. Cada linha só
+vira objeto quando é lida, como um ``Registro`` - uma visão ``Mapping``
+de dois slots (tabela, índice) que não copia os valores.
+
+A tabela é picklável sem conversão (os workers devolvem os resultados ao
+processo principal), ``para_colunas``/``de_colunas`` dão a forma por
+coluna usada em JSON e ``para_estado``/``de_estado`` expõem os próprios
+arrays, gravados como bytes pelo cache de resultados.
+"""
+from collections.abc import Mapping
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import numpy as np
+import pandas as pd
+
+T = TypeVar('T', bound='TabelaRegistros')
+
+
+class Registro(Mapping):
+    """Visão de uma linha da tabela; os valores são lidos das colunas a cada acesso"""
+    __slots__ = ('_tabela', '_indice')
+
+    def __init__(self, tabela: 'TabelaRegistros', indice: int):
+        self._tabela = tabela
+        self._indice = indice
+
+    def __getitem__(self, coluna: str) -> Any:
+        return self._tabela.valor(coluna, self._indice)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tabela.COLUNAS)
+
+    def __len__(self) -> int:
+        return len(self._tabela.COLUNAS)
+
+    def __repr__(self) -> str:
+        return f"Registro({dict(self)!r})"
+
+
+class TabelaRegistros:
+    """
+    Registros de esquema fixo guardados por coluna
+
+    As subclasses declaram ``COLUNAS`` (na ordem de exibição) e, entre elas,
+    as ``NUMERICAS`` (float) e as ``INTEIRAS``; as demais são texto, com ''
+    para valores ausentes.
+    """
+    COLUNAS: Tuple[str, ...] = ()
+    NUMERICAS: Tuple[str, ...] = ()
+    INTEIRAS: Tuple[str, ...] = ()
+
+    __slots__ = ('_colunas', '_categorias', '_tamanho')
+
+    def __init__(self) -> None:
+        self._tamanho = 0
+        # Coluna -> códigos int32 (texto) ou valores float64/int64 (numéricas)
+        self._colunas: Dict[str, np.ndarray] = {
+            c: np.empty(0, dtype=self._tipo_numerico(c) or np.int32) for c in self.COLUNAS
+        }
+        # Coluna de texto -> valores distintos, indexados pelos códigos
+        self._categorias: Dict[str, Tuple[str, ...]] = {
+            c: () for c in self.COLUNAS if self._tipo_numerico(c) is None
+        }
+
+    @classmethod
+    def _tipo_numerico(cls, coluna: str) -> Optional[type]:
+        """dtype de uma coluna numérica; None para texto"""
+        if coluna in cls.INTEIRAS:
+            return np.int64
+        if coluna in cls.NUMERICAS:
+            return np.float64
+        return None
+
+    @classmethod
+    def de_colunas(
+        cls: Type[T], colunas: Mapping[str, Any], tamanho: Optional[int] = None
+    ) -> T:
+        """
+        Monta a tabela a partir de uma sequência de valores por coluna
+
+        Colunas ausentes ficam vazias ('' ou 0).
+
+        Args:
+            colunas: Dict coluna -> valores (lista, array ou Series)
+            tamanho: Quantidade de linhas, se nenhuma coluna for informada
+        """
+        tabela = cls()
+        presentes = [c for c in cls.COLUNAS if c in colunas]
+        if tamanho is None:
+            tamanho = len(colunas[presentes[0]]) if presentes else 0
+        tabela._tamanho = tamanho
+        for coluna in cls.COLUNAS:
+            valores = colunas.get(coluna)
+            tipo = cls._tipo_numerico(coluna)
+            if tipo is not None:
+                tabela._colunas[coluna] = (
+                    np.zeros(tamanho, dtype=tipo) if valores is None
+                    else pd.to_numeric(pd.Series(valores, dtype=object), errors='coerce')
+                    .fillna(0).to_numpy(dtype=tipo)
+                )
+            elif valores is None:
+                tabela._colunas[coluna] = np.zeros(tamanho, dtype=np.int32)
+                tabela._categorias[coluna] = ('',) if tamanho else ()
+            else:
+                serie = pd.Series(valores, dtype=object)
+                codigos, categorias = pd.factorize(serie.where(serie.notna(), '').astype(str))
+                tabela._colunas[coluna] = codigos.astype(np.int32)
+                tabela._categorias[coluna] = tuple(categorias)
+        return tabela
+
+    @classmethod
+    def de_dataframe(cls: Type[T], df: pd.DataFrame) -> T:
+        """Monta a tabela com as colunas do esquema presentes no DataFrame"""
+        return cls.de_colunas({c: df[c] for c in cls.COLUNAS if c in df.columns}, len(df))
+
+    @classmethod
+    def de_registros(cls: Type[T], registros: Iterable[Mapping]) -> T:
+        """Monta a tabela a partir de registros no formato dict (um por linha)"""
+        registros = list(registros)
+        return cls.de_colunas(
+            {
+                c: [r.get(c, '' if cls._tipo_numerico(c) is None else 0) for r in registros]
+                for c in cls.COLUNAS
+            },
+            len(registros),
+        )
+
+    @classmethod
+    def concatenar(cls: Type[T], tabelas: Iterable['TabelaRegistros']) -> T:
+        """Junta tabelas do mesmo esquema, recodificando as colunas de texto"""
+        tabelas = [t for t in tabelas if len(t)]
+        if len(tabelas) == 1 and type(tabelas[0]) is cls:
+            return tabelas[0]  # type: ignore[return-value]
+        return cls.de_colunas(
+            {c: np.concatenate([t.coluna(c) for t in tabelas]) for c in cls.COLUNAS}
+            if tabelas else {},
+            sum(len(t) for t in tabelas),
+        )
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __iter__(self) -> Iterator[Registro]:
+        return (Registro(self, i) for i in range(self._tamanho))
+
+    def __getitem__(self, indice: int) -> Registro:
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError(indice)
+        return Registro(self, indice)
+
+    def __eq__(self, outra: object) -> bool:
+        if not isinstance(outra, TabelaRegistros):
+            return NotImplemented
+        return self.COLUNAS == outra.COLUNAS and self.para_colunas() == outra.para_colunas()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._tamanho} registros)"
+
+    def valor(self, coluna: str, indice: int) -> Any:
+        """Valor de uma célula (str para texto, float ou int para numéricas)"""
+        if coluna not in self._colunas:
+            raise KeyError(coluna)
+        dado = self._colunas[coluna][indice]
+        if coluna in self._categorias:
+            return self._categorias[coluna][dado]
+        return dado.item()
+
+    def coluna(self, coluna: str) -> np.ndarray:
+        """Valores de uma coluna inteira (float64, int64 ou object com str)"""
+        if coluna not in self._categorias:
+            return self._colunas[coluna]
+        categorias = np.empty(len(self._categorias[coluna]), dtype=object)
+        categorias[:] = self._categorias[coluna]
+        return categorias[self._colunas[coluna]]
+
+    def filtrar(self: T, coluna: str, valores: Iterable[str]) -> T:
+        """Linhas cuja coluna de texto tem um dos valores, comparando só os códigos"""
+        aceitos = set(valores)
+        codigos = [i for i, c in enumerate(self._categorias[coluna]) if c in aceitos]
+        mascara = np.isin(self._colunas[coluna], codigos)
+        filtrada = type(self)()
+        filtrada._tamanho = int(mascara.sum())
+        filtrada._colunas = {c: v[mascara] for c, v in self._colunas.items()}
+        filtrada._categorias = dict(self._categorias)
+        return filtrada
+
+    def contar(self, coluna: str) -> Dict[str, int]:
+        """Linhas por valor de uma coluna de texto, contando os códigos"""
+        contagens = np.bincount(
+            self._colunas[coluna], minlength=len(self._categorias[coluna])
+        )
+        return {
+            categoria: int(n) for categoria, n in zip(self._categorias[coluna], contagens) if n
+        }
+
+    def tuplas(self) -> Iterator[Tuple]:
+        """Linhas como tuplas, na ordem de ``COLUNAS``, sem montar visões"""
+        return zip(*(self.coluna(c).tolist() for c in self.COLUNAS))
+
+    def para_colunas(self) -> Dict[str, List]:
+        """Forma por coluna (listas de str/float), para JSON e comparação"""
+        return {c: self.coluna(c).tolist() for c in self.COLUNAS}
+
+    def para_estado(self) -> Tuple[int, Dict[str, List[str]], Dict[str, np.ndarray]]:
+        """
+        Representação interna, sem decodificar as colunas de texto
+
+        Returns:
+            Tupla (linhas, categorias por coluna de texto, array por coluna)
+        """
+        return (
+            self._tamanho,
+            {c: list(v) for c, v in self._categorias.items()},
+            dict(self._colunas),
+        )
+
+    @classmethod
+    def de_estado(
+        cls: Type[T],
+        tamanho: int,
+        categorias: Mapping[str, Sequence[str]],
+        arrays: Mapping[str, np.ndarray],
+    ) -> T:
+        """
+        Reconstrói a tabela a partir de ``para_estado``
+
+        Raises:
+            ValueError: Se faltar coluna, o tamanho não bater ou algum código
+                não tiver categoria
+        """
+        tabela = cls()
+        tabela._tamanho = tamanho
+        for coluna in cls.COLUNAS:
+            if coluna not in arrays or len(arrays[coluna]) != tamanho:
+                raise ValueError(f"Coluna {coluna} ausente ou com tamanho diferente de {tamanho}")
+            tipo = cls._tipo_numerico(coluna)
+            if tipo is not None:
+                tabela._colunas[coluna] = np.asarray(arrays[coluna], dtype=tipo)
+                continue
+            codigos = np.asarray(arrays[coluna], dtype=np.int32)
+            tabela._categorias[coluna] = tuple(categorias.get(coluna, ()))
+            limite = len(tabela._categorias[coluna])
+            if tamanho and not 0 <= codigos.min() <= codigos.max() < limite:
+                raise ValueError(f"Coluna {coluna} com código sem categoria")
+            tabela._colunas[coluna] = codigos
+        return tabela
+
+
+class TabelaDivergencias(TabelaRegistros):
+    """Transações sinalizadas na análise de um par (retentativas e duplicatas do C6)"""
+    COLUNAS = ('fonte', 'tipo', 'data', 'hora', 'num_cartao', 'status', 'valor')
+    NUMERICAS = ('valor',)
+    __slots__ = ()
@@ -0,0 +1,246 @@
+"""Análise das taxas de adquirência (MDR) cobradas por bandeira e parcelamento."""
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .analisador import _serie_brl
+
+# Taxas contratadas em % do valor da parcela:
+# (bandeira, modalidade, parcelas mínimas, parcelas máximas, taxa)
+TABELA_TAXAS_PADRAO: List[Dict] = [
+    {'bandeira': 'visa', 'modalidade': 'debito', 'parcelas_min': 1, 'parcelas_max': 1, 'taxa': 0.85},
+    {'bandeira': 'mastercard', 'modalidade': 'debito', 'parcelas_min': 1, 'parcelas_max': 1, 'taxa': 0.85},
+    {'bandeira': 'visa', 'modalidade': 'credito', 'parcelas_min': 1, 'parcelas_max': 1, 'taxa': 1.92},
+    {'bandeira': 'mastercard', 'modalidade': 'credito', 'parcelas_min': 1, 'parcelas_max': 1, 'taxa': 1.92},
+    {'bandeira': 'visa', 'modalidade': 'credito', 'parcelas_min': 2, 'parcelas_max': 6, 'taxa': 2.21},
+    {'bandeira': 'mastercard', 'modalidade': 'credito', 'parcelas_min': 2, 'parcelas_max': 6, 'taxa': 2.21},
+    {'bandeira': 'visa', 'modalidade': 'credito', 'parcelas_min': 7, 'parcelas_max': 12, 'taxa': 2.53},
+    {'bandeira': 'mastercard', 'modalidade': 'credito', 'parcelas_min': 7, 'parcelas_max': 12, 'taxa': 2.53},
+    {'bandeira': 'elo', 'modalidade': 'credito', 'parcelas_min': 2, 'parcelas_max': 6, 'taxa': 2.91},
+    {'bandeira': 'elo', 'modalidade': 'credito', 'parcelas_min': 7, 'parcelas_max': 12, 'taxa': 3.23},
+]
+
+# Nomes de bandeira usados pelo GDS ("Visa / Master") e pelo C6 ("Mastercard")
+_ALIASES_BANDEIRA = {'master': 'mastercard'}
+
+COLUNAS_LINHA = [
+    'fonte', 'bandeira', 'modalidade', 'parcelas', 'valor_bruto', 'desconto',
+    'taxa_efetiva', 'taxa_contratada', 'desconto_esperado', 'diferenca',
+]
+
+
+def carregar_tabela_taxas(caminho: str) -> List[Dict]:
+    """
+    Carrega uma tabela de taxas em JSON
+
+    O arquivo deve conter uma lista de objetos com as chaves bandeira,
+    modalidade, parcelas_min, parcelas_max e taxa (em %), como em
+    ``TABELA_TAXAS_PADRAO``.
+    """
+    with open(caminho, encoding='utf-8') as f:
+        tabela = json.load(f)
+    obrigatorias = {'bandeira', 'modalidade', 'parcelas_min', 'parcelas_max', 'taxa'}
+    for regra in tabela:
+        faltando = obrigatorias - set(regra)
+        if faltando:
+            raise ValueError(f"Regra de taxa incompleta ({', '.join(sorted(faltando))}): {regra}")
+    return tabela
+
+
+@dataclass
+class ResultadoTaxas:
+    """Resultado da análise de taxas de um mês."""
+    resumo: pd.DataFrame
+    fora_contrato: pd.DataFrame
+    sem_taxa_contratada: int = 0
+    registros_analisados: Dict[str, int] = field(default_factory=dict)
+
+
+class AnalisadorTaxas:
+    """
+    Compara as taxas efetivamente descontadas com as taxas contratadas
+
+    A taxa efetiva de cada linha é calculada por aritmética de colunas sobre
+    o mês inteiro: no C6, desconto / valor da parcela; no GDS,
+    (valor - valor líquido) / valor. As linhas são agregadas por bandeira,
+    modalidade e número de parcelas e comparadas com a tabela de taxas.
+    """
+
+    def __init__(
+        self, tabela: Optional[List[Dict]] = None, tolerancia_valor: float = 0.02
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.tabela = tabela if tabela is not None else TABELA_TAXAS_PADRAO
+        # Diferença máxima (R$) entre desconto cobrado e esperado, para absorver arredondamentos
+        self.tolerancia_valor = tolerancia_valor
+        self._tabela_expandida = self._expandir_tabela(self.tabela)
+
+    def analisar(self, dados: Dict[str, pd.DataFrame]) -> ResultadoTaxas:
+        """
+        Analisa as taxas de pagamento_c6 e pagamento_gds
+
+        Args:
+            dados: Dict com DataFrames de cada fonte (como em carregar_dados_mes)
+
+        Returns:
+            ResultadoTaxas com resumo agregado e linhas fora do contrato
+        """
+        partes = []
+        if 'pagamento_c6' in dados and not dados['pagamento_c6'].empty:
+            partes.append(self._linhas_c6(dados['pagamento_c6']))
+        if 'pagamento_gds' in dados and not dados['pagamento_gds'].empty:
+            partes.append(self._linhas_gds(dados['pagamento_gds']))
+
+        partes = [p for p in partes if not p.empty]
+        if not partes:
+            vazio = pd.DataFrame(columns=COLUNAS_LINHA)
+            return ResultadoTaxas(resumo=vazio, fora_contrato=vazio)
+
+        linhas = self._comparar_com_tabela(pd.concat(partes, ignore_index=True))
+
+        com_taxa = linhas['taxa_contratada'].notna()
+        fora = com_taxa & (linhas['diferenca'].abs() > self.tolerancia_valor)
+        linhas['fora_contrato'] = fora.astype(int)
+
+        resumo = (
+            linhas.groupby(['fonte', 'bandeira', 'modalidade', 'parcelas'], dropna=False)
+            .agg(
+                registros=('valor_bruto', 'size'),
+                valor_bruto=('valor_bruto', 'sum'),
+                desconto=('desconto', 'sum'),
+                desconto_esperado=('desconto_esperado', 'sum'),
+                taxa_contratada=('taxa_contratada', 'first'),
+                fora_contrato=('fora_contrato', 'sum'),
+            )
+            .reset_index()
+        )
+        resumo['taxa_efetiva'] = np.where(
+            resumo['valor_bruto'] > 0, resumo['desconto'] / resumo['valor_bruto'] * 100, 0.0
+        )
+        resumo['diferenca'] = (resumo['desconto'] - resumo['desconto_esperado']).round(2)
+
+        fora_contrato = linhas.loc[fora, COLUNAS_LINHA].sort_values('diferenca', ascending=False)
+        if not fora_contrato.empty:
+            self.logger.warning(
+                "%d cobrança(s) fora das taxas contratadas (R$ %.2f a mais)",
+                len(fora_contrato), fora_contrato['diferenca'].clip(lower=0).sum(),
+            )
+
+        return ResultadoTaxas(
+            resumo=resumo,
+            fora_contrato=fora_contrato.reset_index(drop=True),
+            sem_taxa_contratada=int((~com_taxa).sum()),
+            registros_analisados={
+                str(fonte): int(n) for fonte, n in linhas['fonte'].value_counts().items()
+            },
+        )
+
+    def _linhas_c6(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Deriva bandeira, modalidade, parcelas e taxa efetiva do pagamento C6."""
+        if 'status' in df.columns:
+            df = df[df['status'].astype('string').str.contains('Recebido', na=False)]
+        if 'descontos' not in df.columns:
+            return pd.DataFrame(columns=COLUNAS_LINHA)
+
+        coluna_base = 'valor_parcela' if 'valor_parcela' in df.columns else 'valor_venda'
+        if coluna_base not in df.columns:
+            return pd.DataFrame(columns=COLUNAS_LINHA)
+        tipo = self._texto(df, 'tipo_operacao').str.lower()
+
+        return pd.DataFrame({
+            'fonte': 'pagamento_c6',
+            'bandeira': self._normalizar_bandeira(self._texto(df, 'bandeira')),
+            'modalidade': self._modalidade(tipo),
+            'parcelas': self._total_parcelas(self._texto(df, 'parcelas')),
+            'valor_bruto': _serie_brl(df[coluna_base]),
+            # Descontos vêm negativos no extrato do C6
+            'desconto': -_serie_brl(df['descontos']),
+        })
+
+    def _linhas_gds(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Deriva bandeira, modalidade, parcelas e taxa efetiva do pagamento GDS."""
+        if 'valor' not in df.columns or 'valor_liquido' not in df.columns:
+            return pd.DataFrame(columns=COLUNAS_LINHA)
+        if 'tipo' in df.columns:
+            df = df[df['tipo'].astype('string').str.contains('Receita', na=False)]
+        if 'pago' in df.columns:
+            df = df[df['pago'].astype('string').str.contains('Sim', na=False)]
+
+        metodo = self._texto(df, 'metodo')
+        # "Crédito (Visa / Master)" -> bandeira "visa" (primeira do grupo)
+        grupo = metodo.str.extract(r'\(([^)]*)\)', expand=False).fillna('')
+        bandeira = grupo.str.split('/').str[0].fillna('')
+        # Parcela "(4/4)" na descrição do lançamento
+        parcelas = self._texto(df, 'descricao').str.extract(r'\(\d+/(\d+)\)', expand=False)
+
+        valor = _serie_brl(df['valor'])
+        linhas = pd.DataFrame({
+            'fonte': 'pagamento_gds',
+            'bandeira': self._normalizar_bandeira(bandeira),
+            'modalidade': self._modalidade(metodo.str.lower()),
+            'parcelas': pd.to_numeric(parcelas, errors='coerce').fillna(1).astype(int),
+            'valor_bruto': valor,
+            'desconto': valor - _serie_brl(df['valor_liquido']),
+        })
+        # PIX e lançamentos sem valor não têm MDR
+        return linhas[(linhas['modalidade'] != 'pix') & (linhas['valor_bruto'] > 0)]
+
+    def _comparar_com_tabela(self, linhas: pd.DataFrame) -> pd.DataFrame:
+        """Anexa a taxa contratada e o desconto esperado a cada linha."""
+        linhas = linhas.merge(
+            self._tabela_expandida, on=['bandeira', 'modalidade', 'parcelas'], how='left'
+        )
+        linhas['taxa_efetiva'] = np.where(
+            linhas['valor_bruto'] > 0, linhas['desconto'] / linhas['valor_bruto'] * 100, 0.0
+        )
+        linhas['desconto_esperado'] = (linhas['valor_bruto'] * linhas['taxa_contratada'] / 100).round(2)
+        linhas['diferenca'] = (linhas['desconto'] - linhas['desconto_esperado']).round(2)
+        return linhas[COLUNAS_LINHA]
+
+    @staticmethod
+    def _expandir_tabela(tabela: List[Dict]) -> pd.DataFrame:
+        """Expande faixas de parcelas em uma linha por número de parcelas."""
+        linhas = [
+            (regra['bandeira'].strip().lower(), regra['modalidade'].strip().lower(), parcelas,
+             float(regra['taxa']))
+            for regra in tabela
+            for parcelas in range(int(regra['parcelas_min']), int(regra['parcelas_max']) + 1)
+        ]
+        expandida = pd.DataFrame(
+            linhas, columns=['bandeira', 'modalidade', 'parcelas', 'taxa_contratada']
+        )
+        # Regras posteriores prevalecem sobre anteriores para a mesma chave
+        return expandida.drop_duplicates(['bandeira', 'modalidade', 'parcelas'], keep='last')
+
+    @staticmethod
+    def _texto(df: pd.DataFrame, coluna: str) -> pd.Series:
+        if coluna not in df.columns:
+            return pd.Series('', index=df.index)
+        return df[coluna].fillna('').astype(str).str.strip()
+
+    @staticmethod
+    def _normalizar_bandeira(bandeira: pd.Series) -> pd.Series:
+        normalizada = bandeira.str.strip().str.lower()
+        return normalizada.replace(_ALIASES_BANDEIRA)
+
+    @staticmethod
+    def _modalidade(texto: pd.Series) -> pd.Series:
+        """Classifica em debito, credito ou pix a partir do tipo de operação."""
+        return pd.Series(
+            np.select(
+                [texto.str.contains('pix'), texto.str.contains('débito|debito')],
+                ['pix', 'debito'],
+                default='credito',
+            ),
+            index=texto.index,
+        )
+
+    @staticmethod
+    def _total_parcelas(parcelas: pd.Series) -> pd.Series:
+        """Extrai o total de parcelas de "4/4" (ou "1" quando ausente)."""
+        total = parcelas.str.split('/').str[-1]
+        return pd.to_numeric(total, errors='coerce').fillna(1).astype(int)
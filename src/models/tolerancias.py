@@ -0,0 +1,46 @@
+"""Limites de divergência entre fontes.
+
+Módulo sem dependências pesadas: é importado pela interface de terminal
+antes de o pandas ser carregado.
+"""
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .analisador import ResultadoAnalise
+
+# Divergência percentual a partir da qual um par exige atenção / é crítico
+LIMITE_ALERTA_PERCENTUAL = 1.0
+LIMITE_CRITICO_PERCENTUAL = 5.0
+
+
+def classificar_divergencia(
+    percentual: float,
+    limite_alerta: float = LIMITE_ALERTA_PERCENTUAL,
+    limite_critico: float = LIMITE_CRITICO_PERCENTUAL,
+) -> str:
+    """Classifica a divergência percentual de um par em 'ok', 'alerta' ou 'critico'."""
+    percentual = abs(percentual)
+    if percentual < limite_alerta:
+        return 'ok'
+    if percentual < limite_critico:
+        return 'alerta'
+    return 'critico'
+
+
+def classificar_resultado(
+    resultado: "ResultadoAnalise",
+    limite_alerta: float = LIMITE_ALERTA_PERCENTUAL,
+    limite_critico: float = LIMITE_CRITICO_PERCENTUAL,
+) -> str:
+    """
+    Classifica um par conciliado como ``classificar_divergencia``
+
+    O percentual de um par em que uma das fontes não tem registros ou só uma
+    delas tem total é 0 (não há base de comparação); esses pares são
+    ``'critico'``, e não ``'ok'``.
+    """
+    if not resultado.registros_fonte_1 or not resultado.registros_fonte_2:
+        return 'critico'
+    if (resultado.total_fonte_1 == 0) != (resultado.total_fonte_2 == 0):
+        return 'critico'
+    return classificar_divergencia(resultado.percentual_diferenca, limite_alerta, limite_critico)
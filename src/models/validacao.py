@@ -0,0 +1,261 @@
+"""
+Validação das fontes linha a linha, na mesma passada da padronização
+
+A padronização converte valores em R$ e datas coluna a coluna; os
+conversores devolvem, junto com a coluna convertida, as máscaras de células
+inválidas e vazias. ``ErrosValidacao`` guarda só as linhas marcadas por
+essas máscaras (nenhuma coluna é percorrida de novo) e, ao final, as reúne
+em uma ``TabelaErrosValidacao`` por fonte.
+
+Regras:
+
+- ``valor_invalido``: texto em coluna de R$ que não é um número
+- ``data_invalida``: texto em coluna de data que não é uma data dd/mm/aaaa
+  existente (ex: 31/02/2025)
+- ``valor_negativo``: venda com valor negativo (fontes de faturamento)
+- ``chave_ausente``: data ou valor principal da fonte em branco
+  (``valor_negativo`` e ``chave_ausente`` valem só para as linhas que
+  passam pelos filtros da fonte, ex: receitas pagas do GDS)
+- ``coluna_inesperada`` / ``coluna_ausente``: cabeçalho fora do esquema da
+  fonte ou coluna do esquema que não veio no arquivo (linha 0);
+  ``coluna_ausente`` também aponta a fonte sem nenhuma das colunas de onde
+  sai o total (ex: ``valor/valor_venda``), que então soma R$ 0,00
+
+As linhas continuam nos totais como antes (inválidos valem 0); o relatório
+diz quais são e quanto cada regra pegou.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .registros import TabelaRegistros
+
+REGRA_VALOR_INVALIDO = 'valor_invalido'
+REGRA_DATA_INVALIDA = 'data_invalida'
+REGRA_VALOR_NEGATIVO = 'valor_negativo'
+REGRA_CHAVE_AUSENTE = 'chave_ausente'
+REGRA_COLUNA_INESPERADA = 'coluna_inesperada'
+REGRA_COLUNA_AUSENTE = 'coluna_ausente'
+
+REGRAS = (
+    REGRA_VALOR_INVALIDO, REGRA_DATA_INVALIDA, REGRA_VALOR_NEGATIVO, REGRA_CHAVE_AUSENTE,
+    REGRA_COLUNA_INESPERADA, REGRA_COLUNA_AUSENTE,
+)
+
+# (coluna de data, coluna de valor) que identificam cada lançamento da fonte
+CHAVES_FONTE: Dict[str, Tuple[str, str]] = {
+    'faturamento_c6': ('data', 'valor_faturado'),
+    'faturamento_gds': ('data_emissao', 'valor'),
+    'faturamento_wab': ('data', 'valor_pago'),
+    'pagamento_c6': ('data_recebivel', 'valor_recebivel'),
+    'pagamento_gds': ('data_baixa', 'valor_liquido'),
+}
+
+# Colunas em R$ de cada fonte (nomes internos); as demais colunas que a
+# padronização converte (ex: 'parcelas', "1/3") não são validadas como valor
+COLUNAS_VALOR_FONTE: Dict[str, Tuple[str, ...]] = {
+    'faturamento_c6': ('valor_faturado', 'valor_parcela', 'valor_venda', 'valor'),
+    'faturamento_gds': ('valor', 'valor_liquido'),
+    'faturamento_wab': ('valor_pago', 'valor_total', 'valor'),
+    'pagamento_c6': ('valor_venda', 'valor_parcela', 'descontos', 'valor_recebivel', 'valor'),
+    'pagamento_gds': ('valor', 'valor_liquido'),
+}
+
+# Fontes de vendas: o valor principal não pode ser negativo
+FONTES_SEM_NEGATIVOS = ('faturamento_c6', 'faturamento_gds', 'faturamento_wab')
+
+# Chaves de DataFrame.attrs preenchidas pelo DataLoader ao ler o cabeçalho
+ATRIBUTO_COLUNAS_INESPERADAS = 'colunas_inesperadas'
+ATRIBUTO_COLUNAS_AUSENTES = 'colunas_ausentes'
+# Colunas criadas como cópia de outra (ex: 'valor' do C6), não validadas de novo
+ATRIBUTO_COLUNAS_DERIVADAS = 'colunas_derivadas'
+
+
+class TabelaErrosValidacao(TabelaRegistros):
+    """
+    Células que falharam na validação de uma fonte
+
+    ``linha`` é a posição do registro no arquivo (1 = primeiro após o
+    cabeçalho; 0 para erros de cabeçalho) e ``conteudo`` o texto original.
+    """
+    COLUNAS = ('fonte', 'linha', 'coluna', 'regra', 'conteudo')
+    INTEIRAS = ('linha',)
+    __slots__ = ()
+
+
+class ErrosValidacao:
+    """Erros de uma fonte, acumulados pelos conversores durante a padronização"""
+
+    def __init__(self, fonte: str):
+        self.fonte = fonte
+        self.coluna_data, self.coluna_valor = CHAVES_FONTE.get(fonte, ('', ''))
+        self.colunas_valor = COLUNAS_VALOR_FONTE.get(fonte, ())
+        self._derivadas: Sequence[str] = ()
+        # (regra, coluna, rótulos das linhas, conteúdo original)
+        self._partes: List[Tuple[str, str, np.ndarray, np.ndarray]] = []
+        # Regras das linhas que entram no total, aplicadas após os filtros:
+        # (regra, coluna, conteúdo original só das linhas marcadas)
+        self._pendentes: List[Tuple[str, str, pd.Series]] = []
+
+    def registrar(self, regra: str, coluna: str, mascara: pd.Series, original: pd.Series) -> None:
+        """Guarda as linhas marcadas pela máscara (nada, se nenhuma)"""
+        if mascara.any():
+            self._guardar(regra, coluna, original[mascara])
+
+    def _guardar(self, regra: str, coluna: str, marcadas: pd.Series) -> None:
+        self._partes.append((
+            regra, coluna, marcadas.index.to_numpy(),
+            marcadas.astype(object).where(marcadas.notna(), '').astype(str).to_numpy(),
+        ))
+
+    def _adiar(self, regra: str, coluna: str, mascara: pd.Series, original: pd.Series) -> None:
+        if mascara.any():
+            self._pendentes.append((regra, coluna, original[mascara]))
+
+    def registrar_valores(
+        self,
+        coluna: str,
+        original: pd.Series,
+        valores: pd.Series,
+        invalidos: pd.Series,
+        vazios: pd.Series,
+    ) -> None:
+        """Regras de uma coluna em R$ já convertida por ``converter_brl``"""
+        if coluna in self._derivadas or coluna not in self.colunas_valor:
+            return
+        self.registrar(REGRA_VALOR_INVALIDO, coluna, invalidos, original)
+        if coluna == self.coluna_valor:
+            self._adiar(REGRA_CHAVE_AUSENTE, coluna, vazios, original)
+            if self.fonte in FONTES_SEM_NEGATIVOS:
+                self._adiar(REGRA_VALOR_NEGATIVO, coluna, valores < 0, original)
+
+    def registrar_datas(
+        self, coluna: str, original: pd.Series, invalidas: pd.Series, vazias: pd.Series
+    ) -> None:
+        """Regras de uma coluna de data já convertida por ``converter_data``"""
+        self.registrar(REGRA_DATA_INVALIDA, coluna, invalidas, original)
+        if coluna == self.coluna_data:
+            self._adiar(REGRA_CHAVE_AUSENTE, coluna, vazias, original)
+
+    def registrar_cabecalho(self, df: pd.DataFrame) -> None:
+        """Colunas inesperadas e ausentes apontadas pelo DataLoader na leitura"""
+        self._derivadas = df.attrs.get(ATRIBUTO_COLUNAS_DERIVADAS, ())
+        for regra, atributo in (
+            (REGRA_COLUNA_INESPERADA, ATRIBUTO_COLUNAS_INESPERADAS),
+            (REGRA_COLUNA_AUSENTE, ATRIBUTO_COLUNAS_AUSENTES),
+        ):
+            colunas: Sequence[str] = df.attrs.get(atributo, ())
+            for coluna in colunas:
+                # O índice -1 vira a linha 0 na tabela
+                self._partes.append(
+                    (regra, coluna, np.array([-1]), np.array([coluna], dtype=object))
+                )
+
+    def registrar_coluna_total(self, candidatas: Sequence[str]) -> None:
+        """Nenhuma das colunas candidatas ao total da fonte está no arquivo"""
+        colunas = '/'.join(candidatas)
+        self._partes.append(
+            (REGRA_COLUNA_AUSENTE, colunas, np.array([-1]), np.array([colunas], dtype=object))
+        )
+
+    def restringir_linhas(self, indice: pd.Index) -> None:
+        """Aplica as regras pendentes só às linhas mantidas pelos filtros da fonte"""
+        for regra, coluna, marcadas in self._pendentes:
+            mantidas = marcadas[marcadas.index.isin(indice)]
+            if not mantidas.empty:
+                self._guardar(regra, coluna, mantidas)
+        self._pendentes = []
+
+    def tabela(self) -> TabelaErrosValidacao:
+        """Todos os erros registrados, na ordem do arquivo"""
+        for regra, coluna, marcadas in self._pendentes:
+            self._guardar(regra, coluna, marcadas)
+        self._pendentes = []
+        if not self._partes:
+            return TabelaErrosValidacao()
+        tamanhos = [len(rotulos) for _, _, rotulos, _ in self._partes]
+        rotulos = np.concatenate([rotulos for _, _, rotulos, _ in self._partes])
+        linhas = (
+            pd.to_numeric(pd.Series(rotulos), errors='coerce').fillna(-1).to_numpy(np.int64) + 1
+        )
+        ordem = np.argsort(linhas, kind='stable')
+        colunas = {
+            'fonte': np.full(len(ordem), self.fonte, dtype=object),
+            'linha': linhas[ordem],
+            'coluna': np.repeat([c for _, c, _, _ in self._partes], tamanhos)[ordem],
+            'regra': np.repeat([r for r, _, _, _ in self._partes], tamanhos)[ordem],
+            'conteudo': np.concatenate([c for _, _, _, c in self._partes])[ordem],
+        }
+        return TabelaErrosValidacao.de_colunas(colunas, len(ordem))
+
+
+def _expandir(valores_unicos: np.ndarray, codigos: np.ndarray, ausente) -> np.ndarray:
+    """Valores por linha a partir dos valores únicos (código -1 = célula ausente)"""
+    return np.append(valores_unicos, np.array([ausente], dtype=valores_unicos.dtype))[codigos]
+
+
+def converter_brl(serie: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    Converte uma coluna em R$ para float, vetorizado
+
+    Mesmas regras de ``_to_float_brl`` (``R$`` e espaços removidos; com
+    vírgula e ponto, o ponto é separador de milhar). O texto é tratado só
+    nos valores distintos da coluna (``pd.factorize``), que em colunas de
+    preço se repetem muito, e o resultado é expandido para as linhas.
+
+    Returns:
+        Tupla (valores, inválidos, vazios): os valores trazem 0.0 nas
+        células inválidas ou vazias; as máscaras marcam texto não numérico
+        e células em branco
+    """
+    if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        return (
+            serie.astype(float).fillna(0.0), pd.Series(False, index=serie.index), serie.isna()
+        )
+    codigos, unicos = pd.factorize(serie)
+    texto = (
+        pd.Series(unicos, dtype=object).astype('string')
+        .str.replace('R$', '', regex=False)
+        .str.replace(' ', '', regex=False)
+        .str.strip()
+    )
+    milhar = texto.str.contains(',', regex=False) & texto.str.contains('.', regex=False)
+    texto = texto.mask(milhar.fillna(False), texto.str.replace('.', '', regex=False))
+    texto = texto.str.replace(',', '.', regex=False)
+    valores_unicos = pd.to_numeric(texto, errors='coerce').astype(float).to_numpy()
+    vazios_unicos = texto.eq('').fillna(True).to_numpy(bool)
+
+    valores = _expandir(valores_unicos, codigos, np.nan)
+    vazios = _expandir(vazios_unicos, codigos, True)
+    invalidos = np.isnan(valores) & ~vazios
+    return (
+        pd.Series(np.nan_to_num(valores, nan=0.0), index=serie.index, name=serie.name),
+        pd.Series(invalidos, index=serie.index),
+        pd.Series(vazios, index=serie.index),
+    )
+
+
+def converter_data(
+    serie: pd.Series, formato: str = '%d/%m/%Y'
+) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    Converte uma coluna de datas em texto para datetime (sobre os valores distintos)
+
+    Returns:
+        Tupla (datas, inválidas, vazias): NaT nas células inválidas ou vazias
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie, pd.Series(False, index=serie.index), serie.isna()
+    codigos, unicos = pd.factorize(serie)
+    texto = pd.Series(unicos, dtype=object)
+    datas_unicas = pd.to_datetime(texto, format=formato, errors='coerce').to_numpy()
+    vazias_unicas = texto.astype('string').str.strip().eq('').fillna(True).to_numpy(bool)
+
+    datas = _expandir(datas_unicas, codigos, np.datetime64('NaT'))
+    vazias = _expandir(vazias_unicas, codigos, True)
+    return (
+        pd.Series(datas, index=serie.index, name=serie.name),
+        pd.Series(np.isnat(datas) & ~vazias, index=serie.index),
+        pd.Series(vazias, index=serie.index),
+    )
@@ -0,0 +1,281 @@
+"""
+Modo de monitoramento - reconcilia automaticamente quando as exportações mudam
+
+Varre o diretório base em intervalos regulares comparando apenas tamanho e
+data de modificação dos arquivos de origem (sem ler o conteúdo). Alterações
+em sequência no mesmo mês são agrupadas (debounce) e, passado o intervalo
+de estabilidade, só as fontes alteradas são recarregadas e o mês é
+reconciliado de novo.
+
+Uso:
+    python -m src.monitor --saida conciliacao.json
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from src.cli import BASE_PATH_PADRAO, CACHE_DIR_PADRAO, resultado_para_dict
+from src.controllers.conciliacao_controller import ConciliacaoController
+from src.models.analisador import (
+    LIMITE_ALERTA_PERCENTUAL,
+    LIMITE_CRITICO_PERCENTUAL,
+    ResultadoAnalise,
+)
+from src.models.data_loader import PADRAO_ARQUIVO_FONTE
+
+INTERVALO_PADRAO = 2.0
+DEBOUNCE_PADRAO = 5.0
+
+# (tamanho, mtime_ns) de cada arquivo de origem
+IndiceArquivos = Dict[str, Tuple[int, int]]
+
+
+class MonitorDiretorio:
+    """
+    Observa o diretório base e reconcilia os meses alterados
+
+    Args:
+        base_path: Diretório com os arquivos de faturamento
+        saida: Arquivo JSON com o último resultado de cada mês (opcional)
+        debounce: Segundos sem novas alterações antes de reprocessar um mês
+        cache_dir: Diretório dos artefatos persistentes (opcional)
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        saida: Optional[str] = None,
+        debounce: float = DEBOUNCE_PADRAO,
+        cache_dir: Optional[str] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.controller = ConciliacaoController(base_path, cache_dir=cache_dir)
+        self.saida = saida
+        self.debounce = debounce
+
+        self.indice: IndiceArquivos = {}
+        # mês -> (fontes alteradas, instante da última alteração)
+        self._pendentes: Dict[str, Tuple[Set[str], float]] = {}
+        # Os DataFrames do último processamento de cada mês ficam no cache da
+        # sessão do controller (limitado em bytes, remove os menos usados);
+        # aqui só a impressão digital com que foram guardados
+        self._fingerprints: Dict[str, str] = {}
+        self.resultados: Dict[str, Dict] = {}
+
+    def varrer(self) -> IndiceArquivos:
+        """Indexa tamanho e data de modificação dos arquivos de origem"""
+        indice: IndiceArquivos = {}
+        pastas = [self.controller.data_loader.base_path]
+        # Os arquivos ficam na raiz ou em uma pasta por mês: dois níveis bastam
+        for _nivel in range(2):
+            subpastas = []
+            for pasta in pastas:
+                try:
+                    entradas = list(os.scandir(pasta))
+                except OSError:
+                    continue
+                for entrada in entradas:
+                    if entrada.is_dir():
+                        subpastas.append(entrada.path)
+                    elif PADRAO_ARQUIVO_FONTE.match(entrada.name):
+                        info = entrada.stat()
+                        indice[entrada.path] = (info.st_size, info.st_mtime_ns)
+            pastas = subpastas
+        return indice
+
+    def detectar_alteracoes(self, novo: IndiceArquivos) -> Dict[str, Set[str]]:
+        """
+        Compara um índice novo com o atual
+
+        Returns:
+            Dict mês -> fontes cujos arquivos foram criados, alterados ou removidos
+        """
+        caminhos = {
+            caminho for caminho in set(novo) | set(self.indice)
+            if novo.get(caminho) != self.indice.get(caminho)
+        }
+        alteracoes: Dict[str, Set[str]] = {}
+        for caminho in caminhos:
+            encontrado = PADRAO_ARQUIVO_FONTE.match(os.path.basename(caminho))
+            if not encontrado:
+                continue
+            mes_ano = encontrado.group(1)
+            # Considera apenas o arquivo que o DataLoader de fato lê para cada fonte
+            for fonte, esperado in self.controller.data_loader.caminhos_fontes(mes_ano).items():
+                if os.path.normpath(esperado) == os.path.normpath(caminho):
+                    alteracoes.setdefault(mes_ano, set()).add(fonte)
+        return alteracoes
+
+    def verificar(self, agora: Optional[float] = None) -> List[str]:
+        """
+        Executa uma varredura e reprocessa os meses estáveis
+
+        Args:
+            agora: Instante de referência (time.monotonic() por padrão)
+
+        Returns:
+            Meses reprocessados nesta verificação
+        """
+        agora = time.monotonic() if agora is None else agora
+        novo = self.varrer()
+        for mes_ano, fontes in self.detectar_alteracoes(novo).items():
+            pendentes, _ = self._pendentes.get(mes_ano, (set(), agora))
+            self._pendentes[mes_ano] = (pendentes | fontes, agora)
+            self.logger.info("Alteração em %s: %s", mes_ano, ", ".join(sorted(fontes)))
+        self.indice = novo
+
+        estaveis = [
+            mes_ano for mes_ano, (_, instante) in self._pendentes.items()
+            if agora - instante >= self.debounce
+        ]
+        for mes_ano in estaveis:
+            fontes, _ = self._pendentes.pop(mes_ano)
+            self.processar_mes(mes_ano, fontes)
+        return estaveis
+
+    def processar_mes(self, mes_ano: str, fontes: Set[str]) -> Optional[List[ResultadoAnalise]]:
+        """Recarrega as fontes alteradas do mês e refaz a conciliação"""
+        inicio = time.perf_counter()
+        try:
+            fingerprint = self.controller.data_loader.fingerprint_mes(mes_ano)
+            anteriores = self._dados_anteriores(mes_ano)
+            if anteriores is None:
+                # Primeiro processamento do mês (ou removido do cache): todas as fontes
+                fontes = set(self.controller.data_loader.caminhos_fontes(mes_ano))
+                dados = self.controller.data_loader.carregar_dados_mes(mes_ano)
+            else:
+                dados = {
+                    **anteriores,
+                    **self.controller.data_loader.carregar_dados_mes(
+                        mes_ano, fontes=sorted(fontes)
+                    ),
+                }
+            resultados = self.controller.analisador.analisar_todos_pares(dados)
+            self.controller.atualizar_artefatos_mes(mes_ano, dados)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.error("Erro ao reconciliar %s: %s", mes_ano, exc)
+            self.resultados[mes_ano] = {
+                "processado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "erro": str(exc),
+            }
+            self._gravar_saida()
+            return None
+
+        if self.controller.cache_sessao.guardar(mes_ano, fingerprint, dados):
+            self._fingerprints[mes_ano] = fingerprint
+        else:
+            self._fingerprints.pop(mes_ano, None)
+        duracao = time.perf_counter() - inicio
+        self.resultados[mes_ano] = {
+            "processado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duracao": round(duracao, 4),
+            "fontes_recarregadas": sorted(fontes),
+            "resultados": [
+                resultado_para_dict(r, LIMITE_ALERTA_PERCENTUAL, LIMITE_CRITICO_PERCENTUAL)
+                for r in resultados
+            ],
+        }
+        self.logger.info(
+            "%s reconciliado em %.2fs (%s)", mes_ano, duracao, ", ".join(sorted(fontes))
+        )
+        for resultado in self.resultados[mes_ano]["resultados"]:
+            self.logger.info(
+                "  %s x %s: diferença R$ %.2f (%.2f%%) - %s",
+                resultado["fonte_1"], resultado["fonte_2"], resultado["diferenca"],
+                resultado["percentual_diferenca"], resultado["status"],
+            )
+        self._gravar_saida()
+        return resultados
+
+    def _dados_anteriores(self, mes_ano: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """DataFrames do último processamento do mês, se ainda estiverem no cache"""
+        fingerprint = self._fingerprints.pop(mes_ano, None)
+        if fingerprint is None:
+            return None
+        return self.controller.cache_sessao.obter(mes_ano, fingerprint)
+
+    def _gravar_saida(self) -> None:
+        """Regrava o arquivo de saída de forma atômica"""
+        if not self.saida:
+            return
+        temporario = f"{self.saida}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(
+                {"atualizado_em": time.strftime("%Y-%m-%dT%H:%M:%S"), "meses": self.resultados},
+                f, ensure_ascii=False, indent=2,
+            )
+        os.replace(temporario, self.saida)
+
+    def executar(
+        self,
+        intervalo: float = INTERVALO_PADRAO,
+        processar_existentes: bool = False,
+        iteracoes: Optional[int] = None,
+    ) -> None:
+        """
+        Loop de monitoramento
+
+        Args:
+            intervalo: Segundos entre varreduras
+            processar_existentes: Reconcilia na partida os meses já presentes
+            iteracoes: Número de varreduras (padrão: até ser interrompido)
+        """
+        if processar_existentes:
+            self.indice = {}
+        else:
+            self.indice = self.varrer()
+        self.logger.info(
+            "Monitorando %s (%d arquivos)", self.controller.data_loader.base_path, len(self.indice)
+        )
+
+        executadas = 0
+        while iteracoes is None or executadas < iteracoes:
+            self.verificar()
+            executadas += 1
+            time.sleep(intervalo)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada do modo de monitoramento"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.monitor",
+        description="SWAIF-CONFA - reconcilia automaticamente os meses alterados",
+    )
+    parser.add_argument("--base-path", default=BASE_PATH_PADRAO)
+    parser.add_argument("--cache-dir", default=CACHE_DIR_PADRAO)
+    parser.add_argument("--saida", metavar="ARQUIVO", help="Grava os resultados neste JSON")
+    parser.add_argument(
+        "--intervalo", type=float, default=INTERVALO_PADRAO,
+        help=f"Segundos entre varreduras (padrão: {INTERVALO_PADRAO})",
+    )
+    parser.add_argument(
+        "--debounce", type=float, default=DEBOUNCE_PADRAO,
+        help=f"Segundos sem alterações antes de reprocessar (padrão: {DEBOUNCE_PADRAO})",
+    )
+    parser.add_argument(
+        "--processar-existentes", action="store_true",
+        help="Reconcilia na partida os meses já presentes",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    monitor = MonitorDiretorio(
+        args.base_path, saida=args.saida, debounce=args.debounce, cache_dir=args.cache_dir
+    )
+    try:
+        monitor.executar(args.intervalo, processar_existentes=args.processar_existentes)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
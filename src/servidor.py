@@ -0,0 +1,278 @@
+"""
+Serviço HTTP local - expõe a conciliação para o painel sem reimportar o sistema
+
+Servidor asyncio (somente biblioteca padrão) de longa duração, ligado ao
+localhost. O processamento roda em um pool de threads que compartilha o
+mesmo controller (e seu cache de meses). Requisições simultâneas para o
+mesmo recurso são atendidas por um único cálculo, e o resultado fica em
+cache até os arquivos de origem do mês mudarem.
+
+Endpoints (GET, respostas JSON):
+    /saude
+    /conciliacao/<MMAAAA>
+    /resumo/<MMAAAA>
+    /detalhes/<MMAAAA>/<fonte>
+
+Uso:
+    python -m src.servidor --porta 8765
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.cli import BASE_PATH_PADRAO, CACHE_DIR_PADRAO, resultado_para_dict
+from src.controllers.conciliacao_controller import ConciliacaoController
+from src.models.analisador import (
+    FONTES_FATURAMENTO,
+    FONTES_PAGAMENTO,
+    LIMITE_ALERTA_PERCENTUAL,
+    LIMITE_CRITICO_PERCENTUAL,
+)
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+
+# Quantidade máxima de respostas guardadas; as mais antigas saem primeiro
+LIMITE_RESULTADOS_CACHE = 256
+
+_PADRAO_MES = re.compile(r"^(0[1-9]|1[0-2])\d{4}$")
+
+_MENSAGENS_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class ErroRequisicao(Exception):
+    """Erro com status HTTP a devolver ao cliente"""
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class ServicoConciliacao:
+    """
+    Atende as requisições HTTP usando um controller compartilhado
+
+    Args:
+        base_path: Diretório com os arquivos de faturamento
+        cache_dir: Diretório dos artefatos persistentes (opcional)
+        max_workers: Threads do pool de processamento (padrão do executor)
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        cache_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.controller = ConciliacaoController(base_path, cache_dir=cache_dir)
+        # Threads, e não processos, de propósito: todas as requisições usam o
+        # mesmo controller, e com ele o cache de meses em memória (CacheSessao)
+        # e o de detalhes por fonte. Com um pool de processos cada worker
+        # teria uma cópia e releria os arquivos; a leitura e o pandas liberam
+        # o GIL na maior parte do tempo.
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="servico"
+        )
+        # chave -> (impressão digital do mês, resposta)
+        self._resultados: Dict[Tuple[str, ...], Tuple[str, Any]] = {}
+        # chave -> cálculo em andamento, compartilhado pelas requisições simultâneas
+        self._em_andamento: Dict[Tuple[str, ...], "asyncio.Future[Any]"] = {}
+        self.calculos = 0
+        self.acertos_cache = 0
+
+    async def conciliacao(self, mes_ano: str) -> Dict:
+        """Resultados da conciliação do mês"""
+        return await self._obter(("conciliacao", mes_ano), mes_ano, self._calcular_conciliacao)
+
+    async def resumo(self, mes_ano: str) -> Dict:
+        """Resumo das fontes carregadas no mês"""
+        return await self._obter(
+            ("resumo", mes_ano), mes_ano, self.controller.obter_resumo_dados
+        )
+
+    async def detalhes(self, mes_ano: str, fonte: str) -> Dict:
+        """Detalhes de uma fonte no mês"""
+        if fonte not in FONTES_FATURAMENTO + FONTES_PAGAMENTO:
+            raise ErroRequisicao(404, f"Fonte desconhecida: {fonte}")
+        detalhes = await self._obter(
+            ("detalhes", mes_ano, fonte), mes_ano, self.controller.obter_detalhes_fonte, fonte
+        )
+        if "erro" in detalhes:
+            raise ErroRequisicao(404, detalhes["erro"])
+        return detalhes
+
+    def _calcular_conciliacao(self, mes_ano: str) -> Dict:
+        resultados = self.controller.executar_conciliacao(mes_ano)
+        return {
+            "mes_ano": mes_ano,
+            "resultados": [
+                resultado_para_dict(r, LIMITE_ALERTA_PERCENTUAL, LIMITE_CRITICO_PERCENTUAL)
+                for r in resultados
+            ],
+        }
+
+    async def _obter(
+        self, chave: Tuple[str, ...], mes_ano: str, funcao: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Devolve o resultado em cache, aguarda o cálculo em andamento ou inicia um novo"""
+        loop = asyncio.get_running_loop()
+        fingerprint = await loop.run_in_executor(
+            self.executor, self.controller.data_loader.fingerprint_mes, mes_ano
+        )
+
+        em_cache = self._resultados.get(chave)
+        if em_cache is not None and em_cache[0] == fingerprint:
+            self.acertos_cache += 1
+            return em_cache[1]
+
+        andamento = self._em_andamento.get(chave)
+        if andamento is None:
+            self.calculos += 1
+            andamento = loop.run_in_executor(self.executor, funcao, mes_ano, *args)
+            self._em_andamento[chave] = andamento
+            andamento.add_done_callback(
+                lambda futuro: self._concluir(chave, fingerprint, futuro)
+            )
+        # shield: um cliente que desconecta não cancela o cálculo dos demais
+        return await asyncio.shield(andamento)
+
+    def _concluir(
+        self, chave: Tuple[str, ...], fingerprint: str, futuro: "asyncio.Future[Any]"
+    ) -> None:
+        """Guarda o resultado concluído (erros não ficam em cache)"""
+        self._em_andamento.pop(chave, None)
+        if futuro.cancelled() or futuro.exception() is not None:
+            return
+        self._resultados.pop(chave, None)
+        self._resultados[chave] = (fingerprint, futuro.result())
+        while len(self._resultados) > LIMITE_RESULTADOS_CACHE:
+            self._resultados.pop(next(iter(self._resultados)))
+
+    async def rotear(self, metodo: str, caminho: str) -> Tuple[int, Any]:
+        """Resolve uma requisição em (status, corpo)"""
+        if metodo != "GET":
+            raise ErroRequisicao(405, "Apenas GET é suportado")
+
+        partes = [p for p in caminho.split("?", 1)[0].split("/") if p]
+        if partes == ["saude"]:
+            return 200, {
+                "status": "ok",
+                "calculos": self.calculos,
+                "acertos_cache": self.acertos_cache,
+            }
+        if len(partes) >= 2 and not _PADRAO_MES.match(partes[1]):
+            raise ErroRequisicao(400, f"Mês inválido: {partes[1]} (use MMAAAA)")
+        if len(partes) == 2 and partes[0] == "conciliacao":
+            return 200, await self.conciliacao(partes[1])
+        if len(partes) == 2 and partes[0] == "resumo":
+            return 200, await self.resumo(partes[1])
+        if len(partes) == 3 and partes[0] == "detalhes":
+            return 200, await self.detalhes(partes[1], partes[2])
+        raise ErroRequisicao(404, f"Recurso não encontrado: {caminho}")
+
+    async def tratar_conexao(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Lê uma requisição HTTP/1.1, responde em JSON e fecha a conexão"""
+        try:
+            linha = (await reader.readline()).decode("latin-1").strip()
+            # Cabeçalhos são lidos e ignorados
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            try:
+                metodo, caminho, _versao = linha.split(" ", 2)
+            except ValueError:
+                status, corpo = 400, {"erro": "Requisição malformada"}
+            else:
+                try:
+                    status, corpo = await self.rotear(metodo, caminho)
+                except ErroRequisicao as exc:
+                    status, corpo = exc.status, {"erro": str(exc)}
+                except Exception as exc:  # pylint: disable=broad-except
+                    self.logger.exception("Erro ao atender %s", linha)
+                    status, corpo = 500, {"erro": str(exc)}
+            self.logger.info("%s -> %d", linha, status)
+
+            dados = json.dumps(corpo, ensure_ascii=False, default=str).encode("utf-8")
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {_MENSAGENS_STATUS[status]}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(dados)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("latin-1")
+                + dados
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def iniciar(
+        self, host: str = HOST_PADRAO, porta: int = PORTA_PADRAO
+    ) -> asyncio.Server:
+        """Abre o socket e retorna o servidor asyncio"""
+        return await asyncio.start_server(self.tratar_conexao, host, porta)
+
+    def encerrar(self) -> None:
+        """Libera o pool de processamento"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def servir(args: argparse.Namespace) -> None:
+    """Executa o serviço até ser interrompido"""
+    servico = ServicoConciliacao(
+        args.base_path, cache_dir=args.cache_dir, max_workers=args.workers
+    )
+    servidor = await servico.iniciar(args.host, args.porta)
+    enderecos = ", ".join(str(s.getsockname()) for s in servidor.sockets)
+    servico.logger.warning("Serviço de conciliação em %s", enderecos)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servico.encerrar()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada do serviço"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.servidor",
+        description="SWAIF-CONFA - serviço HTTP local de conciliação",
+    )
+    parser.add_argument("--host", default=HOST_PADRAO, help="Endereço (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--workers", type=int, default=None, help="Threads de processamento")
+    parser.add_argument("--base-path", default=BASE_PATH_PADRAO)
+    parser.add_argument("--cache-dir", default=CACHE_DIR_PADRAO)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if args.host not in ("127.0.0.1", "localhost", "::1"):
+        logging.getLogger(__name__).warning(
+            "Serviço exposto fora do localhost (%s): não há autenticação", args.host
+        )
+    try:
+        asyncio.run(servir(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,323 @@
+"""
+Exportadores de resultados - CSV, JSON Lines e HTML para planilhas e arquivo
+
+Os resultados dos pares, as divergências registro a registro e as células
+que falharam na validação das fontes são escritos
+em blocos, à medida que são gerados: nenhum documento inteiro é montado em
+memória. Os valores em R$ de cada bloco são formatados de uma vez
+(formatar_brl_lote), em vez de uma chamada de format_brl por célula.
+"""
+from __future__ import annotations
+
+import csv
+import html
+import json
+import os
+from itertools import islice
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+)
+
+from src.models.tolerancias import (
+    LIMITE_ALERTA_PERCENTUAL,
+    LIMITE_CRITICO_PERCENTUAL,
+    classificar_resultado,
+)
+
+if TYPE_CHECKING:
+    from src.models.analisador import ResultadoAnalise
+
+# Linhas formatadas e escritas por vez
+TAMANHO_BLOCO = 5000
+
+COLUNAS_RESUMO = [
+    'mes_ano', 'tipo_analise', 'fonte_1', 'fonte_2', 'total_fonte_1', 'total_fonte_2',
+    'registros_fonte_1', 'registros_fonte_2', 'diferenca', 'percentual_diferenca', 'status',
+]
+COLUNAS_DIVERGENCIA = [
+    'mes_ano', 'fonte_1', 'fonte_2', 'fonte', 'tipo', 'data', 'hora', 'num_cartao',
+    'status', 'valor',
+]
+COLUNAS_VALIDACAO = ['mes_ano', 'fonte', 'linha', 'coluna', 'regra', 'conteudo']
+# Colunas em R$ de cada tabela, formatadas em lote
+_MONETARIAS_RESUMO = ('total_fonte_1', 'total_fonte_2', 'diferenca')
+_MONETARIAS_DIVERGENCIA = ('valor',)
+
+FORMATOS_EXPORTACAO = {'.csv': 'csv', '.jsonl': 'jsonl', '.html': 'html', '.htm': 'html'}
+
+# "1,234.56" -> "1.234,56" em uma única passada sobre o bloco inteiro
+_TROCA_SEPARADORES = str.maketrans({',': '.', '.': ','})
+
+
+def formatar_brl_lote(valores: Iterable[float]) -> List[str]:
+    """
+    Formata vários valores no padrão brasileiro (1.234,56) de uma vez
+
+    Equivale a format_brl aplicado a cada valor, mas a troca de separadores
+    é feita uma única vez sobre o texto do bloco.
+    """
+    texto = "\n".join(f"{float(v):,.2f}" for v in valores)
+    if not texto:
+        return []
+    return texto.translate(_TROCA_SEPARADORES).split("\n")
+
+
+def _linhas_resumo(
+    resultados_por_mes: Mapping[str, Sequence[ResultadoAnalise]],
+    limite_alerta: float,
+    limite_critico: float,
+) -> Iterator[Dict]:
+    for mes_ano, resultados in resultados_por_mes.items():
+        for r in resultados:
+            yield {
+                'mes_ano': mes_ano,
+                'tipo_analise': r.tipo_analise,
+                'fonte_1': r.par_fontes[0],
+                'fonte_2': r.par_fontes[1],
+                'total_fonte_1': r.total_fonte_1,
+                'total_fonte_2': r.total_fonte_2,
+                'registros_fonte_1': r.registros_fonte_1,
+                'registros_fonte_2': r.registros_fonte_2,
+                'diferenca': r.diferenca,
+                'percentual_diferenca': round(r.percentual_diferenca, 4),
+                'status': classificar_resultado(r, limite_alerta, limite_critico),
+            }
+
+
+def _linhas_divergencias(
+    resultados_por_mes: Mapping[str, Sequence[ResultadoAnalise]],
+) -> Iterator[Dict]:
+    for mes_ano, resultados in resultados_por_mes.items():
+        for r in resultados:
+            par = {'mes_ano': mes_ano, 'fonte_1': r.par_fontes[0], 'fonte_2': r.par_fontes[1]}
+            colunas = r.detalhes_divergencias.COLUNAS
+            for valores in r.detalhes_divergencias.tuplas():
+                yield {**par, **dict(zip(colunas, valores))}
+
+
+def _linhas_validacao(
+    resultados_por_mes: Mapping[str, Sequence[ResultadoAnalise]],
+) -> Iterator[Dict]:
+    for mes_ano, resultados in resultados_por_mes.items():
+        # A tabela de uma fonte se repete em todos os pares dela
+        tabelas = {f: t for r in resultados for f, t in r.erros_validacao.items()}
+        for tabela in tabelas.values():
+            for valores in tabela.tuplas():
+                yield {'mes_ano': mes_ano, **dict(zip(tabela.COLUNAS, valores))}
+
+
+def _blocos(linhas: Iterable[Dict], tamanho: int = TAMANHO_BLOCO) -> Iterator[List[Dict]]:
+    iterador = iter(linhas)
+    while True:
+        bloco = list(islice(iterador, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+
+def _formatar_bloco(bloco: List[Dict], monetarias: Sequence[str]) -> List[Dict]:
+    """Substitui as colunas em R$ do bloco pelo texto formatado (em lote por coluna)"""
+    for coluna in monetarias:
+        for linha, texto in zip(bloco, formatar_brl_lote(linha[coluna] for linha in bloco)):
+            linha[coluna] = texto
+    if bloco and 'percentual_diferenca' in bloco[0]:
+        for linha in bloco:
+            linha['percentual_diferenca'] = f"{linha['percentual_diferenca']:.4f}".replace('.', ',')
+    return bloco
+
+
+def _escrever_csv(
+    caminho: str, colunas: List[str], linhas: Iterable[Dict], monetarias: Sequence[str]
+) -> int:
+    total = 0
+    # utf-8-sig e ";" para abrir direto no Excel em português
+    with open(caminho, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=colunas, delimiter=';', lineterminator='\n')
+        writer.writeheader()
+        for bloco in _blocos(linhas):
+            writer.writerows(_formatar_bloco(bloco, monetarias))
+            total += len(bloco)
+    return total
+
+
+def exportar_csv(
+    resultados_por_mes: Mapping[str, Sequence[ResultadoAnalise]],
+    caminho: str,
+    limite_alerta: float = LIMITE_ALERTA_PERCENTUAL,
+    limite_critico: float = LIMITE_CRITICO_PERCENTUAL,
+) -> List[str]:
+    """
+    Exporta para CSV (";" e vírgula decimal, como o Excel em português)
+
+    Os pares vão para ``caminho``, as divergências registro a registro para
+    ``<caminho sem extensão>_divergencias.csv`` e os erros de validação das
+    fontes para ``<caminho sem extensão>_validacao.csv``.
+
+    Returns:
+        Arquivos gravados
+    """
+    base, _ext = os.path.splitext(caminho)
+    caminho_divergencias = f"{base}_divergencias.csv"
+    caminho_validacao = f"{base}_validacao.csv"
+    _escrever_csv(
+        caminho, COLUNAS_RESUMO,
+        _linhas_resumo(resultados_por_mes, limite_alerta, limite_critico),
+        _MONETARIAS_RESUMO,
+    )
+    _escrever_csv(
+        caminho_divergencias, COLUNAS_DIVERGENCIA,
+        _linhas_divergencias(resultados_por_mes),
+        _MONETARIAS_DIVERGENCIA,
+    )
+    _escrever_csv(
+        caminho_validacao, COLUNAS_VALIDACAO, _linhas_validacao(resultados_por_mes), ()
+    )
+    return [caminho, caminho_divergencias, caminho_validacao]
+
+
+def exportar_jsonl(
+    resultados_por_mes: Mapping[str, Sequence[ResultadoAnalise]],
+    caminho: str,
+    limite_alerta: float = LIMITE_ALERTA_PERCENTUAL,
+    limite_critico: float = LIMITE_CRITICO_PERCENTUAL,
+) -> List[str]:
+    """
+    Exporta para JSON Lines: um objeto por linha, com ``registro`` igual a
+    "par", "divergencia" ou "validacao"; os valores ficam numéricos, para
+    processamento
+
+    Returns:
+        Arquivos gravados
+    """
+    partes: Tuple[Tuple[str, Iterable[Dict]], ...] = (
+        ('par', _linhas_resumo(resultados_por_mes, limite_alerta, limite_critico)),
+        ('divergencia', _linhas_divergencias(resultados_por_mes)),
+        ('validacao', _linhas_validacao(resultados_por_mes)),
+    )
+    with open(caminho, 'w', encoding='utf-8') as f:
+        for registro, linhas in partes:
+            for bloco in _blocos(linhas):
+                f.write("".join(
+                    json.dumps({'registro': registro, **linha}, ensure_ascii=False) + "\n"
+                    for linha in bloco
+                ))
+    return [caminho]
+
+
+_ESTILO_HTML = """
+body { font-family: Arial, Helvetica, sans-serif; margin: 24px; color: #222; }
+h1 { font-size: 20px; } h2 { font-size: 16px; margin-top: 32px; }
+table { border-collapse: collapse; font-size: 13px; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; }
+th { background: #f0f0f0; text-align: left; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; }
+tr.alerta td { background: #fff6d6; } tr.critico td { background: #fde2e2; }
+"""
+
+
+def _escrever_tabela_html(
+    f: IO[str],
+    colunas: List[str],
+    linhas: Iterable[Dict],
+    monetarias: Sequence[str],
+    classe_linha: Callable[[Dict], str],
+) -> int:
+    numericas = set(monetarias) | {
+        'registros_fonte_1', 'registros_fonte_2', 'percentual_diferenca', 'linha'
+    }
+    f.write("<table>\n<thead><tr>")
+    f.write("".join(f"<th>{html.escape(c)}</th>" for c in colunas))
+    f.write("</tr></thead>\n<tbody>\n")
+    total = 0
+    for bloco in _blocos(linhas):
+        _formatar_bloco(bloco, monetarias)
+        f.write("".join(
+            f'<tr class="{classe_linha(linha)}">'
+            + "".join(
+                f'<td class="num">{html.escape(str(linha[c]))}</td>' if c in numericas
+                else f"<td>{html.escape(str(linha[c]))}</td>"
+                for c in colunas
+            )
+            + "</tr>\n"
+            for linha in bloco
+        ))
+        total += len(bloco)
+    f.write("</tbody>\n</table>\n")
+    return total
+
+
+def exportar_html(
+    resultados_por_mes: Mapping[str, Sequence[ResultadoAnalise]],
+    caminho: str,
+    limite_alerta: float = LIMITE_ALERTA_PERCENTUAL,
+    limite_critico: float = LIMITE_CRITICO_PERCENTUAL,
+) -> List[str]:
+    """
+    Exporta para um arquivo HTML autocontido (estilo embutido, sem scripts)
+
+    Returns:
+        Arquivos gravados
+    """
+    meses = [f"{m[:2]}/{m[2:]}" for m in resultados_por_mes]
+    periodo = f"{meses[0]} a {meses[-1]}" if len(meses) > 1 else "".join(meses)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(
+            "<!DOCTYPE html>\n<html lang=\"pt-BR\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>SWAIF-CONFA - Conciliação {html.escape(periodo)}</title>\n"
+            f"<style>{_ESTILO_HTML}</style>\n</head>\n<body>\n"
+            f"<h1>Conciliação financeira - {html.escape(periodo)}</h1>\n"
+            "<h2>Pares de fontes</h2>\n"
+        )
+        _escrever_tabela_html(
+            f, COLUNAS_RESUMO,
+            _linhas_resumo(resultados_por_mes, limite_alerta, limite_critico),
+            _MONETARIAS_RESUMO,
+            lambda linha: linha['status'],
+        )
+        f.write("<h2>Divergências por registro</h2>\n")
+        _escrever_tabela_html(
+            f, COLUNAS_DIVERGENCIA,
+            _linhas_divergencias(resultados_por_mes),
+            _MONETARIAS_DIVERGENCIA,
+            lambda linha: '',
+        )
+        f.write("<h2>Erros de validação das fontes</h2>\n")
+        _escrever_tabela_html(
+            f, COLUNAS_VALIDACAO, _linhas_validacao(resultados_por_mes), (), lambda linha: '',
+        )
+        f.write("</body>\n</html>\n")
+    return [caminho]
+
+
+_EXPORTADORES = {'csv': exportar_csv, 'jsonl': exportar_jsonl, 'html': exportar_html}
+
+
+def exportar(
+    resultados_por_mes: Mapping[str, Sequence[ResultadoAnalise]],
+    caminho: str,
+    limite_alerta: float = LIMITE_ALERTA_PERCENTUAL,
+    limite_critico: float = LIMITE_CRITICO_PERCENTUAL,
+) -> List[str]:
+    """
+    Exporta no formato indicado pela extensão (.csv, .jsonl ou .html)
+
+    Raises:
+        ValueError: Extensão não suportada
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao not in FORMATOS_EXPORTACAO:
+        raise ValueError(
+            f"Formato de exportação não suportado: {extensao or caminho} "
+            f"(use {', '.join(sorted(FORMATOS_EXPORTACAO))})"
+        )
+    exportador = _EXPORTADORES[FORMATOS_EXPORTACAO[extensao]]
+    return exportador(resultados_por_mes, caminho, limite_alerta, limite_critico)
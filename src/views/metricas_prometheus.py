@@ -0,0 +1,216 @@
+"""
+Métricas da execução no formato texto do Prometheus (textfile collector)
+
+Pensado para o cron: cada execução regrava, de forma atômica, um arquivo
+``.prom`` lido pelo textfile collector do node-exporter. As métricas cobrem
+desempenho (tempo por etapa, linhas lidas, caches, pico de RSS), a
+qualidade das fontes (erros de validação por regra) e o resultado
+financeiro (diferença e nível de divergência por par), para
+alertar sobre os dois sem interpretar logs.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple
+
+from src.models.tolerancias import (
+    LIMITE_ALERTA_PERCENTUAL,
+    LIMITE_CRITICO_PERCENTUAL,
+    classificar_resultado,
+)
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, o pico de RSS não é exportado
+    resource = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from src.models.analisador import ResultadoLote
+
+PREFIXO = 'swaif'
+
+# Etapas de leitura cujas linhas de saída são as linhas carregadas da fonte
+ETAPAS_LEITURA = ('ler_csv', 'ler_wab_json')
+
+NIVEIS_DIVERGENCIA = {'ok': 0, 'alerta': 1, 'critico': 2}
+
+# nome -> (tipo, descrição), na ordem em que aparecem no arquivo
+METRICAS = {
+    'ultima_execucao_timestamp_segundos': ('gauge', 'Fim da última execução (epoch)'),
+    'codigo_saida': ('gauge', 'Código de saída da execução (0 confere, 3 alerta, 4 crítico)'),
+    'pico_rss_bytes': ('gauge', 'Maior RSS do processo principal e dos workers'),
+    'clinica_erro': ('gauge', '1 se a clínica não pôde ser conciliada'),
+    'mes_erro': ('gauge', '1 se o mês não pôde ser conciliado'),
+    'mes_duracao_segundos': ('gauge', 'Duração da conciliação do mês'),
+    'etapa_duracao_segundos': ('gauge', 'Duração somada de cada etapa (internas incluídas)'),
+    'fonte_linhas_carregadas': ('gauge', 'Linhas lidas do arquivo de cada fonte'),
+    'fonte_erros_validacao': ('gauge', 'Células da fonte que falharam na validação, por regra'),
+    'cache_acertos': ('gauge', 'Consultas ao cache respondidas sem recalcular'),
+    'cache_consultas': ('gauge', 'Consultas ao cache'),
+    'cache_taxa_acerto': ('gauge', 'Acertos / consultas ao cache'),
+    'par_diferenca_reais': ('gauge', 'Total da fonte_1 menos o da fonte_2 (R$)'),
+    'par_percentual_diferenca': ('gauge', 'Diferença percentual entre os totais do par'),
+    'par_nivel_divergencia': ('gauge', 'Nível de divergência do par (0 ok, 1 alerta, 2 crítico)'),
+}
+
+Amostra = Tuple[Dict[str, str], float]
+
+
+def pico_rss_bytes() -> Dict[str, int]:
+    """
+    Pico de RSS do processo e do maior worker já encerrado
+
+    Returns:
+        Dict processo -> bytes ('principal' e 'workers'); vazio sem ``resource``
+    """
+    if resource is None:
+        return {}
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    fator = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'principal': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * fator,
+        'workers': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * fator,
+    }
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatar_amostra(nome: str, rotulos: Dict[str, str], valor: float) -> str:
+    texto = ','.join(f'{chave}="{_escapar(str(v))}"' for chave, v in rotulos.items())
+    serie = f"{PREFIXO}_{nome}{{{texto}}}" if texto else f"{PREFIXO}_{nome}"
+    return f"{serie} {float(valor)!r}"
+
+
+def linhas_prometheus(
+    lotes: Mapping[str, ResultadoLote],
+    limite_alerta: float = LIMITE_ALERTA_PERCENTUAL,
+    limite_critico: float = LIMITE_CRITICO_PERCENTUAL,
+    codigo_saida: Optional[int] = None,
+    pico_rss: Optional[Dict[str, int]] = None,
+    instante: Optional[float] = None,
+    erros_clinicas: Optional[Mapping[str, str]] = None,
+) -> List[str]:
+    """
+    Linhas do arquivo de métricas de uma execução
+
+    Args:
+        lotes: Dict clínica -> lote; a chave '' dispensa o rótulo ``clinica``
+        limite_alerta: Percentual a partir do qual um par está em alerta
+        limite_critico: Percentual a partir do qual um par está crítico
+        codigo_saida: Código de saída da execução, se conhecido
+        pico_rss: Dict processo -> bytes (padrão: pico_rss_bytes())
+        instante: Fim da execução em epoch (padrão: agora)
+        erros_clinicas: Dict clínica -> erro das clínicas que falharam por
+            inteiro (sem lote); com ele, ``clinica_erro`` sai para todas
+    """
+    amostras: Dict[str, List[Amostra]] = {nome: [] for nome in METRICAS}
+    amostras['ultima_execucao_timestamp_segundos'].append(
+        ({}, time.time() if instante is None else instante)
+    )
+    if codigo_saida is not None:
+        amostras['codigo_saida'].append(({}, codigo_saida))
+    for processo, bytes_rss in (pico_rss_bytes() if pico_rss is None else pico_rss).items():
+        amostras['pico_rss_bytes'].append(({'processo': processo}, bytes_rss))
+
+    if erros_clinicas is not None:
+        for clinica in lotes:
+            amostras['clinica_erro'].append(({'clinica': clinica}, 0))
+        for clinica in erros_clinicas:
+            amostras['clinica_erro'].append(({'clinica': clinica}, 1))
+
+    caches: Dict[Tuple[str, str], Dict[str, int]] = {}
+    for clinica, lote in lotes.items():
+        base = {'clinica': clinica} if clinica else {}
+        for mes_ano in lote.erros:
+            amostras['mes_erro'].append(({**base, 'mes': mes_ano}, 1))
+        for mes_ano, resultados in lote.resultados.items():
+            rotulos_mes = {**base, 'mes': mes_ano}
+            amostras['mes_erro'].append((rotulos_mes, 0))
+            if mes_ano in lote.tempos:
+                amostras['mes_duracao_segundos'].append((rotulos_mes, lote.tempos[mes_ano]))
+
+            metricas = resultados[0].metricas if resultados else None
+            if metricas is not None:
+                duracoes: Dict[Tuple[str, str], float] = {}
+                for e in metricas.etapas:
+                    duracoes[(e.nome, e.fonte)] = duracoes.get((e.nome, e.fonte), 0.0) + e.duracao
+                    if e.nome in ETAPAS_LEITURA:
+                        amostras['fonte_linhas_carregadas'].append(
+                            ({**rotulos_mes, 'fonte': e.fonte}, e.linhas_saida)
+                        )
+                for (nome, fonte), duracao in duracoes.items():
+                    amostras['etapa_duracao_segundos'].append(
+                        ({**rotulos_mes, 'etapa': nome, 'fonte': fonte}, duracao)
+                    )
+                for cache, contagem in metricas.caches.items():
+                    total = caches.setdefault((clinica, cache), {'acertos': 0, 'falhas': 0})
+                    total['acertos'] += contagem['acertos']
+                    total['falhas'] += contagem['falhas']
+
+            tabelas = {f: t for r in resultados for f, t in r.erros_validacao.items()}
+            for fonte, tabela in tabelas.items():
+                for regra, quantidade in tabela.contar('regra').items():
+                    amostras['fonte_erros_validacao'].append(
+                        ({**rotulos_mes, 'fonte': fonte, 'regra': regra}, quantidade)
+                    )
+
+            for r in resultados:
+                rotulos_par = {
+                    **rotulos_mes, 'tipo': r.tipo_analise,
+                    'fonte_1': r.par_fontes[0], 'fonte_2': r.par_fontes[1],
+                }
+                status = classificar_resultado(r, limite_alerta, limite_critico)
+                amostras['par_diferenca_reais'].append((rotulos_par, r.diferenca))
+                amostras['par_percentual_diferenca'].append(
+                    (rotulos_par, r.percentual_diferenca)
+                )
+                amostras['par_nivel_divergencia'].append(
+                    (rotulos_par, NIVEIS_DIVERGENCIA[status])
+                )
+
+    for (clinica, cache), contagem in caches.items():
+        rotulos_cache = {**({'clinica': clinica} if clinica else {}), 'cache': cache}
+        consultas = contagem['acertos'] + contagem['falhas']
+        amostras['cache_acertos'].append((rotulos_cache, contagem['acertos']))
+        amostras['cache_consultas'].append((rotulos_cache, consultas))
+        amostras['cache_taxa_acerto'].append(
+            (rotulos_cache, contagem['acertos'] / consultas if consultas else 0.0)
+        )
+
+    # O formato exige as amostras de cada métrica juntas, após HELP e TYPE
+    linhas: List[str] = []
+    for nome, (tipo, descricao) in METRICAS.items():
+        if not amostras[nome]:
+            continue
+        linhas.append(f"# HELP {PREFIXO}_{nome} {descricao}")
+        linhas.append(f"# TYPE {PREFIXO}_{nome} {tipo}")
+        linhas.extend(_formatar_amostra(nome, rotulos, valor) for rotulos, valor in amostras[nome])
+    return linhas
+
+
+def escrever_metricas_prometheus(
+    caminho: str,
+    lotes: Mapping[str, ResultadoLote],
+    limite_alerta: float = LIMITE_ALERTA_PERCENTUAL,
+    limite_critico: float = LIMITE_CRITICO_PERCENTUAL,
+    codigo_saida: Optional[int] = None,
+    erros_clinicas: Optional[Mapping[str, str]] = None,
+) -> None:
+    """
+    Regrava o arquivo de métricas de forma atômica
+
+    O collector pode ler o diretório a qualquer momento: o conteúdo vai para
+    um temporário (sem a extensão ``.prom``, ignorado por ele) e substitui o
+    arquivo de uma vez.
+    """
+    linhas = linhas_prometheus(
+        lotes, limite_alerta, limite_critico, codigo_saida, erros_clinicas=erros_clinicas
+    )
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8', newline='\n') as arquivo:
+        arquivo.write('\n'.join(linhas) + '\n')
+    os.replace(temporario, caminho)
@@ -1,9 +1,40 @@
 """Terminal View - Interface estilo mainframe no terminal"""
+from __future__ import annotations
+
+import math
 import os
 import sys
-from typing import Dict, List
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from src.models.tolerancias import classificar_resultado
+
+if TYPE_CHECKING:
+    # Apenas para anotações: a view não importa pandas, para o menu abrir sem esperar
+    from src.models.analisador import ResultadoAnalise, ResultadoLote
+    from src.models.instrumentacao import MetricasExecucao
+    from src.models.taxas import ResultadoTaxas
 
-from src.models.analisador import ResultadoAnalise
+
+# Rótulo exibido para cada classificação de tolerancias.classificar_resultado
+_STATUS_CLASSIFICACAO = {
+    'ok': "✅ CONFERE",
+    'alerta': "⚠️  PEQUENA DIVERGÊNCIA",
+    'critico': "❌ GRANDE DIVERGÊNCIA",
+}
 
 
 def format_brl(value: float) -> str:
@@ -20,6 +51,58 @@ def format_percent(value: float) -> str:
     return f"{value:.1f}".replace(".", ",")
 
 
+def _kb(quantidade: int) -> str:
+    return f"{quantidade / 1024:,.0f}".replace(",", ".")
+
+
+def formatar_metricas(metricas: MetricasExecucao) -> List[str]:
+    """Linhas da tabela de etapas de uma execução, com as internas recuadas"""
+    linhas = [
+        f"{'Etapa':<28} {'Fonte':<16} {'Tempo (ms)':>11} {'Entrada':>10} "
+        f"{'Saída':>10} {'Lidos (KB)':>11}"
+    ]
+    for e in metricas.etapas:
+        nome = "  " * e.profundidade + e.nome
+        lidos = _kb(e.bytes_lidos) if e.bytes_lidos else ""
+        linhas.append((
+            f"{nome:<28} {e.fonte:<16} {format_brl(e.duracao * 1000):>11} "
+            f"{e.linhas_entrada or '':>10} {e.linhas_saida or '':>10} {lidos:>11}"
+        ).rstrip())
+    linhas.append(f"{'Total':<28} {'':<16} {format_brl(metricas.duracao_total * 1000):>11}")
+    return linhas
+
+
+def formatar_perfil_memoria(metricas: MetricasExecucao) -> List[str]:
+    """
+    Linhas do relatório de memória de uma execução com ``memoria=True``
+
+    Pico e saldo (retido) são medidos pelo tracemalloc a partir do início de
+    cada etapa; "DataFrame" é o ``memory_usage(deep=True)`` da saída dela.
+    """
+    linhas = [
+        f"{'Etapa':<28} {'Fonte':<16} {'Pico (KB)':>11} {'Retido (KB)':>12} "
+        f"{'DataFrame (KB)':>15}"
+    ]
+    for e in metricas.etapas:
+        nome = "  " * e.profundidade + e.nome
+        dataframe = _kb(e.bytes_dataframe) if e.bytes_dataframe else ""
+        linhas.append(
+            f"{nome:<28} {e.fonte:<16} {_kb(e.pico_bytes):>11} {_kb(e.retidos_bytes):>12} "
+            f"{dataframe:>15}".rstrip()
+        )
+    linhas.append(f"{'Pico da execução':<28} {'':<16} {_kb(metricas.pico_bytes):>11}")
+
+    com_locais = [e for e in metricas.etapas if e.locais]
+    if com_locais:
+        linhas.append("")
+        linhas.append("Locais que mais retiveram memória por etapa:")
+    for e in com_locais:
+        linhas.append(f"  {e.nome}" + (f" ({e.fonte})" if e.fonte else "") + ":")
+        for local, tamanho, blocos in e.locais:
+            linhas.append(f"    {_kb(tamanho):>11} KB {blocos:>9} blocos  {local}")
+    return linhas
+
+
 def safe_pause(prompt: str = "\nPressione ENTER para continuar...") -> None:
     try:
         if sys.stdin is None or not sys.stdin.isatty():
@@ -27,13 +110,111 @@ def safe_pause(prompt: str = "\nPressione ENTER para continuar...") -> None:
         input(prompt)
     except (EOFError, OSError):
         return
-      
+
+
+def _terminal_interativo() -> bool:
+    try:
+        return sys.stdin is not None and sys.stdin.isatty()
+    except (ValueError, OSError):
+        return False
+
+
+# Linhas por página do Paginador
+TAMANHO_PAGINA_PADRAO = 20
+
+_FIM = object()
+
+
+class Paginador:
+    """
+    Exibe itens de um iterador uma página por vez
+
+    Só os itens da página corrente são consumidos do iterador e formatados;
+    cada página é escrita de uma vez na saída. Em terminal interativo, o
+    operador avança com ENTER ou encerra com "q"; fora dele (saída
+    redirecionada), todas as páginas são escritas em sequência.
+    """
+
+    def __init__(
+        self,
+        tamanho_pagina: int = TAMANHO_PAGINA_PADRAO,
+        saida: Optional[TextIO] = None,
+        interativo: Optional[bool] = None,
+    ):
+        self.tamanho_pagina = max(1, tamanho_pagina)
+        self._saida = saida
+        self._interativo = interativo
+
+    @property
+    def saida(self) -> TextIO:
+        # Resolvida a cada uso, para respeitar redirecionamentos de sys.stdout
+        return self._saida if self._saida is not None else sys.stdout
+
+    @property
+    def interativo(self) -> bool:
+        return self._interativo if self._interativo is not None else _terminal_interativo()
+
+    def paginas(
+        self, itens: Iterable[Any], formatar: Callable[[Any], str]
+    ) -> Iterator[Tuple[List[str], bool]]:
+        """Gera (linhas formatadas da página, há mais páginas)"""
+        restantes: Iterator[Any] = iter(itens)
+        while True:
+            pagina = [formatar(item) for item in islice(restantes, self.tamanho_pagina)]
+            if not pagina:
+                return
+            proximo = next(restantes, _FIM)
+            if proximo is _FIM:
+                yield pagina, False
+                return
+            restantes = chain([proximo], restantes)
+            yield pagina, True
+
+    def exibir(
+        self,
+        itens: Iterable[Any],
+        formatar: Callable[[Any], str],
+        cabecalho: Sequence[str] = (),
+    ) -> int:
+        """
+        Escreve os itens página a página
+
+        Args:
+            itens: Iterável (de preferência preguiçoso) com os itens
+            formatar: Converte um item em uma linha de texto
+            cabecalho: Linhas repetidas no topo de cada página
+
+        Returns:
+            Quantidade de itens exibidos
+        """
+        exibidos = 0
+        saida = self.saida
+        for numero, (pagina, ha_mais) in enumerate(self.paginas(itens, formatar), 1):
+            exibidos += len(pagina)
+            bloco = list(cabecalho) + pagina
+            if ha_mais or numero > 1:
+                bloco.append(f"-- página {numero} ({exibidos} registros exibidos) --")
+            saida.write("\n".join(bloco) + "\n")
+            saida.flush()
+            if ha_mais and self.interativo:
+                try:
+                    resposta = input("ENTER para a próxima página, q para encerrar: ")
+                except (EOFError, OSError):
+                    break
+                if resposta.strip().lower() == "q":
+                    break
+        return exibidos
+
+
 class TerminalView:
     """Interface de terminal estilo mainframe"""
     
-    def __init__(self):
+    def __init__(self, exibir_metricas: bool = False):
         self.largura_tela = 120
         self.titulo_sistema = "SWAIF-CONFA - SISTEMA DE CONCILIAÇÃO FINANCEIRA"
+        self.paginador = Paginador()
+        # Mostra o tempo de cada etapa ao final dos resultados da conciliação
+        self.exibir_metricas = exibir_metricas
         
     def limpar_tela(self):
         """Limpa a tela do terminal"""
@@ -62,6 +243,9 @@ class TerminalView:
         print("2. Visualizar Resumo dos Dados")
         print("3. Detalhes por Fonte")
         print("4. Configurações")
+        print("5. Conciliação em Lote")
+        print("6. Visão Acumulada (Ano / 12 meses)")
+        print("7. Análise de Taxas (MDR)")
         print("0. Sair")
         print()
         
@@ -85,6 +269,14 @@ class TerminalView:
         
         return mes_ano
     
+    def solicitar_intervalo_meses(self) -> Tuple[str, str]:
+        """Solicita o primeiro e o último mês de uma conciliação em lote"""
+        print("\nPrimeiro mês do intervalo:")
+        inicio = self.solicitar_mes_ano()
+        print("\nÚltimo mês do intervalo:")
+        fim = self.solicitar_mes_ano()
+        return inicio, fim
+
     def exibir_resultados_conciliacao(self, resultados: List[ResultadoAnalise], mes_ano: str):
         """Exibe resultados da conciliação"""
         self.limpar_tela()
@@ -111,7 +303,72 @@ class TerminalView:
 
         self._exibir_resumo_geral(resultados)
 
+        if any(r.detalhes_divergencias for r in resultados):
+            print()
+            print("📋 REGISTROS DESCARTADOS / DIVERGENTES")
+            print("-" * 60)
+            self.paginador.exibir(
+                (d for r in resultados for d in r.detalhes_divergencias),
+                self._formatar_divergencia,
+                cabecalho=(
+                    f"{'Data':<10} {'Hora':<8} {'Fonte':<16} {'Tipo':<12} "
+                    f"{'Cartão':<16} {'Valor (R$)':>12}  Status",
+                ),
+            )
+
+        self._exibir_erros_validacao(resultados)
+
+        if self.exibir_metricas and resultados[0].metricas is not None:
+            self.exibir_metricas_execucao(resultados[0].metricas)
+
         safe_pause("\nPressione ENTER para continuar...")
+
+    def _exibir_erros_validacao(self, resultados: List[ResultadoAnalise]):
+        """Exibe as contagens por fonte e regra e as células que falharam na validação"""
+        # A tabela de uma fonte se repete em todos os pares dela
+        tabelas = {f: t for r in resultados for f, t in r.erros_validacao.items() if t}
+        if not tabelas:
+            return
+        print()
+        print("🧪 ERROS DE VALIDAÇÃO DAS FONTES (contados como R$ 0,00 nos totais)")
+        print("-" * 60)
+        for fonte, tabela in tabelas.items():
+            contagens = ", ".join(
+                f"{regra}: {quantidade}" for regra, quantidade in tabela.contar('regra').items()
+            )
+            print(f"   {fonte:<16} {contagens}")
+        print()
+        self.paginador.exibir(
+            chain.from_iterable(tabelas.values()),
+            self._formatar_erro_validacao,
+            cabecalho=(f"{'Fonte':<16} {'Linha':>6} {'Coluna':<16} {'Regra':<18} Conteúdo",),
+        )
+
+    @staticmethod
+    def _formatar_erro_validacao(erro: Mapping) -> str:
+        """Formata uma célula inválida em uma linha da listagem"""
+        return (
+            f"{erro['fonte']:<16} {erro['linha']:>6} {erro['coluna']:<16} "
+            f"{erro['regra']:<18} {erro['conteudo']!r}"
+        )
+
+    def exibir_metricas_execucao(self, metricas: MetricasExecucao):
+        """Exibe tempo, linhas e bytes lidos de cada etapa da execução"""
+        print()
+        print("⏱️  ETAPAS DA EXECUÇÃO")
+        print("-" * 92)
+        for linha in formatar_metricas(metricas):
+            print(linha)
+
+    @staticmethod
+    def _formatar_divergencia(divergencia: Mapping) -> str:
+        """Formata uma divergência/duplicidade em uma linha da listagem"""
+        return (
+            f"{str(divergencia.get('data', '')):<10} {str(divergencia.get('hora', '')):<8} "
+            f"{str(divergencia.get('fonte', '')):<16} {str(divergencia.get('tipo', '')):<12} "
+            f"{str(divergencia.get('num_cartao', '')):<16} "
+            f"{format_brl(divergencia.get('valor', 0.0)):>12}  {divergencia.get('status', '')}"
+        )
     
     def _exibir_secao_faturamento(self, resultados: List[ResultadoAnalise]):
         """Exibe seção de análise de faturamento"""
@@ -137,14 +394,19 @@ class TerminalView:
             )
 
             # Status da análise
-            if abs(resultado.percentual_diferenca) < 1:
-                status = "✅ CONFERE"
-            elif abs(resultado.percentual_diferenca) < 5:
-                status = "⚠️  PEQUENA DIVERGÊNCIA"
-            else:
-                status = "❌ GRANDE DIVERGÊNCIA"
+            status = _STATUS_CLASSIFICACAO[classificar_resultado(resultado)]
             
             print(f"   Status: {status}")
+
+            duplicidades = resultado.detalhes_divergencias.filtrar(
+                'tipo', ('retentativa', 'duplicata')
+            )
+            if duplicidades:
+                valor_descartado = float(duplicidades.coluna('valor').sum())
+                print(
+                    f"   Descartadas do total: {len(duplicidades)} retentativa(s)/duplicata(s) "
+                    f"(R$ {format_brl(valor_descartado)})"
+                )
             print()
         
         print("-" * 60)
@@ -174,12 +436,7 @@ class TerminalView:
             )
 
             # Status da análise
-            if abs(resultado.percentual_diferenca) < 1:
-                status = "✅ CONFERE"
-            elif abs(resultado.percentual_diferenca) < 5:
-                status = "⚠️  PEQUENA DIVERGÊNCIA"
-            else:
-                status = "❌ GRANDE DIVERGÊNCIA"
+            status = _STATUS_CLASSIFICACAO[classificar_resultado(resultado)]
             
             print(f"   Status: {status}")
             print()
@@ -192,7 +449,7 @@ class TerminalView:
         print("📋 RESUMO GERAL")
         print("-" * 40)
         
-        total_divergencias = sum(1 for r in resultados if abs(r.percentual_diferenca) >= 1)
+        total_divergencias = sum(1 for r in resultados if classificar_resultado(r) != 'ok')
         total_analises = len(resultados)
 
         print(f"Total de análises realizadas: {total_analises}")
@@ -209,6 +466,133 @@ class TerminalView:
         else:
             print("\n✅ Todas as análises estão conformes!")
     
+    def exibir_resultados_lote(self, lote: ResultadoLote):
+        """Exibe o resumo de uma conciliação em lote com os tempos por mês"""
+        self.limpar_tela()
+        self.exibir_cabecalho()
+
+        print("RESULTADOS DA CONCILIAÇÃO EM LOTE")
+        print("=" * self.largura_tela)
+        print()
+
+        print(f"{'Mês':<16} {'Tempo (s)':>10} {'Análises':>9} {'Divergências':>13}  Status")
+        print("-" * 70)
+        for mes_ano, resultados in lote.resultados.items():
+            divergencias = sum(1 for r in resultados if classificar_resultado(r) != 'ok')
+            status = "✅ CONFERE" if divergencias == 0 else "⚠️  DIVERGÊNCIA"
+            print(
+                f"{self._formatar_mes_ano(mes_ano):<16} "
+                f"{lote.tempos.get(mes_ano, 0.0):>10.2f} "
+                f"{len(resultados):>9} {divergencias:>13}  {status}"
+            )
+        for mes_ano, erro in lote.erros.items():
+            print(f"{self._formatar_mes_ano(mes_ano):<16} {'-':>10} {'-':>9} {'-':>13}  ❌ {erro}")
+        print("-" * 70)
+
+        soma_tempos = sum(lote.tempos.values())
+        mais_lento = max(lote.tempos.values(), default=0.0)
+        print(f"Tempo total (parede): {lote.duracao_total:.2f}s")
+        print(f"Soma dos tempos por mês: {soma_tempos:.2f}s")
+        print(f"Mês mais lento: {mais_lento:.2f}s")
+
+        safe_pause("\nPressione ENTER para continuar...")
+
+    def solicitar_janela_visao(self) -> Optional[int]:
+        """Solicita o tipo de visão acumulada (None = ano até a data)"""
+        print("\nTipo de visão acumulada:")
+        print("1. Ano até a data (YTD)")
+        print("2. Últimos 12 meses")
+        opcao = input("Escolha uma opção: ").strip()
+        if opcao == "1":
+            return None
+        if opcao == "2":
+            return 12
+        print("Opção inválida!")
+        return self.solicitar_janela_visao()
+
+    def exibir_visao_acumulada(
+        self,
+        resultados: List[ResultadoAnalise],
+        mes_ano: str,
+        janela_meses: Optional[int],
+        meses: List[str],
+    ):
+        """Exibe a análise sobre totais acumulados de vários meses"""
+        self.limpar_tela()
+        self.exibir_cabecalho()
+
+        descricao = "ANO ATÉ A DATA" if janela_meses is None else f"ÚLTIMOS {janela_meses} MESES"
+        print(f"VISÃO ACUMULADA - {descricao} ATÉ {self._formatar_mes_ano(mes_ano)}")
+        print("=" * self.largura_tela)
+        print()
+
+        if not meses:
+            print("Nenhum mês conciliado no período. Execute a conciliação dos meses primeiro.")
+            safe_pause("\nPressione ENTER para continuar...")
+            return
+
+        print(f"Meses incluídos: {', '.join(self._formatar_mes_ano(m) for m in meses)}")
+        print()
+
+        faturamentos = [r for r in resultados if r.tipo_analise == 'faturamento']
+        pagamentos = [r for r in resultados if r.tipo_analise == 'pagamento']
+        if faturamentos:
+            self._exibir_secao_faturamento(faturamentos)
+        if pagamentos:
+            self._exibir_secao_pagamento(pagamentos)
+        self._exibir_resumo_geral(resultados)
+
+        safe_pause("\nPressione ENTER para continuar...")
+
+    def exibir_analise_taxas(self, resultado: ResultadoTaxas, mes_ano: str):
+        """Exibe as taxas efetivas por bandeira/parcelas e as cobranças fora do contrato"""
+        self.limpar_tela()
+        self.exibir_cabecalho()
+
+        print(f"ANÁLISE DE TAXAS (MDR) - {self._formatar_mes_ano(mes_ano)}")
+        print("=" * self.largura_tela)
+        print()
+
+        if resultado.resumo.empty:
+            print("Nenhum recebimento com taxa encontrado.")
+            safe_pause("\nPressione ENTER para continuar...")
+            return
+
+        print(
+            f"{'Fonte':<15} {'Bandeira':<11} {'Modalidade':<10} {'Parc.':>5} {'Qtd':>5} "
+            f"{'Bruto (R$)':>14} {'Taxa efet.':>10} {'Contratada':>10} {'Dif. (R$)':>10}"
+        )
+        print("-" * 100)
+        for linha in resultado.resumo.to_dict('records'):
+            # Taxas contratadas têm duas casas (ex: 2,21%)
+            taxa_efetiva = f"{float(linha['taxa_efetiva']):.2f}%".replace(".", ",")
+            contratada = (
+                f"{float(linha['taxa_contratada']):.2f}%".replace(".", ",")
+                if not math.isnan(float(linha['taxa_contratada']))
+                else "-"
+            )
+            print(
+                f"{linha['fonte']:<15} {linha['bandeira']:<11} {linha['modalidade']:<10} "
+                f"{linha['parcelas']:>5} {linha['registros']:>5} "
+                f"{format_brl(float(linha['valor_bruto'])):>14} "
+                f"{taxa_efetiva:>10} {contratada:>10} {format_brl(float(linha['diferenca'])):>10}"
+            )
+        print("-" * 100)
+        print()
+
+        if resultado.fora_contrato.empty:
+            print("✅ Todas as cobranças estão dentro das taxas contratadas")
+        else:
+            excedente = resultado.fora_contrato['diferenca'].clip(lower=0).sum()
+            print(
+                f"❌ {len(resultado.fora_contrato)} cobrança(s) fora do contrato "
+                f"(R$ {format_brl(excedente)} a mais)"
+            )
+        if resultado.sem_taxa_contratada:
+            print(f"⚠️  {resultado.sem_taxa_contratada} registro(s) sem taxa contratada na tabela")
+
+        safe_pause("\nPressione ENTER para continuar...")
+
     def exibir_resumo_dados(self, resumo: Dict[str, Dict], mes_ano: str):
         """Exibe resumo dos dados carregados"""
         self.limpar_tela()
@@ -227,7 +611,10 @@ class TerminalView:
             print("-" * 50)
             for fonte, dados in faturamentos.items():
                 fonte_limpa = fonte.replace('faturamento_', '').upper()
-                print(f"   {fonte_limpa}: {dados['registros']:>6} registros")
+                print(
+                    f"   {fonte_limpa}: {dados['registros']:>6} registros"
+                    f"{self._formatar_descartados(dados)}"
+                )
             print()
 
         if pagamentos:
@@ -235,7 +622,10 @@ class TerminalView:
             print("-" * 50)
             for fonte, dados in pagamentos.items():
                 fonte_limpa = fonte.replace('pagamento_', '').upper()
-                print(f"   {fonte_limpa}: {dados['registros']:>6} registros")
+                print(
+                    f"   {fonte_limpa}: {dados['registros']:>6} registros"
+                    f"{self._formatar_descartados(dados)}"
+                )
             print()
         
         print("📋 DETALHES TÉCNICOS")
@@ -253,8 +643,24 @@ class TerminalView:
         
         safe_pause("\nPressione ENTER para continuar...")
     
-    def exibir_detalhes_fonte(self, detalhes: Dict, fonte: str, mes_ano: str):
-        """Exibe detalhes específicos de uma fonte"""
+    def _formatar_descartados(self, dados: Dict) -> str:
+        """Formata a quantidade de linhas descartadas pelos filtros de leitura"""
+        descartados = dados.get('descartados', 0)
+        return f" ({descartados} descartados na leitura)" if descartados else ""
+
+    def exibir_detalhes_fonte(
+        self,
+        detalhes: Dict,
+        fonte: str,
+        mes_ano: str,
+        registros: Optional[Iterable[Sequence]] = None,
+    ):
+        """
+        Exibe detalhes específicos de uma fonte
+
+        Com ``registros`` (iterador de linhas, na ordem de ``detalhes['colunas']``),
+        todas as linhas são listadas pelo paginador; sem ele, só as primeiras.
+        """
         self.limpar_tela()
         self.exibir_cabecalho()
         
@@ -295,8 +701,32 @@ class TerminalView:
                 print(
                     f"   Min/Max: R$ {format_brl(stats['minimo'])} / R$ {format_brl(stats['maximo'])}"
                 )
+                if 'mediana' in stats:
+                    print(
+                        f"   Q1/Mediana/Q3: R$ {format_brl(stats['q1'])} / "
+                        f"R$ {format_brl(stats['mediana'])} / R$ {format_brl(stats['q3'])}"
+                    )
                 print()
+
+        nulos = {coluna: n for coluna, n in detalhes.get('nulos', {}).items() if n}
+        if nulos:
+            print("🕳️  VALORES AUSENTES")
+            print("-" * 40)
+            for coluna, quantidade in nulos.items():
+                print(f"   {coluna}: {quantidade} de {detalhes['registros']}")
+            print()
         
+        if registros is not None:
+            print("📋 REGISTROS")
+            print("-" * 40)
+            self.paginador.exibir(
+                registros,
+                self._formatar_registro,
+                cabecalho=(self._truncar(" | ".join(map(str, detalhes['colunas']))),),
+            )
+            safe_pause("\nPressione ENTER para continuar...")
+            return
+
         # Primeiros registros
         print("📋 PRIMEIROS REGISTROS")
         print("-" * 40)
@@ -306,6 +736,18 @@ class TerminalView:
         
         safe_pause("\nPressione ENTER para continuar...")
     
+    def _formatar_registro(self, registro: Sequence) -> str:
+        """Formata uma linha bruta da fonte, cortada na largura da tela"""
+        return self._truncar(" | ".join(
+            "" if v is None or (isinstance(v, float) and math.isnan(v)) else str(v)
+            for v in registro
+        ))
+
+    def _truncar(self, texto: str) -> str:
+        if len(texto) <= self.largura_tela:
+            return texto
+        return texto[:self.largura_tela - 3] + "..."
+
     def solicitar_fonte(self) -> str:
         """Solicita qual fonte o usuário quer detalhar"""
         print("\nFontes disponíveis:")
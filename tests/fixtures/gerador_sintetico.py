@@ -0,0 +1,709 @@
+"""
+Gerador de meses sintéticos - as cinco fontes em escala, com sementes fixas
+
+Produz os arquivos de um mês (faturamento C6/GDS/WAB e pagamento C6/GDS)
+com os mesmos cabeçalhos e as mesmas peculiaridades de formatação dos
+arquivos reais: BOM no faturamento C6 e nos CSVs do GDS, valores
+`` R$ 600,00 `` com espaços no faturamento C6, ``;;;;;;;;;;;`` ao final de
+cada linha do pagamento C6, valores sem R$ (``1173,48``) no GDS e blocos
+``CHAVE: valor`` irregulares no TXT do WAB.
+
+As vendas são sorteadas com numpy (vetorizado) e os arquivos são escritos
+em blocos, de modo que milhões de linhas cabem em memória. Parcelamentos,
+retentativas, duplicatas, transações recusadas e divergências injetadas nas
+fontes secundárias são controlados por ``ConfiguracaoGerador``; o
+``ResumoGeracao`` devolvido traz o que foi injetado e os totais que o
+Analisador deve encontrar em cada fonte.
+
+Uso:
+    python -m tests.fixtures.gerador_sintetico --saida /tmp/sintetico \\
+        --mes 072025 --vendas 1000000 --semente 7
+"""
+import argparse
+import calendar
+import json
+import os
+import sys
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.views.exportadores import formatar_brl_lote
+
+# Cabeçalhos exatamente como nos arquivos exportados pelos sistemas
+CABECALHO_FATURAMENTO_C6 = (
+    'DT_VENDA;HR_VENDA; VAL_FAT ; VAL_PARC ;BANDEIRA;NUM_CARTAO;OPERACAO;PARCELAS;STATUS'
+)
+CABECALHO_PAGAMENTO_C6 = (
+    'Hora da venda;Data da venda;Data do recebível;Valor da venda;Valor da parcela;'
+    'Descontos;Valor do recebível;Bandeira do cartão;Número do cartão;Tipo de operação;'
+    'Parcelas;Status do recebível;Código da venda;Instituição Financeira;'
+    'CNPJ Instituição Financeira' + ';' * 11
+)
+CABECALHO_GDS = (
+    'R/D;Data de emissão;Data de vencimento;Data de baixa;Responsável;Paciente;'
+    'Descrição;Serviços;Categoria;Nota fiscal;Convênio;Método;Caixa;Valor;'
+    'Valor líquido;Agendado;Pago;Observações'
+)
+CHAVES_WAB = [
+    'DATA', 'VALOR PAGO', 'VALOR TOTAL', 'DESCRIÇÃO', 'MODO DE PAGAMTO',
+    'NOME DO PACIENTE (FORNECEDOR)', 'OBS',
+]
+
+# Fontes em que as divergências são injetadas (o C6 é a referência)
+FONTES_DIVERGENTES = ('faturamento_gds', 'faturamento_wab', 'pagamento_gds')
+
+# Linhas formatadas e escritas por vez
+TAMANHO_BLOCO = 50_000
+
+# Espaço de sorteio de (dia, minuto, cartão): cada venda ocupa uma posição
+# distinta, para que só as duplicatas injetadas caiam na mesma janela
+MINUTOS_DIA = 12 * 60  # 08:00 às 20:00
+CARTOES = 10_000
+
+FORMAS = ('pix', 'debito', 'credito')
+BANDEIRAS = ('Mastercard', 'Visa', 'Elo', 'Amex')
+PESOS_BANDEIRAS = (0.6, 0.3, 0.07, 0.03)
+# Taxa (%) descontada do recebível: débito, crédito à vista, 2-6x, 7-12x
+TAXAS = {
+    'Mastercard': (0.85, 1.92, 2.21, 2.53),
+    'Visa': (0.85, 1.92, 2.21, 2.53),
+    'Elo': (1.10, 2.40, 2.91, 3.23),
+    'Amex': (1.10, 2.60, 3.10, 3.40),
+}
+METODOS_GDS = {
+    'pix': 'Chave PIX',
+    'debito': 'Débito (Visa / Master)',
+    'Mastercard': 'Crédito (Visa / Master)',
+    'Visa': 'Crédito (Visa / Master)',
+    'Elo': 'Crédito (Amex / Elo / Hiper)',
+    'Amex': 'Crédito (Amex / Elo / Hiper)',
+}
+VALORES_TIPICOS = (350.0, 600.0, 700.0, 800.0, 1200.0, 1500.0, 2400.0, 3500.0, 4800.0, 6865.6)
+PESOS_VALORES = (0.16, 0.12, 0.3, 0.08, 0.08, 0.08, 0.06, 0.05, 0.05, 0.02)
+NOMES = (
+    'Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Heitor',
+    'Isabela', 'João', 'Juliana', 'Lucas', 'Mariana', 'Natália', 'Otávio', 'Paula',
+    'Rafael', 'Sofia', 'Thiago', 'Valéria',
+)
+SOBRENOMES = (
+    'Silva', 'Souza', 'Oliveira', 'Pereira', 'Ferrari', 'Cotrim', 'Estevão', 'Marinho',
+    'Barboza', 'Pamplona', 'Franco', 'Braga', 'Cabral', 'Martinez', 'Jordão', 'Thomas',
+)
+RESPONSAVEL = 'Cristal Peters Cabral'
+SERVICOS_ORCAMENTO = 'PLANO IMS - SERVIÇOS MÉDICOS PRESTADOS EM PROCEDIMENTO MÉDICO (5)'
+DESCRICOES_WAB = ('Pagamento de consulta', 'Pagamento de PLANO IMS', 'Pagamento de procedimento')
+
+
+@dataclass
+class ConfiguracaoGerador:
+    """
+    Parâmetros do mês sintético
+
+    As proporções são frações entre 0 e 1: ``proporcao_parcelado`` é sobre
+    as vendas no crédito; retentativas, duplicatas e recusadas são sobre as
+    vendas com cartão; ``proporcao_divergencias`` é sobre os registros de
+    cada fonte divergente (metade some da fonte, metade tem o valor alterado).
+    """
+    vendas: int = 1000
+    semente: int = 0
+    proporcao_pix: float = 0.25
+    proporcao_debito: float = 0.15
+    proporcao_parcelado: float = 0.5
+    max_parcelas: int = 12
+    proporcao_retentativas: float = 0.03
+    proporcao_duplicatas: float = 0.01
+    proporcao_recusadas: float = 0.05
+    proporcao_divergencias: float = 0.02
+    gerar_wab_txt: bool = True
+
+    def validar(self) -> None:
+        """Raises: ValueError com o primeiro parâmetro fora da faixa"""
+        if self.vendas < 0:
+            raise ValueError(f"vendas deve ser >= 0: {self.vendas}")
+        if not 1 <= self.max_parcelas <= 12:
+            raise ValueError(f"max_parcelas deve estar entre 1 e 12: {self.max_parcelas}")
+        for nome in (
+            'proporcao_pix', 'proporcao_debito', 'proporcao_parcelado',
+            'proporcao_retentativas', 'proporcao_duplicatas', 'proporcao_recusadas',
+            'proporcao_divergencias',
+        ):
+            valor = getattr(self, nome)
+            if not 0 <= valor <= 1:
+                raise ValueError(f"{nome} deve estar entre 0 e 1: {valor}")
+        if self.proporcao_pix + self.proporcao_debito > 1:
+            raise ValueError("proporcao_pix + proporcao_debito não pode passar de 1")
+
+
+@dataclass
+class ResumoGeracao:
+    """O que foi gerado em um mês sintético e os totais esperados por fonte"""
+    mes_ano: str
+    pasta: str
+    arquivos: Dict[str, str] = field(default_factory=dict)
+    linhas: Dict[str, int] = field(default_factory=dict)
+    retentativas: int = 0
+    duplicatas: int = 0
+    recusadas: int = 0
+    # fonte -> {'ausente': n, 'valor': n}
+    divergencias: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # Totais que o Analisador deve calcular (sem recusadas nem duplicatas)
+    totais: Dict[str, float] = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------- formatação
+
+def _brl(valores: Iterable[float]) -> List[str]:
+    return formatar_brl_lote(valores)
+
+
+def _valor_gds(valores: Iterable[float]) -> List[str]:
+    """Valores como o GDS exporta: sem milhar, vírgula decimal, sem zeros à direita"""
+    return [
+        f"{v:.2f}".rstrip('0').rstrip('.').replace('.', ',')
+        for v in valores
+    ]
+
+
+def _datas_br(datas: np.ndarray) -> List[str]:
+    return [f"{t[8:10]}/{t[5:7]}/{t[:4]}" for t in np.datetime_as_string(datas, unit='D')]
+
+
+def _horas(segundos: np.ndarray) -> List[str]:
+    return [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in segundos.tolist()]
+
+
+def _cartoes(numeros: np.ndarray) -> List[str]:
+    return [f"************{c:04d}" for c in numeros.tolist()]
+
+
+def _somar_meses(datas: np.ndarray, meses: np.ndarray) -> np.ndarray:
+    """Soma meses a datas (datetime64[D]), limitando o dia ao fim do mês"""
+    inicio_mes = datas.astype('M8[M]')
+    dia = (datas - inicio_mes.astype('M8[D]')).astype('int64')
+    destino = inicio_mes + meses.astype('m8[M]')
+    ultimo_dia = ((destino + 1).astype('M8[D]') - destino.astype('M8[D]')).astype('int64') - 1
+    return destino.astype('M8[D]') + np.minimum(dia, ultimo_dia).astype('m8[D]')
+
+
+def _escrever(caminho: str, cabecalho: str, linhas: Iterable[str], bom: bool) -> int:
+    """Escreve o CSV em blocos, com LF e quebra de linha ao final"""
+    total = 0
+    bloco: List[str] = []
+    with open(caminho, 'w', encoding='utf-8-sig' if bom else 'utf-8', newline='') as f:
+        f.write(cabecalho + '\n')
+        for linha in linhas:
+            bloco.append(linha)
+            if len(bloco) >= TAMANHO_BLOCO:
+                f.write('\n'.join(bloco) + '\n')
+                total += len(bloco)
+                bloco = []
+        if bloco:
+            f.write('\n'.join(bloco) + '\n')
+            total += len(bloco)
+    return total
+
+
+def _fatias(n: int) -> Iterable[slice]:
+    for inicio in range(0, n, TAMANHO_BLOCO):
+        yield slice(inicio, min(inicio + TAMANHO_BLOCO, n))
+
+
+# ---------------------------------------------------------------- sorteio
+
+class _GeradorMes:
+    """Sorteia as vendas de um mês e escreve cada fonte a partir delas"""
+
+    def __init__(self, mes_ano: str, config: ConfiguracaoGerador):
+        self.mes_ano = mes_ano
+        self.config = config
+        self.mes = int(mes_ano[:2])
+        self.ano = int(mes_ano[2:])
+        self.dias_mes = calendar.monthrange(self.ano, self.mes)[1]
+        self.inicio = np.datetime64(f"{self.ano:04d}-{self.mes:02d}-01")
+        self.rng = np.random.default_rng(config.semente)
+        # Sorteios só do TXT em gerador próprio: gerar ou não o TXT não muda as demais fontes
+        self.rng_txt = np.random.default_rng([config.semente, 1])
+        self._sortear_vendas()
+
+    def _sortear_vendas(self) -> None:
+        cfg, rng = self.config, self.rng
+        n = cfg.vendas
+        self.n_recusadas = int(round(cfg.proporcao_recusadas * n))
+
+        # Posições distintas de (dia, minuto, cartão) para vendas e recusadas avulsas
+        posicoes = rng.choice(
+            self.dias_mes * MINUTOS_DIA * CARTOES, size=n + self.n_recusadas,
+            replace=False, shuffle=True,
+        )
+        self.cartao = posicoes % CARTOES
+        minuto = posicoes // CARTOES % MINUTOS_DIA
+        self.dia = posicoes // (CARTOES * MINUTOS_DIA)  # 0-based
+        # Segundos entre 5 e 54: retentativas e duplicatas ficam no mesmo minuto
+        self.segundos = 8 * 3600 + minuto * 60 + rng.integers(5, 55, size=len(posicoes))
+
+        self.forma = rng.choice(
+            3, size=n,
+            p=[cfg.proporcao_pix, cfg.proporcao_debito,
+               1 - cfg.proporcao_pix - cfg.proporcao_debito],
+        )
+        self.bandeira = rng.choice(len(BANDEIRAS), size=n, p=PESOS_BANDEIRAS)
+        # Amex só no crédito; débito e PIX ficam entre Mastercard e Visa
+        self.bandeira[(self.forma != 2) & (self.bandeira > 1)] = 0
+        parcelado = (self.forma == 2) & (rng.random(n) < cfg.proporcao_parcelado)
+        self.parcelas = np.ones(n, dtype='int64')
+        if cfg.max_parcelas > 1:
+            self.parcelas[parcelado] = rng.integers(
+                2, cfg.max_parcelas + 1, size=int(parcelado.sum())
+            )
+        self.valor = np.asarray(VALORES_TIPICOS)[
+            rng.choice(len(VALORES_TIPICOS), size=n, p=PESOS_VALORES)
+        ]
+        # Parcela arredondada para baixo; a última absorve os centavos restantes
+        self.parcela = np.floor(self.valor * 100 / self.parcelas) / 100
+        self.ultima_parcela = np.round(self.valor - self.parcela * (self.parcelas - 1), 2)
+        self.nome = rng.integers(0, len(NOMES), size=n)
+        self.sobrenome = rng.integers(0, len(SOBRENOMES), size=(n, 2))
+
+        self.com_cartao = np.flatnonzero(self.forma != 0)
+
+    def _valor_parcela(self, vendas: np.ndarray, numero: np.ndarray) -> np.ndarray:
+        return np.where(
+            numero == self.parcelas[vendas], self.ultima_parcela[vendas], self.parcela[vendas]
+        )
+
+    def _pacientes(self, indices: np.ndarray) -> List[str]:
+        return [
+            f"{NOMES[a]} {SOBRENOMES[b]} {SOBRENOMES[c]}"
+            for a, b, c in zip(
+                self.nome[indices].tolist(),
+                self.sobrenome[indices, 0].tolist(),
+                self.sobrenome[indices, 1].tolist(),
+            )
+        ]
+
+    def _taxas(self, indices: np.ndarray) -> np.ndarray:
+        forma = self.forma[indices]
+        parcelas = self.parcelas[indices]
+        faixa = np.where(
+            forma == 1, 0, np.where(parcelas == 1, 1, np.where(parcelas <= 6, 2, 3))
+        )
+        tabela = np.array([TAXAS[b] for b in BANDEIRAS])
+        return tabela[self.bandeira[indices], faixa]
+
+    def _divergir(
+        self, fonte: str, n: int, resumo: ResumoGeracao
+    ) -> Dict[str, np.ndarray]:
+        """Sorteia registros ausentes e registros com valor alterado (delta em R$)"""
+        k = int(round(self.config.proporcao_divergencias * n))
+        escolhidos = self.rng.choice(n, size=k, replace=False) if k else np.array([], 'int64')
+        ausentes = escolhidos[: k // 2]
+        alterados = escolhidos[k // 2:]
+        delta = self.rng.integers(1, 5001, size=len(alterados)) / 100
+        delta *= self.rng.choice([-1, 1], size=len(alterados))
+        resumo.divergencias[fonte] = {'ausente': len(ausentes), 'valor': len(alterados)}
+        mantidos = np.ones(n, dtype=bool)
+        mantidos[ausentes] = False
+        ajuste = np.zeros(n)
+        ajuste[alterados] = delta
+        return {'mantidos': mantidos, 'ajuste': ajuste}
+
+    # ------------------------------------------------------------ fontes
+
+    def faturamento_c6(self, caminho: str, resumo: ResumoGeracao) -> None:
+        cfg, rng = self.config, self.rng
+        vendas = self.com_cartao
+        n_cartao = len(vendas)
+        ordem = rng.permutation(n_cartao)
+        n_ret = int(round(cfg.proporcao_retentativas * n_cartao))
+        n_dup = min(int(round(cfg.proporcao_duplicatas * n_cartao)), n_cartao - n_ret)
+        retentativas = vendas[ordem[:n_ret]]
+        duplicatas = vendas[ordem[n_ret:n_ret + n_dup]]
+        avulsas = np.arange(cfg.vendas, cfg.vendas + self.n_recusadas)
+
+        # Recusadas avulsas herdam forma/valor de vendas sorteadas
+        origem_avulsas = (
+            rng.choice(vendas, size=self.n_recusadas) if n_cartao and self.n_recusadas
+            else np.array([], 'int64')
+        )
+        venda = np.concatenate([vendas, retentativas, duplicatas, origem_avulsas])
+        posicao = np.concatenate([vendas, retentativas, duplicatas, avulsas[:len(origem_avulsas)]])
+        deslocamento = np.concatenate([
+            np.zeros(n_cartao, 'int64'),
+            -rng.integers(1, 4, size=n_ret),
+            rng.integers(1, 4, size=n_dup),
+            np.zeros(len(origem_avulsas), 'int64'),
+        ])
+        aprovada = np.concatenate([
+            np.ones(n_cartao, bool), np.zeros(n_ret, bool),
+            np.ones(n_dup, bool), np.zeros(len(origem_avulsas), bool),
+        ])
+        segundos = self.segundos[posicao] + deslocamento
+        dia = self.dia[posicao]
+        # Mais recentes primeiro, como no extrato do C6
+        ordem_linhas = np.lexsort((-segundos, -dia))
+
+        def linhas() -> Iterable[str]:
+            for fatia in _fatias(len(ordem_linhas)):
+                idx = ordem_linhas[fatia]
+                v = venda[idx]
+                ok = aprovada[idx]
+                for data, hora, fat, parc, band, cartao, forma, parcelas, aprov in zip(
+                    _datas_br(self.inicio + dia[idx]),
+                    _horas(segundos[idx]),
+                    _brl(self.valor[v]),
+                    _brl(self.parcela[v]),
+                    [BANDEIRAS[b] for b in self.bandeira[v].tolist()],
+                    _cartoes(self.cartao[posicao[idx]]),
+                    self.forma[v].tolist(),
+                    self.parcelas[v].tolist(),
+                    ok.tolist(),
+                ):
+                    yield (
+                        f"{data};{hora}; R$ {fat} ; R$ {parc} ;{band if aprov else '-'};"
+                        f"{cartao};{'Crédito' if forma == 2 else 'Débito'};{parcelas};"
+                        f"{'Aprovada' if aprov else 'Recusada'}"
+                    )
+
+        resumo.linhas['faturamento_c6'] = _escrever(
+            caminho, CABECALHO_FATURAMENTO_C6, linhas(), bom=True
+        )
+        resumo.retentativas = n_ret
+        resumo.duplicatas = n_dup
+        resumo.recusadas = len(origem_avulsas)
+        resumo.totais['faturamento_c6'] = round(float(self.valor[vendas].sum()), 2)
+
+    def faturamento_gds(self, caminho: str, resumo: ResumoGeracao) -> None:
+        n = self.config.vendas
+        divergencia = self._divergir('faturamento_gds', n, resumo)
+        vendas = np.flatnonzero(divergencia['mantidos'])
+        # Uma linha por parcela: (venda, número da parcela)
+        parcelas = self.parcelas[vendas]
+        venda = np.repeat(vendas, parcelas)
+        numero = np.arange(len(venda)) - np.repeat(np.cumsum(parcelas) - parcelas, parcelas) + 1
+        valor = self._valor_parcela(venda, numero)
+        # A alteração de valor cai na primeira parcela
+        valor[numero == 1] += divergencia['ajuste'][venda[numero == 1]]
+        valor = np.round(valor, 2)
+        liquido = np.where(
+            self.forma[venda] == 0, valor,
+            np.round(valor * (1 - self._taxas(venda) / 100), 2),
+        )
+        emissao = self.inicio + self.dia[venda]
+        vencimento = np.where(
+            self.forma[venda] == 2, _somar_meses(emissao, numero), emissao
+        ).astype('M8[D]')
+        ordem_linhas = np.lexsort((-self.segundos[venda], -self.dia[venda]))
+
+        def linhas() -> Iterable[str]:
+            for fatia in _fatias(len(ordem_linhas)):
+                idx = ordem_linhas[fatia]
+                v = venda[idx]
+                for (emis, venc, paciente, forma, band, n_parc, k, val, liq) in zip(
+                    _datas_br(emissao[idx]), _datas_br(vencimento[idx]),
+                    self._pacientes(v), self.forma[v].tolist(),
+                    self.bandeira[v].tolist(), self.parcelas[v].tolist(),
+                    numero[idx].tolist(), _valor_gds(valor[idx]), _valor_gds(liquido[idx]),
+                ):
+                    quitada = forma != 2
+                    if n_parc > 1:
+                        descricao = f"Orçamento: {paciente} ({k}/{n_parc})"
+                        categoria, servicos, convenio = 'Orçamento', SERVICOS_ORCAMENTO, ''
+                    else:
+                        descricao = f"Consulta: {paciente}"
+                        categoria, servicos, convenio = 'Consulta', 'Consulta', 'Particular'
+                    metodo = METODOS_GDS[FORMAS[forma] if forma != 2 else BANDEIRAS[band]]
+                    yield (
+                        f"Receita;{emis};{venc};{emis if quitada else ''};{RESPONSAVEL};"
+                        f"{paciente};{descricao};{servicos};{categoria};FALSE;{convenio};"
+                        f"{metodo};PJ - C6;{val};{liq};{'Sim' if quitada else 'Não'};"
+                        f"{'Sim' if quitada else 'Não'};"
+                    )
+
+        resumo.linhas['faturamento_gds'] = _escrever(caminho, CABECALHO_GDS, linhas(), bom=True)
+        resumo.totais['faturamento_gds'] = round(float(valor.sum()), 2)
+
+    def registros_wab(self, resumo: ResumoGeracao):
+        n = self.config.vendas
+        divergencia = self._divergir('faturamento_wab', n, resumo)
+        vendas = np.flatnonzero(divergencia['mantidos'])
+        valor = np.round(self.valor[vendas] + divergencia['ajuste'][vendas], 2)
+        # Lançado em ordem cronológica
+        ordem = np.lexsort((self.segundos[vendas], self.dia[vendas]))
+        self.descricao_wab = self.rng.integers(0, len(DESCRICOES_WAB), size=n)
+        resumo.totais['faturamento_wab'] = round(float(valor.sum()), 2)
+        return vendas[ordem], valor[ordem]
+
+    def _modos_wab(self, vendas: np.ndarray) -> List[str]:
+        modos = []
+        for forma, band, parcelas, cartao in zip(
+            self.forma[vendas].tolist(), self.bandeira[vendas].tolist(),
+            self.parcelas[vendas].tolist(), _cartoes(self.cartao[vendas]),
+        ):
+            bandeira = BANDEIRAS[band].upper()
+            if forma == 0:
+                modos.append('PIX')
+            elif forma == 1:
+                modos.append(f"Débito ({bandeira}). Cartao {cartao}")
+            elif parcelas > 1:
+                modos.append(f"Crédito ({bandeira}) parcelado em {parcelas}x. Cartao {cartao}")
+            else:
+                modos.append(f"Crédito ({bandeira}). Cartao {cartao}")
+        return modos
+
+    def _blocos_wab(self, vendas: np.ndarray, valores: np.ndarray) -> Iterable[List[List[str]]]:
+        """Registros do WAB (valores das sete chaves), em blocos"""
+        for fatia in _fatias(len(vendas)):
+            v = vendas[fatia]
+            descricoes = self.descricao_wab[v].tolist()
+            yield [
+                [data, f"R${val}", f"R${val}", DESCRICOES_WAB[d], modo, paciente, '']
+                for data, val, d, modo, paciente in zip(
+                    _datas_br(self.inicio + self.dia[v]), _brl(valores[fatia]),
+                    descricoes, self._modos_wab(v), self._pacientes(v),
+                )
+            ]
+
+    def faturamento_wab_json(self, caminho: str, vendas, valores, resumo: ResumoGeracao) -> None:
+        # Mesmo layout de json.dump(indent=2, ensure_ascii=False), sem quebra final
+        chaves = [json.dumps(c, ensure_ascii=False) for c in CHAVES_WAB]
+        total = 0
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for bloco in self._blocos_wab(vendas, valores):
+                for registro in bloco:
+                    # O JSON oficial guarda só a forma de pagamento, sem o cartão
+                    registro[4] = registro[4].split('. Cartao ')[0]
+                    campos = ',\n'.join(
+                        f"    {c}: {json.dumps(v, ensure_ascii=False)}"
+                        for c, v in zip(chaves, registro)
+                    )
+                    f.write(f"{',' if total else ''}\n  {{\n{campos}\n  }}")
+                    total += 1
+            f.write('\n]' if total else ']')
+        resumo.linhas['faturamento_wab'] = total
+
+    def faturamento_wab_txt(self, caminho: str, vendas, valores) -> None:
+        total = 0
+        with open(caminho, 'w', encoding='utf-8', newline='') as f:
+            for bloco in self._blocos_wab(vendas, valores):
+                # Irregularidades da digitação manual: espaço faltando ou sobrando
+                sorteio = self.rng_txt.random((len(bloco), 4)) < 0.05
+                partes = []
+                for registro, (sem_espaco, dois_espacos, obs_espaco, linha_extra) in zip(
+                    bloco, sorteio.tolist()
+                ):
+                    data, pago, total_, descricao, modo, paciente, obs = registro
+                    partes.append(
+                        ('\n\n\n' if linha_extra else '\n\n') * bool(total)
+                        + f"DATA: {data}\nVALOR PAGO: {pago}\nVALOR TOTAL: {total_}\n"
+                        f"DESCRIÇÃO: {descricao}\n"
+                        f"MODO DE PAGAMTO:{'' if sem_espaco else ' '}{modo}\n"
+                        f"NOME DO PACIENTE (FORNECEDOR): {' ' if dois_espacos else ''}{paciente}\n"
+                        f"OBS:{' ' if obs_espaco else ''}{obs}"
+                    )
+                    total += 1
+                f.write(''.join(partes))
+
+    def pagamentos(self, caminho_c6: str, caminho_gds: str, resumo: ResumoGeracao) -> None:
+        """
+        Recebíveis do mês (pagamento C6) e baixas do GDS
+
+        Cada venda com cartão vira o recebível de uma de suas parcelas com
+        data no mês; a data da venda é recuada pelo número da parcela
+        (débito: um dia antes). As vendas PIX entram só no GDS.
+        """
+        rng = self.rng
+        vendas = self.com_cartao
+        parcelas = self.parcelas[vendas]
+        numero = (rng.random(len(vendas)) * parcelas).astype('int64') + 1
+        recebivel = self.inicio + self.dia[vendas]
+        data_venda = np.where(
+            self.forma[vendas] == 1,
+            recebivel - np.timedelta64(1, 'D'),
+            _somar_meses(recebivel, -numero),
+        ).astype('M8[D]')
+        parcela = self._valor_parcela(vendas, numero)
+        desconto = np.round(parcela * self._taxas(vendas) / 100, 2)
+        liquido = np.round(parcela - desconto, 2)
+        codigo_uuid = rng.random(len(vendas)) < 0.1
+        codigos = rng.integers(100_000_000, 999_999_999, size=len(vendas))
+        bits_uuid = rng.integers(0, 1 << 63, size=(len(vendas), 2))
+        ordem_c6 = np.lexsort((-self.segundos[vendas], -self.dia[vendas]))
+
+        def linhas_c6() -> Iterable[str]:
+            for fatia in _fatias(len(ordem_c6)):
+                idx = ordem_c6[fatia]
+                v = vendas[idx]
+                for (hora, venda_, receb, val, parc, desc, liq, band, cartao, forma,
+                     n_parc, k, eh_uuid, codigo, bits) in zip(
+                    _horas(self.segundos[v]), _datas_br(data_venda[idx]),
+                    _datas_br(recebivel[idx]), _brl(self.valor[v]), _brl(parcela[idx]),
+                    _brl(desconto[idx]), _brl(liquido[idx]),
+                    [BANDEIRAS[b] for b in self.bandeira[v].tolist()],
+                    _cartoes(self.cartao[v]), self.forma[v].tolist(),
+                    self.parcelas[v].tolist(), numero[idx].tolist(),
+                    codigo_uuid[idx].tolist(), codigos[idx].tolist(), bits_uuid[idx].tolist(),
+                ):
+                    if forma == 1:
+                        tipo = 'Débito'
+                    elif n_parc == 1:
+                        tipo = 'Crédito à vista'
+                    else:
+                        tipo = 'Crédito parcelado'
+                    if eh_uuid:
+                        codigo = uuid.UUID(int=bits[0] << 64 | bits[1], version=4)
+                    yield (
+                        f"{hora};{venda_};{receb};R$ {val};R$ {parc};-R$ {desc};R$ {liq};"
+                        f"{band};{cartao};{tipo};{k}/{n_parc};Recebido;{codigo};-;-"
+                        + ';' * 11
+                    )
+
+        resumo.linhas['pagamento_c6'] = _escrever(
+            caminho_c6, CABECALHO_PAGAMENTO_C6, linhas_c6(), bom=False
+        )
+        resumo.totais['pagamento_c6'] = round(float(liquido.sum()), 2)
+
+        # GDS: as mesmas baixas do C6 mais as vendas PIX do mês
+        pix = np.flatnonzero(self.forma == 0)
+        venda_gds = np.concatenate([vendas, pix])
+        numero_gds = np.concatenate([numero, np.ones(len(pix), 'int64')])
+        emissao = np.concatenate([data_venda, self.inicio + self.dia[pix]])
+        baixa = np.concatenate([recebivel, self.inicio + self.dia[pix]])
+        valor = np.concatenate([parcela, self.valor[pix]])
+        liquido_gds = np.concatenate([liquido, self.valor[pix]])
+
+        divergencia = self._divergir('pagamento_gds', len(venda_gds), resumo)
+        mantidos = np.flatnonzero(divergencia['mantidos'])
+        liquido_gds = np.round(liquido_gds + divergencia['ajuste'], 2)
+        ordem_gds = mantidos[
+            np.lexsort((-self.segundos[venda_gds[mantidos]], -baixa[mantidos].astype('int64')))
+        ]
+
+        def linhas_gds() -> Iterable[str]:
+            for fatia in _fatias(len(ordem_gds)):
+                idx = ordem_gds[fatia]
+                v = venda_gds[idx]
+                for (emis, data_baixa, paciente, forma, band, n_parc, k, val, liq) in zip(
+                    _datas_br(emissao[idx]), _datas_br(baixa[idx]), self._pacientes(v),
+                    self.forma[v].tolist(), self.bandeira[v].tolist(),
+                    self.parcelas[v].tolist(), numero_gds[idx].tolist(),
+                    _valor_gds(valor[idx]), _valor_gds(liquido_gds[idx]),
+                ):
+                    if n_parc > 1:
+                        descricao = f"Orçamento: {paciente} ({k}/{n_parc})"
+                        categoria, servicos, convenio = 'Orçamento', SERVICOS_ORCAMENTO, ''
+                    elif forma == 0:
+                        descricao = f"Consulta: {paciente}"
+                        categoria, servicos, convenio = 'Consulta', 'Consulta', 'Particular'
+                    else:
+                        descricao = f"Consulta: {paciente} (1/1)"
+                        categoria, servicos, convenio = 'Consulta', '', 'Particular'
+                    metodo = METODOS_GDS[FORMAS[forma] if forma != 2 else BANDEIRAS[band]]
+                    yield (
+                        f"Receita;{emis};{data_baixa};{data_baixa};{RESPONSAVEL};{paciente};"
+                        f"{descricao};{servicos};{categoria};TRUE;{convenio};{metodo};"
+                        f"PJ - C6;{val};{liq};Sim;Sim;"
+                    )
+
+        resumo.linhas['pagamento_gds'] = _escrever(caminho_gds, CABECALHO_GDS, linhas_gds(), bom=True)
+        resumo.totais['pagamento_gds'] = round(float(liquido_gds[mantidos].sum()), 2)
+
+
+def gerar_mes(
+    destino: str, mes_ano: str = '072025', config: Optional[ConfiguracaoGerador] = None
+) -> ResumoGeracao:
+    """
+    Gera os arquivos das cinco fontes de um mês em ``destino/<mes_ano>/``
+
+    Com a mesma configuração (incluindo a semente) os arquivos gerados são
+    idênticos byte a byte.
+
+    Args:
+        destino: Diretório base (o mesmo usado pelo DataLoader)
+        mes_ano: Mês no formato "072025"
+        config: Parâmetros de volume e de injeção (padrão: ConfiguracaoGerador())
+
+    Returns:
+        ResumoGeracao com arquivos, linhas, injeções e totais esperados
+    """
+    config = config or ConfiguracaoGerador()
+    config.validar()
+    pasta = os.path.join(destino, mes_ano)
+    os.makedirs(pasta, exist_ok=True)
+    resumo = ResumoGeracao(mes_ano=mes_ano, pasta=pasta)
+    gerador = _GeradorMes(mes_ano, config)
+
+    arquivos = {
+        'faturamento_c6': f'faturamento_C6_{mes_ano}.csv',
+        'faturamento_gds': f'faturamento_GDS_{mes_ano}.csv',
+        'faturamento_wab': f'faturamento_WAB_{mes_ano}.json',
+        'pagamento_c6': f'pagamento_C6_{mes_ano}.csv',
+        'pagamento_gds': f'pagamento_GDS_{mes_ano}.csv',
+    }
+    resumo.arquivos = {fonte: os.path.join(pasta, nome) for fonte, nome in arquivos.items()}
+
+    gerador.faturamento_c6(resumo.arquivos['faturamento_c6'], resumo)
+    gerador.faturamento_gds(resumo.arquivos['faturamento_gds'], resumo)
+    vendas_wab, valores_wab = gerador.registros_wab(resumo)
+    gerador.faturamento_wab_json(resumo.arquivos['faturamento_wab'], vendas_wab, valores_wab, resumo)
+    if config.gerar_wab_txt:
+        caminho_txt = os.path.join(pasta, f'faturamento_WAB_{mes_ano}.txt')
+        gerador.faturamento_wab_txt(caminho_txt, vendas_wab, valores_wab)
+        resumo.arquivos['faturamento_wab_txt'] = caminho_txt
+    gerador.pagamentos(
+        resumo.arquivos['pagamento_c6'], resumo.arquivos['pagamento_gds'], resumo
+    )
+    return resumo
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Gera um mês sintético com as cinco fontes da conciliação'
+    )
+    parser.add_argument('--saida', required=True, help='Diretório base de saída')
+    parser.add_argument('--mes', default='072025', help='Mês no formato MMAAAA')
+    parser.add_argument('--vendas', type=int, default=ConfiguracaoGerador.vendas)
+    parser.add_argument('--semente', type=int, default=ConfiguracaoGerador.semente)
+    parser.add_argument('--max-parcelas', type=int, default=ConfiguracaoGerador.max_parcelas)
+    parser.add_argument('--parcelado', type=float, default=ConfiguracaoGerador.proporcao_parcelado)
+    parser.add_argument('--retentativas', type=float,
+                        default=ConfiguracaoGerador.proporcao_retentativas)
+    parser.add_argument('--duplicatas', type=float,
+                        default=ConfiguracaoGerador.proporcao_duplicatas)
+    parser.add_argument('--recusadas', type=float, default=ConfiguracaoGerador.proporcao_recusadas)
+    parser.add_argument('--divergencias', type=float,
+                        default=ConfiguracaoGerador.proporcao_divergencias)
+    parser.add_argument('--sem-txt', action='store_true', help='Não gera o TXT do WAB')
+    args = parser.parse_args(argv)
+
+    config = ConfiguracaoGerador(
+        vendas=args.vendas,
+        semente=args.semente,
+        max_parcelas=args.max_parcelas,
+        proporcao_parcelado=args.parcelado,
+        proporcao_retentativas=args.retentativas,
+        proporcao_duplicatas=args.duplicatas,
+        proporcao_recusadas=args.recusadas,
+        proporcao_divergencias=args.divergencias,
+        gerar_wab_txt=not args.sem_txt,
+    )
+    try:
+        resumo = gerar_mes(args.saida, args.mes, config)
+    except ValueError as exc:
+        parser.error(str(exc))
+    for fonte, linhas in resumo.linhas.items():
+        print(f"{fonte:16} {linhas:>10} linhas  total esperado R$ {resumo.totais[fonte]:,.2f}")
+    print(
+        f"retentativas={resumo.retentativas} duplicatas={resumo.duplicatas} "
+        f"recusadas={resumo.recusadas} divergencias={resumo.divergencias}"
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -174,7 +174,29 @@ class TestIntegracaoCompleta(unittest.TestCase):
         for resultado in resultados:
             self.assertIsInstance(resultado.diferenca, float)
             self.assertIsInstance(resultado.percentual_diferenca, float)
-            
+
+    def test_retentativas_c6_lidas_do_arquivo(self):
+        """Testa que as recusadas chegam ao Analisador e viram retentativas"""
+        pasta_mes = os.path.join(self.temp_dir, '082025')
+        os.makedirs(pasta_mes)
+        pd.DataFrame({
+            'DT_VENDA': ['01/08/2025'] * 4,
+            'HR_VENDA': ['10:00:59', '10:01:02', '11:30:00', '15:00:00'],
+            'VAL_FAT': ['R$ 150,00', 'R$ 150,00', 'R$ 80,00', 'R$ 40,00'],
+            'NUM_CARTAO': ['************1949', '************1949', '************0518',
+                           '************0518'],
+            'STATUS': ['Recusada', 'Aprovada', 'Aprovada', 'Recusada'],
+        }).to_csv(os.path.join(pasta_mes, 'faturamento_C6_082025.csv'), sep=';', index=False)
+
+        dados = DataLoader(self.temp_dir).carregar_dados_mes('082025')
+        totais = Analisador().calcular_totais_faturamento(dados)
+
+        c6 = totais['faturamento_c6']
+        self.assertEqual(c6['duplicidades'].contar('tipo'), {'retentativa': 1})
+        # A recusada avulsa das 15h não entra nem no total bruto
+        self.assertEqual(c6['registros_brutos'], 3)
+        self.assertEqual(c6['total'], 230.0)
+
     def test_consistencia_padronizacao_valores(self):
         """Testa consistência da padronização de valores entre componentes"""
         data_loader = DataLoader(self.temp_dir)
@@ -1,66 +1,49 @@
 #!/usr/bin/env python3
 """
 Script de teste para debug de padronização de valores
+
+Para medir onde o tempo é gasto, prefira ``python main.py --meses 072025 --perfil``.
 """
 import os
 import sys
 
 # Adiciona o diretório raiz ao path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
 
-from src.models.analisador import AnalisadorConciliacao
+from src.models.analisador import Analisador
 from src.models.data_loader import DataLoader
 
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
 
 def main():
     print("🔍 TESTE DE DEBUG - PADRONIZAÇÃO DE VALORES")
     print("=" * 80)
-    
+
     # Inicializa componentes
-    data_loader = DataLoader()
-    analisador = AnalisadorConciliacao()
-    
+    data_loader = DataLoader(os.path.join(RAIZ, 'faturamentos'))
+    analisador = Analisador()
+
     mes_ano = "072025"
-    
-    # Testa C6
-    print("\n🏦 TESTANDO C6...")
-    try:
-        df_c6 = data_loader.carregar_c6_faturamento(mes_ano)
-        print(f"✅ C6 carregado: {len(df_c6)} registros")
-        
-        # Aplica padronização com debug
-        df_c6_padronizado = analisador._padronizar_valores_c6_faturamento(df_c6)
-        print("✅ C6 padronizado concluído")
-        
-    except Exception as e:
-        print(f"❌ Erro no C6: {e}")
-    
-    # Testa GDS
-    print("\n🏢 TESTANDO GDS...")
-    try:
-        df_gds = data_loader.carregar_gds_faturamento(mes_ano)
-        print(f"✅ GDS carregado: {len(df_gds)} registros")
-        
-        # Aplica padronização com debug
-        df_gds_padronizado = analisador._padronizar_valores_gds(df_gds)
-        print("✅ GDS padronizado concluído")
-        
-    except Exception as e:
-        print(f"❌ Erro no GDS: {e}")
-    
-    # Testa WAB
-    print("\n🌐 TESTANDO WAB...")
-    try:
-        df_wab = data_loader.carregar_wab_faturamento(mes_ano)
-        print(f"✅ WAB carregado: {len(df_wab)} registros")
-        
-        # Aplica padronização com debug
-        df_wab_padronizado = analisador._padronizar_valores_wab(df_wab)
-        print("✅ WAB padronizado concluído")
-        
-    except Exception as e:
-        print(f"❌ Erro no WAB: {e}")
-    
+    fontes = {
+        'faturamento_c6': "🏦 TESTANDO C6...",
+        'faturamento_gds': "🏢 TESTANDO GDS...",
+        'faturamento_wab': "🌐 TESTANDO WAB...",
+    }
+    dados = data_loader.carregar_dados_mes(mes_ano, fontes=list(fontes))
+
+    for fonte, titulo in fontes.items():
+        print(f"\n{titulo}")
+        try:
+            df = dados[fonte]
+            print(f"✅ {fonte} carregado: {len(df)} registros")
+
+            df_padronizado = analisador.padronizar_fonte(fonte, df)
+            print(f"✅ {fonte} padronizado: colunas {list(df_padronizado.columns)}")
+
+        except Exception as e:
+            print(f"❌ Erro em {fonte}: {e}")
+
     print("\n✅ TESTE COMPLETO!")
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""
+Testes Unitários para o armazenamento de agregados mensais
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.agregados import AgregadosStore, mes_do_periodo, periodo_mes
+
+
+class TestAgregadosStore(unittest.TestCase):
+    """Testes para o componente AgregadosStore"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = AgregadosStore(os.path.join(self.temp_dir, 'cache', 'agregados.sqlite3'))
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _agregados(self, total_c6: float, total_gds: float) -> pd.DataFrame:
+        return pd.DataFrame({
+            'fonte': ['faturamento_c6', 'faturamento_c6', 'faturamento_gds'],
+            'dia': ['2025-07-01', '2025-07-02', '2025-07-01'],
+            'metodo': ['Crédito', 'Débito', 'PIX'],
+            'total': [total_c6 / 2, total_c6 / 2, total_gds],
+            'registros': [1, 2, 3],
+        })
+
+    def test_periodo_mes(self):
+        """Testa conversão entre MMAAAA e período ordenável"""
+        self.assertEqual(periodo_mes('072025'), 202507)
+        self.assertEqual(mes_do_periodo(202507), '072025')
+        self.assertLess(periodo_mes('122024'), periodo_mes('012025'))
+
+    def test_precisa_atualizar(self):
+        """Testa controle de reprocessamento por impressão digital"""
+        self.assertTrue(self.store.precisa_atualizar('072025', 'abc', 'v1'))
+
+        self.store.gravar_mes('072025', 'abc', 'v1', self._agregados(100.0, 50.0))
+
+        self.assertFalse(self.store.precisa_atualizar('072025', 'abc', 'v1'))
+        self.assertTrue(self.store.precisa_atualizar('072025', 'def', 'v1'))
+
+    def test_versao_do_analisador_forca_atualizacao(self):
+        """Testa que agregados gravados por outra versão do analisador são refeitos"""
+        self.store.gravar_mes('072025', 'abc', 'v1', self._agregados(100.0, 50.0))
+
+        self.assertTrue(self.store.precisa_atualizar('072025', 'abc', 'v2'))
+
+        self.store.gravar_mes('072025', 'abc', 'v2', self._agregados(100.0, 50.0))
+        self.assertFalse(self.store.precisa_atualizar('072025', 'abc', 'v2'))
+        self.assertTrue(self.store.precisa_atualizar('072025', 'abc', 'v1'))
+
+    def test_totais_periodo(self):
+        """Testa soma dos totais de vários meses"""
+        self.store.gravar_mes('062025', 'a', 'v1', self._agregados(100.0, 50.0))
+        self.store.gravar_mes('072025', 'b', 'v1', self._agregados(200.0, 25.0))
+        self.store.gravar_mes('012024', 'c', 'v1', self._agregados(999.0, 999.0))
+
+        totais = self.store.totais_periodo('012025', '072025')
+
+        self.assertAlmostEqual(totais['faturamento_c6']['total'], 300.0)
+        self.assertEqual(totais['faturamento_c6']['registros'], 6)
+        self.assertAlmostEqual(totais['faturamento_gds']['total'], 75.0)
+        self.assertEqual(totais['pagamento_c6'], {'total': 0.0, 'registros': 0})
+        self.assertEqual(self.store.meses_disponiveis('012025', '072025'), ['062025', '072025'])
+
+    def test_gravar_mes_substitui_agregados(self):
+        """Testa que regravar um mês substitui os agregados anteriores"""
+        self.store.gravar_mes('072025', 'a', 'v1', self._agregados(100.0, 50.0))
+        self.store.gravar_mes('072025', 'b', 'v1', self._agregados(10.0, 5.0))
+
+        detalhes = self.store.totais_detalhados('072025', '072025')
+
+        self.assertEqual(len(detalhes), 3)
+        self.assertEqual(set(detalhes['mes_ano']), {'072025'})
+        self.assertAlmostEqual(detalhes['total'].sum(), 15.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
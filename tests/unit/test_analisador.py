@@ -215,5 +215,101 @@ class TestAnalisador(unittest.TestCase):
         has_non_zero = any(r.total_fonte_1 > 0 or r.total_fonte_2 > 0 for r in resultados)
         self.assertTrue(has_non_zero)
 
+    def test_agregar_totais_por_dia_e_metodo(self):
+        """Testa agregação por fonte, dia e método consistente com os totais"""
+        dados = {
+            'faturamento_gds': pd.DataFrame({
+                'data_emissao': ['01/07/2025', '01/07/2025', '02/07/2025'],
+                'metodo': ['PIX', 'PIX', 'Débito'],
+                'valor': ['100,00', '50,00', '25,00'],
+            }),
+            'pagamento_c6': pd.DataFrame({
+                'data_recebivel': ['03/07/2025', '03/07/2025'],
+                'tipo_operacao': ['Crédito à vista', 'Crédito à vista'],
+                'valor_recebivel': ['R$ 90,00', 'R$ 10,00'],
+                'status': ['Recebido', 'Pendente'],
+            }),
+        }
+
+        agregados = self.analisador.agregar_totais(dados)
+
+        gds = agregados[agregados['fonte'] == 'faturamento_gds'].set_index(['dia', 'metodo'])
+        self.assertEqual(gds.loc[('2025-07-01', 'PIX'), 'total'], 150.0)
+        self.assertEqual(gds.loc[('2025-07-01', 'PIX'), 'registros'], 2)
+        self.assertEqual(gds.loc[('2025-07-02', 'Débito'), 'total'], 25.0)
+
+        # Mesmos filtros dos totais: o recebível pendente não entra
+        c6 = agregados[agregados['fonte'] == 'pagamento_c6']
+        totais = self.analisador.calcular_totais_pagamento(dados)
+        self.assertEqual(c6['total'].sum(), totais['pagamento_c6']['total'])
+        self.assertEqual(c6['registros'].sum(), 1)
+
+    def _c6_com_retentativa(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'data': ['31/07/2025', '31/07/2025', '31/07/2025', '31/07/2025', '30/07/2025'],
+            'hora': ['19:46:38', '19:46:37', '15:44:10', '15:44:12', '19:46:38'],
+            'valor_faturado': [' R$ 600,00 ', ' R$ 600,00 ', ' R$ 700,00 ', ' R$ 700,00 ', ' R$ 600,00 '],
+            'num_cartao': ['************1949', '************1949', '************0518',
+                           '************0518', '************1949'],
+            'status': ['Aprovada', 'Recusada', 'Aprovada', 'Aprovada', 'Aprovada'],
+        })
+
+    def test_detectar_duplicidades_c6(self):
+        """Testa classificação de retentativas e duplicatas no C6"""
+        df = self.analisador._padronizar_valores_c6_faturamento(self._c6_com_retentativa())
+
+        resultado = self.analisador.detectar_duplicidades_c6(df, 'valor_faturado')
+
+        self.assertEqual(
+            list(resultado['classificacao_duplicidade']),
+            ['', 'retentativa', '', 'duplicata', ''],
+        )
+
+    def test_duplicidades_c6_na_virada_do_minuto(self):
+        """Testa tentativas separadas por menos que a janela em minutos diferentes"""
+        df = self.analisador._padronizar_valores_c6_faturamento(pd.DataFrame({
+            'data': ['31/07/2025'] * 4,
+            'hora': ['10:00:59', '10:01:02', '10:03:00', '10:01:40'],
+            'valor_faturado': ['R$ 50,00'] * 4,
+            'num_cartao': ['************1949'] * 4,
+            'status': ['Recusada', 'Aprovada', 'Aprovada', 'Aprovada'],
+        }))
+
+        resultado = self.analisador.detectar_duplicidades_c6(df, 'valor_faturado')
+
+        # 10:01:40 segue 10:01:02 dentro da janela; 10:03:00 já é outra compra
+        self.assertEqual(
+            list(resultado['classificacao_duplicidade']),
+            ['retentativa', '', '', 'duplicata'],
+        )
+
+    def test_totais_c6_sem_duplicidades(self):
+        """Testa totais bruto e deduplicado do C6 e os detalhes nas divergências"""
+        dados = {'faturamento_c6': self._c6_com_retentativa()}
+
+        totais = self.analisador.calcular_totais_faturamento(dados)
+
+        c6 = totais['faturamento_c6']
+        self.assertEqual(c6['total_bruto'], 3200.0)
+        self.assertEqual(c6['registros_brutos'], 5)
+        self.assertEqual(c6['total'], 1900.0)
+        self.assertEqual(c6['registros'], 3)
+
+        resultado = self.analisador.analisar_par_faturamento(
+            'faturamento_c6', 'faturamento_gds', totais
+        )
+        tipos = sorted(d['tipo'] for d in resultado.detalhes_divergencias)
+        self.assertEqual(tipos, ['duplicata', 'retentativa'])
+        self.assertEqual(resultado.total_fonte_1, 1900.0)
+
+    def test_duplicidades_sem_colunas_necessarias(self):
+        """Testa que sem cartão/hora nenhuma transação é descartada"""
+        dados = {'faturamento_c6': pd.DataFrame({'valor_venda': ['R$ 10,00', 'R$ 10,00']})}
+
+        totais = self.analisador.calcular_totais_faturamento(dados)
+
+        self.assertEqual(totais['faturamento_c6']['total'], 20.0)
+        self.assertEqual(totais['faturamento_c6']['registros'], 2)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,191 @@
+"""
+Testes Unitários para a base SQL de lançamentos
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.analisador import Analisador
+from src.models.analisador_sql import AnalisadorSQL
+
+
+def _dados_mes(dia: str = '31', fator: int = 1):
+    """Dados de um mês com retentativa no C6 e pagamentos em ambas as fontes"""
+    mes = '07/2025'
+    return {
+        'faturamento_c6': pd.DataFrame({
+            'data': [f'{dia}/{mes}'] * 4 + [f'30/{mes}'],
+            'hora': ['19:46:38', '19:46:37', '15:44:10', '15:44:12', '19:46:38'],
+            'valor_faturado': [f' R$ {600 * fator},00 ', f' R$ {600 * fator},00 ',
+                               ' R$ 700,00 ', ' R$ 700,00 ', ' R$ 600,00 '],
+            'num_cartao': ['************1949', '************1949', '************0518',
+                           '************0518', '************1949'],
+            'status': ['Aprovada', 'Recusada', 'Aprovada', 'Aprovada', 'Aprovada'],
+        }),
+        'faturamento_gds': pd.DataFrame({
+            'data_emissao': [f'30/{mes}', f'{dia}/{mes}', f'{dia}/{mes}'],
+            'metodo': ['PIX', 'Débito', 'Crédito'],
+            'paciente': ['Maria Silva', 'João Souza', 'Maria Silva'],
+            'valor': ['600,00', '700,00', '123,45'],
+        }),
+        'faturamento_wab': pd.DataFrame(),
+        'pagamento_c6': pd.DataFrame({
+            'data_recebivel': [f'{dia}/{mes}', f'{dia}/{mes}'],
+            'tipo_operacao': ['Crédito à vista', 'Crédito à vista'],
+            'valor_recebivel': ['R$ 90,00', 'R$ 10,00'],
+            'status': ['Recebido', 'Pendente'],
+        }),
+        'pagamento_gds': pd.DataFrame({
+            'data_baixa': [f'{dia}/{mes}', f'{dia}/{mes}'],
+            'valor': ['90,00', '15,50'],
+        }),
+    }
+
+
+class TestAnalisadorSQL(unittest.TestCase):
+    """Testes para o componente AnalisadorSQL"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'cache', 'lancamentos.sqlite3')
+        self.analisador = Analisador()
+        self.sql = AnalisadorSQL(self.db_path, self.analisador)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_mesmos_resultados_do_pandas(self):
+        """Testa que os pares calculados por SQL são os mesmos do Analisador"""
+        dados = _dados_mes()
+        self.sql.ingerir_mes('072025', 'abc', dados)
+
+        esperados = self.analisador.analisar_todos_pares(dados)
+        obtidos = self.sql.analisar_todos_pares('072025')
+
+        self.assertEqual(len(obtidos), len(esperados))
+        for obtido, esperado in zip(obtidos, esperados):
+            self.assertEqual(obtido.par_fontes, esperado.par_fontes)
+            self.assertAlmostEqual(obtido.total_fonte_1, esperado.total_fonte_1, places=2)
+            self.assertAlmostEqual(obtido.total_fonte_2, esperado.total_fonte_2, places=2)
+            self.assertEqual(obtido.registros_fonte_1, esperado.registros_fonte_1)
+            self.assertEqual(obtido.registros_fonte_2, esperado.registros_fonte_2)
+            self.assertAlmostEqual(
+                obtido.percentual_diferenca, esperado.percentual_diferenca, places=4
+            )
+
+    def test_duplicidades_c6(self):
+        """Testa totais brutos e lista de duplicidades do faturamento C6"""
+        dados = _dados_mes()
+        self.sql.ingerir_mes('072025', 'abc', dados)
+
+        obtido = self.sql.calcular_totais('072025')['faturamento_c6']
+        esperado = self.analisador.calcular_totais_faturamento(dados)['faturamento_c6']
+
+        self.assertEqual(obtido['total_bruto'], esperado['total_bruto'])
+        self.assertEqual(obtido['registros_brutos'], esperado['registros_brutos'])
+        self.assertEqual(
+            sorted((d['tipo'], d['hora'], d['valor']) for d in obtido['duplicidades']),
+            sorted((d['tipo'], d['hora'], d['valor']) for d in esperado['duplicidades']),
+        )
+
+    def test_totais_por_dia_iguais_a_agregar_totais(self):
+        """Testa quebra por dia e método igual à de Analisador.agregar_totais"""
+        dados = _dados_mes()
+        self.sql.ingerir_mes('072025', 'abc', dados)
+
+        colunas = ['fonte', 'dia', 'metodo', 'total', 'registros']
+        ordem = ['fonte', 'dia', 'metodo']
+        esperado = self.analisador.agregar_totais(dados)[colunas].sort_values(ordem)
+        obtido = self.sql.totais_por_dia('072025').sort_values(ordem)
+
+        pd.testing.assert_frame_equal(
+            obtido.reset_index(drop=True), esperado.reset_index(drop=True), check_dtype=False
+        )
+
+    def test_reingestao_substitui_o_mes(self):
+        """Testa que reingerir um mês não duplica lançamentos"""
+        self.assertTrue(self.sql.precisa_atualizar('072025', 'abc'))
+        self.sql.ingerir_mes('072025', 'abc', _dados_mes())
+        self.assertFalse(self.sql.precisa_atualizar('072025', 'abc'))
+
+        self.sql.ingerir_mes('072025', 'def', _dados_mes(fator=2))
+
+        totais = self.sql.calcular_totais('072025')
+        self.assertEqual(totais['faturamento_c6']['total'], 1200.0 + 700.0 + 600.0)
+        self.assertEqual(self.sql.meses_ingeridos(), ['072025'])
+
+    def test_versao_do_analisador_forca_reingestao(self):
+        """Testa que regras novas (versão do analisador) invalidam o mês ingerido"""
+        self.sql.ingerir_mes('072025', 'abc', _dados_mes())
+        self.assertEqual(self.sql.calcular_totais('072025')['faturamento_c6']['total'], 1900.0)
+
+        # Sem janela, as tentativas repetidas do C6 deixam de ser agrupadas
+        self.analisador.janela_duplicidade_segundos = 0
+
+        self.assertTrue(self.sql.precisa_atualizar('072025', 'abc'))
+        self.sql.ingerir_mes('072025', 'abc', _dados_mes())
+        self.assertFalse(self.sql.precisa_atualizar('072025', 'abc'))
+        self.assertEqual(self.sql.calcular_totais('072025')['faturamento_c6']['total'], 2600.0)
+
+    def test_intervalo_de_meses(self):
+        """Testa totais somados sobre vários meses"""
+        self.sql.ingerir_mes('062025', 'a', _dados_mes())
+        self.sql.ingerir_mes('072025', 'b', _dados_mes())
+
+        um_mes = self.sql.calcular_totais('072025')['faturamento_gds']
+        dois_meses = self.sql.calcular_totais('062025', '072025')['faturamento_gds']
+
+        self.assertAlmostEqual(dois_meses['total'], 2 * um_mes['total'], places=2)
+        self.assertEqual(dois_meses['registros'], 2 * um_mes['registros'])
+
+    def test_parear_registros(self):
+        """Testa pareamento 1:1 por dia e valor, com sobras de ambos os lados"""
+        self.sql.ingerir_mes('072025', 'abc', _dados_mes())
+
+        pares = self.sql.parear_registros('pagamento_c6', 'pagamento_gds', '072025')
+
+        casados = pares.dropna(subset=['linha_1', 'linha_2'])
+        self.assertEqual(len(casados), 1)
+        self.assertEqual(casados.iloc[0]['valor'], 90.0)
+        sobras = pares[pares['linha_1'].isna()]
+        self.assertEqual(sobras['valor'].tolist(), [15.5])
+
+    def test_buscar_lancamentos(self):
+        """Testa busca por paciente, cartão e valor"""
+        self.sql.ingerir_mes('072025', 'abc', _dados_mes())
+
+        paciente = self.sql.buscar_lancamentos(paciente='maria silva')
+        self.assertEqual(len(paciente), 2)
+
+        cartao = self.sql.buscar_lancamentos(cartao='************1949', fonte='faturamento_c6')
+        self.assertEqual(len(cartao), 3)
+
+        valor = self.sql.buscar_lancamentos(valor=700.0, inicio='072025')
+        self.assertEqual(set(valor['fonte']), {'faturamento_c6', 'faturamento_gds'})
+
+    def test_indices_criados(self):
+        """Testa os índices por data, valor, cartão e paciente"""
+        with sqlite3.connect(self.db_path) as conn:
+            indices = {
+                nome for (nome,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+        self.assertTrue({
+            'idx_lancamentos_fonte_dia_centavos', 'idx_lancamentos_centavos',
+            'idx_lancamentos_cartao', 'idx_lancamentos_paciente',
+        } <= indices)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Testes Unitários para o cache de resultados em disco
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.controllers.conciliacao_controller import ConciliacaoController
+from src.models.analisador import Analisador, ResultadoAnalise
+from src.models.cache_resultados import (
+    CacheResultados,
+    desserializar_resultados,
+    serializar_resultados,
+)
+from src.models.registros import TabelaDivergencias
+from tests.fixtures.gerador_sintetico import ConfiguracaoGerador, gerar_mes
+
+
+def _resultados():
+    duplicidades = TabelaDivergencias.de_registros([
+        {'fonte': 'faturamento_c6', 'tipo': 'retentativa', 'data': '31/07/2025',
+         'hora': '19:46:37', 'num_cartao': '************1949', 'status': 'Recusada',
+         'valor': 1600.5},
+        {'fonte': 'faturamento_c6', 'tipo': 'duplicata', 'valor': 700.0},
+    ])
+    return [
+        ResultadoAnalise(('faturamento_c6', 'faturamento_gds'), 1234.5, 1200.0, 10, 9,
+                         34.5, 2.7945, detalhes_divergencias=duplicidades),
+        ResultadoAnalise(('faturamento_c6', 'faturamento_wab'), 1234.5, 0, 10, 0,
+                         1234.5, 0.0, detalhes_divergencias=duplicidades),
+        ResultadoAnalise(('pagamento_c6', 'pagamento_gds'), 100.0, 100.0, 1, 1, 0.0, 0.0,
+                         tipo_analise='pagamento'),
+    ]
+
+
+def _sem_metricas(resultados):
+    return [(r.par_fontes, r.total_fonte_1, r.total_fonte_2, r.registros_fonte_1,
+             r.registros_fonte_2, r.diferenca, r.percentual_diferenca, r.tipo_analise,
+             r.detalhes_divergencias.para_colunas()) for r in resultados]
+
+
+class TestCacheResultados(unittest.TestCase):
+    """Testes para a serialização, CacheResultados e o uso pelo controller"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_serializacao_ida_e_volta(self):
+        """Testa campos, divergências compartilhadas gravadas uma vez e bloco corrompido"""
+        resultados = _resultados()
+
+        dados = serializar_resultados(resultados)
+        lidos = desserializar_resultados(dados)
+
+        self.assertEqual(lidos, resultados)
+        self.assertIs(lidos[0].detalhes_divergencias, lidos[1].detalhes_divergencias)
+        self.assertEqual(lidos[0].detalhes_divergencias[0]['hora'], '19:46:37')
+        self.assertEqual(lidos[2].detalhes_divergencias.coluna('valor').tolist(), [])
+        with self.assertRaises(ValueError):
+            desserializar_resultados(dados[:-4])
+
+    def test_chave_por_mes_fontes_fingerprint_e_versao(self):
+        """Testa que só a mesma combinação de entradas e versão é reaproveitada"""
+        cache = CacheResultados(os.path.join(self.temp_dir, 'resultados.sqlite3'))
+        resultados = _resultados()
+
+        self.assertIsNone(cache.obter('072025', 'f1', 'v1'))
+        self.assertGreater(cache.guardar('072025', 'f1', 'v1', resultados), 0)
+        cache.guardar('072025', 'f1', 'v1', resultados[2:], ['pagamento_gds', 'pagamento_c6'])
+
+        self.assertEqual(cache.obter('072025', 'f1', 'v1'), resultados)
+        self.assertEqual(
+            cache.obter('072025', 'f1', 'v1', ['pagamento_c6', 'pagamento_gds']), resultados[2:]
+        )
+        self.assertIsNone(cache.obter('072025', 'f2', 'v1'))
+        self.assertIsNone(cache.obter('072025', 'f1', 'v2'))
+        self.assertIsNone(cache.obter('082025', 'f1', 'v1'))
+
+        with sqlite3.connect(cache.db_path) as conn:
+            conn.execute("UPDATE resultados SET dados = x'00'")
+        conn.close()
+        with self.assertLogs('src.models.cache_resultados', 'WARNING'):
+            self.assertIsNone(cache.obter('072025', 'f1', 'v1'))
+
+    def test_controller_reabre_mes_sem_ler_arquivos(self):
+        """Testa leitura dos resultados gravados e recálculo com arquivo alterado"""
+        base = os.path.join(self.temp_dir, 'dados')
+        cache_dir = os.path.join(self.temp_dir, 'cache')
+        resumo = gerar_mes(base, '072025', ConfiguracaoGerador(vendas=200, semente=5))
+
+        calculados = ConciliacaoController(base, cache_dir=cache_dir).executar_conciliacao(
+            '072025'
+        )
+        controller = ConciliacaoController(base, cache_dir=cache_dir)
+        reabertos = controller.executar_conciliacao('072025')
+
+        self.assertEqual(_sem_metricas(reabertos), _sem_metricas(calculados))
+        etapas = {e.nome for e in reabertos[0].metricas.etapas}
+        self.assertIn('ler_resultados_gravados', etapas)
+        self.assertNotIn('carregar_dados', etapas)
+        self.assertEqual(reabertos[0].metricas.caches['resultados']['acertos'], 1)
+
+        # Arquivo alterado ou outra versão do analisador: recalcula
+        with open(resumo.arquivos['pagamento_gds'], 'a', encoding='utf-8') as arquivo:
+            arquivo.write('\n')
+        etapas = {e.nome for e in controller.executar_conciliacao('072025')[0].metricas.etapas}
+        self.assertIn('carregar_dados', etapas)
+        controller.analisador = Analisador(janela_duplicidade_segundos=30)
+        etapas = {e.nome for e in controller.executar_conciliacao('072025')[0].metricas.etapas}
+        self.assertIn('carregar_dados', etapas)
+
+        recalculado = ConciliacaoController(
+            base, cache_dir=cache_dir, reutilizar_resultados=False
+        ).executar_conciliacao('072025')
+        self.assertIn('carregar_dados', {e.nome for e in recalculado[0].metricas.etapas})
+
+
+if __name__ == '__main__':
+    unittest.main()
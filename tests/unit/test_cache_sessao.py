@@ -0,0 +1,58 @@
+"""
+Testes Unitários para o cache de meses da sessão
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.cache_sessao import CacheSessao, tamanho_dados
+
+
+def _dados(linhas: int):
+    return {'faturamento_c6': pd.DataFrame({'valor': ['R$ 10,00'] * linhas})}
+
+
+class TestCacheSessao(unittest.TestCase):
+    """Testes para o componente CacheSessao"""
+
+    def test_obter_com_fingerprint(self):
+        """Testa acerto, falha e invalidação por impressão digital"""
+        cache = CacheSessao()
+        dados = _dados(3)
+        self.assertTrue(cache.guardar('072025', 'a', dados))
+
+        self.assertIs(cache.obter('072025', 'a'), dados)
+        self.assertIsNone(cache.obter('062025', 'a'))
+        # Arquivos alterados: a entrada é descartada
+        self.assertIsNone(cache.obter('072025', 'b'))
+        self.assertEqual(cache.meses, [])
+        self.assertEqual((cache.acertos, cache.falhas), (1, 2))
+
+    def test_limite_memoria_remove_menos_usado(self):
+        """Testa remoção LRU ao ultrapassar o limite de memória"""
+        tamanho = tamanho_dados(_dados(100))
+        cache = CacheSessao(limite_bytes=int(tamanho * 2.5))
+        cache.guardar('052025', 'x', _dados(100))
+        cache.guardar('062025', 'x', _dados(100))
+        cache.obter('052025', 'x')  # 052025 passa a ser o mais recente
+
+        self.assertFalse(cache.cabe(tamanho))
+        cache.guardar('072025', 'x', _dados(100))
+
+        self.assertEqual(cache.meses, ['052025', '072025'])
+        self.assertLessEqual(cache.tamanho_bytes, cache.limite_bytes)
+
+    def test_mes_maior_que_limite(self):
+        """Testa que um mês maior que o limite não é guardado"""
+        cache = CacheSessao(limite_bytes=10)
+        self.assertFalse(cache.guardar('072025', 'x', _dados(100)))
+        self.assertEqual(cache.meses, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
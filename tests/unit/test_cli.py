@@ -0,0 +1,216 @@
+"""
+Testes Unitários para a interface de linha de comando
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.cli import (
+    SAIDA_ALERTA,
+    SAIDA_CRITICO,
+    SAIDA_ERRO,
+    SAIDA_OK,
+    calcular_codigo_saida,
+    criar_parser,
+    main,
+    resolver_meses,
+)
+from src.models.analisador import ResultadoAnalise, ResultadoLote
+
+
+class TestCli(unittest.TestCase):
+    """Testes para o modo não interativo"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _criar_mes(self, mes_ano: str, valor_c6: str, valor_gds: str):
+        """Cria uma pasta de mês com faturamento C6 e GDS"""
+        pasta_mes = os.path.join(self.temp_dir, mes_ano)
+        os.makedirs(pasta_mes)
+        pd.DataFrame({'Data da Venda': ['01/07/2025'], 'Valor da Venda': [valor_c6]}).to_csv(
+            os.path.join(pasta_mes, f'faturamento_C6_{mes_ano}.csv'), index=False
+        )
+        pd.DataFrame({'Data de emissão': ['01/07/2025'], 'Valor': [valor_gds]}).to_csv(
+            os.path.join(pasta_mes, f'faturamento_GDS_{mes_ano}.csv'), index=False
+        )
+
+    def _executar(self, *argumentos):
+        saida = os.path.join(self.temp_dir, 'saida.out')
+        codigo = main([
+            '--base-path', self.temp_dir, '--sem-cache', '--saida', saida, *argumentos
+        ])
+        with open(saida, encoding='utf-8') as f:
+            return codigo, f.read()
+
+    def test_resolver_meses(self):
+        """Testa combinação de --meses e intervalo, sem repetições"""
+        args = criar_parser().parse_args(['--meses', '072025', '--de', '062025', '--ate', '082025'])
+        self.assertEqual(resolver_meses(args), ['072025', '062025', '082025'])
+
+        with self.assertRaises(ValueError):
+            resolver_meses(criar_parser().parse_args(['--meses', '132025']))
+
+    def test_calcular_codigo_saida(self):
+        """Testa códigos de saída pelos limites de divergência"""
+        def lote(percentual):
+            resultado = ResultadoAnalise(('a', 'b'), 100.0, 100.0, 1, 1, 0.0, percentual)
+            return ResultadoLote(resultados={'072025': [resultado]})
+
+        self.assertEqual(calcular_codigo_saida(lote(0.5), 1.0, 5.0), SAIDA_OK)
+        self.assertEqual(calcular_codigo_saida(lote(-2.0), 1.0, 5.0), SAIDA_ALERTA)
+        self.assertEqual(calcular_codigo_saida(lote(7.0), 1.0, 5.0), SAIDA_CRITICO)
+        self.assertEqual(calcular_codigo_saida(lote(7.0), 1.0, 10.0), SAIDA_ALERTA)
+
+        com_erro = lote(0.0)
+        com_erro.erros['082025'] = 'falha'
+        self.assertEqual(calcular_codigo_saida(com_erro, 1.0, 5.0), SAIDA_ERRO)
+
+    def test_codigo_saida_sem_dados(self):
+        """Testa mês vazio como erro e fonte ausente ou zerada como crítico"""
+        def lote(*resultados):
+            return ResultadoLote(resultados={'072025': list(resultados)})
+
+        vazio = ResultadoAnalise(('a', 'b'), 0.0, 0.0, 0, 0, 0.0, 0.0)
+        self.assertEqual(calcular_codigo_saida(lote(vazio, vazio), 1.0, 5.0), SAIDA_ERRO)
+        self.assertEqual(calcular_codigo_saida(lote(), 1.0, 5.0), SAIDA_ERRO)
+
+        ausente = ResultadoAnalise(('a', 'b'), 123100.0, 0.0, 10, 0, 123100.0, 0.0)
+        self.assertEqual(calcular_codigo_saida(lote(ausente), 1.0, 5.0), SAIDA_CRITICO)
+        zerada = ResultadoAnalise(('a', 'b'), 123100.0, 0.0, 10, 4, 123100.0, 0.0)
+        self.assertEqual(calcular_codigo_saida(lote(zerada), 1.0, 5.0), SAIDA_CRITICO)
+
+        codigo, conteudo = self._executar('--meses', '012020')
+        self.assertEqual(codigo, SAIDA_ERRO)
+        self.assertEqual(json.loads(conteudo)['codigo_saida'], SAIDA_ERRO)
+
+    def test_saida_json_com_fontes(self):
+        """Testa saída JSON restrita a um par de fontes"""
+        self._criar_mes('072025', 'R$ 100,00', 'R$ 97,00')
+
+        codigo, conteudo = self._executar(
+            '--meses', '072025', '--fontes', 'faturamento_c6', 'faturamento_gds'
+        )
+
+        documento = json.loads(conteudo)
+        self.assertEqual(codigo, SAIDA_ALERTA)
+        self.assertEqual(documento['codigo_saida'], SAIDA_ALERTA)
+        resultados = documento['meses']['072025']['resultados']
+        self.assertEqual(len(resultados), 1)
+        self.assertEqual(resultados[0]['fonte_2'], 'faturamento_gds')
+        self.assertEqual(resultados[0]['diferenca'], 3.0)
+        self.assertEqual(resultados[0]['status'], 'alerta')
+
+    def test_saida_csv(self):
+        """Testa saída CSV com limites personalizados"""
+        self._criar_mes('062025', 'R$ 100,00', 'R$ 100,00')
+        self._criar_mes('072025', 'R$ 100,00', 'R$ 97,00')
+
+        codigo, conteudo = self._executar(
+            '--de', '062025', '--ate', '072025', '--formato', 'csv',
+            '--fontes', 'faturamento_c6', 'faturamento_gds', '--limite-alerta', '5',
+        )
+
+        linhas = list(csv.DictReader(conteudo.splitlines()))
+        self.assertEqual(codigo, SAIDA_OK)
+        self.assertEqual([linha['mes_ano'] for linha in linhas], ['062025', '072025'])
+        self.assertEqual({linha['status'] for linha in linhas}, {'ok'})
+
+    def test_varias_clinicas(self):
+        """Testa relatório consolidado com o pior código de saída entre as clínicas"""
+        for nome, valor_gds in (('norte', 'R$ 100,00'), ('sul', 'R$ 90,00')):
+            pasta_mes = os.path.join(self.temp_dir, 'raiz', nome, '072025')
+            os.makedirs(pasta_mes)
+            pd.DataFrame({'Data da Venda': ['01/07/2025'], 'Valor da Venda': ['R$ 100,00']}).to_csv(
+                os.path.join(pasta_mes, 'faturamento_C6_072025.csv'), index=False
+            )
+            pd.DataFrame({'Data de emissão': ['01/07/2025'], 'Valor': [valor_gds]}).to_csv(
+                os.path.join(pasta_mes, 'faturamento_GDS_072025.csv'), index=False
+            )
+
+        codigo, conteudo = self._executar(
+            '--raiz-clinicas', os.path.join(self.temp_dir, 'raiz'), '--meses', '072025',
+            '--fontes', 'faturamento_c6', 'faturamento_gds', '--workers', '1',
+        )
+
+        documento = json.loads(conteudo)
+        self.assertEqual(codigo, SAIDA_CRITICO)
+        self.assertEqual(list(documento['clinicas']), ['norte', 'sul'])
+        self.assertEqual(documento['clinicas']['norte']['codigo_saida'], SAIDA_OK)
+        self.assertEqual(documento['clinicas']['sul']['codigo_saida'], SAIDA_CRITICO)
+        self.assertIn('duracao', documento['clinicas']['sul'])
+
+    def test_perfil_memoria(self):
+        """Testa o relatório de memória por etapa gravado em arquivo"""
+        self._criar_mes('072025', 'R$ 100,00', 'R$ 100,00')
+        relatorio = os.path.join(self.temp_dir, 'memoria.txt')
+
+        codigo, _ = self._executar(
+            '--meses', '072025', '--fontes', 'faturamento_c6', 'faturamento_gds',
+            '--perfil-memoria', relatorio,
+        )
+
+        self.assertEqual(codigo, SAIDA_OK)
+        with open(relatorio, encoding='utf-8') as f:
+            conteudo = f.read()
+        self.assertIn('Memória por etapa 07/2025', conteudo)
+        self.assertIn('ler_csv', conteudo)
+        self.assertIn('Pico da execução', conteudo)
+
+    def test_perfil_cpu(self):
+        """Testa os arquivos do cProfile e o resumo das funções mais lentas"""
+        self._criar_mes('072025', 'R$ 100,00', 'R$ 100,00')
+        prefixo = os.path.join(self.temp_dir, 'perfil')
+
+        with open(os.devnull, 'w') as devnull:
+            stderr, sys.stderr = sys.stderr, devnull
+            try:
+                codigo, conteudo = self._executar(
+                    '--meses', '072025', '--fontes', 'faturamento_c6', 'faturamento_gds',
+                    '--perfil', prefixo,
+                )
+            finally:
+                sys.stderr = stderr
+
+        self.assertEqual(codigo, SAIDA_OK)
+        self.assertEqual(json.loads(conteudo)['codigo_saida'], SAIDA_OK)
+        with open(prefixo + '.folded', encoding='utf-8') as f:
+            self.assertIn('executar_conciliacao', f.read())
+        self.assertTrue(os.path.getsize(prefixo + '.prof') > 0)
+
+    def test_argumentos_invalidos(self):
+        """Testa rejeição de argumentos inconsistentes"""
+        for argumentos in (
+            [],
+            ['--meses', '072025', '--fontes', 'faturamento_c6'],
+            ['--meses', '072025', '--limite-alerta', '10', '--limite-critico', '5'],
+            ['--meses', '072025', '--backend', 'sql', '--perfil-memoria', 'memoria.txt'],
+            ['--meses', '072025', '--perfil', '--workers', '2'],
+        ):
+            with self.subTest(argumentos=argumentos):
+                with self.assertRaises(SystemExit) as ctx:
+                    with open(os.devnull, 'w') as devnull:
+                        stderr, sys.stderr = sys.stderr, devnull
+                        try:
+                            main(argumentos)
+                        finally:
+                            sys.stderr = stderr
+                self.assertEqual(ctx.exception.code, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
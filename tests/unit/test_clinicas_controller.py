@@ -0,0 +1,101 @@
+"""
+Testes Unitários para a conciliação de várias clínicas
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.controllers import clinicas_controller
+from src.controllers.clinicas_controller import ClinicasController, descobrir_clinicas
+
+FONTES = ['faturamento_c6', 'faturamento_gds']
+
+
+class TestClinicasController(unittest.TestCase):
+    """Testes para o componente ClinicasController"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.raiz = os.path.join(self.temp_dir, 'clinicas')
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _criar_clinica(self, nome: str, valor_c6: str, valor_gds: str) -> str:
+        """Cria o diretório base de uma clínica com faturamento C6 e GDS de 07/2025"""
+        pasta_mes = os.path.join(self.raiz, nome, 'julho')
+        os.makedirs(pasta_mes)
+        pd.DataFrame({'Data da Venda': ['01/07/2025'], 'Valor da Venda': [valor_c6]}).to_csv(
+            os.path.join(pasta_mes, 'faturamento_C6_072025.csv'), index=False
+        )
+        pd.DataFrame({'Data de emissão': ['01/07/2025'], 'Valor': [valor_gds]}).to_csv(
+            os.path.join(pasta_mes, 'faturamento_GDS_072025.csv'), index=False
+        )
+        return os.path.join(self.raiz, nome)
+
+    def test_descobrir_clinicas(self):
+        """Testa que só subdiretórios com arquivos de origem viram clínicas"""
+        self._criar_clinica('norte', 'R$ 100,00', 'R$ 100,00')
+        self._criar_clinica('centro', 'R$ 100,00', 'R$ 100,00')
+        os.makedirs(os.path.join(self.raiz, 'vazia'))
+
+        self.assertEqual(list(descobrir_clinicas(self.raiz)), ['centro', 'norte'])
+
+    def test_resultados_e_caches_por_clinica(self):
+        """Testa resultados separados e um diretório de cache por clínica"""
+        clinicas = {
+            'norte': self._criar_clinica('norte', 'R$ 100,00', 'R$ 100,00'),
+            'sul': self._criar_clinica('sul', 'R$ 100,00', 'R$ 90,00'),
+        }
+        controller = ClinicasController(clinicas, cache_dir=self.cache_dir)
+
+        consolidado = controller.executar_conciliacao(['072025'], max_workers=2, fontes=FONTES)
+
+        self.assertEqual(list(consolidado.lotes), ['norte', 'sul'])
+        self.assertEqual(set(consolidado.tempos), {'norte', 'sul'})
+        self.assertEqual(consolidado.erros, {})
+        diferencas = {
+            nome: lote.resultados['072025'][0].diferenca
+            for nome, lote in consolidado.lotes.items()
+        }
+        self.assertEqual(diferencas, {'norte': 0.0, 'sul': 10.0})
+        for nome in clinicas:
+            self.assertTrue(
+                os.path.exists(os.path.join(controller.cache_dir_clinica(nome), 'agregados.sqlite3'))
+            )
+
+    def test_erro_isolado_por_clinica(self):
+        """Testa que a falha de uma clínica não interrompe as demais"""
+        clinicas = {
+            'norte': self._criar_clinica('norte', 'R$ 100,00', 'R$ 100,00'),
+            'quebrada': os.path.join(self.raiz, 'quebrada'),
+        }
+        original = clinicas_controller._conciliar_clinica_isolada
+
+        def conciliar(base_path, *args):
+            if base_path.endswith('quebrada'):
+                raise OSError('disco indisponível')
+            return original(base_path, *args)
+
+        with mock.patch.object(clinicas_controller, '_conciliar_clinica_isolada', conciliar):
+            consolidado = ClinicasController(clinicas).executar_conciliacao(
+                ['072025'], max_workers=1, fontes=FONTES
+            )
+
+        self.assertEqual(list(consolidado.lotes), ['norte'])
+        self.assertEqual(consolidado.erros, {'quebrada': 'disco indisponível'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,12 @@
 """
 Testes Unitários para o Controller
 """
+import json
 import os
 import shutil
 import sys
 import tempfile
+import threading
 import unittest
 
 import pandas as pd
@@ -12,7 +14,7 @@ import pandas as pd
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from src.controllers.conciliacao_controller import ConciliacaoController
+from src.controllers.conciliacao_controller import ConciliacaoController, expandir_meses
 
 
 class TestConciliacaoController(unittest.TestCase):
@@ -97,6 +99,22 @@ class TestConciliacaoController(unittest.TestCase):
         for key in expected_keys:
             self.assertIn(key, resumo)
             
+    def test_obter_resumo_dados_com_descartados(self):
+        """Testa que o resumo informa as linhas descartadas na leitura"""
+        pasta_mes = os.path.join(self.temp_dir, '072025')
+        os.makedirs(pasta_mes)
+        pd.DataFrame({
+            'Data do recebível': ['01/07/2025', '01/07/2025', '02/07/2025'],
+            'Valor do recebível': ['R$ 10,00', 'R$ 10,00', 'R$ 5,00'],
+            'Status do recebível': ['Recebido', 'Pendente', 'Recebido'],
+        }).to_csv(os.path.join(pasta_mes, 'pagamento_C6_072025.csv'), sep=';', index=False)
+
+        resumo = self.controller.obter_resumo_dados('072025')
+
+        self.assertEqual(resumo['pagamento_c6']['registros'], 2)
+        self.assertEqual(resumo['pagamento_c6']['descartados'], 1)
+        self.assertEqual(resumo['pagamento_gds']['descartados'], 0)
+
     def test_obter_detalhes_fonte_inexistente(self):
         """Testa obtenção de detalhes para fonte inexistente"""
         detalhes = self.controller.obter_detalhes_fonte('072025', 'fonte_inexistente')
@@ -165,6 +183,224 @@ class TestConciliacaoController(unittest.TestCase):
         self.assertEqual(detalhes['tipo_total'], 'Valor Recebível')
         self.assertGreater(detalhes['total_principal'], 0)
         
+    def test_detalhes_fonte_estatisticas_em_cache(self):
+        """Testa estatísticas sobre valores normalizados, com cache por arquivo da fonte"""
+        pasta_mes = os.path.join(self.temp_dir, '072025')
+        os.makedirs(pasta_mes)
+        caminho = os.path.join(pasta_mes, 'faturamento_GDS_072025.csv')
+        pd.DataFrame({
+            'Data de emissão': ['01/07/2025', '02/07/2025', '03/07/2025'],
+            'Valor': ['R$ 1.000,00', 'R$ 200,00', 'R$ 300,00'],
+            'Paciente': ['Maria', '', 'João'],
+        }).to_csv(caminho, index=False)
+
+        detalhes = self.controller.obter_detalhes_fonte('072025', 'faturamento_gds')
+
+        self.assertEqual(detalhes['estatisticas']['valor']['total'], 1500.0)
+        self.assertEqual(detalhes['estatisticas']['valor']['mediana'], 300.0)
+        self.assertEqual(detalhes['nulos']['paciente'], 1)
+        self.assertIs(self.controller.obter_detalhes_fonte('072025', 'faturamento_gds'), detalhes)
+
+        # Alterar outra fonte do mês não invalida; alterar a própria fonte, sim
+        pd.DataFrame({'Data da Venda': ['01/07/2025'], 'Valor da Venda': ['R$ 1,00']}).to_csv(
+            os.path.join(pasta_mes, 'faturamento_C6_072025.csv'), index=False
+        )
+        self.assertIs(self.controller.obter_detalhes_fonte('072025', 'faturamento_gds'), detalhes)
+        pd.DataFrame({'Data de emissão': ['01/07/2025'], 'Valor': ['R$ 10,00']}).to_csv(
+            caminho, index=False
+        )
+        atualizado = self.controller.obter_detalhes_fonte('072025', 'faturamento_gds')
+        self.assertEqual(atualizado['estatisticas']['valor']['total'], 10.0)
+
+    def test_expandir_meses(self):
+        """Testa expansão de intervalo de meses com virada de ano"""
+        self.assertEqual(
+            expandir_meses('112024', '022025'),
+            ['112024', '122024', '012025', '022025'],
+        )
+        self.assertEqual(expandir_meses('072025', '072025'), ['072025'])
+        self.assertEqual(expandir_meses('082025', '072025'), [])
+        with self.assertRaises(ValueError):
+            expandir_meses('132025', '012026')
+
+    def _criar_mes_c6(self, mes_ano: str, valores):
+        """Cria uma pasta de mês apenas com faturamento C6"""
+        pasta_mes = os.path.join(self.temp_dir, mes_ano)
+        os.makedirs(pasta_mes)
+        pd.DataFrame({
+            'Data da Venda': ['01/07/2025'] * len(valores),
+            'Valor da Venda': valores,
+        }).to_csv(os.path.join(pasta_mes, f'faturamento_C6_{mes_ano}.csv'), index=False)
+
+    def test_executar_conciliacao_lote(self):
+        """Testa conciliação em lote no pool de processos"""
+        self._criar_mes_c6('062025', ['R$ 100,00'])
+        self._criar_mes_c6('072025', ['R$ 100,00', 'R$ 50,00'])
+
+        lote = self.controller.executar_conciliacao_lote(['062025', '072025'], max_workers=2)
+
+        self.assertEqual(list(lote.resultados), ['062025', '072025'])
+        self.assertEqual(set(lote.tempos), {'062025', '072025'})
+        self.assertFalse(lote.erros)
+        self.assertGreaterEqual(lote.duracao_total, 0)
+        c6_julho = lote.resultados['072025'][0]
+        self.assertEqual(c6_julho.total_fonte_1, 150.0)
+        self.assertEqual(c6_julho.registros_fonte_1, 2)
+
+    def test_executar_conciliacao_lote_sequencial(self):
+        """Testa conciliação em lote sem pool (max_workers=1)"""
+        self._criar_mes_c6('072025', ['R$ 10,00'])
+
+        lote = self.controller.executar_conciliacao_lote(['072025', '082025'], max_workers=1)
+
+        self.assertEqual(list(lote.resultados), ['072025', '082025'])
+        self.assertEqual(lote.resultados['072025'][0].total_fonte_1, 10.0)
+
+    def test_carregar_dados_usa_cache_da_sessao(self):
+        """Testa reaproveitamento do mês carregado e invalidação por alteração"""
+        self._criar_mes_c6('072025', ['R$ 10,00'])
+
+        primeiro = self.controller.carregar_dados('072025')
+        self.assertIs(self.controller.carregar_dados('072025'), primeiro)
+
+        caminho = os.path.join(self.temp_dir, '072025', 'faturamento_C6_072025.csv')
+        pd.DataFrame({
+            'Data da Venda': ['01/07/2025', '02/07/2025'],
+            'Valor da Venda': ['R$ 10,00', 'R$ 20,00'],
+        }).to_csv(caminho, index=False)
+        os.utime(caminho, ns=(0, 1))
+
+        self.assertEqual(len(self.controller.carregar_dados('072025')['faturamento_c6']), 2)
+
+    def test_prefetch_meses_vizinhos(self):
+        """Testa pré-carregamento dos meses vizinhos após a conciliação"""
+        controller = ConciliacaoController(self.temp_dir, prefetch=True)
+        for mes_ano in ('052025', '062025', '072025', '092025'):
+            self._criar_mes_c6(mes_ano, ['R$ 10,00'])
+
+        controller.executar_conciliacao('072025')
+        futuros = list(controller._prefetch_futuros.values())
+        for futuro in futuros:
+            futuro.result(timeout=30)
+
+        self.assertEqual(sorted(controller._prefetch_futuros), ['062025', '092025'])
+        self.assertEqual(set(controller.cache_sessao.meses), {'062025', '072025', '092025'})
+
+        # Vizinhos já em cache não são agendados de novo
+        self.assertEqual(controller.prefetch_meses_vizinhos('072025'), [])
+        controller.encerrar()
+
+    def test_prefetch_cancelado_descarta_resultado(self):
+        """Testa que um pré-carregamento cancelado não alimenta o cache"""
+        self._criar_mes_c6('062025', ['R$ 10,00'])
+        cancelado = threading.Event()
+        cancelado.set()
+
+        self.assertFalse(self.controller._prefetch_mes('062025', cancelado))
+        self.assertEqual(self.controller.cache_sessao.meses, [])
+
+    def test_visao_acumulada_com_agregados(self):
+        """Testa visões acumuladas a partir dos agregados gravados na conciliação"""
+        controller = ConciliacaoController(
+            self.temp_dir, cache_dir=os.path.join(self.temp_dir, 'cache')
+        )
+        self._criar_mes_c6('062025', ['R$ 100,00'])
+        self._criar_mes_c6('072025', ['R$ 100,00', 'R$ 50,00'])
+        controller.executar_conciliacao('062025')
+        controller.executar_conciliacao('072025')
+
+        resultados, meses = controller.obter_visao_acumulada('072025')
+
+        self.assertEqual(meses, ['062025', '072025'])
+        self.assertEqual(resultados[0].par_fontes, ('faturamento_c6', 'faturamento_gds'))
+        self.assertAlmostEqual(resultados[0].total_fonte_1, 250.0)
+        self.assertEqual(resultados[0].registros_fonte_1, 3)
+
+        _, meses_janela = controller.obter_visao_acumulada('072025', janela_meses=1)
+        self.assertEqual(meses_janela, ['072025'])
+
+    def test_tabela_taxas_do_arquivo(self):
+        """Testa que a análise de taxas usa a tabela informada ao controller"""
+        caminho = os.path.join(self.temp_dir, 'taxas.json')
+        tabela = [{'bandeira': 'elo', 'modalidade': 'debito',
+                   'parcelas_min': 1, 'parcelas_max': 1, 'taxa': 0.99}]
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(tabela, f)
+
+        controller = ConciliacaoController(self.temp_dir, tabela_taxas=caminho)
+
+        self.assertEqual(controller.analisador_taxas.tabela, tabela)
+        self.assertNotEqual(self.controller.analisador_taxas.tabela, tabela)
+
+    def test_visao_acumulada_atualiza_meses_da_janela(self):
+        """Testa que meses nunca conciliados ou alterados entram atualizados na visão"""
+        controller = ConciliacaoController(
+            self.temp_dir, cache_dir=os.path.join(self.temp_dir, 'cache')
+        )
+        self._criar_mes_c6('062025', ['R$ 100,00'])
+        self._criar_mes_c6('072025', ['R$ 100,00'])
+        controller.executar_conciliacao('072025')
+
+        resultados, meses = controller.obter_visao_acumulada('072025')
+        self.assertEqual(meses, ['062025', '072025'])
+        self.assertAlmostEqual(resultados[0].total_fonte_1, 200.0)
+
+        pd.DataFrame({
+            'Data da Venda': ['01/07/2025'], 'Valor da Venda': ['R$ 700,00'],
+        }).to_csv(os.path.join(self.temp_dir, '072025', 'faturamento_C6_072025.csv'), index=False)
+        resultados, _ = controller.obter_visao_acumulada('072025')
+        self.assertAlmostEqual(resultados[0].total_fonte_1, 800.0)
+
+    def test_atualizar_agregados_somente_meses_alterados(self):
+        """Testa que apenas meses com arquivos alterados são reprocessados"""
+        controller = ConciliacaoController(
+            self.temp_dir, cache_dir=os.path.join(self.temp_dir, 'cache')
+        )
+        self._criar_mes_c6('072025', ['R$ 100,00'])
+
+        self.assertEqual(controller.atualizar_agregados(['072025']), ['072025'])
+        self.assertEqual(controller.atualizar_agregados(['072025']), [])
+
+        caminho = os.path.join(self.temp_dir, '072025', 'faturamento_C6_072025.csv')
+        pd.DataFrame({
+            'Data da Venda': ['01/07/2025', '02/07/2025'],
+            'Valor da Venda': ['R$ 100,00', 'R$ 900,00'],
+        }).to_csv(caminho, index=False)
+        self.assertEqual(controller.atualizar_agregados(['072025']), ['072025'])
+
+        resultados, _ = controller.obter_visao_acumulada('072025')
+        self.assertAlmostEqual(resultados[0].total_fonte_1, 1000.0)
+
+        # Regras novas (versão do analisador) também refazem os agregados
+        controller.analisador.janela_duplicidade_segundos = 0
+        self.assertEqual(controller.atualizar_agregados(['072025']), ['072025'])
+        self.assertEqual(controller.atualizar_agregados(['072025']), [])
+
+    def test_vincular_recebiveis_entre_meses(self):
+        """Testa vínculo de recebíveis de julho às vendas de junho"""
+        controller = ConciliacaoController(
+            self.temp_dir, cache_dir=os.path.join(self.temp_dir, 'cache')
+        )
+        pasta_junho = os.path.join(self.temp_dir, '062025')
+        pasta_julho = os.path.join(self.temp_dir, '072025')
+        os.makedirs(pasta_junho)
+        os.makedirs(pasta_julho)
+        pd.DataFrame({
+            'DT_VENDA': ['30/06/2025'], 'HR_VENDA': ['12:59:38'], 'VAL_FAT': ['R$ 700,00'],
+            'NUM_CARTAO': ['************7163'], 'STATUS': ['Aprovada'],
+        }).to_csv(os.path.join(pasta_junho, 'faturamento_C6_062025.csv'), sep=';', index=False)
+        pd.DataFrame({
+            'Hora da venda': ['12:59:38'], 'Data da venda': ['30/06/2025'],
+            'Valor da venda': ['R$ 700,00'], 'Valor do recebível': ['R$ 686,21'],
+            'Número do cartão': ['************7163'], 'Status do recebível': ['Recebido'],
+            'Código da venda': ['86ce4963'],
+        }).to_csv(os.path.join(pasta_julho, 'pagamento_C6_072025.csv'), sep=';', index=False)
+
+        vinculos = controller.vincular_recebiveis('072025')
+
+        self.assertEqual(vinculos.iloc[0]['mes_origem'], '062025')
+        self.assertEqual(controller.atualizar_indice_recebiveis(), [])
+
     def test_verificar_dados_carregados(self):
         """Testa verificação de dados carregados"""
         # Teste com dados vazios
@@ -47,6 +47,33 @@ class TestDataLoader(unittest.TestCase):
                 result = self.data_loader._get_pasta_mes(input_mes)
                 self.assertEqual(result, expected)
                 
+    def test_resolver_pasta_mes_nomeada(self):
+        """Testa resolução da pasta nomeada pelo mês (ex: julho)"""
+        os.makedirs(os.path.join(self.temp_dir, 'julho'))
+
+        self.assertEqual(
+            self.data_loader._resolver_pasta_mes('072025'),
+            os.path.join(self.temp_dir, 'julho'),
+        )
+        # Pasta numérica tem prioridade quando existe
+        os.makedirs(os.path.join(self.temp_dir, '072025'))
+        self.assertEqual(
+            self.data_loader._resolver_pasta_mes('072025'),
+            os.path.join(self.temp_dir, '072025'),
+        )
+
+    def test_listar_meses_disponiveis(self):
+        """Testa descoberta dos meses pelos nomes dos arquivos"""
+        for pasta, arquivo in [
+            ('julho', 'faturamento_C6_072025.csv'),
+            ('122024', 'pagamento_GDS_122024.csv'),
+            ('122024', 'outro_arquivo.csv'),
+        ]:
+            os.makedirs(os.path.join(self.temp_dir, pasta), exist_ok=True)
+            open(os.path.join(self.temp_dir, pasta, arquivo), 'w').close()
+
+        self.assertEqual(self.data_loader.listar_meses_disponiveis(), ['122024', '072025'])
+
     def test_ler_csv_arquivo_inexistente(self):
         """Testa leitura de arquivo CSV inexistente"""
         arquivo_inexistente = os.path.join(self.temp_dir, "inexistente.csv")
@@ -71,6 +98,35 @@ class TestDataLoader(unittest.TestCase):
         self.assertEqual(len(resultado), 3)
         self.assertIn('coluna1', resultado.columns)
         
+    def test_ler_csv_com_filtros(self):
+        """Testa descarte de linhas pelos filtros durante a leitura em blocos"""
+        test_file = os.path.join(self.temp_dir, 'pagamento.csv')
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write('\ufeffR/D;Valor;Pago\n')
+            f.write('Receita;100;Sim\n')
+            f.write('Despesa;50;Sim\n')
+            f.write('Receita;30;Não\n')
+            f.write('Receita;20;\n')
+
+        filtros = [('tipo', 'contem', 'Receita'), ('pago', 'contem', 'Sim')]
+        resultado = self.data_loader.ler_csv(
+            test_file, self.data_loader.pagamento_gds_cols, filtros
+        )
+
+        self.assertEqual(len(resultado), 1)
+        self.assertEqual(resultado.iloc[0]['tipo'], 'Receita')
+        self.assertEqual(resultado.attrs['linhas_descartadas'], 3)
+
+    def test_aplicar_filtros_nao_contem(self):
+        """Testa que 'nao_contem' mantém valores vazios"""
+        df = pd.DataFrame({'status': ['Aprovada', 'Recusada', None]})
+
+        resultado = self.data_loader._aplicar_filtros(df, [('status', 'nao_contem', 'Recusada')])
+
+        self.assertEqual(list(resultado.index), [0, 2])
+        with self.assertRaises(ValueError):
+            self.data_loader._aplicar_filtros(df, [('status', 'igual', 'x')])
+
     def test_ler_wab_json_arquivo_inexistente(self):
         """Testa leitura de arquivo WAB JSON inexistente"""
         resultado = self.data_loader.ler_wab_json('arquivo_inexistente.json')
@@ -174,6 +230,22 @@ class TestDataLoader(unittest.TestCase):
         for fonte, df in resultado.items():
             self.assertTrue(df.empty)
             
+    def test_carregar_dados_mes_somente_fontes(self):
+        """Testa carregamento restrito a algumas fontes"""
+        pasta_mes = os.path.join(self.temp_dir, '072025')
+        os.makedirs(pasta_mes)
+        pd.DataFrame({'Data da Venda': ['01/07/2025'], 'Valor da Venda': [100.0]}).to_csv(
+            os.path.join(pasta_mes, 'faturamento_C6_072025.csv'), index=False
+        )
+
+        resultado = self.data_loader.carregar_dados_mes(
+            '072025', fontes=['faturamento_c6', 'pagamento_gds']
+        )
+
+        self.assertEqual(set(resultado), {'faturamento_c6', 'pagamento_gds'})
+        self.assertEqual(len(resultado['faturamento_c6']), 1)
+        self.assertTrue(resultado['pagamento_gds'].empty)
+
     def test_carregar_dados_mes_com_arquivos(self):
         """Testa carregamento de dados com arquivos presentes"""
         # Cria estrutura de diretório de teste
@@ -0,0 +1,60 @@
+"""
+Testes Unitários para as estatísticas das fontes
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.estatisticas import calcular_estatisticas, contar_nulos
+
+
+class TestEstatisticas(unittest.TestCase):
+    """Testes para calcular_estatisticas e contar_nulos"""
+
+    def test_mesmos_valores_do_pandas(self):
+        """Testa agregados e quantis iguais aos calculados coluna a coluna"""
+        df = pd.DataFrame({
+            'valor': [100.5, 200.0, np.nan, 50.25, 1000.0],
+            'parcelas': [1, 2, 3, 1, 12],
+            'cliente': ['A', 'B', 'C', 'D', 'E'],
+        })
+
+        estatisticas = calcular_estatisticas(df)
+
+        self.assertEqual(set(estatisticas), {'valor', 'parcelas'})
+        for coluna, stats in estatisticas.items():
+            serie = df[coluna]
+            self.assertAlmostEqual(stats['total'], serie.sum())
+            self.assertAlmostEqual(stats['media'], serie.mean())
+            self.assertEqual(stats['minimo'], serie.min())
+            self.assertEqual(stats['maximo'], serie.max())
+            self.assertEqual(stats['contagem'], serie.count())
+            self.assertAlmostEqual(stats['mediana'], serie.median())
+            self.assertAlmostEqual(stats['q1'], serie.quantile(0.25))
+            self.assertAlmostEqual(stats['q3'], serie.quantile(0.75))
+
+    def test_colunas_vazias_e_sem_numericas(self):
+        """Testa que colunas sem valores ficam de fora, sem avisos"""
+        df = pd.DataFrame({'valor': [np.nan, np.nan], 'texto': ['a', 'b']})
+        self.assertEqual(calcular_estatisticas(df), {})
+        self.assertEqual(calcular_estatisticas(pd.DataFrame()), {})
+
+    def test_contar_nulos(self):
+        """Testa que ausentes e textos em branco contam como nulos"""
+        df = pd.DataFrame({
+            'paciente': ['Maria', '', '  ', None],
+            'valor': [1.0, np.nan, 3.0, 4.0],
+            'obs': ['x', 'y', 'z', 'w'],
+        })
+
+        self.assertEqual(contar_nulos(df), {'paciente': 3, 'valor': 1, 'obs': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
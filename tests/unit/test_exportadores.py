@@ -0,0 +1,115 @@
+"""
+Testes Unitários para os exportadores de resultados
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.analisador import ResultadoAnalise
+from src.views.exportadores import exportar, formatar_brl_lote
+from src.views.terminal_view import format_brl
+
+
+def _resultados():
+    divergencias = [
+        {'fonte': 'faturamento_c6', 'tipo': 'retentativa', 'data': '31/07/2025',
+         'hora': '19:46:37', 'num_cartao': '************1949', 'status': 'Recusada',
+         'valor': 1600.5},
+        {'fonte': 'faturamento_c6', 'tipo': 'duplicata', 'data': '31/07/2025',
+         'hora': '15:44:12', 'num_cartao': '<script>', 'status': 'Aprovada', 'valor': 700.0},
+    ]
+    return {
+        '072025': [
+            ResultadoAnalise(
+                ('faturamento_c6', 'faturamento_gds'), 1234567.891, 1200000.0, 10, 9,
+                34567.891, 2.8, detalhes_divergencias=divergencias,
+            ),
+            ResultadoAnalise(
+                ('pagamento_c6', 'pagamento_gds'), 100.0, 100.0, 1, 1, 0.0, 0.0,
+                tipo_analise='pagamento',
+            ),
+        ],
+    }
+
+
+class TestExportadores(unittest.TestCase):
+    """Testes para os exportadores CSV, JSON Lines e HTML"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_formatar_brl_lote_igual_a_format_brl(self):
+        """Testa que a formatação em lote equivale à formatação por valor"""
+        valores = [0.0, 1.005, -1234.5, 1234567.891, 999.999, -0.004]
+        self.assertEqual(formatar_brl_lote(valores), [format_brl(v) for v in valores])
+        self.assertEqual(formatar_brl_lote([]), [])
+
+    def test_exportar_csv(self):
+        """Testa CSV com ";", valores formatados e arquivo separado de divergências"""
+        caminho = os.path.join(self.temp_dir, 'julho.csv')
+
+        arquivos = exportar(_resultados(), caminho)
+
+        divergencias = os.path.join(self.temp_dir, 'julho_divergencias.csv')
+        validacao = os.path.join(self.temp_dir, 'julho_validacao.csv')
+        self.assertEqual(arquivos, [caminho, divergencias, validacao])
+        with open(caminho, encoding='utf-8-sig') as f:
+            pares = list(csv.DictReader(f, delimiter=';'))
+        self.assertEqual(pares[0]['total_fonte_1'], '1.234.567,89')
+        self.assertEqual(pares[0]['percentual_diferenca'], '2,8000')
+        self.assertEqual(pares[0]['status'], 'alerta')
+        self.assertEqual(pares[1]['status'], 'ok')
+        with open(divergencias, encoding='utf-8-sig') as f:
+            linhas = list(csv.DictReader(f, delimiter=';'))
+        self.assertEqual([linha['valor'] for linha in linhas], ['1.600,50', '700,00'])
+        self.assertEqual(linhas[0]['mes_ano'], '072025')
+
+    def test_exportar_jsonl(self):
+        """Testa JSON Lines com valores numéricos e tipo de registro"""
+        caminho = os.path.join(self.temp_dir, 'julho.jsonl')
+
+        exportar(_resultados(), caminho)
+
+        with open(caminho, encoding='utf-8') as f:
+            linhas = [json.loads(linha) for linha in f]
+        self.assertEqual([linha['registro'] for linha in linhas],
+                         ['par', 'par', 'divergencia', 'divergencia'])
+        self.assertEqual(linhas[0]['total_fonte_1'], 1234567.891)
+        self.assertEqual(linhas[2]['valor'], 1600.5)
+
+    def test_exportar_html(self):
+        """Testa HTML autocontido, com conteúdo escapado e status por linha"""
+        caminho = os.path.join(self.temp_dir, 'julho.html')
+
+        exportar(_resultados(), caminho)
+
+        with open(caminho, encoding='utf-8') as f:
+            conteudo = f.read()
+        self.assertTrue(conteudo.startswith('<!DOCTYPE html>'))
+        self.assertIn('<style>', conteudo)
+        self.assertNotIn('<script>', conteudo)
+        self.assertIn('&lt;script&gt;', conteudo)
+        self.assertIn('<tr class="alerta">', conteudo)
+        self.assertIn('1.600,50', conteudo)
+        self.assertIn('07/2025', conteudo)
+
+    def test_extensao_nao_suportada(self):
+        """Testa rejeição de formato desconhecido"""
+        with self.assertRaises(ValueError):
+            exportar(_resultados(), os.path.join(self.temp_dir, 'julho.xlsx'))
+
+
+if __name__ == '__main__':
+    unittest.main()
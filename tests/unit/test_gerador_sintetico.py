@@ -0,0 +1,116 @@
+"""
+Testes Unitários para o gerador de meses sintéticos
+"""
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.analisador import Analisador
+from src.models.data_loader import DataLoader
+from tests.fixtures.gerador_sintetico import ConfiguracaoGerador, gerar_mes
+
+PASTA_JULHO = os.path.join(os.path.dirname(__file__), '..', '..', 'faturamentos', 'julho')
+
+
+def _primeira_linha(caminho: str) -> bytes:
+    with open(caminho, 'rb') as f:
+        return f.readline()
+
+
+class TestGeradorSintetico(unittest.TestCase):
+    """Testes para o gerador de meses sintéticos"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfiguracaoGerador(vendas=2000, semente=11)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_totais_esperados_iguais_aos_do_analisador(self):
+        """Testa que o Analisador encontra os totais e as duplicatas injetadas"""
+        resumo = gerar_mes(self.temp_dir, '072025', self.config)
+        dados = DataLoader(self.temp_dir).carregar_dados_mes('072025')
+        analisador = Analisador()
+        totais = {
+            **analisador.calcular_totais_faturamento(dados),
+            **analisador.calcular_totais_pagamento(dados),
+        }
+
+        for fonte in ('faturamento_c6', 'faturamento_gds', 'pagamento_c6', 'pagamento_gds'):
+            self.assertAlmostEqual(totais[fonte]['total'], resumo.totais[fonte], places=2)
+        c6 = totais['faturamento_c6']
+        # Só as recusadas avulsas saem; as retentativas chegam sinalizadas
+        self.assertEqual(
+            c6['registros_brutos'], resumo.linhas['faturamento_c6'] - resumo.recusadas
+        )
+        self.assertEqual(
+            c6['duplicidades'].contar('tipo'),
+            {'retentativa': resumo.retentativas, 'duplicata': resumo.duplicatas},
+        )
+        self.assertEqual(len(dados['faturamento_wab']), resumo.linhas['faturamento_wab'])
+        self.assertEqual(resumo.divergencias['pagamento_gds'], {'ausente': 20, 'valor': 20})
+
+    def test_total_wab_esperado(self):
+        """Testa o total do WAB, somado da coluna 'VALOR PAGO'"""
+        resumo = gerar_mes(self.temp_dir, '072025', self.config)
+        dados = DataLoader(self.temp_dir).carregar_dados_mes('072025', fontes=['faturamento_wab'])
+
+        totais = Analisador().calcular_totais_faturamento(dados)
+
+        self.assertAlmostEqual(
+            totais['faturamento_wab']['total'], resumo.totais['faturamento_wab'], places=2
+        )
+
+    @unittest.skipUnless(os.path.isdir(PASTA_JULHO), 'amostra real de julho indisponível')
+    def test_cabecalhos_iguais_aos_arquivos_reais(self):
+        """Testa cabeçalho, BOM e ';' finais idênticos aos arquivos reais"""
+        resumo = gerar_mes(self.temp_dir, '072025', self.config)
+        for fonte, caminho in resumo.arquivos.items():
+            if not caminho.endswith('.csv'):
+                continue
+            real = os.path.join(PASTA_JULHO, os.path.basename(caminho))
+            self.assertEqual(_primeira_linha(caminho), _primeira_linha(real), fonte)
+
+        with open(resumo.arquivos['faturamento_c6'], encoding='utf-8-sig') as f:
+            f.readline()
+            self.assertRegex(f.readline(), r';\d\d:\d\d:\d\d; R\$ [\d.]+,\d\d ; R\$ ')
+        with open(resumo.arquivos['pagamento_c6'], encoding='utf-8') as f:
+            f.readline()
+            self.assertTrue(f.readline().endswith(';-;-' + ';' * 11 + '\n'))
+        with open(resumo.arquivos['faturamento_wab_txt'], encoding='utf-8') as f:
+            texto = f.read()
+        self.assertTrue(texto.startswith('DATA: '))
+        self.assertFalse(texto.endswith('\n'))
+
+    def test_mesma_semente_mesmos_arquivos(self):
+        """Testa que a geração é determinística pela semente"""
+        primeiro = gerar_mes(os.path.join(self.temp_dir, 'a'), '072025', self.config)
+        segundo = gerar_mes(os.path.join(self.temp_dir, 'b'), '072025', self.config)
+        self.config.semente = 12
+        outro = gerar_mes(os.path.join(self.temp_dir, 'c'), '072025', self.config)
+
+        for fonte, caminho in primeiro.arquivos.items():
+            self.assertTrue(filecmp.cmp(caminho, segundo.arquivos[fonte], shallow=False), fonte)
+        self.assertFalse(filecmp.cmp(
+            primeiro.arquivos['faturamento_c6'], outro.arquivos['faturamento_c6'], shallow=False
+        ))
+
+    def test_configuracao_invalida(self):
+        """Testa rejeição de proporções fora da faixa"""
+        with self.assertRaises(ValueError):
+            gerar_mes(self.temp_dir, '072025', ConfiguracaoGerador(proporcao_duplicatas=1.5))
+        with self.assertRaises(ValueError):
+            gerar_mes(self.temp_dir, '072025', ConfiguracaoGerador(max_parcelas=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Testes Unitários para o índice de recebíveis entre meses
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.indice_recebiveis import IndiceRecebiveis, _centavos
+
+
+class TestIndiceRecebiveis(unittest.TestCase):
+    """Testes para o componente IndiceRecebiveis"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.indice = IndiceRecebiveis(os.path.join(self.temp_dir, 'recebiveis.sqlite3'))
+
+        self.vendas_abril = pd.DataFrame({
+            'data': ['01/04/2025', '01/04/2025'],
+            'hora': ['15:44:50', '09:00:00'],
+            'valor_faturado': [' R$ 4.800,00 ', ' R$ 4.800,00 '],
+            'num_cartao': ['************5094', '************5094'],
+            'parcelas': [4, 4],
+        })
+        self.recebiveis_julho = pd.DataFrame({
+            'hora_venda': ['15:44:53', '12:59:38'],
+            'data_venda': ['01/04/2025', '30/06/2025'],
+            'valor_venda': [4800.0, 700.0],
+            'valor_recebivel': [1173.48, 686.21],
+            'num_cartao': ['************5094', '************7163'],
+            'parcelas': ['4/4', '1/1'],
+            'codigo_venda': ['137673824', '86ce4963'],
+        })
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_vincular_recebivel_a_venda_de_outro_mes(self):
+        """Testa vínculo de parcela recebida em julho à venda de abril"""
+        self.indice.indexar_mes('042025', 'fp-abril', 'v1', self.vendas_abril, pd.DataFrame())
+        self.indice.indexar_mes('072025', 'fp-julho', 'v1', pd.DataFrame(), self.recebiveis_julho)
+
+        vinculos = self.indice.vincular(self.recebiveis_julho)
+
+        self.assertEqual(len(vinculos), 2)
+        self.assertEqual(vinculos.iloc[0]['mes_origem'], '042025')
+        # Entre duas vendas iguais, escolhe a de horário mais próximo
+        self.assertEqual(vinculos.iloc[0]['linha_origem'], 0)
+        self.assertTrue(pd.isna(vinculos.iloc[1]['mes_origem']))
+
+        origem = self.indice.origem_venda('137673824', '************5094', '01/04/2025')
+        self.assertEqual(origem['mes_ano'], '042025')
+        self.assertEqual(origem['valor'], 4800.0)
+        self.assertIsNone(self.indice.origem_venda('inexistente', '-', '01/04/2025'))
+
+    def test_reindexar_mes_substitui_linhas(self):
+        """Testa atualização incremental por impressão digital"""
+        self.assertTrue(self.indice.precisa_atualizar('042025', 'fp1', 'v1'))
+        self.indice.indexar_mes('042025', 'fp1', 'v1', self.vendas_abril, pd.DataFrame())
+        self.assertFalse(self.indice.precisa_atualizar('042025', 'fp1', 'v1'))
+        self.assertTrue(self.indice.precisa_atualizar('042025', 'fp2', 'v1'))
+
+        self.indice.indexar_mes('042025', 'fp2', 'v1', pd.DataFrame(), pd.DataFrame())
+
+        vinculos = self.indice.vincular(self.recebiveis_julho)
+        self.assertTrue(vinculos['mes_origem'].isna().all())
+        self.assertEqual(self.indice.meses_indexados(), ['042025'])
+
+    def test_versao_do_analisador_forca_reindexacao(self):
+        """Testa que um mês indexado por outra versão do analisador é reindexado"""
+        self.indice.indexar_mes('042025', 'fp1', 'v1', self.vendas_abril, pd.DataFrame())
+
+        self.assertTrue(self.indice.precisa_atualizar('042025', 'fp1', 'v2'))
+        self.indice.indexar_mes('042025', 'fp1', 'v2', self.vendas_abril, pd.DataFrame())
+        self.assertFalse(self.indice.precisa_atualizar('042025', 'fp1', 'v2'))
+
+    def test_centavos(self):
+        """Testa conversão vetorizada de valores BRL em centavos"""
+        serie = pd.Series([' R$ 4.800,00 ', '1173,48', None, 'abc', '0,1'])
+        self.assertEqual(_centavos(serie).tolist(), [480000, 117348, 0, 0, 10])
+
+
+if __name__ == '__main__':
+    unittest.main()
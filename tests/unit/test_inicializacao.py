@@ -0,0 +1,38 @@
+"""
+Testes Unitários para a inicialização rápida da interface de terminal
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+RAIZ_PROJETO = os.path.join(os.path.dirname(__file__), '..', '..')
+
+
+class TestInicializacao(unittest.TestCase):
+    """Garante que o menu não espera o carregamento do pandas"""
+
+    def _executar(self, codigo: str) -> str:
+        processo = subprocess.run(
+            [sys.executable, '-c', codigo],
+            cwd=RAIZ_PROJETO, capture_output=True, text=True, check=True,
+        )
+        return processo.stdout.strip()
+
+    def test_importar_main_sem_pandas(self):
+        """Testa que main e a view não importam pandas"""
+        saida = self._executar("import sys, main; print('pandas' in sys.modules)")
+        self.assertEqual(saida, 'False')
+
+    def test_controller_aquecido_em_segundo_plano(self):
+        """Testa que o controller fica disponível após o aquecimento"""
+        saida = self._executar(
+            "import main\n"
+            "app = main.SwaifConfaApp()\n"
+            "print(type(app.controller).__name__, app._aquecimento.is_alive())"
+        )
+        self.assertEqual(saida, 'ConciliacaoController False')
+
+
+if __name__ == '__main__':
+    unittest.main()
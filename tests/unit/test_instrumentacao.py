@@ -0,0 +1,118 @@
+"""
+Testes Unitários para a instrumentação por etapa
+"""
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.controllers.conciliacao_controller import ConciliacaoController
+from src.models.instrumentacao import coleta_ativa, coletar, etapa
+from src.views.terminal_view import formatar_metricas, formatar_perfil_memoria
+from tests.fixtures.gerador_sintetico import ConfiguracaoGerador, gerar_mes
+
+
+class TestInstrumentacao(unittest.TestCase):
+    """Testes para coletar() e etapa()"""
+
+    def test_etapas_aninhadas(self):
+        """Testa ordem, profundidade e contadores das etapas registradas"""
+        with coletar('072025') as metricas:
+            with etapa('ler_csv', 'faturamento_c6', bytes_lidos=10) as leitura:
+                leitura.linhas_entrada, leitura.linhas_saida = 5, 4
+                with etapa('padronizar', 'faturamento_c6'):
+                    pass
+            with etapa('ler_csv', 'faturamento_gds', bytes_lidos=20) as leitura:
+                leitura.linhas_saida = 3
+
+        self.assertEqual(
+            [(e.nome, e.fonte, e.profundidade) for e in metricas.etapas],
+            [('ler_csv', 'faturamento_c6', 0), ('padronizar', 'faturamento_c6', 1),
+             ('ler_csv', 'faturamento_gds', 0)],
+        )
+        self.assertGreaterEqual(metricas.etapas[0].duracao, metricas.etapas[1].duracao)
+        self.assertGreater(metricas.duracao_total, 0)
+        agregado = metricas.agregar()['ler_csv']
+        self.assertEqual(agregado['chamadas'], 2)
+        self.assertEqual(agregado['linhas_saida'], 7)
+        self.assertEqual(agregado['bytes_lidos'], 30)
+
+    def test_etapa_sem_coleta_e_coletas_aninhadas(self):
+        """Testa que fora de coletar() nada é registrado e a coleta externa é restaurada"""
+        self.assertIsNone(coleta_ativa())
+        with etapa('ler_csv') as avulsa:
+            avulsa.linhas_saida = 1
+        self.assertIsNone(coleta_ativa())
+
+        with coletar('externa') as externa:
+            with coletar('interna') as interna:
+                with etapa('analisar_pares'):
+                    pass
+            self.assertIs(coleta_ativa(), externa)
+            with etapa('totais'):
+                pass
+        self.assertIsNone(coleta_ativa())
+        self.assertEqual([e.nome for e in interna.etapas], ['analisar_pares'])
+        self.assertEqual([(e.nome, e.profundidade) for e in externa.etapas], [('totais', 0)])
+
+    def test_modo_memoria(self):
+        """Testa pico, saldo, DataFrame de saída e locais de alocação por etapa"""
+        mib = 1024 ** 2
+        with coletar('072025', memoria=True, locais=3) as metricas:
+            with etapa('externa'):
+                with etapa('temporaria'):
+                    temporario = bytearray(8 * mib)
+                    del temporario
+                with etapa('retida') as medida:
+                    retido = [bytearray(mib) for _ in range(2)]
+                    df = pd.DataFrame({'texto': ['abc'] * 1000})
+                    medida.registrar_saida(df)
+
+        externa, temporaria, retida = metricas.etapas
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreaterEqual(temporaria.pico_bytes, 8 * mib)
+        self.assertLess(temporaria.retidos_bytes, mib)
+        self.assertGreaterEqual(retida.retidos_bytes, 2 * mib)
+        self.assertEqual(retida.linhas_saida, 1000)
+        self.assertEqual(retida.bytes_dataframe, int(df.memory_usage(deep=True).sum()))
+        self.assertTrue(retida.locais[0][0].startswith(os.path.join('tests', 'unit')))
+        # O pico da etapa interna sobe para a externa e para a execução,
+        # sem os snapshots tirados pela própria medição
+        self.assertGreaterEqual(externa.pico_bytes, 8 * mib)
+        self.assertLess(externa.pico_bytes, 12 * mib)
+        self.assertGreaterEqual(metricas.pico_bytes, externa.pico_bytes)
+        self.assertEqual(len(retido), 2)
+        self.assertIn('temporaria', '\n'.join(formatar_perfil_memoria(metricas)))
+
+    def test_controller_anexa_metricas_ao_resultado(self):
+        """Testa etapas de leitura, padronização e análise em uma conciliação real"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        resumo = gerar_mes(temp_dir, '072025', ConfiguracaoGerador(vendas=200, semente=3))
+
+        resultado = ConciliacaoController(temp_dir).executar_conciliacao('072025')[0]
+
+        metricas = resultado.metricas
+        self.assertIsNotNone(metricas)
+        agregado = metricas.agregar()
+        for nome in ('carregar_dados', 'ler_csv', 'ler_wab_json', 'padronizar',
+                     'totais', 'analisar_pares'):
+            self.assertIn(nome, agregado)
+        leitura_gds = next(
+            e for e in metricas.etapas if e.nome == 'ler_csv' and e.fonte == 'faturamento_gds'
+        )
+        self.assertEqual(leitura_gds.linhas_saida, resumo.linhas['faturamento_gds'])
+        self.assertEqual(leitura_gds.bytes_lidos,
+                         os.path.getsize(resumo.arquivos['faturamento_gds']))
+        self.assertTrue(any('analisar_pares' in linha for linha in formatar_metricas(metricas)))
+
+
+if __name__ == '__main__':
+    unittest.main()
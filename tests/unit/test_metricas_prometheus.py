@@ -0,0 +1,131 @@
+"""
+Testes Unitários para as métricas no formato do Prometheus
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.cli import main
+from src.models.analisador import ResultadoAnalise, ResultadoLote
+from src.models.instrumentacao import Etapa, MetricasExecucao
+from src.views.metricas_prometheus import linhas_prometheus
+from tests.fixtures.gerador_sintetico import ConfiguracaoGerador, gerar_mes
+
+
+def _amostras(linhas):
+    """Dict série -> valor das linhas que não são comentários"""
+    return dict(linha.rsplit(' ', 1) for linha in linhas if not linha.startswith('#'))
+
+
+class TestMetricasPrometheus(unittest.TestCase):
+    """Testes para linhas_prometheus e a opção --metricas-prometheus"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_linhas_de_um_lote(self):
+        """Testa etapas, linhas, caches, pares e agrupamento por métrica"""
+        metricas = MetricasExecucao('072025', etapas=[
+            Etapa('ler_csv', 'faturamento_c6', linhas_saida=10, duracao=0.5),
+            Etapa('padronizar', 'faturamento_c6', duracao=0.25),
+            Etapa('padronizar', 'faturamento_c6', duracao=0.25),
+        ], caches={'sessao': {'acertos': 1, 'falhas': 3}})
+        resultado = ResultadoAnalise(
+            ('faturamento_c6', 'faturamento_gds'), 100.0, 90.0, 1, 1, 10.0, 10.0,
+            metricas=metricas,
+        )
+        lote = ResultadoLote(
+            resultados={'072025': [resultado]}, tempos={'072025': 1.5},
+            erros={'082025': 'falha'},
+        )
+
+        linhas = linhas_prometheus(
+            {'cl"1': lote}, limite_alerta=1, limite_critico=5, codigo_saida=4,
+            pico_rss={'principal': 2048}, instante=1.0,
+        )
+
+        amostras = _amostras(linhas)
+        self.assertEqual(amostras['swaif_codigo_saida'], '4.0')
+        self.assertEqual(amostras['swaif_pico_rss_bytes{processo="principal"}'], '2048.0')
+        self.assertEqual(amostras['swaif_mes_erro{clinica="cl\\"1",mes="082025"}'], '1.0')
+        self.assertEqual(amostras[
+            'swaif_etapa_duracao_segundos{clinica="cl\\"1",mes="072025",'
+            'etapa="padronizar",fonte="faturamento_c6"}'
+        ], '0.5')
+        self.assertEqual(amostras[
+            'swaif_fonte_linhas_carregadas{clinica="cl\\"1",mes="072025",fonte="faturamento_c6"}'
+        ], '10.0')
+        self.assertEqual(
+            amostras['swaif_cache_taxa_acerto{clinica="cl\\"1",cache="sessao"}'], '0.25'
+        )
+        rotulos_par = (
+            '{clinica="cl\\"1",mes="072025",tipo="faturamento",'
+            'fonte_1="faturamento_c6",fonte_2="faturamento_gds"}'
+        )
+        self.assertEqual(amostras['swaif_par_diferenca_reais' + rotulos_par], '10.0')
+        self.assertEqual(amostras['swaif_par_nivel_divergencia' + rotulos_par], '2.0')
+
+        # Cada métrica aparece em um único bloco, logo após o seu TYPE
+        nomes = [linha.split('{')[0].split(' ')[0] for linha in linhas if linha[0] != '#']
+        blocos = [n for i, n in enumerate(nomes) if i == 0 or nomes[i - 1] != n]
+        self.assertEqual(len(blocos), len(set(blocos)))
+        self.assertEqual(
+            blocos, [linha.split(' ')[2] for linha in linhas if linha.startswith('# TYPE')]
+        )
+
+    def test_clinicas_com_erro(self):
+        """Testa a série de erro por clínica, inclusive das que não geraram lote"""
+        lote = ResultadoLote(resultados={'072025': []})
+
+        amostras = _amostras(linhas_prometheus(
+            {'norte': lote}, pico_rss={}, instante=1.0, erros_clinicas={'sul': 'sem acesso'},
+        ))
+
+        self.assertEqual(amostras['swaif_clinica_erro{clinica="norte"}'], '0.0')
+        self.assertEqual(amostras['swaif_clinica_erro{clinica="sul"}'], '1.0')
+        self.assertNotIn('swaif_clinica_erro', '\n'.join(linhas_prometheus({'': lote})))
+
+    def test_cli_grava_arquivo_com_caches_reaproveitados(self):
+        """Testa o arquivo gravado pela CLI e os acertos de cache na segunda execução"""
+        base = os.path.join(self.temp_dir, 'dados')
+        gerar_mes(base, '072025', ConfiguracaoGerador(vendas=100, semente=4))
+        arquivo = os.path.join(self.temp_dir, 'swaif.prom')
+        argumentos = [
+            '--base-path', base, '--meses', '072025', '--cache-dir',
+            os.path.join(self.temp_dir, 'cache'), '--saida', os.devnull,
+            '--metricas-prometheus', arquivo,
+        ]
+
+        main(argumentos)
+        main(argumentos + ['--recalcular'])
+
+        with open(arquivo, encoding='utf-8') as f:
+            amostras = _amostras(f.read().splitlines())
+        self.assertEqual(os.listdir(self.temp_dir).count('swaif.prom'), 1)
+        self.assertFalse([n for n in os.listdir(self.temp_dir) if n.endswith('.tmp')])
+        self.assertEqual(amostras['swaif_cache_taxa_acerto{cache="agregados"}'], '1.0')
+        self.assertEqual(amostras['swaif_cache_consultas{cache="sessao"}'], '1.0')
+        self.assertIn('swaif_fonte_linhas_carregadas{mes="072025",fonte="pagamento_gds"}',
+                      amostras)
+        self.assertGreater(float(amostras['swaif_pico_rss_bytes{processo="principal"}']), 0)
+
+        # Sem --recalcular, os resultados gravados respondem sem ler os arquivos
+        main(argumentos)
+        with open(arquivo, encoding='utf-8') as f:
+            amostras = _amostras(f.read().splitlines())
+        self.assertEqual(amostras['swaif_cache_taxa_acerto{cache="resultados"}'], '1.0')
+        self.assertNotIn('swaif_cache_consultas{cache="sessao"}', amostras)
+
+
+if __name__ == '__main__':
+    unittest.main()
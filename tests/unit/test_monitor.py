@@ -0,0 +1,132 @@
+"""
+Testes Unitários para o modo de monitoramento do diretório
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.monitor import MonitorDiretorio
+
+
+class TestMonitorDiretorio(unittest.TestCase):
+    """Testes para o componente MonitorDiretorio"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pasta_mes = os.path.join(self.temp_dir, '072025')
+        os.makedirs(self.pasta_mes)
+        self.saida = os.path.join(self.temp_dir, 'resultado.json')
+        self.monitor = MonitorDiretorio(self.temp_dir, saida=self.saida, debounce=5)
+        self.mtime = 1_000_000_000
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _escrever(self, nome: str, df: pd.DataFrame):
+        caminho = os.path.join(self.pasta_mes, nome)
+        df.to_csv(caminho, index=False)
+        # mtime explícito: escritas rápidas podem cair no mesmo tick do relógio
+        self.mtime += 1_000_000_000
+        os.utime(caminho, ns=(self.mtime, self.mtime))
+
+    def _c6(self, valor: str):
+        self._escrever(
+            'faturamento_C6_072025.csv',
+            pd.DataFrame({'Data da Venda': ['01/07/2025'], 'Valor da Venda': [valor]}),
+        )
+
+    def _gds(self, valor: str):
+        self._escrever(
+            'faturamento_GDS_072025.csv',
+            pd.DataFrame({'Data de emissão': ['01/07/2025'], 'Valor': [valor]}),
+        )
+
+    def test_detectar_alteracoes(self):
+        """Testa detecção por tamanho/mtime restrita aos arquivos lidos"""
+        self._c6('R$ 10,00')
+        open(os.path.join(self.pasta_mes, 'outro.csv'), 'w').close()
+
+        self.assertEqual(
+            self.monitor.detectar_alteracoes(self.monitor.varrer()),
+            {'072025': {'faturamento_c6'}},
+        )
+
+    def test_debounce_e_recarga_incremental(self):
+        """Testa agrupamento de escritas e recarga apenas das fontes alteradas"""
+        self.monitor.indice = self.monitor.varrer()
+        self._c6('R$ 10,00')
+        self._gds('R$ 10,00')
+
+        # Dentro da janela de debounce nada é processado
+        self.assertEqual(self.monitor.verificar(agora=100.0), [])
+        self._c6('R$ 12,00')
+        self.assertEqual(self.monitor.verificar(agora=103.0), [])
+        self.assertEqual(self.monitor.verificar(agora=108.0), ['072025'])
+
+        chamadas = []
+        original = self.monitor.controller.data_loader.carregar_dados_mes
+
+        def espiao(mes_ano, fontes=None):
+            chamadas.append(fontes)
+            return original(mes_ano, fontes=fontes)
+
+        self.monitor.controller.data_loader.carregar_dados_mes = espiao
+        self._gds('R$ 12,00')
+        self.monitor.verificar(agora=200.0)
+        self.assertEqual(self.monitor.verificar(agora=210.0), ['072025'])
+
+        self.assertEqual(chamadas, [['faturamento_gds']])
+        with open(self.saida, encoding='utf-8') as f:
+            mes = json.load(f)['meses']['072025']
+        self.assertEqual(mes['fontes_recarregadas'], ['faturamento_gds'])
+        par = mes['resultados'][0]
+        self.assertEqual((par['total_fonte_1'], par['total_fonte_2']), (12.0, 12.0))
+
+    def test_dados_limitados_ao_cache_da_sessao(self):
+        """Testa recarga completa do mês que não coube no cache da sessão"""
+        self.monitor.indice = self.monitor.varrer()
+        self._c6('R$ 10,00')
+        self._gds('R$ 10,00')
+        self.monitor.verificar(agora=100.0)
+        self.assertEqual(self.monitor.verificar(agora=110.0), ['072025'])
+        self.assertEqual(self.monitor.controller.cache_sessao.meses, ['072025'])
+
+        chamadas = []
+        original = self.monitor.controller.data_loader.carregar_dados_mes
+
+        def espiao(mes_ano, fontes=None):
+            chamadas.append(fontes)
+            return original(mes_ano, fontes=fontes)
+
+        self.monitor.controller.data_loader.carregar_dados_mes = espiao
+        self.monitor.controller.cache_sessao.limpar()
+        self._gds('R$ 12,00')
+        self.monitor.verificar(agora=200.0)
+        self.assertEqual(self.monitor.verificar(agora=210.0), ['072025'])
+
+        self.assertEqual(chamadas, [None])
+        with open(self.saida, encoding='utf-8') as f:
+            mes = json.load(f)['meses']['072025']
+        self.assertEqual(len(mes['fontes_recarregadas']), 5)
+
+    def test_sem_alteracoes(self):
+        """Testa que varreduras sem mudanças não reprocessam"""
+        self._c6('R$ 10,00')
+        self.monitor.indice = self.monitor.varrer()
+
+        self.assertEqual(self.monitor.verificar(agora=1000.0), [])
+        self.assertFalse(os.path.exists(self.saida))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Testes Unitários para o perfil de CPU (cProfile e pilhas colapsadas)
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.perfilador import perfilar
+
+
+def _ocupar(iteracoes: int) -> int:
+    return sum(i * i for i in range(iteracoes))
+
+
+def _folha() -> int:
+    return _ocupar(20_000)
+
+
+def _raiz() -> int:
+    return _folha() + _folha() + _ocupar(40_000)
+
+
+class TestPerfilador(unittest.TestCase):
+    """Testes para perfilar() e a reconstrução das pilhas colapsadas"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_grava_prof_e_pilhas_colapsadas(self):
+        """Testa os arquivos gravados, as pilhas por caminho e o total preservado"""
+        with perfilar(os.path.join(self.temp_dir, 'sub', 'perfil')) as perfil:
+            _raiz()
+
+        self.assertTrue(os.path.getsize(perfil.arquivo_prof) > 0)
+        with open(perfil.arquivo_pilhas, encoding='utf-8') as f:
+            linhas = f.read().splitlines()
+        pilhas = {}
+        for linha in linhas:
+            pilha, microssegundos = linha.rsplit(' ', 1)
+            pilhas[pilha] = int(microssegundos)
+        nomes = [[quadro.split(' ')[0] for quadro in pilha.split(';')] for pilha in pilhas]
+
+        # _ocupar aparece pelos dois caminhos: direto da raiz e via _folha (e sum)
+        self.assertIn(['_raiz', '_folha', '_ocupar', '<built-in', '<genexpr>'], nomes)
+        self.assertIn(['_raiz', '_ocupar', '<built-in', '<genexpr>'], nomes)
+        total_pilhas = sum(pilhas.values()) / 1_000_000
+        total_stats = perfil.stats.total_tt
+        self.assertAlmostEqual(total_pilhas, total_stats, delta=total_stats * 0.05 + 1e-4)
+        self.assertIn('_ocupar', perfil.funcoes_quentes(5))
+
+    def test_grava_arquivos_mesmo_com_excecao(self):
+        """Testa que o perfil é gravado quando o bloco falha"""
+        prefixo = os.path.join(self.temp_dir, 'falha')
+        with self.assertRaises(ValueError):
+            with perfilar(prefixo):
+                _folha()
+                raise ValueError('falha')
+
+        self.assertTrue(os.path.exists(prefixo + '.prof'))
+        self.assertTrue(os.path.exists(prefixo + '.folded'))
+
+
+if __name__ == '__main__':
+    unittest.main()
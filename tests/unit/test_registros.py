@@ -0,0 +1,82 @@
+"""
+Testes Unitários para as tabelas de registros por coluna
+"""
+import os
+import pickle
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.analisador import ResultadoAnalise
+from src.models.registros import Registro, TabelaDivergencias
+
+
+def _tabela():
+    return TabelaDivergencias.de_dataframe(pd.DataFrame({
+        'fonte': ['faturamento_c6'] * 3,
+        'tipo': ['retentativa', 'duplicata', 'retentativa'],
+        'hora': ['10:00:00', None, '10:00:30'],
+        'valor': [100.0, 'x', 50.5],
+        'coluna_extra': [1, 2, 3],
+    }))
+
+
+class TestTabelaDivergencias(unittest.TestCase):
+    """Testes para TabelaDivergencias e Registro"""
+
+    def test_colunas_e_visoes_de_linha(self):
+        """Testa códigos por coluna, ausentes vazios e visão Mapping de cada linha"""
+        tabela = _tabela()
+
+        self.assertEqual(len(tabela), 3)
+        self.assertEqual(tabela._colunas['tipo'].dtype, np.int32)
+        self.assertEqual(tabela._categorias['tipo'], ('retentativa', 'duplicata'))
+        self.assertEqual(tabela.coluna('valor').tolist(), [100.0, 0.0, 50.5])
+
+        linha = tabela[1]
+        self.assertIsInstance(linha, Registro)
+        self.assertFalse(hasattr(linha, '__dict__'))
+        self.assertEqual(dict(linha), {
+            'fonte': 'faturamento_c6', 'tipo': 'duplicata', 'data': '', 'hora': '',
+            'num_cartao': '', 'status': '', 'valor': 0.0,
+        })
+        self.assertEqual(tabela[-1]['hora'], '10:00:30')
+        self.assertIsNone(linha.get('coluna_extra'))
+        with self.assertRaises(IndexError):
+            tabela[3]
+
+    def test_filtrar_concatenar_e_serializar(self):
+        """Testa filtro por códigos, concatenação e ida e volta por pickle e colunas"""
+        tabela = _tabela()
+
+        retentativas = tabela.filtrar('tipo', ['retentativa'])
+        self.assertEqual([r['valor'] for r in retentativas], [100.0, 50.5])
+        self.assertFalse(tabela.filtrar('tipo', ['inexistente']))
+
+        juntas = TabelaDivergencias.concatenar([tabela, TabelaDivergencias(), retentativas])
+        self.assertEqual(len(juntas), 5)
+        self.assertEqual(juntas.coluna('tipo').tolist()[2:], ['retentativa'] * 3)
+        self.assertEqual(list(juntas.tuplas())[3][:2], ('faturamento_c6', 'retentativa'))
+
+        self.assertEqual(pickle.loads(pickle.dumps(juntas)), juntas)
+        self.assertEqual(TabelaDivergencias.de_colunas(juntas.para_colunas()), juntas)
+
+    def test_resultado_aceita_lista_de_dicts(self):
+        """Testa que ResultadoAnalise converte a forma antiga (lista de dicts)"""
+        registros = [{'fonte': 'faturamento_c6', 'tipo': 'duplicata', 'valor': 7.0}]
+        resultado = ResultadoAnalise(('a', 'b'), 1.0, 1.0, 1, 1, 0.0, 0.0,
+                                     detalhes_divergencias=registros)
+
+        self.assertIsInstance(resultado.detalhes_divergencias, TabelaDivergencias)
+        self.assertEqual(resultado.detalhes_divergencias[0]['valor'], 7.0)
+        self.assertFalse(ResultadoAnalise(('a', 'b'), 1.0, 1.0, 1, 1, 0.0, 0.0)
+                         .detalhes_divergencias)
+
+
+if __name__ == '__main__':
+    unittest.main()
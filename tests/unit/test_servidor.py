@@ -0,0 +1,112 @@
+"""
+Testes Unitários para o serviço HTTP local
+"""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.servidor import ServicoConciliacao
+
+
+class TestServicoConciliacao(unittest.IsolatedAsyncioTestCase):
+    """Testes para o componente ServicoConciliacao"""
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        pasta_mes = os.path.join(self.temp_dir, '072025')
+        os.makedirs(pasta_mes)
+        self.arquivo_c6 = os.path.join(pasta_mes, 'faturamento_C6_072025.csv')
+        pd.DataFrame({'Data da Venda': ['01/07/2025'], 'Valor da Venda': ['R$ 10,00']}).to_csv(
+            self.arquivo_c6, index=False
+        )
+        self.servico = ServicoConciliacao(self.temp_dir, max_workers=4)
+        self.servidor = await self.servico.iniciar('127.0.0.1', 0)
+        self.porta = self.servidor.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.servidor.close()
+        await self.servidor.wait_closed()
+        self.servico.encerrar()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def _get(self, caminho: str):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.porta)
+        writer.write(f"GET {caminho} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        resposta = await reader.read()
+        writer.close()
+        cabecalho, corpo = resposta.split(b"\r\n\r\n", 1)
+        status = int(cabecalho.split(b" ")[1])
+        return status, json.loads(corpo.decode('utf-8'))
+
+    async def test_conciliacao(self):
+        """Testa o endpoint de conciliação"""
+        status, corpo = await self._get('/conciliacao/072025')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(corpo['resultados'][0]['total_fonte_1'], 10.0)
+
+    async def test_requisicoes_simultaneas_coalescidas(self):
+        """Testa que requisições simultâneas compartilham um único cálculo"""
+        original = self.servico.controller.executar_conciliacao
+        chamadas = []
+        lock = threading.Lock()
+
+        def lenta(mes_ano):
+            with lock:
+                chamadas.append(mes_ano)
+            time.sleep(0.2)
+            return original(mes_ano)
+
+        self.servico.controller.executar_conciliacao = lenta
+
+        respostas = await asyncio.gather(*[self._get('/conciliacao/072025') for _ in range(5)])
+
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual({status for status, _ in respostas}, {200})
+
+        # Em cache enquanto os arquivos não mudam
+        await self._get('/conciliacao/072025')
+        self.assertEqual(len(chamadas), 1)
+
+        pd.DataFrame({'Data da Venda': ['01/07/2025'], 'Valor da Venda': ['R$ 20,00']}).to_csv(
+            self.arquivo_c6, index=False
+        )
+        os.utime(self.arquivo_c6, ns=(0, 1))
+        _, corpo = await self._get('/conciliacao/072025')
+        self.assertEqual(len(chamadas), 2)
+        self.assertEqual(corpo['resultados'][0]['total_fonte_1'], 20.0)
+
+    async def test_resumo_e_detalhes(self):
+        """Testa os endpoints de resumo e detalhes"""
+        status, resumo = await self._get('/resumo/072025')
+        self.assertEqual(status, 200)
+        self.assertEqual(resumo['faturamento_c6']['registros'], 1)
+
+        status, detalhes = await self._get('/detalhes/072025/faturamento_c6')
+        self.assertEqual(status, 200)
+        self.assertEqual(detalhes['registros'], 1)
+
+        status, _ = await self._get('/detalhes/072025/pagamento_gds')
+        self.assertEqual(status, 404)
+
+    async def test_erros_de_requisicao(self):
+        """Testa respostas para mês inválido e recurso inexistente"""
+        self.assertEqual((await self._get('/conciliacao/132025'))[0], 400)
+        self.assertEqual((await self._get('/inexistente'))[0], 404)
+        self.assertEqual((await self._get('/detalhes/072025/outra'))[0], 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
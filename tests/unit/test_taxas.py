@@ -0,0 +1,111 @@
+"""
+Testes Unitários para a análise de taxas de adquirência (MDR)
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.analisador import _serie_brl
+from src.models.taxas import AnalisadorTaxas, carregar_tabela_taxas
+
+
+class TestAnalisadorTaxas(unittest.TestCase):
+    """Testes para o componente AnalisadorTaxas"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.analisador = AnalisadorTaxas()
+
+    def _pagamento_c6(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'status': ['Recebido', 'Recebido', 'Recebido', 'Cancelado'],
+            'bandeira': ['Visa', 'Mastercard', 'Elo', 'Visa'],
+            'tipo_operacao': ['Crédito', 'Crédito', 'Débito', 'Crédito'],
+            'parcelas': ['1/1', '2/3', '1', '1/1'],
+            'valor_parcela': ['R$ 1.000,00', 'R$ 500,00', 'R$ 200,00', 'R$ 300,00'],
+            # Mastercard 2-6x deveria ser 2,21% (11,05); cobrado 11,40
+            'descontos': ['-R$ 19,20', '-R$ 11,40', '-R$ 1,70', '-R$ 5,76'],
+        })
+
+    def test_serie_brl(self):
+        """Testa conversão vetorizada de valores em formato brasileiro"""
+        serie = pd.Series(['R$ 1.234,56', '-R$ 10,00', '', None, 7.5])
+        self.assertEqual(_serie_brl(serie).tolist(), [1234.56, -10.0, 0.0, 0.0, 7.5])
+
+    def test_taxas_c6_fora_contrato(self):
+        """Testa identificação de cobranças acima da taxa contratada"""
+        resultado = self.analisador.analisar({'pagamento_c6': self._pagamento_c6()})
+
+        # Linha cancelada é ignorada; Elo débito não tem taxa contratada
+        self.assertEqual(resultado.registros_analisados, {'pagamento_c6': 3})
+        self.assertEqual(resultado.sem_taxa_contratada, 1)
+
+        self.assertEqual(len(resultado.fora_contrato), 1)
+        linha = resultado.fora_contrato.iloc[0]
+        self.assertEqual(linha['bandeira'], 'mastercard')
+        self.assertEqual(linha['parcelas'], 3)
+        self.assertAlmostEqual(linha['desconto_esperado'], 11.05)
+        self.assertAlmostEqual(linha['diferenca'], 0.35)
+
+        visa = resultado.resumo[resultado.resumo['bandeira'] == 'visa'].iloc[0]
+        self.assertAlmostEqual(visa['taxa_efetiva'], 1.92)
+        self.assertEqual(visa['fora_contrato'], 0)
+
+    def test_taxas_gds(self):
+        """Testa derivação de bandeira e parcelas do pagamento GDS"""
+        gds = pd.DataFrame({
+            'tipo': ['Receita', 'Receita', 'Receita'],
+            'pago': ['Sim', 'Sim', 'Sim'],
+            'metodo': ['Crédito (Visa / Master)', 'Débito (Visa / Master)', 'PIX'],
+            'descricao': ['Consulta (2/4)', 'Consulta', 'Consulta'],
+            'valor': ['R$ 400,00', 'R$ 100,00', 'R$ 50,00'],
+            'valor_liquido': ['R$ 391,16', 'R$ 99,15', 'R$ 50,00'],
+        })
+
+        resultado = self.analisador.analisar({'pagamento_gds': gds})
+
+        self.assertEqual(resultado.registros_analisados, {'pagamento_gds': 2})
+        self.assertTrue(resultado.fora_contrato.empty)
+        parcelas = dict(zip(resultado.resumo['modalidade'], resultado.resumo['parcelas']))
+        self.assertEqual(parcelas, {'credito': 4, 'debito': 1})
+
+    def test_tabela_configuravel(self):
+        """Testa carregamento de tabela de taxas em JSON"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            caminho = os.path.join(temp_dir, 'taxas.json')
+            with open(caminho, 'w', encoding='utf-8') as f:
+                json.dump([{'bandeira': 'Elo', 'modalidade': 'debito',
+                            'parcelas_min': 1, 'parcelas_max': 1, 'taxa': 0.85}], f)
+
+            analisador = AnalisadorTaxas(carregar_tabela_taxas(caminho))
+            resultado = analisador.analisar({'pagamento_c6': self._pagamento_c6()})
+
+            # Apenas Elo débito tem taxa nesta tabela
+            self.assertEqual(resultado.sem_taxa_contratada, 2)
+            self.assertTrue(resultado.fora_contrato.empty)
+
+            with open(caminho, 'w', encoding='utf-8') as f:
+                json.dump([{'bandeira': 'visa', 'taxa': 1.0}], f)
+            with self.assertRaises(ValueError):
+                carregar_tabela_taxas(caminho)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_sem_dados(self):
+        """Testa análise sem fontes de pagamento"""
+        resultado = self.analisador.analisar({})
+        self.assertTrue(resultado.resumo.empty)
+        self.assertTrue(resultado.fora_contrato.empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
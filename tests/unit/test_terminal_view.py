@@ -10,8 +10,9 @@ from unittest.mock import patch
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from src.models.analisador import ResultadoAnalise
-from src.views.terminal_view import TerminalView
+from src.models.analisador import ResultadoAnalise, ResultadoLote
+from src.models.validacao import TabelaErrosValidacao
+from src.views.terminal_view import Paginador, TerminalView
 
 
 class TestTerminalView(unittest.TestCase):
@@ -93,6 +94,106 @@ class TestTerminalView(unittest.TestCase):
         self.assertIn("1.000,00", output)  # Formato monetário
         self.assertIn("10,0%", output)     # Percentual
         
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_exibir_resultados_com_duplicidades(self, mock_stdout):
+        """Testa exibição das retentativas descartadas do total C6"""
+        resultado = ResultadoAnalise(
+            par_fontes=('faturamento_c6', 'faturamento_gds'),
+            total_fonte_1=1000.0,
+            total_fonte_2=1000.0,
+            registros_fonte_1=10,
+            registros_fonte_2=10,
+            diferenca=0.0,
+            percentual_diferenca=0.0,
+            detalhes_divergencias=[
+                {'fonte': 'faturamento_c6', 'tipo': 'retentativa', 'valor': 600.0},
+            ],
+        )
+
+        with patch.object(self.view, 'limpar_tela'):
+            self.view.exibir_resultados_conciliacao([resultado], '072025')
+
+        output = mock_stdout.getvalue()
+        self.assertIn("Descartadas do total: 1", output)
+        self.assertIn("600,00", output)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_exibir_erros_validacao(self, mock_stdout):
+        """Testa contagens por fonte e regra e a listagem das células inválidas"""
+        erros = TabelaErrosValidacao.de_registros([
+            {'fonte': 'faturamento_gds', 'linha': 4, 'coluna': 'valor',
+             'regra': 'valor_invalido', 'conteudo': 'cem reais'},
+            {'fonte': 'faturamento_gds', 'linha': 9, 'coluna': 'data_emissao',
+             'regra': 'data_invalida', 'conteudo': '31/02/2025'},
+        ])
+        resultados = [
+            ResultadoAnalise((fonte, 'faturamento_gds'), 1.0, 1.0, 1, 1, 0.0, 0.0,
+                             erros_validacao={'faturamento_gds': erros})
+            for fonte in ('faturamento_c6', 'faturamento_wab')
+        ]
+
+        with patch.object(self.view, 'limpar_tela'):
+            self.view.exibir_resultados_conciliacao(resultados, '072025')
+
+        output = mock_stdout.getvalue()
+        self.assertIn("ERROS DE VALIDAÇÃO", output)
+        self.assertIn("valor_invalido: 1, data_invalida: 1", output)
+        # A tabela compartilhada pelos dois pares é listada uma vez
+        self.assertEqual(output.count("'cem reais'"), 1)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_exibir_resultados_lote(self, mock_stdout):
+        """Testa exibição do resumo de conciliação em lote"""
+        resultado = ResultadoAnalise(
+            par_fontes=('faturamento_c6', 'faturamento_gds'),
+            total_fonte_1=1000.0,
+            total_fonte_2=1100.0,
+            registros_fonte_1=10,
+            registros_fonte_2=11,
+            diferenca=100.0,
+            percentual_diferenca=10.0
+        )
+        lote = ResultadoLote(
+            resultados={'062025': [resultado]},
+            tempos={'062025': 1.25},
+            erros={'072025': 'falha de leitura'},
+            duracao_total=1.5,
+        )
+
+        with patch.object(self.view, 'limpar_tela'):
+            self.view.exibir_resultados_lote(lote)
+
+        output = mock_stdout.getvalue()
+        self.assertIn("CONCILIAÇÃO EM LOTE", output)
+        self.assertIn("Junho/2025", output)
+        self.assertIn("1.25", output)
+        self.assertIn("falha de leitura", output)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_mes_sem_registros_nao_confere(self, mock_stdout):
+        """Testa que par com uma fonte vazia é divergência, como no CLI e exportadores"""
+        vazio = ResultadoAnalise(
+            par_fontes=('faturamento_c6', 'faturamento_gds'),
+            total_fonte_1=0.0,
+            total_fonte_2=0.0,
+            registros_fonte_1=0,
+            registros_fonte_2=0,
+            diferenca=0.0,
+            percentual_diferenca=0.0
+        )
+        lote = ResultadoLote(
+            resultados={'062025': [vazio]}, tempos={'062025': 0.5}, erros={}, duracao_total=0.5,
+        )
+
+        with patch.object(self.view, 'limpar_tela'):
+            self.view.exibir_resultados_lote(lote)
+            self.view.exibir_resultados_conciliacao([vazio], '062025')
+
+        output = mock_stdout.getvalue()
+        self.assertNotIn("CONFERE", output)
+        self.assertIn("⚠️  DIVERGÊNCIA", output)
+        self.assertIn("Status: ❌ GRANDE DIVERGÊNCIA", output)
+
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_exibir_resultados_vazios(self, mock_stdout):
         """Testa exibição com resultados vazios"""
@@ -182,6 +283,29 @@ class TestTerminalView(unittest.TestCase):
         self.assertIn("ESTATÍSTICAS", output)
         self.assertIn("PRIMEIROS REGISTROS", output)
         
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_exibir_detalhes_fonte_paginado(self, mock_stdout):
+        """Testa listagem de todas as linhas da fonte pelo paginador"""
+        detalhes = {
+            'registros': 45,
+            'colunas': ['data_venda', 'valor_venda'],
+            'estatisticas': {},
+            'primeiros_registros': [],
+        }
+        registros = ((f'{i:02d}/07/2025', float(i)) for i in range(45))
+        self.view.paginador = Paginador(tamanho_pagina=20, interativo=False)
+
+        with patch.object(self.view, 'limpar_tela'):
+            self.view.exibir_detalhes_fonte(
+                detalhes, 'faturamento_c6', '072025', registros=registros
+            )
+
+        output = mock_stdout.getvalue()
+        self.assertIn("data_venda | valor_venda", output)
+        self.assertIn("44/07/2025 | 44.0", output)
+        self.assertIn("-- página 3 (45 registros exibidos) --", output)
+        self.assertNotIn("PRIMEIROS REGISTROS", output)
+
     @patch('builtins.input', return_value='2')
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_solicitar_fonte_valida(self, mock_stdout, mock_input):
@@ -241,5 +365,69 @@ class TestTerminalView(unittest.TestCase):
         resultado = self.view._formatar_mes_ano('132025')  # Mês 13 inválido
         self.assertIn('13/2025', resultado)  # Deve retornar o valor original
 
+class TestPaginador(unittest.TestCase):
+    """Testes para o componente Paginador"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.saida = io.StringIO()
+        self.formatados = []
+
+    def _formatar(self, item):
+        self.formatados.append(item)
+        return f"linha {item}"
+
+    def test_formata_apenas_paginas_exibidas(self):
+        """Testa que encerrar na primeira página não consome o resto do iterador"""
+        consumidos = []
+
+        def itens():
+            for i in range(1_000_000):
+                consumidos.append(i)
+                yield i
+
+        paginador = Paginador(tamanho_pagina=10, saida=self.saida, interativo=True)
+        with patch('builtins.input', return_value='q'):
+            exibidos = paginador.exibir(itens(), self._formatar)
+
+        self.assertEqual(exibidos, 10)
+        self.assertEqual(self.formatados, list(range(10)))
+        # Uma linha a mais é lida apenas para saber se há próxima página
+        self.assertEqual(len(consumidos), 11)
+
+    def test_avanca_paginas_com_enter(self):
+        """Testa navegação página a página, com cabeçalho repetido"""
+        paginador = Paginador(tamanho_pagina=2, saida=self.saida, interativo=True)
+        with patch('builtins.input', return_value='') as mock_input:
+            exibidos = paginador.exibir(range(5), self._formatar, cabecalho=('TÍTULO',))
+
+        self.assertEqual(exibidos, 5)
+        # Sem pergunta após a última página
+        self.assertEqual(mock_input.call_count, 2)
+        output = self.saida.getvalue()
+        self.assertEqual(output.count('TÍTULO'), 3)
+        self.assertIn("-- página 3 (5 registros exibidos) --", output)
+
+    def test_escreve_uma_vez_por_pagina(self):
+        """Testa escrita em blocos, uma chamada por página"""
+        saida = io.StringIO()
+        paginador = Paginador(tamanho_pagina=50, saida=saida, interativo=False)
+        with patch.object(saida, 'write', wraps=saida.write) as escrita:
+            paginador.exibir(range(120), self._formatar)
+
+        self.assertEqual(escrita.call_count, 3)
+        self.assertIn("linha 119", saida.getvalue())
+
+    def test_pagina_unica_sem_rodape(self):
+        """Testa que uma só página não exibe rodapé nem pergunta"""
+        paginador = Paginador(tamanho_pagina=20, saida=self.saida, interativo=True)
+        with patch('builtins.input') as mock_input:
+            paginador.exibir([], self._formatar)
+            paginador.exibir([1, 2], self._formatar)
+
+        mock_input.assert_not_called()
+        self.assertEqual(self.saida.getvalue(), "linha 1\nlinha 2\n")
+
+
 if __name__ == '__main__':
     unittest.main()
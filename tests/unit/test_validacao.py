@@ -0,0 +1,146 @@
+"""
+Testes Unitários para a validação das fontes durante a padronização
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.analisador import Analisador
+from src.models.cache_resultados import desserializar_resultados, serializar_resultados
+from src.models.data_loader import DataLoader
+from src.models.validacao import TabelaErrosValidacao, converter_brl, converter_data
+
+
+class TestValidacao(unittest.TestCase):
+    """Testes para os conversores, ErrosValidacao e o relatório nos resultados"""
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_conversores_devolvem_mascaras(self):
+        """Testa valores, inválidos e vazios em R$ e datas inexistentes"""
+        valores, invalidos, vazios = converter_brl(
+            pd.Series(['R$ 1.500,75', '12,3O', '', None, ' 7,5 ', '-R$ 10,00'])
+        )
+        self.assertEqual(valores.tolist(), [1500.75, 0.0, 0.0, 0.0, 7.5, -10.0])
+        self.assertEqual(invalidos.tolist(), [False, True, False, False, False, False])
+        self.assertEqual(vazios.tolist(), [False, False, True, True, False, False])
+
+        datas, invalidas, vazias = converter_data(
+            pd.Series(['28/02/2025', '31/02/2025', '', None, '14/07/2025.'])
+        )
+        self.assertEqual(datas.isna().tolist(), [False, True, True, True, True])
+        self.assertEqual(invalidas.tolist(), [False, True, False, False, True])
+        self.assertEqual(vazias.tolist(), [False, False, True, True, False])
+
+    def test_erros_por_linha_nos_resultados(self):
+        """Testa regras por linha, filtros da fonte e tabela compartilhada entre pares"""
+        dados = {
+            'faturamento_gds': pd.DataFrame({
+                'data_emissao': ['01/07/2025', '31/06/2025', '', '03/07/2025'],
+                'valor': ['R$ 100,00', 'R$ 50,00', 'R$ 30,00', 'cem reais'],
+            }),
+            'faturamento_wab': pd.DataFrame({
+                'data': ['01/07/2025', '02/07/2025'],
+                'valor_pago': ['R$700,00', '-R$ 20,00'],
+            }),
+            'pagamento_gds': pd.DataFrame({
+                'tipo': ['Receita', 'Receita', 'Receita'],
+                'pago': ['Sim', 'Não', 'Sim'],
+                'data_baixa': ['05/07/2025', '', ''],
+                'valor_liquido': ['R$ 10,00', 'R$ 20,00', 'R$ 30,00'],
+            }),
+        }
+
+        with self.assertLogs('src.models.analisador', 'WARNING'):
+            resultados = Analisador().analisar(dados)
+
+        gds_c6, gds_wab = resultados[0].erros_validacao, resultados[2].erros_validacao
+        self.assertIs(gds_c6['faturamento_gds'], gds_wab['faturamento_gds'])
+        self.assertNotIn('faturamento_c6', gds_c6)
+        gds = gds_c6['faturamento_gds']
+        self.assertEqual(list(gds.tuplas()), [
+            ('faturamento_gds', 2, 'data_emissao', 'data_invalida', '31/06/2025'),
+            ('faturamento_gds', 3, 'data_emissao', 'chave_ausente', ''),
+            ('faturamento_gds', 4, 'valor', 'valor_invalido', 'cem reais'),
+        ])
+        # O total segue contando a célula inválida como zero
+        self.assertEqual(resultados[0].total_fonte_2, 180.0)
+        # O valor negativo do WAB é apontado e segue somado ao total
+        wab = gds_wab['faturamento_wab']
+        self.assertEqual(wab.contar('regra'), {'valor_negativo': 1})
+        self.assertEqual(resultados[2].total_fonte_2, 680.0)
+        # Só a receita paga sem data de baixa é apontada
+        pagamento = resultados[3].erros_validacao['pagamento_gds']
+        self.assertEqual(pagamento.coluna('linha').tolist(), [3])
+
+        lidos = desserializar_resultados(serializar_resultados(resultados))
+        self.assertEqual(lidos, resultados)
+        self.assertIsInstance(lidos[0].erros_validacao['faturamento_gds'], TabelaErrosValidacao)
+        self.assertIs(
+            lidos[0].erros_validacao['faturamento_gds'],
+            lidos[2].erros_validacao['faturamento_gds'],
+        )
+
+
+    def test_coluna_de_total_ausente(self):
+        """Testa fonte sem nenhuma das colunas de total: soma zero e é apontada"""
+        dados = {
+            'faturamento_wab': pd.DataFrame({
+                'data': ['01/07/2025'], 'valor_total': ['R$700,00'],
+            }),
+        }
+
+        resultados = Analisador().analisar(dados)
+
+        wab = resultados[2].erros_validacao['faturamento_wab']
+        self.assertEqual(wab.contar('regra'), {'coluna_ausente': 1})
+        self.assertEqual(
+            wab.filtrar('regra', ['coluna_ausente'])[0]['coluna'], 'valor_pago/valor/valor_venda'
+        )
+        self.assertEqual(resultados[2].total_fonte_2, 0.0)
+    def test_cabecalho_e_texto_invalido_vindos_do_loader(self):
+        """Testa colunas fora do esquema, ';' finais ignorados e valor inválido preservado"""
+        caminho = os.path.join(self.temp_dir, 'pagamento_C6_072025.csv')
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(
+                'Data do recebível;Valor da venda;Valor do recebível;Status do recebível;'
+                'Coluna Nova;;\n'
+                '05/07/2025;R$ 100,00;R$ 97,00;Recebido;x;;\n'
+                '06/07/2025;R$ 1OO,00;R$ 97,00;Recebido;y;;\n'
+            )
+        loader = DataLoader(self.temp_dir)
+
+        df = loader.ler_csv(caminho, loader.pagamento_c6_cols)
+
+        self.assertEqual(df.attrs['colunas_inesperadas'], ['Coluna Nova'])
+        self.assertIn('hora_venda', df.attrs['colunas_ausentes'])
+        self.assertEqual(df['valor_venda'].tolist(), [100.0, 'R$ 1OO,00'])
+
+        with self.assertLogs('src.models.analisador', 'WARNING'):
+            totais = Analisador().calcular_totais_pagamento({'pagamento_c6': df})
+        erros = totais['pagamento_c6']['validacao']
+        self.assertEqual(totais['pagamento_c6']['total'], 194.0)
+        self.assertEqual(erros[0]['linha'], 0)
+        self.assertIn(('coluna_inesperada', 'Coluna Nova'), {
+            (e['regra'], e['coluna']) for e in erros
+        })
+        # 'valor' é cópia de 'valor_venda': o erro aparece uma vez só
+        invalidos = erros.filtrar('regra', ['valor_invalido'])
+        self.assertEqual([(e['linha'], e['coluna']) for e in invalidos], [(2, 'valor_venda')])
+
+
+if __name__ == '__main__':
+    unittest.main()